@@ -0,0 +1,25 @@
+from .brokers import (
+    BACKENDS,
+    BrokerBenchmark,
+)
+from .fakes import (
+    FakeKafkaConsumer,
+    FakeKafkaProducer,
+    FakeKafkaRecord,
+)
+from .rest import (
+    MIDDLEWARE_LENGTHS,
+    PAYLOAD_SIZES,
+    RestBenchmark,
+)
+from .runners import (
+    BenchmarkResult,
+    dump_results,
+    find_regressions,
+    get_environment,
+    load_baselines,
+    run_benchmark,
+    run_load_benchmark,
+    save_baselines,
+    select_median,
+)
@@ -0,0 +1,146 @@
+"""Run the benchmarks.
+
+Usage examples::
+
+    python -m benchmarks                                # Run every suite, the broker one with the in-memory stand-in.
+    python -m benchmarks --suite broker --backend postgres  # Run against the Postgres of the ``config.yml`` file.
+    python -m benchmarks --suite rest --json            # Print the results of the rest suite as JSON.
+    python -m benchmarks --save                         # Store the results as the new baselines.
+
+Each stage is run ``--repeats`` times: the run with the median throughput is reported and stored as the baseline, and
+the process exits with a non-zero status if the best run of any gated stage regresses more than the tolerance against
+its baseline. The rest microbenchmarks are only reported, as only the load tests of that suite are gated.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from collections import (
+    defaultdict,
+)
+from pathlib import (
+    Path,
+)
+
+from minos.common import (
+    MinosConfig,
+)
+
+from .brokers import (
+    BACKENDS,
+    BrokerBenchmark,
+)
+from .rest import (
+    PAYLOAD_SIZES,
+    RestBenchmark,
+)
+from .runners import (
+    dump_results,
+    find_regressions,
+    get_environment,
+    load_baselines,
+    save_baselines,
+    select_median,
+)
+
+BASE_PATH = Path(__file__).parent
+
+SUITES = ("broker", "rest")
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Run the benchmarks.")
+    parser.add_argument("stages", nargs="*", help="The stages to be run. All of them by default.")
+    parser.add_argument(
+        "--suite", choices=SUITES, action="append", help="The suites to be run. All of them by default."
+    )
+    parser.add_argument("--messages", type=int, default=2000, help="The number of messages of each stage.")
+    parser.add_argument("--repeats", type=int, default=3, help="The number of runs of each stage.")
+    parser.add_argument("--backend", choices=BACKENDS, default="memory", help="The broker queues backend.")
+    parser.add_argument("--config", type=Path, default=BASE_PATH / "config.yml", help="The broker config file.")
+    parser.add_argument("--batch-size", type=int, default=None, help="The number of messages of each broker batch.")
+    parser.add_argument("--payload-size", type=int, default=256, help="The size of the broker message payloads.")
+    parser.add_argument("--kafka-latency", type=float, default=0.0, help="The fake Kafka latency, in seconds.")
+    parser.add_argument(
+        "--payload-sizes", type=int, nargs="+", default=PAYLOAD_SIZES, help="The sizes of the rest payloads."
+    )
+    parser.add_argument("--concurrency", type=int, default=10, help="The number of concurrent rest clients.")
+    parser.add_argument("--baselines", type=Path, default=BASE_PATH / "baselines.json", help="The baselines file.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="The accepted relative regression.")
+    parser.add_argument("--save", action="store_true", help="Store the results as the new baselines.")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    parser.add_argument("--output", type=Path, default=None, help="Write the results as JSON to the given file.")
+    return parser.parse_args(argv)
+
+
+def _build_suites(args: argparse.Namespace) -> dict[str, object]:
+    suites = dict()
+    if not args.suite or "broker" in args.suite:
+        suites[args.backend] = BrokerBenchmark(
+            MinosConfig(args.config),
+            backend=args.backend,
+            batch_size=args.batch_size,
+            payload_size=args.payload_size,
+            kafka_latency=args.kafka_latency,
+        )
+    if not args.suite or "rest" in args.suite:
+        suites["rest"] = RestBenchmark(payload_sizes=tuple(args.payload_sizes), concurrency=args.concurrency)
+    return suites
+
+
+async def _main(args: argparse.Namespace) -> int:
+    suites = _build_suites(args)
+
+    available = {name for suite in suites.values() for name in suite.stages}
+    unknown = set(args.stages) - available
+    if unknown:
+        print(f"Unknown stages: {sorted(unknown)}. Available: {sorted(available)}", file=sys.stderr)
+        return 2
+
+    runs = defaultdict(list)
+    gated = set()
+    for prefix, suite in suites.items():
+        names = [name for name in suite.stages if not args.stages or name in args.stages]
+        if not names:
+            continue
+        gated |= {f"{prefix}:{name}" for name in suite.gated_stages}
+        async with suite:
+            for _ in range(args.repeats):
+                for name, result in (await suite.run(names, messages=args.messages)).items():
+                    runs[f"{prefix}:{name}"].append(result)
+
+    results = {key: select_median(value) for key, value in runs.items()}
+    if not args.json:
+        for key, result in results.items():
+            prefix = key.split(":", 1)[0]
+            print(f"{prefix:<8} {result!s}")
+
+    if args.json:
+        print(json.dumps(dump_results(results), indent=2))
+    if args.output is not None:
+        with args.output.open("w") as file:
+            json.dump(dump_results(results), file, indent=2)
+
+    baselines = load_baselines(args.baselines)
+
+    if args.save:
+        save_baselines(args.baselines, baselines, results)
+        print(f"Stored the baselines on {args.baselines!s}", file=sys.stderr)
+        return 0
+
+    if baselines["environment"] is not None and baselines["environment"] != get_environment():
+        print(f"The baselines were measured on a different environment: {baselines['environment']}", file=sys.stderr)
+
+    regressions = find_regressions(
+        baselines, {key: value for key, value in runs.items() if key in gated}, args.tolerance
+    )
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(asyncio.run(_main(_parse_args(sys.argv[1:]))))
@@ -0,0 +1,295 @@
+from __future__ import (
+    annotations,
+)
+
+import sys
+from collections.abc import (
+    Awaitable,
+    Callable,
+)
+from pathlib import (
+    Path,
+)
+from tempfile import (
+    TemporaryDirectory,
+)
+from typing import (
+    Optional,
+)
+
+from psycopg2.sql import (
+    SQL,
+)
+
+from minos.common import (
+    MinosConfig,
+)
+from minos.networks import (
+    BrokerConsumer,
+    BrokerHandler,
+    BrokerMessage,
+    BrokerMessageStrategy,
+    BrokerProducer,
+    BrokerPublisher,
+    BrokerQueue,
+    DynamicBroker,
+    InMemoryBrokerQueue,
+    Request,
+    Response,
+    SQLiteBrokerQueue,
+)
+
+from .fakes import (
+    FakeKafkaConsumer,
+    FakeKafkaProducer,
+    FakeKafkaRecord,
+)
+from .runners import (
+    BenchmarkResult,
+    run_benchmark,
+)
+
+BACKENDS = ("memory", "sqlite", "postgres")
+
+REQUEST_TOPIC = "BenchmarkRequest"
+REPLY_TOPIC = "BenchmarkRequestReply"
+EXTERNAL_TOPIC = "BenchmarkExternal"
+
+
+async def _handle(request: Request) -> Response:
+    return Response(await request.content())
+
+
+class BrokerBenchmark:
+    """Broker Benchmark class.
+
+    Measures each stage of the broker pipeline: publishing into the ``producer_queue``, producing to Kafka, consuming
+    from Kafka into the ``consumer_queue``, handling, consuming and handling directly (without the ``consumer_queue``),
+    and the full request/reply round trip of a ``DynamicBroker``.
+
+    Kafka is always replaced by ``FakeKafkaProducer`` and ``FakeKafkaConsumer``. The queues are the Postgres tables
+    with the ``"postgres"`` backend (their rows are deleted before each stage, so a dedicated database must be used),
+    a ``SQLiteBrokerQueue`` on a temporary file with the ``"sqlite"`` one, or an ``InMemoryBrokerQueue`` with the
+    ``"memory"`` one, which measures only the Python side of each stage.
+    """
+
+    def __init__(
+        self,
+        config: MinosConfig,
+        backend: str = "memory",
+        batch_size: Optional[int] = None,
+        payload_size: int = 256,
+        kafka_latency: float = 0.0,
+    ):
+        if backend not in BACKENDS:
+            raise ValueError(f"The 'backend' value must be one of {BACKENDS!r}. Obtained: {backend!r}")
+        if batch_size is None:
+            batch_size = config.broker.queue.records
+
+        self.config = config
+        self.backend = backend
+        self.batch_size = batch_size
+        self.payload = "x" * payload_size
+        self.kafka = FakeKafkaProducer(kafka_latency)
+        self._raw: dict[str, bytes] = dict()
+
+        self.queue: Optional[BrokerQueue] = None
+        self._directory: Optional[TemporaryDirectory] = None
+        self.publisher: Optional[BrokerPublisher] = None
+        self.consumer: Optional[BrokerConsumer] = None
+        self.producer: Optional[BrokerProducer] = None
+        self.handler: Optional[BrokerHandler] = None
+        self.direct: Optional[BrokerConsumer] = None
+        self.dynamic: Optional[DynamicBroker] = None
+
+    @property
+    def stages(self) -> dict[str, tuple[Callable[[], Awaitable[int]], Optional[Callable[[], Awaitable[None]]], bool]]:
+        """Get the benchmark stages.
+
+        :return: A dictionary in which keys are stage names and values are ``(fn, prepare, batched)`` tuples.
+        """
+        return {
+            "publisher.send": (self.publish, None, False),
+            "producer.dispatch": (self.produce, self.prepare_produce, True),
+            "consumer.handle_message": (self.consume, None, False),
+            "handler.dispatch": (self.handle, self.prepare_handle, True),
+            "consumer.direct": (self.consume_direct, None, True),
+            "dynamic.round_trip": (self.round_trip, None, False),
+        }
+
+    @property
+    def gated_stages(self) -> set[str]:
+        """Get the stages that are compared with the baselines.
+
+        :return: A set of stage names.
+        """
+        return set(self.stages)
+
+    async def run(self, names: Optional[list[str]] = None, messages: int = 2000) -> dict[str, BenchmarkResult]:
+        """Run the given stages.
+
+        :param names: The stage names. If ``None`` all of them are run.
+        :param messages: The approximate number of messages to be processed on each stage.
+        :return: A dictionary in which keys are stage names and values are ``BenchmarkResult`` instances.
+        """
+        stages = self.stages
+        if names is None:
+            names = list(stages)
+
+        results = dict()
+        for name in names:
+            fn, prepare, batched = stages[name]
+            iterations = max(messages // self.batch_size, 1) if batched else messages
+            await self.clear()
+            results[name] = await run_benchmark(name, fn, iterations, warmup=max(iterations // 10, 1), prepare=prepare)
+        return results
+
+    async def __aenter__(self) -> BrokerBenchmark:
+        if self.backend == "memory":
+            self.queue = InMemoryBrokerQueue()
+        elif self.backend == "sqlite":
+            self._directory = TemporaryDirectory()
+            self.queue = SQLiteBrokerQueue(Path(self._directory.name) / "queue.sqlite3")
+        kwargs = {"broker_queue": self.queue}
+
+        self.publisher = BrokerPublisher.from_config(config=self.config, **kwargs)
+
+        # noinspection PyProtectedMember
+        self.consumer = BrokerConsumer(
+            topics={REQUEST_TOPIC, REPLY_TOPIC},
+            broker=self.config.broker,
+            client=FakeKafkaConsumer(),
+            **self.config.broker.queue._asdict(),
+            **kwargs,
+        )
+        self.producer = BrokerProducer.from_config(
+            config=self.config, consumer=self.consumer, client=self.kafka, **kwargs
+        )
+        self.handler = BrokerHandler.from_config(
+            config=self.config, handlers={REQUEST_TOPIC: _handle}, publisher=self.publisher, **kwargs
+        )
+        # noinspection PyProtectedMember
+        self.direct = BrokerConsumer(
+            topics={REQUEST_TOPIC},
+            broker=self.config.broker,
+            client=FakeKafkaConsumer(),
+            handler=self.handler,
+            **{**self.config.broker.queue._asdict(), "records": self.batch_size},
+            **kwargs,
+        )
+        self.dynamic = DynamicBroker.from_config(
+            config=self.config, topic=REPLY_TOPIC, publisher=self.publisher, **kwargs
+        )
+
+        for component in self._components:
+            await component.setup()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        for component in reversed(self._components):
+            await component.destroy()
+        if self._directory is not None:
+            self._directory.cleanup()
+
+    @property
+    def _components(self) -> list:
+        return [self.publisher, self.consumer, self.producer, self.handler, self.direct, self.dynamic]
+
+    async def clear(self) -> None:
+        """Remove all the entries from the queues.
+
+        :return: This method does not return anything.
+        """
+        if self.queue is not None:
+            for row in await self.queue.claim_producer(sys.maxsize, sys.maxsize):
+                await self.queue.ack_producer(row[0])
+            for row in await self.queue.claim_consumer(_TOPICS, None, sys.maxsize):
+                await self.queue.ack_consumer(row[0])
+            return
+        await self.publisher.submit_query(_DELETE_PRODUCER_QUEUE_QUERY)
+        await self.consumer.submit_query(_DELETE_CONSUMER_QUEUE_QUERY)
+
+    async def publish(self) -> int:
+        """Publish one message.
+
+        :return: The number of processed messages.
+        """
+        await self.publisher.send(self.payload, topic=EXTERNAL_TOPIC)
+        return 1
+
+    async def prepare_produce(self) -> None:
+        """Fill the producer queue with a batch of messages.
+
+        :return: This method does not return anything.
+        """
+        raw = self._get_raw(EXTERNAL_TOPIC)
+        for _ in range(self.batch_size):
+            await self.publisher.enqueue(EXTERNAL_TOPIC, BrokerMessageStrategy.UNICAST, raw)
+
+    async def produce(self) -> int:
+        """Produce a batch of messages from the producer queue to Kafka.
+
+        :return: The number of processed messages.
+        """
+        await self.producer.dispatch()
+        return self.batch_size
+
+    async def consume(self) -> int:
+        """Consume one message from Kafka into the consumer queue.
+
+        :return: The number of processed messages.
+        """
+        raw = self._get_raw(REQUEST_TOPIC)
+        await self.consumer.handle_message(FakeKafkaConsumer([FakeKafkaRecord(REQUEST_TOPIC, 0, raw)]))
+        return 1
+
+    async def prepare_handle(self) -> None:
+        """Fill the consumer queue with a batch of messages.
+
+        :return: This method does not return anything.
+        """
+        raw = self._get_raw(REQUEST_TOPIC)
+        for _ in range(self.batch_size):
+            await self.consumer.enqueue(REQUEST_TOPIC, 0, raw)
+
+    async def handle(self) -> int:
+        """Handle a batch of messages from the consumer queue.
+
+        :return: The number of processed messages.
+        """
+        await self.handler.dispatch()
+        return self.batch_size
+
+    async def consume_direct(self) -> int:
+        """Consume a batch of messages from Kafka and dispatch them directly, without the consumer queue.
+
+        :return: The number of processed messages.
+        """
+        raw = self._get_raw(REQUEST_TOPIC)
+        records = [FakeKafkaRecord(REQUEST_TOPIC, 0, raw, offset) for offset in range(self.batch_size)]
+        await self.direct.handle_batch(FakeKafkaConsumer(records))
+        return self.batch_size
+
+    async def round_trip(self) -> int:
+        """Send a request with a ``DynamicBroker`` and wait for its reply.
+
+        :return: The number of processed messages.
+        """
+        await self.dynamic.send(self.payload, topic=REQUEST_TOPIC)
+        await self.producer.dispatch()
+        await self.handler.dispatch()
+        await self.producer.dispatch()
+        await self.dynamic.get_one()
+        return 1
+
+    def _get_raw(self, topic: str) -> bytes:
+        if topic not in self._raw:
+            self._raw[topic] = BrokerMessage(topic, self.payload).avro_bytes
+        return self._raw[topic]
+
+
+_TOPICS = (REQUEST_TOPIC, REPLY_TOPIC, EXTERNAL_TOPIC)
+
+_DELETE_PRODUCER_QUEUE_QUERY = SQL("DELETE FROM producer_queue")
+
+_DELETE_CONSUMER_QUEUE_QUERY = SQL("DELETE FROM consumer_queue")
@@ -0,0 +1,126 @@
+from __future__ import (
+    annotations,
+)
+
+from asyncio import (
+    sleep,
+)
+from collections.abc import (
+    AsyncIterator,
+    Iterable,
+)
+from typing import (
+    Any,
+    NamedTuple,
+    Optional,
+)
+
+from aiokafka import (
+    TopicPartition,
+)
+
+
+class FakeKafkaRecord(NamedTuple):
+    """Fake Kafka Record class."""
+
+    topic: str
+    partition: int
+    value: bytes
+    offset: int = 0
+
+
+class FakeKafkaProducer:
+    """Fake Kafka Producer class.
+
+    Replaces the ``AIOKafkaProducer`` so that the publication costs only the given latency.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.sent = 0
+
+    async def start(self) -> None:
+        """Start the producer.
+
+        :return: This method does not return anything.
+        """
+
+    async def stop(self) -> None:
+        """Stop the producer.
+
+        :return: This method does not return anything.
+        """
+
+    async def send_and_wait(self, topic: str, value: bytes) -> None:
+        """Send a message to the given topic.
+
+        :param topic: The topic.
+        :param value: The message.
+        :return: This method does not return anything.
+        """
+        if self.latency:
+            await sleep(self.latency)
+        self.sent += 1
+
+
+class FakeKafkaConsumer:
+    """Fake Kafka Consumer class.
+
+    Replaces the ``AIOKafkaConsumer`` yielding the given records.
+    """
+
+    def __init__(self, records: Iterable[FakeKafkaRecord] = tuple()):
+        self.records = list(records)
+        self.commits = 0
+
+    async def start(self) -> None:
+        """Start the consumer.
+
+        :return: This method does not return anything.
+        """
+
+    async def stop(self) -> None:
+        """Stop the consumer.
+
+        :return: This method does not return anything.
+        """
+
+    def subscribe(self, topics: list[str]) -> None:
+        """Subscribe to the given topics.
+
+        :param topics: The topics.
+        :return: This method does not return anything.
+        """
+
+    def unsubscribe(self) -> None:
+        """Unsubscribe from all the topics.
+
+        :return: This method does not return anything.
+        """
+
+    async def commit(self, offsets: Optional[dict[TopicPartition, Any]] = None) -> None:
+        """Commit the consumed offsets.
+
+        :param offsets: The offsets to be committed. If ``None`` the consumed ones are committed.
+        :return: This method does not return anything.
+        """
+        self.commits += 1
+
+    async def getmany(self, timeout_ms: int = 0, max_records: Optional[int] = None) -> dict[TopicPartition, list]:
+        """Get a batch of records, grouped by partition.
+
+        :param timeout_ms: Ignored, as the records are always available.
+        :param max_records: The maximum number of records.
+        :return: A dictionary in which the keys are the partitions and the values are the records.
+        """
+        if max_records is None:
+            max_records = len(self.records)
+        batch, self.records = self.records[:max_records], self.records[max_records:]
+        batches = dict()
+        for record in batch:
+            batches.setdefault(TopicPartition(record.topic, record.partition), list()).append(record)
+        return batches
+
+    async def __aiter__(self) -> AsyncIterator[FakeKafkaRecord]:
+        for record in self.records:
+            yield record
@@ -0,0 +1,278 @@
+from __future__ import (
+    annotations,
+)
+
+import json
+from asyncio import (
+    get_running_loop,
+)
+from collections.abc import (
+    Awaitable,
+    Callable,
+)
+from functools import (
+    partial,
+)
+from typing import (
+    Any,
+    Optional,
+)
+from urllib.parse import (
+    urlencode,
+)
+
+from aiohttp import (
+    web,
+)
+from aiohttp.base_protocol import (
+    BaseProtocol,
+)
+from aiohttp.streams import (
+    StreamReader,
+)
+from aiohttp.test_utils import (
+    TestClient,
+    TestServer,
+    make_mocked_request,
+)
+
+from minos.common import (
+    MinosAvroProtocol,
+)
+from minos.networks import (
+    EnrouteBuilder,
+    InMemoryRequest,
+    Request,
+    Response,
+    RestHandler,
+    RestQueryEnrouteDecorator,
+    RestRequest,
+    enroute,
+)
+
+from .runners import (
+    BenchmarkResult,
+    run_benchmark,
+    run_load_benchmark,
+)
+
+PAYLOAD_SIZES = (64, 1024, 16384)
+
+MIDDLEWARE_LENGTHS = (0, 1, 3, 4, 10)
+
+_AVRO_SCHEMA = {"type": "map", "values": "string"}
+
+_CONTENT_TYPES = {
+    "json": "application/json",
+    "form": "application/x-www-form-encoded",
+    "avro": "avro/binary",
+}
+
+
+async def _passthrough_middleware(request: Request, inner: Callable) -> Optional[Response]:
+    return await inner(request)
+
+
+class _BenchmarkService:
+    @enroute.rest.query(url="/benchmark", method="GET")
+    async def query(self, request: Request) -> Response:
+        return Response(await request.content())
+
+    @query.check(max_attempts=1)
+    async def check_query(self, request: Request) -> bool:
+        return True
+
+    @enroute.rest.command(url="/benchmark", method="POST")
+    def command(self, request: Request) -> Response:
+        return Response("ok")
+
+    @command.check(max_attempts=1)
+    def check_command(self, request: Request) -> bool:
+        return True
+
+
+async def _echo(request: RestRequest) -> Response:
+    return Response(await request.content())
+
+
+class RestBenchmark:
+    """Rest Benchmark class.
+
+    Measures the overhead added to the rest handling functions (the ``RestHandler.get_callback`` wrapper, the
+    ``EnrouteBuilder`` middleware chains and the ``HandlerMeta`` wrappers with checkers), the request content parsing
+    and the response serialization, at several payload sizes. Additionally, it load tests the whole ``RestHandler``
+    with an in-process ``aiohttp`` client, sending concurrent requests.
+    """
+
+    def __init__(self, payload_sizes: tuple[int, ...] = PAYLOAD_SIZES, concurrency: int = 10):
+        self.payload_sizes = payload_sizes
+        self.concurrency = concurrency
+
+        self.handler = RestHandler(host="localhost", port=8080, endpoints={("/echo", "POST"): _echo})
+        self.client: Optional[TestClient] = None
+        self._callback = self.handler.get_callback(_echo)
+        self._chains = {
+            length: EnrouteBuilder(
+                _BenchmarkService, middleware=[_passthrough_middleware] * length
+            ).get_rest_command_query()[RestQueryEnrouteDecorator("/benchmark", "GET")]
+            for length in MIDDLEWARE_LENGTHS
+        }
+        self._service = _BenchmarkService()
+        self._request = InMemoryRequest("foo")
+
+    @property
+    def stages(self) -> dict[str, tuple[Callable[[], Awaitable[int]], bool]]:
+        """Get the benchmark stages.
+
+        :return: A dictionary in which keys are stage names and values are ``(fn, load)`` tuples.
+        """
+        stages = {
+            "rest.get_callback": (partial(self.get_callback, self._build_raw("json", 64)), False),
+            **{
+                f"builder.middleware.{length}": (partial(self.middleware_chain, length), False)
+                for length in MIDDLEWARE_LENGTHS
+            },
+            "handler_meta.async": (self.handler_meta_async, False),
+            "handler_meta.sync": (self.handler_meta_sync, False),
+        }
+        for size in self.payload_sizes:
+            for format_ in _CONTENT_TYPES:
+                stages[f"rest_request.content.{format_}.{size}"] = (
+                    partial(self.request_content, self._build_raw(format_, size)),
+                    False,
+                )
+            stages[f"response.raw_content.{size}"] = (partial(self.response_raw_content, _build_payload(size)), False)
+            stages[f"load.echo.{size}"] = (partial(self.echo, json.dumps(_build_payload(size)).encode()), True)
+        return stages
+
+    @property
+    def gated_stages(self) -> set[str]:
+        """Get the stages that are compared with the baselines.
+
+        Only the load tests are compared, as the rest of stages are microbenchmarks of a few microseconds per operation,
+        whose results are dominated by the noise of the machine, so they are only reported.
+
+        :return: A set of stage names.
+        """
+        return {name for name, (_, load) in self.stages.items() if load}
+
+    async def run(self, names: Optional[list[str]] = None, messages: int = 2000) -> dict[str, BenchmarkResult]:
+        """Run the given stages.
+
+        :param names: The stage names. If ``None`` all of them are run.
+        :param messages: The number of operations of each stage.
+        :return: A dictionary in which keys are stage names and values are ``BenchmarkResult`` instances.
+        """
+        stages = self.stages
+        if names is None:
+            names = list(stages)
+
+        results = dict()
+        for name in names:
+            fn, load = stages[name]
+            if load:
+                results[name] = await run_load_benchmark(name, fn, messages, self.concurrency)
+            else:
+                results[name] = await run_benchmark(name, fn, messages, warmup=max(messages // 10, 1))
+        return results
+
+    async def __aenter__(self) -> RestBenchmark:
+        await self.handler.setup()
+        self.client = TestClient(TestServer(self.handler.get_app()))
+        await self.client.start_server()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.client.close()
+        await self.handler.destroy()
+
+    async def get_callback(self, raw: web.Request) -> int:
+        """Call the ``RestHandler.get_callback`` wrapper of a function that echoes the request content.
+
+        :param raw: The raw request.
+        :return: The number of processed requests.
+        """
+        await self._callback(raw)
+        return 1
+
+    async def middleware_chain(self, length: int) -> int:
+        """Call an ``EnrouteBuilder`` handler with the given number of middleware functions.
+
+        :param length: The number of middleware functions.
+        :return: The number of processed requests.
+        """
+        await self._chains[length](self._request)
+        return 1
+
+    async def handler_meta_async(self) -> int:
+        """Call an asynchronous ``HandlerMeta`` wrapper with a checker.
+
+        :return: The number of processed requests.
+        """
+        await self._service.query(self._request)
+        return 1
+
+    async def handler_meta_sync(self) -> int:
+        """Call a synchronous ``HandlerMeta`` wrapper with a checker.
+
+        :return: The number of processed requests.
+        """
+        self._service.command(self._request)
+        return 1
+
+    @staticmethod
+    async def request_content(raw: web.Request) -> int:
+        """Parse the content of a ``RestRequest``.
+
+        :param raw: The raw request.
+        :return: The number of processed requests.
+        """
+        await RestRequest(raw).content()
+        return 1
+
+    @staticmethod
+    async def response_raw_content(payload: Any) -> int:
+        """Serialize the content of a ``Response``.
+
+        :param payload: The response payload.
+        :return: The number of processed responses.
+        """
+        await Response(payload).raw_content()
+        return 1
+
+    async def echo(self, body: bytes) -> int:
+        """Send a request to the in-process server, which echoes its content.
+
+        :param body: The request body.
+        :return: The number of processed requests.
+        """
+        response = await self.client.post("/echo", data=body, headers={"Content-Type": "application/json"})
+        await response.read()
+        if response.status != 200:
+            raise ValueError(f"The echo request failed with the {response.status!r} status.")
+        return 1
+
+    @staticmethod
+    def _build_raw(format_: str, size: int) -> web.Request:
+        payload = _build_payload(size)
+        if format_ == "json":
+            body = json.dumps(payload).encode()
+        elif format_ == "form":
+            body = urlencode(payload).encode()
+        else:
+            body = MinosAvroProtocol.encode(payload, _AVRO_SCHEMA)
+
+        payload = StreamReader(BaseProtocol(get_running_loop()), len(body) + 1)
+        payload.feed_data(body)
+        payload.feed_eof()
+
+        raw = make_mocked_request(
+            "POST", "/benchmark", headers={"Content-Type": _CONTENT_TYPES[format_]}, payload=payload
+        )
+        # The body is set as already read, so that the same request can be parsed several times.
+        raw._read_bytes = body
+        return raw
+
+
+def _build_payload(size: int) -> dict[str, str]:
+    return {"foo": "x" * size}
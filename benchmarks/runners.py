@@ -0,0 +1,264 @@
+from __future__ import (
+    annotations,
+)
+
+import json
+import math
+import os
+import platform
+import sys
+import time
+from asyncio import (
+    gather,
+)
+from collections.abc import (
+    Awaitable,
+    Callable,
+)
+from pathlib import (
+    Path,
+)
+from typing import (
+    Any,
+    Optional,
+    Union,
+)
+
+BENCHMARK_METRICS = ("throughput", "p50", "p95", "p99")
+GATED_METRICS = ("throughput", "p50")
+
+
+class BenchmarkResult:
+    """Benchmark Result class.
+
+    Contains the latencies of each operation and the number of messages processed by all of them.
+    """
+
+    def __init__(self, name: str, latencies: list[float], messages: int, elapsed: float):
+        self.name = name
+        self.latencies = sorted(latencies)
+        self.messages = messages
+        self.elapsed = elapsed
+
+    @property
+    def throughput(self) -> float:
+        """Get the number of processed messages per second.
+
+        :return: A ``float`` value.
+        """
+        if not self.elapsed:
+            return 0.0
+        return self.messages / self.elapsed
+
+    def percentile(self, q: float) -> float:
+        """Get the given latency percentile, using the nearest-rank method.
+
+        :param q: The percentile, between ``0`` and ``100``.
+        :return: The latency in seconds.
+        """
+        if not self.latencies:
+            return 0.0
+        rank = max(math.ceil(q / 100 * len(self.latencies)), 1)
+        return self.latencies[rank - 1]
+
+    @property
+    def p50(self) -> float:
+        """Get the median latency.
+
+        :return: The latency in seconds.
+        """
+        return self.percentile(50)
+
+    @property
+    def p95(self) -> float:
+        """Get the 95th percentile latency.
+
+        :return: The latency in seconds.
+        """
+        return self.percentile(95)
+
+    @property
+    def p99(self) -> float:
+        """Get the 99th percentile latency.
+
+        :return: The latency in seconds.
+        """
+        return self.percentile(99)
+
+    def as_dict(self) -> dict[str, Union[int, float]]:
+        """Get the result as a dictionary.
+
+        :return: A dictionary in which keys are metric names and values are numbers.
+        """
+        return {
+            "operations": len(self.latencies),
+            "messages": self.messages,
+            **{name: getattr(self, name) for name in BENCHMARK_METRICS},
+        }
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name:<36} {self.throughput:>12,.0f} msg/s "
+            f"p50 {self.p50 * 1e3:>9.3f} ms  p95 {self.p95 * 1e3:>9.3f} ms  p99 {self.p99 * 1e3:>9.3f} ms"
+        )
+
+
+async def run_benchmark(
+    name: str,
+    fn: Callable[[], Awaitable[int]],
+    iterations: int,
+    warmup: int = 0,
+    prepare: Optional[Callable[[], Awaitable[None]]] = None,
+) -> BenchmarkResult:
+    """Run the given benchmark function several times, measuring the latency of each call.
+
+    :param name: The benchmark name.
+    :param fn: The function to be measured. It must return the number of processed messages.
+    :param iterations: The number of measured calls.
+    :param warmup: The number of calls performed before starting to measure.
+    :param prepare: Optional function called before each call, which is not measured.
+    :return: A ``BenchmarkResult`` instance.
+    """
+    for _ in range(warmup):
+        if prepare is not None:
+            await prepare()
+        await fn()
+
+    latencies = list()
+    messages = 0
+    for _ in range(iterations):
+        if prepare is not None:
+            await prepare()
+        start = time.perf_counter()
+        messages += await fn()
+        latencies.append(time.perf_counter() - start)
+
+    return BenchmarkResult(name, latencies, messages, sum(latencies))
+
+
+async def run_load_benchmark(
+    name: str, fn: Callable[[], Awaitable[int]], iterations: int, concurrency: int
+) -> BenchmarkResult:
+    """Run the given benchmark function from several concurrent workers, measuring the latency of each call.
+
+    Contrary to ``run_benchmark``, the throughput is computed with the wall time, so it includes the concurrency gains.
+
+    :param name: The benchmark name.
+    :param fn: The function to be measured. It must return the number of processed messages.
+    :param iterations: The total number of measured calls.
+    :param concurrency: The number of concurrent workers.
+    :return: A ``BenchmarkResult`` instance.
+    """
+    latencies = list()
+    messages = 0
+    remaining = iterations
+
+    async def _worker() -> None:
+        nonlocal messages, remaining
+        while remaining > 0:
+            remaining -= 1
+            operation_start = time.perf_counter()
+            # The result is awaited before the increment, as ``messages += await fn()`` would lose concurrent updates.
+            processed = await fn()
+            latencies.append(time.perf_counter() - operation_start)
+            messages += processed
+
+    start = time.perf_counter()
+    await gather(*(_worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return BenchmarkResult(name, latencies, messages, elapsed)
+
+
+def get_environment() -> dict[str, Any]:
+    """Get a description of the environment in which the benchmarks are run.
+
+    :return: A dictionary.
+    """
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": sys.platform,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def dump_results(results: dict[str, BenchmarkResult]) -> dict[str, Any]:
+    """Get the given results in a machine-readable format, together with the environment.
+
+    :param results: The results, indexed by benchmark key.
+    :return: A dictionary containing the ``environment`` and the ``results`` keys.
+    """
+    return {"environment": get_environment(), "results": {key: result.as_dict() for key, result in results.items()}}
+
+
+def load_baselines(path: Path) -> dict[str, Any]:
+    """Load the stored baselines.
+
+    :param path: The path of the baselines file.
+    :return: A dictionary containing the ``environment`` and the ``results`` keys.
+    """
+    if not path.exists():
+        return {"environment": None, "results": dict()}
+    with path.open() as file:
+        return json.load(file)
+
+
+def save_baselines(path: Path, baselines: dict[str, Any], results: dict[str, BenchmarkResult]) -> None:
+    """Store the given results as the new baselines, keeping the previous ones of the benchmarks that were not run.
+
+    :param path: The path of the baselines file.
+    :param baselines: The previous baselines.
+    :param results: The new results, indexed by benchmark key.
+    :return: This method does not return anything.
+    """
+    stored = dict(baselines.get("results", dict()))
+    for key, result in results.items():
+        stored[key] = {name: value for name, value in result.as_dict().items() if name in BENCHMARK_METRICS}
+
+    with path.open("w") as file:
+        json.dump({"environment": get_environment(), "results": dict(sorted(stored.items()))}, file, indent=2)
+        file.write("\n")
+
+
+def select_median(runs: list[BenchmarkResult]) -> BenchmarkResult:
+    """Select the representative result of a set of repeated runs, that is, the one with the median throughput.
+
+    :param runs: The results of the repeated runs of the same benchmark.
+    :return: A ``BenchmarkResult`` instance.
+    """
+    return sorted(runs, key=lambda result: result.throughput)[(len(runs) - 1) // 2]
+
+
+def find_regressions(
+    baselines: dict[str, Any], results: dict[str, list[BenchmarkResult]], tolerance: float
+) -> list[str]:
+    """Compare the given results with the stored baselines.
+
+    A benchmark is a regression if the best of its repeated runs has a lower throughput or a higher median latency than
+    the baseline, by more than the given tolerance. As the noise of the machine only makes the runs slower, the best
+    run is the most stable estimate, so a regression must be observed on every run to be reported. The tail latencies
+    are not compared, as they are dominated by that noise.
+
+    :param baselines: The stored baselines.
+    :param results: The results of the repeated runs, indexed by benchmark key.
+    :param tolerance: The accepted relative difference, like ``0.2`` for a 20%.
+    :return: A list of human-readable descriptions of the regressions.
+    """
+    regressions = list()
+    for key, runs in results.items():
+        baseline = baselines.get("results", dict()).get(key)
+        if baseline is None or not runs:
+            continue
+        for name in GATED_METRICS:
+            expected = baseline[name]
+            if name == "throughput":
+                observed = max(result.throughput for result in runs)
+                regressed = observed < expected * (1 - tolerance)
+            else:
+                observed = min(getattr(result, name) for result in runs)
+                regressed = observed > expected * (1 + tolerance)
+            if regressed:
+                regressions.append(f"{key}: {name} {observed:.6g} (baseline {expected:.6g})")
+    return regressions
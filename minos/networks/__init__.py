@@ -3,8 +3,11 @@ __email__ = "devs@clariteia.com"
 __version__ = "0.3.2"
 
 from .brokers import (
+    PUBLISHED_AT_HEADER,
     REQUEST_HEADERS_CONTEXT_VAR,
     REQUEST_REPLY_TOPIC_CONTEXT_VAR,
+    TRACE_CONTEXT_VAR,
+    TRACEPARENT_HEADER,
     BrokerConsumer,
     BrokerConsumerService,
     BrokerHandler,
@@ -18,11 +21,31 @@ from .brokers import (
     BrokerProducerService,
     BrokerPublisher,
     BrokerPublisherSetup,
+    BrokerQueue,
     BrokerRequest,
     BrokerResponse,
     BrokerResponseException,
+    BrokerSpan,
+    BrokerSpanExporter,
+    BrokerSpanKind,
+    BrokerTraceContext,
+    BrokerTracer,
     DynamicBroker,
     DynamicBrokerPool,
+    InMemoryBrokerQueue,
+    InMemoryBrokerSpanExporter,
+    OtlpFileBrokerSpanExporter,
+    SQLiteBrokerQueue,
+    add_topic_hook,
+    get_broker_queue,
+    get_broker_tracer,
+    remove_topic_hook,
+    run_topic_hooks,
+    set_broker_queue,
+    set_broker_tracer,
+)
+from .coalescers import (
+    RequestCoalescer,
 )
 from .decorators import (
     BrokerCommandEnrouteDecorator,
@@ -37,6 +60,7 @@ from .decorators import (
     EnrouteBuilder,
     EnrouteDecorator,
     EnrouteDecoratorKind,
+    EnrouteRegistry,
     Handler,
     HandlerMeta,
     HandlerWrapper,
@@ -67,6 +91,38 @@ from .exceptions import (
     NotSatisfiedCheckerException,
     RequestException,
 )
+from .executors import (
+    HandlerExecutor,
+    get_handler_executor,
+    set_handler_executor,
+)
+from .loops import (
+    get_event_loop_policy,
+    get_event_loop_policy_from_config,
+    new_event_loop,
+    setup_event_loop_policy,
+)
+from .metrics import (
+    MetricsCounter,
+    MetricsCounterChild,
+    MetricsHistogram,
+    MetricsHistogramChild,
+    MetricsRegistry,
+    get_metrics_registry,
+    set_metrics_registry,
+)
+from .monitoring import (
+    EventLoopMonitor,
+    EventLoopMonitorService,
+    EventLoopStall,
+    HandlerProfile,
+    HandlerProfiler,
+    get_handler_profiler,
+    get_task_label,
+    reset_task_label,
+    set_handler_profiler,
+    set_task_label,
+)
 from .requests import (
     REQUEST_USER_CONTEXT_VAR,
     InMemoryRequest,
@@ -76,10 +132,21 @@ from .requests import (
     WrappedRequest,
 )
 from .rest import (
+    AvroRestSerializer,
+    JsonRestSerializer,
+    NdJsonRestSerializer,
+    RestAccessLogger,
+    RestAdmissionController,
+    RestCacheEntry,
+    RestCachePolicy,
+    RestCompressor,
+    RestConcurrencyLimiter,
     RestHandler,
     RestRequest,
     RestResponse,
+    RestResponseCache,
     RestResponseException,
+    RestSerializer,
     RestService,
 )
 from .scheduling import (
@@ -92,6 +159,7 @@ from .scheduling import (
 )
 from .utils import (
     consume_queue,
+    get_config_value,
     get_host_ip,
     get_host_name,
     get_ip,
@@ -12,6 +12,9 @@ from .handlers import (
     BrokerRequest,
     BrokerResponse,
     BrokerResponseException,
+    add_topic_hook,
+    remove_topic_hook,
+    run_topic_hooks,
 )
 from .messages import (
     REQUEST_HEADERS_CONTEXT_VAR,
@@ -26,3 +29,24 @@ from .publishers import (
     BrokerPublisher,
     BrokerPublisherSetup,
 )
+from .queues import (
+    BrokerQueue,
+    InMemoryBrokerQueue,
+    SQLiteBrokerQueue,
+    get_broker_queue,
+    set_broker_queue,
+)
+from .tracing import (
+    PUBLISHED_AT_HEADER,
+    TRACE_CONTEXT_VAR,
+    TRACEPARENT_HEADER,
+    BrokerSpan,
+    BrokerSpanExporter,
+    BrokerSpanKind,
+    BrokerTraceContext,
+    BrokerTracer,
+    InMemoryBrokerSpanExporter,
+    OtlpFileBrokerSpanExporter,
+    get_broker_tracer,
+    set_broker_tracer,
+)
@@ -3,6 +3,7 @@ from __future__ import (
 )
 
 import logging
+import time
 from asyncio import (
     TimeoutError,
     wait_for,
@@ -47,6 +48,14 @@ from ..handlers import (
 from ..publishers import (
     BrokerPublisher,
 )
+from ..queues import (
+    get_broker_queue,
+)
+from ..tracing import (
+    BrokerSpanKind,
+    BrokerTracer,
+    get_broker_tracer,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -63,6 +72,8 @@ class DynamicBroker(BrokerHandlerSetup):
     @classmethod
     def _from_config(cls, *args, config: MinosConfig, **kwargs) -> DynamicBroker:
         kwargs["publisher"] = cls._get_publisher(**kwargs)
+        if "broker_queue" not in kwargs:
+            kwargs["broker_queue"] = get_broker_queue(config)
         # noinspection PyProtectedMember
         return cls(**config.broker.queue._asdict(), **kwargs)
 
@@ -122,9 +133,34 @@ class DynamicBroker(BrokerHandlerSetup):
 
         logger.info(f"Dispatching '{entries if count > 1 else entries[0]!s}'...")
 
+        tracer = get_broker_tracer()
+        if tracer.enabled:
+            self._trace_entries(tracer, entries)
+
         return entries
 
+    @staticmethod
+    def _trace_entries(tracer: BrokerTracer, entries: list[BrokerHandlerEntry]) -> None:
+        end = time.time()
+        for entry in entries:
+            # noinspection PyBroadException
+            try:
+                message = entry.data
+            except Exception:
+                continue
+            context = tracer.extract(message.headers)
+            if context is None:
+                continue
+
+            received_at = entry.created_at.timestamp()
+            attributes = {"messaging.destination.name": entry.topic, "messaging.message.id": str(message.identifier)}
+            tracer.record("transport", context.child(), tracer.get_published_at(message.headers), received_at)
+            tracer.record("receive", context.child(), received_at, end, BrokerSpanKind.CONSUMER, attributes)
+
     async def _get_many(self, count: int, max_wait: Optional[float] = 10.0) -> list[BrokerHandlerEntry]:
+        if self.broker_queue is not None:
+            return await self._get_many_from_queue(count, max_wait)
+
         result = list()
         async with self.cursor() as cursor:
 
@@ -138,6 +174,16 @@ class DynamicBroker(BrokerHandlerSetup):
 
         return result
 
+    async def _get_many_from_queue(self, count: int, max_wait: Optional[float]) -> list[BrokerHandlerEntry]:
+        result = list()
+        while len(result) < count:
+            await self.broker_queue.wait_consumer((self.topic,), None, max_wait)
+            rows = await self.broker_queue.claim_consumer((self.topic,), None, count - len(result))
+            for entry in self._build_entries(rows):
+                await self.broker_queue.ack_consumer(entry.id)
+                result.append(entry)
+        return result
+
     async def _wait_for_entries(self, cursor: Cursor, count: int, max_wait: Optional[float]) -> None:
         if await self._get_count(cursor):
             return
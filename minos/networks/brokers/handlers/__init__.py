@@ -10,6 +10,11 @@ from .entries import (
 from .handlers import (
     BrokerHandler,
 )
+from .hooks import (
+    add_topic_hook,
+    remove_topic_hook,
+    run_topic_hooks,
+)
 from .requests import (
     BrokerRequest,
     BrokerResponse,
@@ -1,3 +1,7 @@
+from typing import (
+    Optional,
+)
+
 from psycopg2.sql import (
     SQL,
 )
@@ -6,16 +10,40 @@ from minos.common import (
     PostgreSqlMinosDatabase,
 )
 
+from ..queues import (
+    BrokerQueue,
+)
+
 
 class BrokerHandlerSetup(PostgreSqlMinosDatabase):
-    """Minos Broker Setup Class"""
+    """Minos Broker Setup Class
 
-    def __init__(self, *args, **kwargs):
+    The entries are stored on the ``consumer_queue`` table, unless a ``BrokerQueue`` is provided.
+    """
+
+    def __init__(self, *args, broker_queue: Optional[BrokerQueue] = None, **kwargs):
         super().__init__(*args, **kwargs)
+        self._broker_queue = broker_queue
+
+    @property
+    def broker_queue(self) -> Optional[BrokerQueue]:
+        """Get the broker queue.
+
+        :return: A ``BrokerQueue`` instance or ``None`` if the ``consumer_queue`` table is used.
+        """
+        return self._broker_queue
 
     async def _setup(self) -> None:
+        if self._broker_queue is not None:
+            await self._broker_queue.setup()
+            return
         await self._create_event_queue_table()
 
+    async def _destroy(self) -> None:
+        if self._broker_queue is not None:
+            await self._broker_queue.destroy()
+        await super()._destroy()
+
     async def _create_event_queue_table(self) -> None:
         _CREATE_TABLE_QUERY = SQL(
             "CREATE TABLE IF NOT EXISTS consumer_queue ("
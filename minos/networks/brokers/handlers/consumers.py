@@ -3,13 +3,17 @@ from __future__ import (
 )
 
 import logging
+import time
+from asyncio import (
+    TimeoutError,
+    gather,
+    wait_for,
+)
 from contextlib import (
     suppress,
 )
-from itertools import (
-    chain,
-)
 from typing import (
+    TYPE_CHECKING,
     Any,
     NoReturn,
     Optional,
@@ -19,6 +23,7 @@ from aiokafka import (
     AIOKafkaConsumer,
 )
 from kafka.errors import (
+    CommitFailedError,
     IllegalStateError,
     KafkaError,
 )
@@ -33,19 +38,48 @@ from minos.common import (
 )
 
 from ...decorators import (
-    EnrouteAnalyzer,
+    EnrouteRegistry,
+)
+from ...utils import (
+    get_config_value,
+)
+from ..queues import (
+    BrokerQueue,
+    get_broker_queue,
 )
 from .abc import (
     BrokerHandlerSetup,
 )
 
+if TYPE_CHECKING:
+    from .handlers import (
+        BrokerHandler,
+    )
+
 logger = logging.getLogger(__name__)
 
 
 class BrokerConsumer(BrokerHandlerSetup):
-    """Broker Consumer class."""
+    """Broker Consumer class.
+
+    By default, every consumed message is stored on the consumer queue, from which it is dispatched by the
+    ``BrokerHandler``. If a ``handler`` is provided (with the ``broker.queue.direct`` config value), the messages of
+    its topics are dispatched directly, and only the failed ones are stored on the queue to be retried.
+
+    The handler is only used as a dispatcher (that is, to look up the handling functions and to send the replies with
+    the shared publisher), which does not require any setup, so it is neither set up nor destroyed by the consumer.
+    Setting it up would start an additional set of queue consumers and metrics collectors, which are already provided
+    by the ``BrokerHandlerService``.
+
+    The direct dispatching happens inside the polling loop: the partitions are dispatched concurrently, but the
+    messages of each partition are dispatched one after the other, so the concurrency is bounded by the number of
+    assigned partitions instead of the ``consumer_concurrency`` of the handler. To avoid exceeding the
+    ``max_poll_interval_ms`` of the Kafka client, the dispatching of each partition batch is bounded by
+    ``direct_timeout`` seconds (with the ``broker.queue.direct_timeout`` config value): the message that exceeds it is
+    cancelled and, together with the following ones, stored on the queue to be retried.
+    """
 
-    __slots__ = "_topics", "_broker", "_client"
+    __slots__ = "_topics", "_broker", "_client", "_handler", "_records", "_direct_timeout"
 
     def __init__(
         self,
@@ -53,6 +87,9 @@ class BrokerConsumer(BrokerHandlerSetup):
         broker: Optional[BROKER] = None,
         client: Optional[AIOKafkaConsumer] = None,
         group_id: Optional[str] = "default",
+        handler: Optional[BrokerHandler] = None,
+        records: int = 10,
+        direct_timeout: float = 60,
         **kwargs,
     ):
         super().__init__(**kwargs)
@@ -62,20 +99,39 @@ class BrokerConsumer(BrokerHandlerSetup):
         self._broker = broker
         self._client = client
         self._group_id = group_id
+        self._handler = handler
+        self._records = records
+        self._direct_timeout = direct_timeout
 
     @classmethod
     def _from_config(cls, config: MinosConfig, **kwargs) -> BrokerConsumer:
-        topics = set()
-
-        for name in config.services:
-            decorators = EnrouteAnalyzer(name, config).get_broker_command_query_event()
-            topics |= {decorator.topic for decorator in chain(*decorators.values())}
+        topics = set(EnrouteRegistry.from_config(config).broker_topics)
+        if "broker_queue" not in kwargs:
+            kwargs["broker_queue"] = get_broker_queue(config)
+        publisher = kwargs.pop("publisher", None)
+        if "handler" not in kwargs and get_config_value(config, "broker.queue.direct", False):
+            kwargs["handler"] = cls._get_handler(config, publisher=publisher, **kwargs)
+        if "direct_timeout" not in kwargs:
+            direct_timeout = get_config_value(config, "broker.queue.direct_timeout")
+            if direct_timeout is not None:
+                kwargs["direct_timeout"] = direct_timeout
 
         # noinspection PyProtectedMember
         return cls(
             topics=topics, broker=config.broker, group_id=config.service.name, **config.broker.queue._asdict(), **kwargs
         )
 
+    # noinspection PyUnusedLocal
+    @staticmethod
+    def _get_handler(
+        config: MinosConfig, broker_queue: Optional[BrokerQueue] = None, publisher: Optional[Any] = None, **kwargs
+    ) -> BrokerHandler:
+        from .handlers import (
+            BrokerHandler,
+        )
+
+        return BrokerHandler.from_config(config, broker_queue=broker_queue, publisher=publisher)
+
     async def _setup(self) -> None:
         await super()._setup()
         await self.client.start()
@@ -116,6 +172,14 @@ class BrokerConsumer(BrokerHandlerSetup):
         else:
             self.client.unsubscribe()
 
+    @property
+    def handler(self) -> Optional[BrokerHandler]:
+        """Get the handler used to dispatch the messages directly.
+
+        :return: A ``BrokerHandler`` instance or ``None`` if every message is stored on the consumer queue.
+        """
+        return self._handler
+
     @property
     def client(self) -> AIOKafkaConsumer:
         """Get the kafka consumer client.
@@ -137,8 +201,72 @@ class BrokerConsumer(BrokerHandlerSetup):
 
         :return: This method does not return anything.
         """
+        if self._handler is not None:
+            while True:
+                await self.handle_batch(self.client)
+
         await self.handle_message(self.client)
 
+    async def handle_batch(self, consumer: Any) -> None:
+        """Consume a batch of messages and dispatch them directly.
+
+        The partitions are handled concurrently, but the messages of each partition are handled in order, and its
+        offset is committed once all of them have been dispatched successfully or stored on the consumer queue to be
+        retried, so the delivery is at-least-once. The dispatching of each partition is bounded by ``direct_timeout``.
+
+        The failures are isolated per partition: if a message can neither be dispatched nor stored on the consumer
+        queue, only the offset of the previous messages is committed, and the partition is rewound to the failed one, so
+        that it is consumed again on the next batch. The rest of partitions are not affected.
+
+        :param consumer: Kafka Consumer instance.
+        :return: This method does not return anything.
+        """
+        batches = await consumer.getmany(timeout_ms=_GET_MANY_TIMEOUT_MS, max_records=self._records)
+        await gather(
+            *(self._handle_partition(consumer, partition, messages) for partition, messages in batches.items())
+        )
+
+    async def _handle_partition(self, consumer: Any, partition: Any, messages: list) -> None:
+        deadline = time.monotonic() + self._direct_timeout
+        offset = None
+        for message in messages:
+            try:
+                await self._handle_direct(message, deadline - time.monotonic())
+            except Exception as exc:
+                logger.exception(
+                    f"Unable to handle the {partition!r} message with {message.offset!r} offset: {exc!r}. "
+                    f"Rewinding the partition to consume it again..."
+                )
+                with suppress(IllegalStateError):
+                    consumer.seek(partition, message.offset)
+                break
+            offset = message.offset + 1
+
+        if offset is None:
+            return
+
+        try:
+            await consumer.commit({partition: offset})
+        except IllegalStateError:
+            pass
+        except CommitFailedError as exc:
+            # The partition has been reassigned, so its messages will be consumed again by the new owner.
+            logger.warning(f"Unable to commit the {partition!r} offset: {exc!r}")
+
+    async def _handle_direct(self, message: Any, timeout: float) -> None:
+        if message.topic in self._handler.topics and timeout > 0:
+            try:
+                if await wait_for(
+                    self._handler.dispatch_direct(message.topic, message.partition, message.value), timeout
+                ):
+                    return
+            except TimeoutError:
+                logger.warning(
+                    f"The direct dispatching exceeded {self._direct_timeout!r} seconds. "
+                    f"Storing the pending {message.topic!r} messages on the consumer queue..."
+                )
+        await self.handle_single_message(message)
+
     async def handle_message(self, consumer: Any) -> None:
         """Message consumer.
 
@@ -186,12 +314,17 @@ class BrokerConsumer(BrokerHandlerSetup):
         Raises:
             Exception: An error occurred inserting record.
         """
+        if self.broker_queue is not None:
+            return await self.broker_queue.enqueue_consumer(topic, partition, binary)
+
         row = await self.submit_query_and_fetchone(_INSERT_QUERY, (topic, partition, binary))
         await self.submit_query(_NOTIFY_QUERY.format(Identifier(topic)))
 
         return row[0]
 
 
+_GET_MANY_TIMEOUT_MS = 1000
+
 _INSERT_QUERY = SQL("INSERT INTO consumer_queue (topic, partition, data) VALUES (%s, %s, %s) RETURNING id")
 
 _NOTIFY_QUERY = SQL("NOTIFY {}")
@@ -48,6 +48,7 @@ class BrokerHandlerEntry(Generic[T]):
         data_cls: Type[Model] = Model,
         callback_lookup: Optional[Callable] = None,
         exception: Optional[Exception] = None,
+        fetched_at: Optional[float] = None,
     ):
         if created_at is None or updated_at is None:
             now = current_datetime()
@@ -66,6 +67,7 @@ class BrokerHandlerEntry(Generic[T]):
         self.updated_at = updated_at
         self.callback_lookup = callback_lookup
         self.exception = exception
+        self.fetched_at = fetched_at
 
     @property
     def success(self) -> bool:
@@ -3,6 +3,7 @@ from __future__ import (
 )
 
 import logging
+import time
 from asyncio import (
     CancelledError,
     PriorityQueue,
@@ -49,11 +50,22 @@ from minos.common import (
 )
 
 from ...decorators import (
-    EnrouteBuilder,
+    EnrouteRegistry,
 )
 from ...exceptions import (
     MinosActionNotFoundException,
 )
+from ...executors import (
+    get_handler_executor,
+)
+from ...metrics import (
+    MetricsSample,
+    get_metrics_registry,
+)
+from ...monitoring import (
+    reset_task_label,
+    set_task_label,
+)
 from ...requests import (
     REQUEST_USER_CONTEXT_VAR,
     Response,
@@ -70,12 +82,25 @@ from ..messages import (
 from ..publishers import (
     BrokerPublisher,
 )
+from ..queues import (
+    get_broker_queue,
+)
+from ..tracing import (
+    TRACE_CONTEXT_VAR,
+    BrokerSpanKind,
+    BrokerTraceContext,
+    BrokerTracer,
+    get_broker_tracer,
+)
 from .abc import (
     BrokerHandlerSetup,
 )
 from .entries import (
     BrokerHandlerEntry,
 )
+from .hooks import (
+    run_topic_hooks,
+)
 from .requests import (
     BrokerRequest,
     BrokerResponse,
@@ -109,20 +134,31 @@ class BrokerHandler(BrokerHandlerSetup):
 
         self._publisher = publisher
 
+        registry = get_metrics_registry()
+        self._dispatch_duration = registry.histogram(
+            "minos_broker_handler_duration_seconds", "Duration of the broker handling functions.", ("topic",)
+        )
+        self._dispatch_outcomes = registry.counter(
+            "minos_broker_handler_messages_total", "Number of handled broker messages.", ("topic", "outcome")
+        )
+
     @classmethod
     def _from_config(cls, config: MinosConfig, **kwargs) -> BrokerHandler:
         kwargs["handlers"] = cls._get_handlers(config, **kwargs)
         kwargs["publisher"] = cls._get_publisher(**kwargs)
+        if "broker_queue" not in kwargs:
+            kwargs["broker_queue"] = get_broker_queue(config)
+        get_broker_tracer(config)
         # noinspection PyProtectedMember
         return cls(**config.broker.queue._asdict(), **kwargs)
 
+    # noinspection PyUnusedLocal
     @staticmethod
     def _get_handlers(
         config: MinosConfig, handlers: dict[str, Optional[Callable]] = None, **kwargs
     ) -> dict[str, Callable[[BrokerRequest], Awaitable[Optional[BrokerResponse]]]]:
         if handlers is None:
-            builder = EnrouteBuilder(*config.services, middleware=config.middleware)
-            decorators = builder.get_broker_command_query_event(config=config, **kwargs)
+            decorators = EnrouteRegistry.from_config(config).broker_command_query_event
             handlers = {decorator.topic: fn for decorator, fn in decorators.items()}
         return handlers
 
@@ -143,11 +179,30 @@ class BrokerHandler(BrokerHandlerSetup):
     async def _setup(self) -> None:
         await super()._setup()
         await self._create_consumers()
+        get_metrics_registry().register_collector(self._collect_metrics)
 
     async def _destroy(self) -> None:
+        get_metrics_registry().unregister_collector(self._collect_metrics)
         await self._destroy_consumers()
+        get_broker_tracer().flush()
         await super()._destroy()
 
+    async def _collect_metrics(self) -> list[MetricsSample]:
+        samples = [
+            ("minos_broker_handler_queue_size", {}, self._queue.qsize()),
+            ("minos_broker_handler_queue_capacity", {}, self._queue.maxsize),
+        ]
+        if self.broker_queue is not None:
+            rows = await self.broker_queue.get_consumer_metrics(self._retry)
+        elif len(self.topics):
+            rows = [row async for row in self.submit_query_and_iter(_QUEUE_METRICS_QUERY, (self._retry,))]
+        else:
+            rows = list()
+        for topic, depth, age in rows:
+            samples.append(("minos_broker_consumer_queue_depth", {"topic": topic}, depth))
+            samples.append(("minos_broker_consumer_queue_age_seconds", {"topic": topic}, float(age)))
+        return samples
+
     async def _create_consumers(self):
         while len(self._consumers) < self._consumer_concurrency:
             self._consumers.append(create_task(self._consume()))
@@ -160,7 +215,7 @@ class BrokerHandler(BrokerHandlerSetup):
 
         while not self._queue.empty():
             entry = self._queue.get_nowait()
-            await self.submit_query(self._queries["update_not_processed"], (entry.id,))
+            await self._release_entry(entry, success=False)
 
     async def _consume(self) -> None:
         while True:
@@ -211,6 +266,11 @@ class BrokerHandler(BrokerHandlerSetup):
         :param max_wait: Maximum seconds to wait for notifications. If ``None`` the wait is performed until infinity.
         :return: This method does not return anything.
         """
+        if self.broker_queue is not None:
+            while True:
+                await self.broker_queue.wait_consumer(self.topics, self._retry, max_wait)
+                await self.dispatch(background_mode=True)
+
         async with self.cursor() as cursor:
             await self._listen_entries(cursor)
             try:
@@ -251,12 +311,23 @@ class BrokerHandler(BrokerHandlerSetup):
     async def dispatch(self, cursor: Optional[Cursor] = None, background_mode: bool = False) -> None:
         """Dispatch a batch of ``HandlerEntry`` instances from the database's queue.
 
-        :param cursor: The cursor to interact with the database. If ``None`` is provided a new one is acquired.
+        :param cursor: The cursor to interact with the database. If ``None`` is provided a new one is acquired. It is
+            ignored if a ``BrokerQueue`` is used.
         :param background_mode: If ``True`` the entries dispatching waits until every entry is processed. Otherwise,
             the dispatching is performed on background.
         :return: This method does not return anything.
         """
+        if self.broker_queue is not None:
+            rows = await self.broker_queue.claim_consumer(self.topics, self._retry, self._records)
+            for entry in self._build_entries(rows):
+                await self._queue.put(entry)
+        else:
+            await self._dispatch_from_table(cursor)
 
+        if not background_mode:
+            await self._queue.join()
+
+    async def _dispatch_from_table(self, cursor: Optional[Cursor]) -> None:
         is_external_cursor = cursor is not None
         if not is_external_cursor:
             cursor = await self.cursor().__aenter__()
@@ -278,15 +349,33 @@ class BrokerHandler(BrokerHandlerSetup):
         if not is_external_cursor:
             await cursor.__aexit__(None, None, None)
 
-        if not background_mode:
-            await self._queue.join()
-
     def _build_entries(self, rows: list[tuple]) -> list[BrokerHandlerEntry]:
-        kwargs = {"callback_lookup": self.get_action}
+        kwargs = {"callback_lookup": self.get_action, "fetched_at": time.time()}
         return [BrokerHandlerEntry(*row, **kwargs) for row in rows]
 
+    async def dispatch_direct(self, topic: str, partition: int, data: bytes) -> bool:
+        """Dispatch a message consumed directly from the broker, without storing it on the consumer queue.
+
+        :param topic: The topic of the message.
+        :param partition: The partition of the message.
+        :param data: The message bytes.
+        :return: ``True`` if the message was dispatched successfully or ``False`` otherwise.
+        """
+        entry = BrokerHandlerEntry(
+            None, topic, partition, data, callback_lookup=self.get_action, fetched_at=time.time()
+        )
+        await self._dispatch_entry(entry)
+        return entry.success
+
     async def _dispatch_one(self, entry: BrokerHandlerEntry) -> None:
+        try:
+            await self._dispatch_entry(entry)
+        finally:
+            await self._release_entry(entry, entry.success)
+
+    async def _dispatch_entry(self, entry: BrokerHandlerEntry) -> None:
         logger.debug(f"Dispatching '{entry!r}'...")
+        previous = set_task_label(entry.topic)
         try:
             await self.dispatch_one(entry)
         except (CancelledError, Exception) as exc:
@@ -295,8 +384,18 @@ class BrokerHandler(BrokerHandlerSetup):
             if isinstance(exc, CancelledError):
                 raise exc
         finally:
-            query_id = "delete_processed" if entry.success else "update_not_processed"
-            await self.submit_query(self._queries[query_id], (entry.id,))
+            reset_task_label(previous)
+
+    async def _release_entry(self, entry: BrokerHandlerEntry, success: bool) -> None:
+        if self.broker_queue is not None:
+            if success:
+                await self.broker_queue.ack_consumer(entry.id)
+            else:
+                await self.broker_queue.nack_consumer(entry.id)
+            return
+
+        query_id = "delete_processed" if success else "update_not_processed"
+        await self.submit_query(self._queries[query_id], (entry.id,))
 
     async def dispatch_one(self, entry: BrokerHandlerEntry) -> None:
         """Dispatch one row.
@@ -308,7 +407,33 @@ class BrokerHandler(BrokerHandlerSetup):
 
         fn = self.get_callback(entry.callback)
         message = entry.data
-        data, status, headers = await fn(message)
+
+        tracer = get_broker_tracer()
+        context = tracer.extract(message.headers) if tracer.enabled else None
+        if context is None:
+            return await self._dispatch_message(entry, fn, message)
+
+        # The messages sent while handling (including the reply) become children of the handling span.
+        handling = context.child()
+        token = TRACE_CONTEXT_VAR.set(handling)
+        start = time.time()
+        try:
+            await self._dispatch_message(entry, fn, message)
+        finally:
+            TRACE_CONTEXT_VAR.reset(token)
+            self._trace_dispatch(tracer, entry, message, context, handling, start, time.time())
+
+    async def _dispatch_message(self, entry: BrokerHandlerEntry, fn: Callable, message: BrokerMessage) -> None:
+        outcome = "exception"
+        start = time.monotonic()
+        try:
+            data, status, headers = await fn(message)
+            outcome = status.name.lower()
+        finally:
+            self._dispatch_duration.labels(entry.topic).observe(time.monotonic() - start)
+            self._dispatch_outcomes.labels(entry.topic, outcome).inc()
+
+        run_topic_hooks(entry.topic)
 
         if message.reply_topic is not None:
             await self.publisher.send(
@@ -320,6 +445,29 @@ class BrokerHandler(BrokerHandlerSetup):
                 headers=headers,
             )
 
+    @staticmethod
+    def _trace_dispatch(
+        tracer: BrokerTracer,
+        entry: BrokerHandlerEntry,
+        message: BrokerMessage,
+        context: BrokerTraceContext,
+        handling: BrokerTraceContext,
+        start: float,
+        end: float,
+    ) -> None:
+        received_at = entry.created_at.timestamp()
+        fetched_at = entry.fetched_at if entry.fetched_at is not None else start
+        attributes = {
+            "messaging.destination.name": entry.topic,
+            "messaging.message.id": str(message.identifier),
+            "minos.retry": entry.retry,
+        }
+
+        tracer.record("transport", context.child(), tracer.get_published_at(message.headers), received_at)
+        tracer.record("consumer_queue", context.child(), received_at, fetched_at)
+        tracer.record("handler_queue", context.child(), fetched_at, start)
+        tracer.record("handle", handling, start, end, BrokerSpanKind.CONSUMER, attributes)
+
     @staticmethod
     def get_callback(
         fn: Callable[[BrokerRequest], Union[Optional[BrokerRequest], Awaitable[Optional[BrokerRequest]]]]
@@ -337,7 +485,7 @@ class BrokerHandler(BrokerHandlerSetup):
             headers_token = REQUEST_HEADERS_CONTEXT_VAR.set(raw.headers)
 
             try:
-                response = fn(request)
+                response = await get_handler_executor().run(fn, request)
                 if isawaitable(response):
                     response = await response
                 if isinstance(response, Response):
@@ -412,6 +560,13 @@ _UPDATE_NOT_PROCESSED_QUERY = SQL(
     "UPDATE consumer_queue SET processing = FALSE, retry = retry + 1, updated_at = NOW() WHERE id = %s"
 )
 
+_QUEUE_METRICS_QUERY = SQL(
+    "SELECT topic, COUNT(*), EXTRACT(EPOCH FROM NOW() - MIN(created_at)) "
+    "FROM consumer_queue "
+    "WHERE NOT processing AND retry < %s "
+    "GROUP BY topic"
+)
+
 _LISTEN_QUERY = SQL("LISTEN {}")
 
 _UNLISTEN_QUERY = SQL("UNLISTEN {}")
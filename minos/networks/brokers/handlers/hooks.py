@@ -0,0 +1,52 @@
+from __future__ import (
+    annotations,
+)
+
+import logging
+from typing import (
+    Callable,
+)
+
+logger = logging.getLogger(__name__)
+
+TopicHook = Callable[[str], None]
+
+_TOPIC_HOOKS: list[TopicHook] = list()
+
+
+def add_topic_hook(hook: TopicHook) -> None:
+    """Add a process-wide hook that is called with the topic of every message dispatched by the ``BrokerHandler``.
+
+    The hooks allow other components (for example, the rest response cache) to react to the handled topics without
+    being known by the broker handler. Adding the same hook more than once has no effect.
+
+    :param hook: A function that receives the topic name.
+    :return: This method does not return anything.
+    """
+    if hook not in _TOPIC_HOOKS:
+        _TOPIC_HOOKS.append(hook)
+
+
+def remove_topic_hook(hook: TopicHook) -> None:
+    """Remove a process-wide topic hook.
+
+    :param hook: The hook to be removed.
+    :return: This method does not return anything.
+    """
+    if hook in _TOPIC_HOOKS:
+        _TOPIC_HOOKS.remove(hook)
+
+
+def run_topic_hooks(topic: str) -> None:
+    """Call the process-wide topic hooks with the given topic.
+
+    The failures of a hook are logged, so that they do not affect neither the other hooks nor the dispatching.
+
+    :param topic: The topic name.
+    :return: This method does not return anything.
+    """
+    for hook in tuple(_TOPIC_HOOKS):
+        try:
+            hook(topic)
+        except Exception as exc:
+            logger.exception(f"Raised an exception while running the {hook!r} hook of {topic!r}: {exc!r}")
@@ -3,6 +3,9 @@ from __future__ import (
 )
 
 import logging
+from typing import (
+    Optional,
+)
 
 from psycopg2.sql import (
     SQL,
@@ -12,15 +15,42 @@ from minos.common import (
     PostgreSqlMinosDatabase,
 )
 
+from ..queues import (
+    BrokerQueue,
+)
+
 logger = logging.getLogger(__name__)
 
 
 class BrokerPublisherSetup(PostgreSqlMinosDatabase):
-    """Broker Publisher Setup class."""
+    """Broker Publisher Setup class.
+
+    The entries are stored on the ``producer_queue`` table, unless a ``BrokerQueue`` is provided.
+    """
+
+    def __init__(self, *args, broker_queue: Optional[BrokerQueue] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._broker_queue = broker_queue
+
+    @property
+    def broker_queue(self) -> Optional[BrokerQueue]:
+        """Get the broker queue.
+
+        :return: A ``BrokerQueue`` instance or ``None`` if the ``producer_queue`` table is used.
+        """
+        return self._broker_queue
 
     async def _setup(self) -> None:
+        if self._broker_queue is not None:
+            await self._broker_queue.setup()
+            return
         await self._create_broker_table()
 
+    async def _destroy(self) -> None:
+        if self._broker_queue is not None:
+            await self._broker_queue.destroy()
+        await super()._destroy()
+
     async def _create_broker_table(self) -> None:
         await self.submit_query(_CREATE_TABLE_QUERY, lock=hash("producer_queue"))
 
@@ -3,11 +3,15 @@ from __future__ import (
 )
 
 import logging
+import time
 from asyncio import (
     TimeoutError,
     gather,
     wait_for,
 )
+from io import (
+    BytesIO,
+)
 from typing import (
     NoReturn,
     Optional,
@@ -26,6 +30,9 @@ from dependency_injector.wiring import (
     Provide,
     inject,
 )
+from fastavro import (
+    reader,
+)
 from psycopg2.sql import (
     SQL,
 )
@@ -35,6 +42,10 @@ from minos.common import (
     NotProvidedException,
 )
 
+from ...metrics import (
+    MetricsSample,
+    get_metrics_registry,
+)
 from ...utils import (
     consume_queue,
 )
@@ -44,6 +55,14 @@ from ..handlers import (
 from ..messages import (
     BrokerMessageStrategy,
 )
+from ..queues import (
+    get_broker_queue,
+)
+from ..tracing import (
+    BrokerSpanKind,
+    BrokerTracer,
+    get_broker_tracer,
+)
 from .abc import (
     BrokerPublisherSetup,
 )
@@ -73,11 +92,18 @@ class BrokerProducer(BrokerPublisherSetup):
         self._client = client
         self.consumer = consumer
 
+        self._publish_duration = get_metrics_registry().histogram(
+            "minos_broker_producer_publish_duration_seconds", "Duration of the broker publications.", ("outcome",)
+        )
+
     @classmethod
     def _from_config(cls, config: MinosConfig, **kwargs) -> BrokerProducer:
         kwargs["broker_host"] = config.broker.host
         kwargs["broker_port"] = config.broker.port
         kwargs["consumer"] = cls._get_consumer(**kwargs)
+        if "broker_queue" not in kwargs:
+            kwargs["broker_queue"] = get_broker_queue(config)
+        get_broker_tracer(config)
         # noinspection PyProtectedMember
         return cls(**config.broker.queue._asdict(), **kwargs)
 
@@ -98,17 +124,34 @@ class BrokerProducer(BrokerPublisherSetup):
     async def _setup(self) -> None:
         await super()._setup()
         await self.client.start()
+        get_metrics_registry().register_collector(self._collect_metrics)
 
     async def _destroy(self) -> None:
+        get_metrics_registry().unregister_collector(self._collect_metrics)
         await self.client.stop()
         await super()._destroy()
 
+    async def _collect_metrics(self) -> list[MetricsSample]:
+        if self.broker_queue is not None:
+            depth, age = await self.broker_queue.get_producer_metrics(self.retry)
+        else:
+            depth, age = await self.submit_query_and_fetchone(self._queries["queue_metrics"], (self.retry,))
+        return [
+            ("minos_broker_producer_queue_depth", {}, depth),
+            ("minos_broker_producer_queue_age_seconds", {}, float(age or 0)),
+        ]
+
     async def dispatch_forever(self, max_wait: Optional[float] = 60.0) -> NoReturn:
         """Dispatch the items in the publishing queue forever.
 
         :param max_wait: Maximum seconds to wait for notifications. If ``None`` the wait is performed until infinity.
         :return: This method does not return anything.
         """
+        if self.broker_queue is not None:
+            while True:
+                await self.broker_queue.wait_producer(self.retry, max_wait)
+                await self.dispatch()
+
         async with self.cursor() as cursor:
             await cursor.execute(self._queries["listen"])
             try:
@@ -139,6 +182,9 @@ class BrokerProducer(BrokerPublisherSetup):
 
         :return: This method does not return anything.
         """
+        if self.broker_queue is not None:
+            return await self._dispatch_from_queue()
+
         is_external_cursor = cursor is not None
         if not is_external_cursor:
             cursor = await self.cursor().__aenter__()
@@ -157,6 +203,18 @@ class BrokerProducer(BrokerPublisherSetup):
         if not is_external_cursor:
             await cursor.__aexit__(None, None, None)
 
+    async def _dispatch_from_queue(self) -> None:
+        rows = await self.broker_queue.claim_producer(self.retry, self.records)
+        result = zip(await gather(*(self.dispatch_one(row) for row in rows)), rows)
+
+        acked = list()
+        for (published, row) in result:
+            if published:
+                acked.append(row[0])
+            else:
+                await self.broker_queue.nack_producer(row[0])
+        await self.broker_queue.ack_producer_many(acked)
+
     @cached_property
     def _queries(self) -> dict[str, str]:
         # noinspection PyTypeChecker
@@ -167,6 +225,7 @@ class BrokerProducer(BrokerPublisherSetup):
             "select_not_processed": _SELECT_NOT_PROCESSED_QUERY,
             "delete_processed": _DELETE_PROCESSED_QUERY,
             "update_not_processed": _UPDATE_NOT_PROCESSED_QUERY,
+            "queue_metrics": _QUEUE_METRICS_QUERY,
         }
 
     async def dispatch_one(self, row: tuple) -> bool:
@@ -175,6 +234,32 @@ class BrokerProducer(BrokerPublisherSetup):
         :param row: A row containing the message information.
         :return: ``True`` if everything was fine or ``False`` otherwise.
         """
+        tracer = get_broker_tracer()
+        if not tracer.enabled:
+            return await self._dispatch_one(row)
+
+        start = time.time()
+        published = await self._dispatch_one(row)
+        self._trace_dispatch(tracer, row, start, time.time(), published)
+        return published
+
+    @staticmethod
+    def _trace_dispatch(tracer: BrokerTracer, row: tuple, start: float, end: float, published: bool) -> None:
+        # noinspection PyBroadException
+        try:
+            # The raw record is read instead of building the message, as only the headers are needed.
+            headers = next(reader(BytesIO(row[2])))["headers"]
+        except Exception:
+            return
+        context = tracer.extract(headers)
+        if context is None:
+            return
+
+        attributes = {"messaging.destination.name": row[1], "minos.published": published}
+        tracer.record("producer_queue", context.child(), tracer.get_published_at(headers), start)
+        tracer.record("produce", context.child(), start, end, BrokerSpanKind.PRODUCER, attributes)
+
+    async def _dispatch_one(self, row: tuple) -> bool:
         topic, message, strategy = row[1], row[2], row[3]
 
         # noinspection PyBroadException
@@ -197,12 +282,17 @@ class BrokerProducer(BrokerPublisherSetup):
         """
         logger.debug(f"Producing message with {topic!s} topic...")
 
+        outcome = "failure"
+        start = time.monotonic()
         # noinspection PyBroadException
         try:
             await self.client.send_and_wait(topic, message)
+            outcome = "success"
             return True
         except Exception:
             return False
+        finally:
+            self._publish_duration.labels(outcome).observe(time.monotonic() - start)
 
     @property
     def client(self) -> AIOKafkaProducer:
@@ -234,6 +324,10 @@ _DELETE_PROCESSED_QUERY = SQL("DELETE FROM producer_queue WHERE id = %s")
 
 _UPDATE_NOT_PROCESSED_QUERY = SQL("UPDATE producer_queue SET retry = retry + 1, updated_at = NOW() WHERE id = %s")
 
+_QUEUE_METRICS_QUERY = SQL(
+    "SELECT COUNT(*), EXTRACT(EPOCH FROM NOW() - MIN(created_at)) FROM producer_queue WHERE retry < %s"
+)
+
 _LISTEN_QUERY = SQL("LISTEN producer_queue")
 
 _UNLISTEN_QUERY = SQL("UNLISTEN producer_queue")
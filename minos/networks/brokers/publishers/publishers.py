@@ -3,6 +3,7 @@ from __future__ import (
 )
 
 import logging
+import time
 from typing import (
     Any,
     Optional,
@@ -24,6 +25,13 @@ from ..messages import (
     BrokerMessageStatus,
     BrokerMessageStrategy,
 )
+from ..queues import (
+    get_broker_queue,
+)
+from ..tracing import (
+    BrokerSpanKind,
+    get_broker_tracer,
+)
 from .abc import (
     BrokerPublisherSetup,
 )
@@ -36,6 +44,9 @@ class BrokerPublisher(BrokerPublisherSetup):
 
     @classmethod
     def _from_config(cls, *args, config: MinosConfig, **kwargs) -> BrokerPublisher:
+        if "broker_queue" not in kwargs:
+            kwargs["broker_queue"] = get_broker_queue(config)
+        get_broker_tracer(config)
         # noinspection PyProtectedMember
         return cls(*args, **config.broker.queue._asdict(), **kwargs)
 
@@ -66,6 +77,12 @@ class BrokerPublisher(BrokerPublisherSetup):
         :param kwargs: Additional named arguments.
         :return: The ``UUID`` identifier of the message.
         """
+        tracer = get_broker_tracer()
+        context = None
+        if tracer.enabled:
+            start = time.time()
+            headers = dict(headers) if headers is not None else dict()
+            context = tracer.inject(headers, start)
 
         message = BrokerMessage(
             topic=topic,
@@ -79,6 +96,11 @@ class BrokerPublisher(BrokerPublisherSetup):
         )
         logger.info(f"Publishing '{message!s}'...")
         await self.enqueue(message.topic, message.strategy, message.avro_bytes)
+
+        if context is not None:
+            attributes = {"messaging.destination.name": topic, "messaging.message.id": str(message.identifier)}
+            tracer.record("publish", context, start, time.time(), BrokerSpanKind.PRODUCER, attributes)
+
         return message.identifier
 
     async def enqueue(self, topic: str, strategy: BrokerMessageStrategy, raw: bytes) -> int:
@@ -89,6 +111,9 @@ class BrokerPublisher(BrokerPublisherSetup):
         :param raw: Bytes sequence to be send.
         :return: The identifier of the message in the queue.
         """
+        if self.broker_queue is not None:
+            return await self.broker_queue.enqueue_producer(topic, strategy, raw)
+
         params = (topic, raw, strategy)
         raw = await self.submit_query_and_fetchone(_INSERT_ENTRY_QUERY, params)
         await self.submit_query(_NOTIFY_QUERY)
@@ -0,0 +1,13 @@
+from .abc import (
+    BrokerQueue,
+)
+from .factories import (
+    get_broker_queue,
+    set_broker_queue,
+)
+from .memory import (
+    InMemoryBrokerQueue,
+)
+from .sqlite import (
+    SQLiteBrokerQueue,
+)
@@ -0,0 +1,247 @@
+from __future__ import (
+    annotations,
+)
+
+import logging
+from abc import (
+    ABC,
+    abstractmethod,
+)
+from asyncio import (
+    Event,
+    Lock,
+    TimeoutError,
+    wait_for,
+)
+from collections.abc import (
+    Awaitable,
+    Callable,
+    Iterable,
+)
+from typing import (
+    Optional,
+)
+
+from minos.common import (
+    MinosSetup,
+)
+
+from ..messages import (
+    BrokerMessageStrategy,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class BrokerQueue(ABC, MinosSetup):
+    """Broker Queue base class.
+
+    Stores the entries of the producer queue (filled by the ``BrokerPublisher`` and drained by the ``BrokerProducer``)
+    and the consumer queue (filled by the ``BrokerConsumer`` and drained by the ``BrokerHandler`` and the
+    ``DynamicBroker``), as an alternative to the ``producer_queue`` and ``consumer_queue`` tables.
+
+    The claimed rows have the same layout as the ones selected from the tables, that is,
+    ``(id, topic, data, strategy, retry, created_at, updated_at)`` for the producer queue and
+    ``(id, topic, partition, data, retry, created_at, updated_at)`` for the consumer one. They are claimed in creation
+    order, and they are not claimable again until they are not acked (removed) or nacked (released with an additional
+    retry).
+
+    The implementations must call ``_notify`` after inserting or releasing entries, to wake up the waiting tasks.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._event: Optional[Event] = None
+        self._setup_lock: Optional[Lock] = None
+        self._users = 0
+
+    async def setup(self) -> None:
+        """Setup the queue.
+
+        The queue is shared by several components, so it keeps the count of its users: the first call performs the
+        setup and the following ones only register a new user. The calls are serialized, as the components could set
+        up the queue concurrently.
+
+        :return: This method does not return anything.
+        """
+        async with self._get_setup_lock():
+            await super().setup()
+            self._users += 1
+
+    async def destroy(self) -> None:
+        """Destroy the queue.
+
+        The queue is only destroyed once all its users have destroyed it, that is, after the last component that uses
+        it has stopped.
+
+        :return: This method does not return anything.
+        """
+        async with self._get_setup_lock():
+            self._users = max(self._users - 1, 0)
+            if not self._users:
+                await super().destroy()
+
+    @abstractmethod
+    async def enqueue_producer(self, topic: str, strategy: BrokerMessageStrategy, data: bytes) -> int:
+        """Insert a new entry into the producer queue.
+
+        :param topic: The topic in which the message will be published.
+        :param strategy: The publishing strategy.
+        :param data: The message bytes.
+        :return: The identifier of the entry.
+        """
+
+    @abstractmethod
+    async def claim_producer(self, retry: int, limit: int) -> list[tuple]:
+        """Claim the oldest not claimed entries of the producer queue.
+
+        :param retry: The entries retried at least this number of times are not claimed.
+        :param limit: The maximum number of entries.
+        :return: A list of rows.
+        """
+
+    @abstractmethod
+    async def ack_producer(self, id_: int) -> None:
+        """Remove a claimed entry from the producer queue.
+
+        :param id_: The identifier of the entry.
+        :return: This method does not return anything.
+        """
+
+    async def ack_producer_many(self, ids: Iterable[int]) -> None:
+        """Remove a batch of claimed entries from the producer queue.
+
+        :param ids: The identifiers of the entries.
+        :return: This method does not return anything.
+        """
+        for id_ in ids:
+            await self.ack_producer(id_)
+
+    @abstractmethod
+    async def nack_producer(self, id_: int) -> None:
+        """Release a claimed entry of the producer queue, increasing its number of retries.
+
+        :param id_: The identifier of the entry.
+        :return: This method does not return anything.
+        """
+
+    @abstractmethod
+    async def count_producer(self, retry: int) -> int:
+        """Count the claimable entries of the producer queue.
+
+        :param retry: The entries retried at least this number of times are not counted.
+        :return: An integer value.
+        """
+
+    @abstractmethod
+    async def get_producer_metrics(self, retry: int) -> tuple[int, float]:
+        """Get the depth of the producer queue and the age of its oldest claimable entry.
+
+        :param retry: The entries retried at least this number of times are not taken into account.
+        :return: A tuple containing the depth and the age in seconds.
+        """
+
+    async def wait_producer(self, retry: int, max_wait: Optional[float] = 60.0) -> None:
+        """Wait until there is at least one claimable entry in the producer queue.
+
+        :param retry: The entries retried at least this number of times are not taken into account.
+        :param max_wait: Maximum seconds to wait for notifications before counting the entries again. If ``None`` the
+            wait is performed until infinity.
+        :return: This method does not return anything.
+        """
+        await self._wait_for(lambda: self.count_producer(retry), max_wait)
+
+    @abstractmethod
+    async def enqueue_consumer(self, topic: str, partition: int, data: bytes) -> int:
+        """Insert a new entry into the consumer queue.
+
+        :param topic: The topic from which the message was consumed.
+        :param partition: The partition from which the message was consumed.
+        :param data: The message bytes.
+        :return: The identifier of the entry.
+        """
+
+    @abstractmethod
+    async def claim_consumer(self, topics: Iterable[str], retry: Optional[int], limit: int) -> list[tuple]:
+        """Claim the oldest not claimed entries of the given topics from the consumer queue.
+
+        :param topics: The topics.
+        :param retry: The entries retried at least this number of times are not claimed. If ``None`` all of them are.
+        :param limit: The maximum number of entries.
+        :return: A list of rows.
+        """
+
+    @abstractmethod
+    async def ack_consumer(self, id_: int) -> None:
+        """Remove a claimed entry from the consumer queue.
+
+        :param id_: The identifier of the entry.
+        :return: This method does not return anything.
+        """
+
+    @abstractmethod
+    async def nack_consumer(self, id_: int) -> None:
+        """Release a claimed entry of the consumer queue, increasing its number of retries.
+
+        :param id_: The identifier of the entry.
+        :return: This method does not return anything.
+        """
+
+    @abstractmethod
+    async def count_consumer(self, topics: Iterable[str], retry: Optional[int]) -> int:
+        """Count the claimable entries of the given topics from the consumer queue.
+
+        :param topics: The topics.
+        :param retry: The entries retried at least this number of times are not counted. If ``None`` all of them are.
+        :return: An integer value.
+        """
+
+    @abstractmethod
+    async def get_consumer_metrics(self, retry: int) -> list[tuple[str, int, float]]:
+        """Get the depth of the consumer queue and the age of its oldest claimable entry, by topic.
+
+        :param retry: The entries retried at least this number of times are not taken into account.
+        :return: A list of tuples containing the topic, the depth and the age in seconds.
+        """
+
+    async def wait_consumer(
+        self, topics: Iterable[str], retry: Optional[int], max_wait: Optional[float] = 60.0
+    ) -> None:
+        """Wait until there is at least one claimable entry of the given topics in the consumer queue.
+
+        :param topics: The topics.
+        :param retry: The entries retried at least this number of times are not taken into account. If ``None`` all
+            of them are.
+        :param max_wait: Maximum seconds to wait for notifications before counting the entries again. If ``None`` the
+            wait is performed until infinity.
+        :return: This method does not return anything.
+        """
+        topics = tuple(topics)
+        await self._wait_for(lambda: self.count_consumer(topics, retry), max_wait)
+
+    async def _wait_for(self, count: Callable[[], Awaitable[int]], max_wait: Optional[float]) -> None:
+        while True:
+            # The event is obtained before counting, so that the insertions performed meanwhile are not missed.
+            event = self._get_event()
+            if await count():
+                return
+            try:
+                await wait_for(event.wait(), max_wait)
+            except TimeoutError:
+                pass
+
+    async def _notify(self) -> None:
+        if self._event is None:
+            return
+        self._event.set()
+        self._event = None
+
+    def _get_setup_lock(self) -> Lock:
+        if self._setup_lock is None:
+            self._setup_lock = Lock()
+        return self._setup_lock
+
+    def _get_event(self) -> Event:
+        if self._event is None:
+            self._event = Event()
+        return self._event
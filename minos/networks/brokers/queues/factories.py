@@ -0,0 +1,71 @@
+from __future__ import (
+    annotations,
+)
+
+import logging
+from typing import (
+    Optional,
+)
+
+from minos.common import (
+    MinosConfig,
+    import_module,
+)
+
+from ...utils import (
+    get_config_value,
+)
+from .abc import (
+    BrokerQueue,
+)
+from .memory import (
+    InMemoryBrokerQueue,
+)
+from .sqlite import (
+    SQLiteBrokerQueue,
+)
+
+logger = logging.getLogger(__name__)
+
+_BROKER_QUEUE: Optional[BrokerQueue] = None
+
+
+def get_broker_queue(config: Optional[MinosConfig] = None) -> Optional[BrokerQueue]:
+    """Get the process-wide broker queue, building it on the first call.
+
+    The queue is selected with the ``broker.queue.backend`` value, that can be ``"postgres"`` (the default one, in
+    which case the ``producer_queue`` and ``consumer_queue`` tables are used), ``"memory"``, ``"sqlite"`` (stored on
+    the ``broker.queue.path`` file) or the import path of a ``BrokerQueue`` class.
+
+    :param config: Optional config instance used to build the queue if it does not exist yet.
+    :return: A ``BrokerQueue`` instance or ``None`` if the tables must be used.
+    """
+    global _BROKER_QUEUE
+    if _BROKER_QUEUE is None and config is not None:
+        _BROKER_QUEUE = _build_broker_queue(config)
+    return _BROKER_QUEUE
+
+
+def set_broker_queue(queue: Optional[BrokerQueue]) -> None:
+    """Set the process-wide broker queue.
+
+    :param queue: The new queue. If ``None`` is provided, it will be built from the config on the next access.
+    :return: This method does not return anything.
+    """
+    global _BROKER_QUEUE
+    _BROKER_QUEUE = queue
+
+
+def _build_broker_queue(config: MinosConfig) -> Optional[BrokerQueue]:
+    backend = get_config_value(config, "broker.queue.backend")
+    if backend is None or backend == "postgres":
+        return None
+    if backend == "memory":
+        return InMemoryBrokerQueue()
+    if backend == "sqlite":
+        return SQLiteBrokerQueue.from_config(config)
+    if isinstance(backend, str):
+        backend = import_module(backend)
+    if isinstance(backend, type):
+        backend = backend()
+    return backend
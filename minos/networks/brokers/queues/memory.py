@@ -0,0 +1,225 @@
+from __future__ import (
+    annotations,
+)
+
+import logging
+from collections import (
+    defaultdict,
+)
+from collections.abc import (
+    Iterable,
+)
+from heapq import (
+    heapify,
+    heappop,
+    heappush,
+)
+from itertools import (
+    count,
+)
+from typing import (
+    Optional,
+)
+
+from minos.common import (
+    current_datetime,
+)
+
+from ..messages import (
+    BrokerMessageStrategy,
+)
+from .abc import (
+    BrokerQueue,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryBrokerQueue(BrokerQueue):
+    """In Memory Broker Queue class.
+
+    Keeps the entries in the process memory, so it is only suitable when the publishers, producers, consumers and
+    handlers run in the same process (single node deployments, local development, tests, etc.). The entries are lost
+    when the process finishes.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._ids = count(1)
+
+        self._producer_rows: dict[int, list] = dict()
+        self._producer_pending: list[int] = list()
+
+        self._consumer_rows: dict[int, list] = dict()
+        self._consumer_pending: defaultdict[str, list[int]] = defaultdict(list)
+
+    async def enqueue_producer(self, topic: str, strategy: BrokerMessageStrategy, data: bytes) -> int:
+        """Insert a new entry into the producer queue.
+
+        :param topic: The topic in which the message will be published.
+        :param strategy: The publishing strategy.
+        :param data: The message bytes.
+        :return: The identifier of the entry.
+        """
+        id_, now = next(self._ids), current_datetime()
+        self._producer_rows[id_] = [id_, topic, data, strategy, 0, now, now]
+        heappush(self._producer_pending, id_)
+        await self._notify()
+        return id_
+
+    async def claim_producer(self, retry: int, limit: int) -> list[tuple]:
+        """Claim the oldest not claimed entries of the producer queue.
+
+        :param retry: The entries retried at least this number of times are not claimed.
+        :param limit: The maximum number of entries.
+        :return: A list of rows.
+        """
+        return self._claim(self._producer_rows, self._producer_pending, retry, limit)
+
+    async def ack_producer(self, id_: int) -> None:
+        """Remove a claimed entry from the producer queue.
+
+        :param id_: The identifier of the entry.
+        :return: This method does not return anything.
+        """
+        self._producer_rows.pop(id_, None)
+
+    async def nack_producer(self, id_: int) -> None:
+        """Release a claimed entry of the producer queue, increasing its number of retries.
+
+        :param id_: The identifier of the entry.
+        :return: This method does not return anything.
+        """
+        if self._release(self._producer_rows, id_):
+            heappush(self._producer_pending, id_)
+            await self._notify()
+
+    async def count_producer(self, retry: int) -> int:
+        """Count the claimable entries of the producer queue.
+
+        :param retry: The entries retried at least this number of times are not counted.
+        :return: An integer value.
+        """
+        return self._count(self._producer_pending)
+
+    async def get_producer_metrics(self, retry: int) -> tuple[int, float]:
+        """Get the depth of the producer queue and the age of its oldest claimable entry.
+
+        :param retry: The entries retried at least this number of times are not taken into account.
+        :return: A tuple containing the depth and the age in seconds.
+        """
+        return self._get_metrics(self._producer_rows, self._producer_pending, retry)
+
+    async def enqueue_consumer(self, topic: str, partition: int, data: bytes) -> int:
+        """Insert a new entry into the consumer queue.
+
+        :param topic: The topic from which the message was consumed.
+        :param partition: The partition from which the message was consumed.
+        :param data: The message bytes.
+        :return: The identifier of the entry.
+        """
+        id_, now = next(self._ids), current_datetime()
+        self._consumer_rows[id_] = [id_, topic, partition, data, 0, now, now]
+        heappush(self._consumer_pending[topic], id_)
+        await self._notify()
+        return id_
+
+    async def claim_consumer(self, topics: Iterable[str], retry: Optional[int], limit: int) -> list[tuple]:
+        """Claim the oldest not claimed entries of the given topics from the consumer queue.
+
+        :param topics: The topics.
+        :param retry: The entries retried at least this number of times are not claimed. If ``None`` all of them are.
+        :param limit: The maximum number of entries.
+        :return: A list of rows.
+        """
+        heads = [(pending[0], topic) for topic in topics if (pending := self._consumer_pending.get(topic))]
+        heapify(heads)
+
+        rows = list()
+        while heads and len(rows) < limit:
+            _, topic = heappop(heads)
+            pending = self._consumer_pending[topic]
+            rows += self._claim(self._consumer_rows, pending, retry, 1)
+            if pending:
+                heappush(heads, (pending[0], topic))
+        return rows
+
+    async def ack_consumer(self, id_: int) -> None:
+        """Remove a claimed entry from the consumer queue.
+
+        :param id_: The identifier of the entry.
+        :return: This method does not return anything.
+        """
+        self._consumer_rows.pop(id_, None)
+
+    async def nack_consumer(self, id_: int) -> None:
+        """Release a claimed entry of the consumer queue, increasing its number of retries.
+
+        :param id_: The identifier of the entry.
+        :return: This method does not return anything.
+        """
+        if self._release(self._consumer_rows, id_):
+            heappush(self._consumer_pending[self._consumer_rows[id_][1]], id_)
+            await self._notify()
+
+    async def count_consumer(self, topics: Iterable[str], retry: Optional[int]) -> int:
+        """Count the claimable entries of the given topics from the consumer queue.
+
+        :param topics: The topics.
+        :param retry: The entries retried at least this number of times are not counted. If ``None`` all of them are.
+        :return: An integer value.
+        """
+        return sum(self._count(self._consumer_pending[topic]) for topic in topics if topic in self._consumer_pending)
+
+    async def get_consumer_metrics(self, retry: int) -> list[tuple[str, int, float]]:
+        """Get the depth of the consumer queue and the age of its oldest claimable entry, by topic.
+
+        :param retry: The entries retried at least this number of times are not taken into account.
+        :return: A list of tuples containing the topic, the depth and the age in seconds.
+        """
+        metrics = list()
+        for topic, pending in self._consumer_pending.items():
+            depth, age = self._get_metrics(self._consumer_rows, pending, retry)
+            if depth:
+                metrics.append((topic, depth, age))
+        return metrics
+
+    @staticmethod
+    def _claim(rows: dict[int, list], pending: list[int], retry: Optional[int], limit: int) -> list[tuple]:
+        claimed = list()
+        while pending and len(claimed) < limit:
+            row = rows[heappop(pending)]
+            if retry is not None and row[_RETRY] >= retry:
+                # Contrary to the tables, the exhausted entries are discarded, so that they do not leak memory.
+                logger.warning(
+                    f"Discarding the entry {row[0]!r} of the {row[1]!r} topic after {row[_RETRY]!r} retries."
+                )
+                del rows[row[0]]
+                continue
+            claimed.append(tuple(row))
+        return claimed
+
+    @staticmethod
+    def _release(rows: dict[int, list], id_: int) -> bool:
+        row = rows.get(id_)
+        if row is None:
+            return False
+        row[_RETRY] += 1
+        row[_UPDATED_AT] = current_datetime()
+        return True
+
+    @staticmethod
+    def _count(pending: list[int]) -> int:
+        # The exhausted entries are only discarded while claiming, so the result could be greater than the real one.
+        return len(pending)
+
+    @staticmethod
+    def _get_metrics(rows: dict[int, list], pending: list[int], retry: int) -> tuple[int, float]:
+        claimable = [rows[id_] for id_ in pending if rows[id_][_RETRY] < retry]
+        if not claimable:
+            return 0, 0.0
+        oldest = min(row[_CREATED_AT] for row in claimable)
+        return len(claimable), (current_datetime() - oldest).total_seconds()
+
+
+_RETRY, _CREATED_AT, _UPDATED_AT = 4, 5, 6
@@ -0,0 +1,493 @@
+from __future__ import (
+    annotations,
+)
+
+import logging
+import sqlite3
+import sys
+import time
+from asyncio import (
+    CancelledError,
+    Future,
+    Task,
+    create_task,
+    get_running_loop,
+)
+from collections.abc import (
+    Callable,
+    Iterable,
+)
+from concurrent.futures import (
+    ThreadPoolExecutor,
+)
+from datetime import (
+    datetime,
+    timezone,
+)
+from functools import (
+    partial,
+)
+from pathlib import (
+    Path,
+)
+from typing import (
+    Any,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+from minos.common import (
+    MinosConfig,
+)
+
+from ...utils import (
+    get_config_value,
+)
+from ..messages import (
+    BrokerMessageStrategy,
+)
+from .abc import (
+    BrokerQueue,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SQLiteBrokerQueue(BrokerQueue):
+    """SQLite Broker Queue class.
+
+    Stores the entries on a SQLite database file in WAL mode, so that they survive the process restarts without
+    requiring a Postgres instance. It is intended for single node deployments in which the publishers, producers,
+    consumers and handlers run in the same process, as the file is owned by that process.
+
+    The write operations (enqueue, claim, ack and nack) issued on the same event loop iteration are appended to a batch
+    that is committed in a single transaction, so that the cost of syncing the file is shared between them. Each
+    operation is isolated on a savepoint, so a failing one is rolled back without affecting the rest of the batch.
+
+    The entries claimed by a cancelled call are released immediately, and the ones claimed but neither acked nor
+    nacked (for example, because the process crashed while dispatching them) are released on setup. The space of the
+    removed entries is returned to the file system every ``compaction_threshold`` removals (see ``compact``).
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        *args,
+        synchronous: str = "FULL",
+        compaction_threshold: int = 10_000,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.path = str(path)
+        self.synchronous = synchronous
+        self.compaction_threshold = compaction_threshold
+
+        self._connection: Optional[sqlite3.Connection] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._writes: list[tuple[Callable[[sqlite3.Connection], Any], Future, Optional[Callable[[Any], None]]]] = list()
+        self._flushing: Optional[Task] = None
+        self._removed = 0
+
+    @classmethod
+    def _from_config(cls, config: MinosConfig, **kwargs) -> SQLiteBrokerQueue:
+        if "path" not in kwargs:
+            kwargs["path"] = get_config_value(config, "broker.queue.path", "broker_queue.sqlite3")
+        return cls(**kwargs)
+
+    async def _setup(self) -> None:
+        await super()._setup()
+        # The sqlite3 connections must not be used concurrently, so every operation is performed on the same thread.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="broker-queue")
+        await self._submit(self._connect)
+
+    async def _destroy(self) -> None:
+        if self._flushing is not None:
+            await self._flushing
+        await self._submit(self._close)
+        self._executor.shutdown()
+        self._executor = None
+        await super()._destroy()
+
+    async def enqueue_producer(self, topic: str, strategy: BrokerMessageStrategy, data: bytes) -> int:
+        """Insert a new entry into the producer queue.
+
+        :param topic: The topic in which the message will be published.
+        :param strategy: The publishing strategy.
+        :param data: The message bytes.
+        :return: The identifier of the entry.
+        """
+        id_ = await self._write(self._insert, _INSERT_PRODUCER_QUERY, (topic, data, strategy.value))
+        await self._notify()
+        return id_
+
+    async def claim_producer(self, retry: int, limit: int) -> list[tuple]:
+        """Claim the oldest not claimed entries of the producer queue.
+
+        :param retry: The entries retried at least this number of times are not claimed.
+        :param limit: The maximum number of entries.
+        :return: A list of rows.
+        """
+        rows = await self._write_claim("producer_queue", _SELECT_PRODUCER_QUERY, (retry, limit))
+        return [(*row[:3], BrokerMessageStrategy(row[3]), row[4], *map(_to_datetime, row[5:])) for row in rows]
+
+    async def ack_producer(self, id_: int) -> None:
+        """Remove a claimed entry from the producer queue.
+
+        :param id_: The identifier of the entry.
+        :return: This method does not return anything.
+        """
+        await self._write(self._delete, "producer_queue", id_)
+
+    async def ack_producer_many(self, ids: Iterable[int]) -> None:
+        """Remove a batch of claimed entries from the producer queue.
+
+        :param ids: The identifiers of the entries.
+        :return: This method does not return anything.
+        """
+        ids = tuple(ids)
+        if ids:
+            await self._write(self._delete_many, "producer_queue", ids)
+
+    async def nack_producer(self, id_: int) -> None:
+        """Release a claimed entry of the producer queue, increasing its number of retries.
+
+        :param id_: The identifier of the entry.
+        :return: This method does not return anything.
+        """
+        if await self._write(self._release, "producer_queue", id_):
+            await self._notify()
+
+    async def count_producer(self, retry: int) -> int:
+        """Count the claimable entries of the producer queue.
+
+        :param retry: The entries retried at least this number of times are not counted.
+        :return: An integer value.
+        """
+        (count,) = await self._submit(self._fetchone, _COUNT_PRODUCER_QUERY, (retry,))
+        return count
+
+    async def get_producer_metrics(self, retry: int) -> tuple[int, float]:
+        """Get the depth of the producer queue and the age of its oldest claimable entry.
+
+        :param retry: The entries retried at least this number of times are not taken into account.
+        :return: A tuple containing the depth and the age in seconds.
+        """
+        depth, oldest = await self._submit(self._fetchone, _PRODUCER_METRICS_QUERY, (retry,))
+        return depth, _get_age(oldest)
+
+    async def enqueue_consumer(self, topic: str, partition: int, data: bytes) -> int:
+        """Insert a new entry into the consumer queue.
+
+        :param topic: The topic from which the message was consumed.
+        :param partition: The partition from which the message was consumed.
+        :param data: The message bytes.
+        :return: The identifier of the entry.
+        """
+        id_ = await self._write(self._insert, _INSERT_CONSUMER_QUERY, (topic, partition, data))
+        await self._notify()
+        return id_
+
+    async def claim_consumer(self, topics: Iterable[str], retry: Optional[int], limit: int) -> list[tuple]:
+        """Claim the oldest not claimed entries of the given topics from the consumer queue.
+
+        :param topics: The topics.
+        :param retry: The entries retried at least this number of times are not claimed. If ``None`` all of them are.
+        :param limit: The maximum number of entries.
+        :return: A list of rows.
+        """
+        topics = tuple(topics)
+        if not topics:
+            return list()
+        query = _SELECT_CONSUMER_QUERY.format(topics=_placeholders(topics))
+        rows = await self._write_claim("consumer_queue", query, (*topics, _get_retry(retry), limit))
+        return [(*row[:5], *map(_to_datetime, row[5:])) for row in rows]
+
+    async def ack_consumer(self, id_: int) -> None:
+        """Remove a claimed entry from the consumer queue.
+
+        :param id_: The identifier of the entry.
+        :return: This method does not return anything.
+        """
+        await self._write(self._delete, "consumer_queue", id_)
+
+    async def nack_consumer(self, id_: int) -> None:
+        """Release a claimed entry of the consumer queue, increasing its number of retries.
+
+        :param id_: The identifier of the entry.
+        :return: This method does not return anything.
+        """
+        if await self._write(self._release, "consumer_queue", id_):
+            await self._notify()
+
+    async def count_consumer(self, topics: Iterable[str], retry: Optional[int]) -> int:
+        """Count the claimable entries of the given topics from the consumer queue.
+
+        :param topics: The topics.
+        :param retry: The entries retried at least this number of times are not counted. If ``None`` all of them are.
+        :return: An integer value.
+        """
+        topics = tuple(topics)
+        if not topics:
+            return 0
+        query = _COUNT_CONSUMER_QUERY.format(topics=_placeholders(topics))
+        (count,) = await self._submit(self._fetchone, query, (*topics, _get_retry(retry)))
+        return count
+
+    async def get_consumer_metrics(self, retry: int) -> list[tuple[str, int, float]]:
+        """Get the depth of the consumer queue and the age of its oldest claimable entry, by topic.
+
+        :param retry: The entries retried at least this number of times are not taken into account.
+        :return: A list of tuples containing the topic, the depth and the age in seconds.
+        """
+        rows = await self._submit(self._fetchall, _CONSUMER_METRICS_QUERY, (retry,))
+        return [(topic, depth, _get_age(oldest)) for topic, depth, oldest in rows]
+
+    async def compact(self) -> None:
+        """Return the space of the removed entries to the file system and truncate the write-ahead log.
+
+        :return: This method does not return anything.
+        """
+        await self._submit(self._compact)
+
+    async def _submit(self, fn: Callable[..., T], *args) -> T:
+        return await get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def _write(self, fn: Callable[..., T], *args) -> T:
+        return await self._enqueue(partial(fn, *args))
+
+    async def _write_claim(self, table: str, query: str, parameters: tuple) -> list[tuple]:
+        release = partial(self._release_claimed, table)
+        future = self._enqueue(partial(self._claim, table, query, parameters), release)
+        try:
+            return await future
+        except CancelledError:
+            # The rows could have been claimed before cancelling the caller, so they would never be acked nor nacked.
+            if future.done() and not future.cancelled() and future.exception() is None:
+                release(future.result())
+            raise
+
+    def _release_claimed(self, table: str, rows: list[tuple]) -> None:
+        if not rows:
+            return
+        # The released entries must be claimable by the pending claims, so the release is performed first.
+        self._enqueue(partial(self._unclaim, table, tuple(row[0] for row in rows)), first=True)
+
+    def _enqueue(
+        self,
+        fn: Callable[[sqlite3.Connection], T],
+        on_cancel: Optional[Callable[[T], None]] = None,
+        first: bool = False,
+    ) -> Future:
+        future = get_running_loop().create_future()
+        self._writes.insert(0 if first else len(self._writes), (fn, future, on_cancel))
+        if self._flushing is None:
+            self._flushing = create_task(self._flush())
+        return future
+
+    async def _flush(self) -> None:
+        try:
+            while self._writes:
+                writes, self._writes = self._writes, list()
+                try:
+                    results = await self._submit(self._execute_batch, [fn for fn, _, _ in writes])
+                except Exception as exc:
+                    for _, future, _ in writes:
+                        if not future.done():
+                            future.set_exception(exc)
+                    continue
+
+                for (_, future, on_cancel), (exc, result) in zip(writes, results):
+                    if future.cancelled():
+                        if on_cancel is not None and exc is None:
+                            on_cancel(result)
+                    elif exc is not None:
+                        future.set_exception(exc)
+                    else:
+                        future.set_result(result)
+        finally:
+            self._flushing = None
+
+    def _connect(self) -> None:
+        connection = sqlite3.connect(self.path, isolation_level=None)
+        # The vacuum mode can only be changed before the creation of the first table.
+        connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute(f"PRAGMA synchronous = {self.synchronous}")
+        connection.executescript(_CREATE_TABLES_QUERY)
+
+        recovered = sum(connection.execute(query).rowcount for query in _RECOVER_QUERIES)
+        if recovered:
+            logger.warning(f"Released {recovered!r} entries claimed before the last shutdown of {self.path!r}.")
+
+        self._connection = connection
+        self._compact()
+
+    def _close(self) -> None:
+        self._connection.close()
+        self._connection = None
+
+    def _execute_batch(self, fns: list[Callable[[sqlite3.Connection], Any]]) -> list[tuple[Optional[Exception], Any]]:
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            results = [self._execute_one(fn) for fn in fns]
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+
+        if self._removed >= self.compaction_threshold:
+            self._compact()
+        return results
+
+    def _execute_one(self, fn: Callable[[sqlite3.Connection], Any]) -> tuple[Optional[Exception], Any]:
+        self._connection.execute("SAVEPOINT write")
+        try:
+            result = fn(self._connection)
+        except Exception as exc:
+            self._connection.execute("ROLLBACK TO write")
+            self._connection.execute("RELEASE write")
+            return exc, None
+        self._connection.execute("RELEASE write")
+        return None, result
+
+    def _compact(self) -> None:
+        # Each step of the pragma frees a single page, and ``execute`` performs only the first one.
+        self._connection.executescript("PRAGMA incremental_vacuum;")
+        self._connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self._removed = 0
+
+    def _fetchone(self, query: str, parameters: tuple) -> tuple:
+        return self._connection.execute(query, parameters).fetchone()
+
+    def _fetchall(self, query: str, parameters: tuple) -> list[tuple]:
+        return self._connection.execute(query, parameters).fetchall()
+
+    @staticmethod
+    def _insert(query: str, parameters: tuple, connection: sqlite3.Connection) -> int:
+        now = time.time()
+        return connection.execute(query, (*parameters, now, now)).lastrowid
+
+    @staticmethod
+    def _claim(table: str, query: str, parameters: tuple, connection: sqlite3.Connection) -> list[tuple]:
+        rows = connection.execute(query, parameters).fetchall()
+        connection.executemany(f"UPDATE {table} SET claimed = 1 WHERE id = ?", [(row[0],) for row in rows])
+        return rows
+
+    @staticmethod
+    def _unclaim(table: str, ids: tuple[int, ...], connection: sqlite3.Connection) -> None:
+        query = f"UPDATE {table} SET claimed = 0 WHERE id IN ({_placeholders(ids)}) AND claimed = 1"
+        connection.execute(query, ids)
+
+    def _delete(self, table: str, id_: int, connection: sqlite3.Connection) -> None:
+        self._removed += connection.execute(f"DELETE FROM {table} WHERE id = ?", (id_,)).rowcount
+
+    def _delete_many(self, table: str, ids: tuple[int, ...], connection: sqlite3.Connection) -> None:
+        query = f"DELETE FROM {table} WHERE id IN ({_placeholders(ids)})"
+        self._removed += connection.execute(query, ids).rowcount
+
+    @staticmethod
+    def _release(table: str, id_: int, connection: sqlite3.Connection) -> bool:
+        query = f"UPDATE {table} SET claimed = 0, retry = retry + 1, updated_at = ? WHERE id = ? AND claimed = 1"
+        return connection.execute(query, (time.time(), id_)).rowcount > 0
+
+
+def _placeholders(values: tuple) -> str:
+    return ", ".join("?" for _ in values)
+
+
+def _get_retry(retry: Optional[int]) -> int:
+    # The ``retry`` column can never reach the greatest integer value, so that every entry is claimable.
+    return sys.maxsize if retry is None else retry
+
+
+def _to_datetime(value: float) -> datetime:
+    return datetime.fromtimestamp(value, tz=timezone.utc)
+
+
+def _get_age(oldest: Optional[float]) -> float:
+    if oldest is None:
+        return 0.0
+    return max(time.time() - oldest, 0.0)
+
+
+_CREATE_TABLES_QUERY = """
+CREATE TABLE IF NOT EXISTS producer_queue (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    topic TEXT NOT NULL,
+    data BLOB NOT NULL,
+    strategy TEXT NOT NULL,
+    retry INTEGER NOT NULL DEFAULT 0,
+    claimed INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS producer_queue_claimable ON producer_queue (id) WHERE claimed = 0;
+CREATE TABLE IF NOT EXISTS consumer_queue (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    topic TEXT NOT NULL,
+    partition INTEGER,
+    data BLOB NOT NULL,
+    retry INTEGER NOT NULL DEFAULT 0,
+    claimed INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS consumer_queue_claimable ON consumer_queue (topic, id) WHERE claimed = 0;
+""".strip()
+
+_RECOVER_QUERIES = (
+    "UPDATE producer_queue SET claimed = 0 WHERE claimed = 1",
+    "UPDATE consumer_queue SET claimed = 0 WHERE claimed = 1",
+)
+
+_INSERT_PRODUCER_QUERY = """
+INSERT INTO producer_queue (topic, data, strategy, created_at, updated_at) VALUES (?, ?, ?, ?, ?)
+""".strip()
+
+_SELECT_PRODUCER_QUERY = """
+SELECT id, topic, data, strategy, retry, created_at, updated_at
+FROM producer_queue
+WHERE claimed = 0 AND retry < ?
+ORDER BY id
+LIMIT ?
+""".strip()
+
+_COUNT_PRODUCER_QUERY = """
+SELECT COUNT(*)
+FROM producer_queue
+WHERE claimed = 0 AND retry < ?
+""".strip()
+
+_PRODUCER_METRICS_QUERY = """
+SELECT COUNT(*), MIN(created_at)
+FROM producer_queue
+WHERE claimed = 0 AND retry < ?
+""".strip()
+
+_INSERT_CONSUMER_QUERY = """
+INSERT INTO consumer_queue (topic, partition, data, created_at, updated_at) VALUES (?, ?, ?, ?, ?)
+""".strip()
+
+_SELECT_CONSUMER_QUERY = """
+SELECT id, topic, partition, data, retry, created_at, updated_at
+FROM consumer_queue
+WHERE claimed = 0 AND topic IN ({topics}) AND retry < ?
+ORDER BY id
+LIMIT ?
+""".strip()
+
+_COUNT_CONSUMER_QUERY = """
+SELECT COUNT(*)
+FROM consumer_queue
+WHERE claimed = 0 AND topic IN ({topics}) AND retry < ?
+""".strip()
+
+_CONSUMER_METRICS_QUERY = """
+SELECT topic, COUNT(*), MIN(created_at)
+FROM consumer_queue
+WHERE claimed = 0 AND retry < ?
+GROUP BY topic
+""".strip()
@@ -0,0 +1,526 @@
+from __future__ import (
+    annotations,
+)
+
+import json
+import logging
+import random
+from abc import (
+    ABC,
+    abstractmethod,
+)
+from collections import (
+    deque,
+)
+from collections.abc import (
+    Iterable,
+    Sequence,
+)
+from concurrent.futures import (
+    ThreadPoolExecutor,
+)
+from contextvars import (
+    ContextVar,
+)
+from enum import (
+    IntEnum,
+)
+from pathlib import (
+    Path,
+)
+from typing import (
+    Any,
+    Final,
+    Optional,
+    TextIO,
+    Union,
+)
+
+from minos.common import (
+    MinosConfig,
+    import_module,
+)
+
+from ..utils import (
+    get_config_value,
+)
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_HEADER: Final[str] = "traceparent"
+PUBLISHED_AT_HEADER: Final[str] = "minos-published-at"
+
+TRACE_CONTEXT_VAR: Final[ContextVar[Optional[BrokerTraceContext]]] = ContextVar("trace_context", default=None)
+
+
+class BrokerSpanKind(IntEnum):
+    """Broker Span Kind class.
+
+    The values are the ones used by the OTLP protocol.
+    """
+
+    INTERNAL = 1
+    PRODUCER = 4
+    CONSUMER = 5
+
+
+class BrokerTraceContext:
+    """Broker Trace Context class.
+
+    Identifies a span inside a trace, and it is propagated between services with the W3C ``traceparent`` format.
+    """
+
+    __slots__ = "trace_id", "span_id", "parent_id", "sampled"
+
+    def __init__(self, trace_id: str, span_id: str, parent_id: Optional[str] = None, sampled: bool = True):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.sampled = sampled
+
+    @classmethod
+    def new(cls, sampled: bool = True) -> BrokerTraceContext:
+        """Build the context of a new trace.
+
+        :param sampled: If ``True`` the spans of the trace are recorded.
+        :return: A ``BrokerTraceContext`` instance.
+        """
+        return cls(f"{random.getrandbits(128):032x}", _new_span_id(), sampled=sampled)
+
+    def child(self) -> BrokerTraceContext:
+        """Build the context of a new child span.
+
+        :return: A ``BrokerTraceContext`` instance.
+        """
+        return type(self)(self.trace_id, _new_span_id(), self.span_id, self.sampled)
+
+    @classmethod
+    def from_traceparent(cls, value: Optional[str]) -> Optional[BrokerTraceContext]:
+        """Build a new instance from a ``traceparent`` header value.
+
+        :param value: The header value.
+        :return: A ``BrokerTraceContext`` instance or ``None`` if the value is not valid.
+        """
+        if not value:
+            return None
+        parts = value.strip().split("-")
+        if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+            return None
+        try:
+            flags = int(parts[3], 16)
+            int(parts[1], 16)
+            int(parts[2], 16)
+        except ValueError:
+            return None
+        return cls(parts[1], parts[2], sampled=bool(flags & 1))
+
+    def to_traceparent(self) -> str:
+        """Get the ``traceparent`` header value.
+
+        :return: A ``str`` value.
+        """
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, type(self)) and tuple(self) == tuple(other)
+
+    def __iter__(self) -> Iterable:
+        yield from (self.trace_id, self.span_id, self.parent_id, self.sampled)
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(trace_id={self.trace_id!r}, span_id={self.span_id!r}, "
+            f"parent_id={self.parent_id!r}, sampled={self.sampled!r})"
+        )
+
+
+class BrokerSpan:
+    """Broker Span class."""
+
+    __slots__ = "name", "context", "start", "end", "kind", "attributes"
+
+    def __init__(
+        self,
+        name: str,
+        context: BrokerTraceContext,
+        start: float,
+        end: float,
+        kind: BrokerSpanKind = BrokerSpanKind.INTERNAL,
+        attributes: Optional[dict[str, Any]] = None,
+    ):
+        if attributes is None:
+            attributes = dict()
+        self.name = name
+        self.context = context
+        self.start = start
+        self.end = end
+        self.kind = kind
+        self.attributes = attributes
+
+    @property
+    def duration(self) -> float:
+        """Get the span duration, in seconds.
+
+        :return: A ``float`` value.
+        """
+        return self.end - self.start
+
+    def to_otlp(self) -> dict[str, Any]:
+        """Get the span in the OTLP/JSON format.
+
+        :return: A dictionary.
+        """
+        span = {
+            "traceId": self.context.trace_id,
+            "spanId": self.context.span_id,
+            "name": self.name,
+            "kind": int(self.kind),
+            "startTimeUnixNano": str(int(self.start * 1e9)),
+            "endTimeUnixNano": str(int(self.end * 1e9)),
+            "attributes": _to_otlp_attributes(self.attributes),
+        }
+        if self.context.parent_id is not None:
+            span["parentSpanId"] = self.context.parent_id
+        return span
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(name={self.name!r}, context={self.context!r}, duration={self.duration!r})"
+
+
+class BrokerSpanExporter(ABC):
+    """Broker Span Exporter base class."""
+
+    @abstractmethod
+    def export(self, spans: Sequence[BrokerSpan]) -> None:
+        """Export the given spans.
+
+        :param spans: The spans to be exported.
+        :return: This method does not return anything.
+        """
+
+    def flush(self) -> None:
+        """Flush the pending spans, if any.
+
+        :return: This method does not return anything.
+        """
+
+
+class InMemoryBrokerSpanExporter(BrokerSpanExporter):
+    """In Memory Broker Span Exporter class.
+
+    Keeps the last ``max_spans`` spans in memory.
+    """
+
+    def __init__(self, max_spans: int = 10_000):
+        self._spans: deque[BrokerSpan] = deque(maxlen=max_spans)
+
+    @property
+    def spans(self) -> list[BrokerSpan]:
+        """Get the exported spans.
+
+        :return: A list of ``BrokerSpan`` instances.
+        """
+        return list(self._spans)
+
+    def export(self, spans: Sequence[BrokerSpan]) -> None:
+        """Export the given spans.
+
+        :param spans: The spans to be exported.
+        :return: This method does not return anything.
+        """
+        self._spans.extend(spans)
+
+    def clear(self) -> None:
+        """Remove the exported spans.
+
+        :return: This method does not return anything.
+        """
+        self._spans.clear()
+
+
+class OtlpFileBrokerSpanExporter(BrokerSpanExporter):
+    """OTLP File Broker Span Exporter class.
+
+    Appends the spans to a file, one OTLP/JSON ``ExportTraceServiceRequest`` per line, so that they can be loaded later
+    by any OpenTelemetry compatible tool without needing a collector. The spans are written in batches of
+    ``batch_size`` spans, by a background thread so that the event loop is not blocked by the file operations.
+    """
+
+    def __init__(self, path: Union[str, Path], service_name: str = "minos", batch_size: int = 128):
+        self._path = Path(path)
+        self._service_name = service_name
+        self._batch_size = batch_size
+        self._pending: list[BrokerSpan] = list()
+        self._file: Optional[TextIO] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def path(self) -> Path:
+        """Get the file path.
+
+        :return: A ``Path`` instance.
+        """
+        return self._path
+
+    def export(self, spans: Sequence[BrokerSpan]) -> None:
+        """Export the given spans.
+
+        :param spans: The spans to be exported.
+        :return: This method does not return anything.
+        """
+        self._pending.extend(spans)
+        if len(self._pending) >= self._batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the pending spans to the file.
+
+        The spans are written in the background, in the same order in which they were flushed.
+
+        :return: This method does not return anything.
+        """
+        if not self._pending:
+            return
+        spans, self._pending = self._pending, list()
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="minos-otlp-exporter")
+        self._executor.submit(self._write, spans)
+
+    def _write(self, spans: Sequence[BrokerSpan]) -> None:
+        try:
+            if self._file is None:
+                self._file = self._path.open("a")
+            self._file.write(json.dumps(self._build_request(spans), separators=(",", ":")) + "\n")
+            self._file.flush()
+        except Exception as exc:
+            logger.warning(f"Raised an exception while writing the spans to {self._path!s}: {exc!r}")
+
+    def _build_request(self, spans: Sequence[BrokerSpan]) -> dict[str, Any]:
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": _to_otlp_attributes({"service.name": self._service_name})},
+                    "scopeSpans": [
+                        {"scope": {"name": "minos.networks"}, "spans": [span.to_otlp() for span in spans]},
+                    ],
+                }
+            ]
+        }
+
+    def close(self) -> None:
+        """Flush the pending spans, wait until they are written and close the file.
+
+        :return: This method does not return anything.
+        """
+        self.flush()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class BrokerTracer:
+    """Broker Tracer class.
+
+    Records the lifecycle of the broker messages as spans: the trace context is propagated on the ``traceparent``
+    message header, together with the publication timestamp, and each stage (the publication, the waiting on the
+    ``producer_queue``, the transport, the waiting on the ``consumer_queue`` and on the handler queue, and the
+    handling) is recorded as a child span of the publication. The messages sent while handling a message (including
+    the reply) are children of its handling span.
+
+    If there is not any exporter, the tracer is disabled and the instrumented code skips the tracing entirely.
+    """
+
+    def __init__(self, exporter: Optional[BrokerSpanExporter] = None, sample_rate: float = 1.0):
+        if not 0 <= sample_rate <= 1:
+            raise ValueError(f"The 'sample_rate' value must be between 0 and 1. Obtained: {sample_rate!r}")
+        self._exporter = exporter
+        self._sample_rate = sample_rate
+
+    @classmethod
+    def from_config(cls, config: MinosConfig, **kwargs) -> BrokerTracer:
+        """Build a new instance from config.
+
+        The exporter is selected with the ``tracing.exporter`` value, that can be ``"memory"``, ``"otlp_file"`` (in
+        that case the file is set with ``tracing.path``) or the import path of a ``BrokerSpanExporter`` class.
+
+        :param config: The config instance.
+        :param kwargs: Additional named arguments.
+        :return: A ``BrokerTracer`` instance.
+        """
+        if "exporter" not in kwargs:
+            kwargs["exporter"] = cls._exporter_from_config(config)
+        if "sample_rate" not in kwargs:
+            sample_rate = get_config_value(config, "tracing.sample_rate")
+            if sample_rate is not None:
+                kwargs["sample_rate"] = sample_rate
+        return cls(**kwargs)
+
+    @staticmethod
+    def _exporter_from_config(config: MinosConfig) -> Optional[BrokerSpanExporter]:
+        exporter = get_config_value(config, "tracing.exporter")
+        if exporter is None:
+            return None
+        if exporter == "memory":
+            return InMemoryBrokerSpanExporter()
+        if exporter == "otlp_file":
+            path = get_config_value(config, "tracing.path", "traces.jsonl")
+            service_name = get_config_value(config, "service.name", "minos")
+            return OtlpFileBrokerSpanExporter(path, service_name=service_name)
+        if isinstance(exporter, str):
+            exporter = import_module(exporter)
+        if isinstance(exporter, type):
+            exporter = exporter()
+        return exporter
+
+    @property
+    def enabled(self) -> bool:
+        """Check if the tracer records spans.
+
+        :return: A boolean value.
+        """
+        return self._exporter is not None
+
+    @property
+    def exporter(self) -> Optional[BrokerSpanExporter]:
+        """Get the span exporter.
+
+        :return: A ``BrokerSpanExporter`` instance or ``None``.
+        """
+        return self._exporter
+
+    def inject(self, headers: dict[str, str], published_at: float) -> BrokerTraceContext:
+        """Build the context of a new publication span and inject it into the given headers.
+
+        The span is a child of the one that is being handled (if any), or of the one set on the headers, or the root
+        of a new trace otherwise.
+
+        :param headers: The message headers.
+        :param published_at: The publication timestamp.
+        :return: A ``BrokerTraceContext`` instance.
+        """
+        parent = TRACE_CONTEXT_VAR.get()
+        if parent is None:
+            parent = self.extract(headers)
+
+        if parent is not None:
+            context = parent.child()
+        else:
+            context = BrokerTraceContext.new(sampled=random.random() < self._sample_rate)
+
+        headers[TRACEPARENT_HEADER] = context.to_traceparent()
+        headers[PUBLISHED_AT_HEADER] = repr(published_at)
+        return context
+
+    @staticmethod
+    def extract(headers: Optional[dict[str, str]]) -> Optional[BrokerTraceContext]:
+        """Extract the trace context from the given headers.
+
+        :param headers: The message headers.
+        :return: A ``BrokerTraceContext`` instance or ``None`` if the headers do not contain any.
+        """
+        if not headers:
+            return None
+        return BrokerTraceContext.from_traceparent(headers.get(TRACEPARENT_HEADER))
+
+    @staticmethod
+    def get_published_at(headers: Optional[dict[str, str]]) -> Optional[float]:
+        """Get the publication timestamp from the given headers.
+
+        :param headers: The message headers.
+        :return: A ``float`` value or ``None`` if the headers do not contain any.
+        """
+        if not headers:
+            return None
+        try:
+            return float(headers[PUBLISHED_AT_HEADER])
+        except (KeyError, ValueError):
+            return None
+
+    def record(
+        self,
+        name: str,
+        context: BrokerTraceContext,
+        start: Optional[float],
+        end: float,
+        kind: BrokerSpanKind = BrokerSpanKind.INTERNAL,
+        attributes: Optional[dict[str, Any]] = None,
+    ) -> Optional[BrokerSpan]:
+        """Record a span.
+
+        :param name: The span name.
+        :param context: The span context.
+        :param start: The start timestamp. If ``None``, the span is not recorded.
+        :param end: The end timestamp.
+        :param kind: The span kind.
+        :param attributes: The span attributes.
+        :return: The recorded ``BrokerSpan`` or ``None`` if it was not recorded.
+        """
+        if self._exporter is None or not context.sampled or start is None:
+            return None
+        span = BrokerSpan(name, context, start, max(start, end), kind, attributes)
+        try:
+            self._exporter.export((span,))
+        except Exception as exc:
+            logger.warning(f"Raised an exception while exporting {span!r}: {exc!r}")
+        return span
+
+    def flush(self) -> None:
+        """Flush the pending spans of the exporter.
+
+        :return: This method does not return anything.
+        """
+        if self._exporter is not None:
+            self._exporter.flush()
+
+
+def _new_span_id() -> str:
+    return f"{random.getrandbits(64):016x}"
+
+
+def _to_otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    result = list()
+    for key, value in attributes.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            value = {"boolValue": value}
+        elif isinstance(value, int):
+            value = {"intValue": str(value)}
+        elif isinstance(value, float):
+            value = {"doubleValue": value}
+        else:
+            value = {"stringValue": str(value)}
+        result.append({"key": key, "value": value})
+    return result
+
+
+_BROKER_TRACER: Optional[BrokerTracer] = None
+
+
+def get_broker_tracer(config: Optional[MinosConfig] = None) -> BrokerTracer:
+    """Get the process-wide broker tracer, building it on the first call.
+
+    :param config: Optional config instance used to build the tracer if it does not exist yet.
+    :return: A ``BrokerTracer`` instance.
+    """
+    global _BROKER_TRACER
+    if _BROKER_TRACER is None:
+        if config is not None:
+            _BROKER_TRACER = BrokerTracer.from_config(config)
+        else:
+            _BROKER_TRACER = BrokerTracer()
+    return _BROKER_TRACER
+
+
+def set_broker_tracer(tracer: Optional[BrokerTracer]) -> None:
+    """Set the process-wide broker tracer.
+
+    :param tracer: The new tracer. If ``None`` is provided, a default one will be built on the next access.
+    :return: This method does not return anything.
+    """
+    global _BROKER_TRACER
+    _BROKER_TRACER = tracer
@@ -0,0 +1,158 @@
+from __future__ import (
+    annotations,
+)
+
+import logging
+from asyncio import (
+    Task,
+    create_task,
+    shield,
+)
+from collections.abc import (
+    AsyncIterable,
+    Awaitable,
+    Callable,
+    Hashable,
+)
+from functools import (
+    partial,
+)
+from typing import (
+    Any,
+    Optional,
+)
+
+from minos.common import (
+    Model,
+)
+
+from .requests import (
+    Request,
+    Response,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RequestCoalescer:
+    """Request Coalescer class.
+
+    Collapses the concurrent executions of a handler with identical requests (same user, params and content) into a
+    single one (the "single-flight"), whose response is shared by all of them.
+
+    The shared execution runs on its own task, so it is not cancelled if the request that started it is cancelled
+    while others are still waiting for it. Streamed responses cannot be shared, so in that case the waiting requests
+    are executed independently.
+    """
+
+    def __init__(self, fn: Callable[[Request], Awaitable[Optional[Response]]]):
+        self._fn = fn
+        self._in_flight: dict[Hashable, Task] = dict()
+
+        self._executions = 0
+        self._coalesced = 0
+
+    @property
+    def fn(self) -> Callable[[Request], Awaitable[Optional[Response]]]:
+        """Get the coalesced handling function.
+
+        :return: A function.
+        """
+        return self._fn
+
+    async def run(self, request: Request) -> Optional[Response]:
+        """Run the handling function, sharing the in-flight execution of an identical request if there is any.
+
+        :param request: The request to be handled.
+        :return: The handling function response.
+        """
+        key = await self.build_key(request)
+        if key is None:
+            self._executions += 1
+            return await self._fn(request)
+
+        task = self._in_flight.get(key)
+        if task is None:
+            self._executions += 1
+            task = create_task(self._run_shared(request))
+            self._in_flight[key] = task
+            task.add_done_callback(partial(self._on_done, key))
+            response, _ = await shield(task)
+            return response
+
+        self._coalesced += 1
+        response, shareable = await shield(task)
+        if not shareable:
+            self._coalesced -= 1
+            self._executions += 1
+            return await self._fn(request)
+        return response
+
+    async def _run_shared(self, request: Request) -> tuple[Optional[Response], bool]:
+        response = await self._fn(request)
+        return response, not await _is_streamed(response)
+
+    def _on_done(self, key: Hashable, task: Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Marks the exception as retrieved, as it is possible that nobody is waiting for it anymore.
+            task.exception()
+
+    @staticmethod
+    async def build_key(request: Request) -> Optional[Hashable]:
+        """Build the coalescing key of the given request.
+
+        The key is composed by the user, the params and the content of the request, normalised so that equivalent
+        values (like dictionaries with a different key order) produce the same key.
+
+        :param request: The request.
+        :return: A hashable value or ``None`` if the request cannot be coalesced.
+        """
+        try:
+            params = await request.params() if request.has_params else None
+            content = await request.content() if request.has_content else None
+            key = (request.user, _freeze(params), _freeze(content))
+            hash(key)
+        except Exception as exc:
+            logger.debug(f"The {request!r} request cannot be coalesced: {exc!r}")
+            return None
+        return key
+
+    @property
+    def in_flight(self) -> int:
+        """Get the number of executions currently running.
+
+        :return: An integer value.
+        """
+        return len(self._in_flight)
+
+    @property
+    def metrics(self) -> dict[str, int]:
+        """Get the coalescing metrics.
+
+        :return: A dictionary in which keys are metric names and values are numbers.
+        """
+        return {"in_flight": self.in_flight, "executions": self._executions, "coalesced": self._coalesced}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._fn!r})"
+
+
+async def _is_streamed(response: Any) -> bool:
+    if isinstance(response, Response) and type(response).raw_content is Response.raw_content:
+        response = await response.content()
+    return isinstance(response, AsyncIterable)
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, Model):
+        return type(value), _freeze({name: field.value for name, field in value.fields.items()})
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    # The type is included to avoid collisions between equal values of different types, like ``1`` and ``True``.
+    return type(value), value
@@ -29,3 +29,6 @@ from .definitions import (
     RestEnrouteDecorator,
     RestQueryEnrouteDecorator,
 )
+from .registries import (
+    EnrouteRegistry,
+)
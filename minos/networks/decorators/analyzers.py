@@ -41,6 +41,7 @@ class EnrouteAnalyzer:
 
         self.decorated = decorated
         self.config = config
+        self._all = None
 
     def get_rest_command_query(self) -> dict[str, set[RestEnrouteDecorator]]:
         """Returns rest's command and query values.
@@ -97,8 +98,10 @@ class EnrouteAnalyzer:
 
         :return: A mapping with functions as keys and a sets of decorators as values.
         """
-        fn: Callable = getattr(self.decorated, "__get_enroute__", self._get_all)
-        return fn(config=self.config)
+        if self._all is None:
+            fn: Callable = getattr(self.decorated, "__get_enroute__", self._get_all)
+            self._all = fn(config=self.config)
+        return self._all
 
     # noinspection PyUnusedLocal
     def _get_all(self, *args, **kwargs) -> dict[str, set[EnrouteDecorator]]:
@@ -1,17 +1,19 @@
 from asyncio import (
     gather,
+    iscoroutinefunction,
 )
 from collections import (
     defaultdict,
 )
 from functools import (
-    partial,
+    update_wrapper,
     wraps,
 )
 from inspect import (
     isawaitable,
 )
 from typing import (
+    Any,
     Awaitable,
     Callable,
     Optional,
@@ -23,9 +25,20 @@ from minos.common import (
     import_module,
 )
 
+from ..coalescers import (
+    RequestCoalescer,
+)
 from ..exceptions import (
     MinosRedefinedEnrouteDecoratorException,
 )
+from ..executors import (
+    HandlerExecutor,
+    get_handler_executor,
+)
+from ..monitoring import (
+    HandlerProfiler,
+    get_handler_profiler,
+)
 from ..requests import (
     Request,
     Response,
@@ -48,7 +61,11 @@ class EnrouteBuilder:
     """Enroute builder class."""
 
     def __init__(
-        self, *classes: Union[str, Type], middleware: Optional[Union[str, Callable, list[Union[str, Callable]]]] = None
+        self,
+        *classes: Union[str, Type],
+        middleware: Optional[Union[str, Callable, list[Union[str, Callable]]]] = None,
+        executor: Optional[HandlerExecutor] = None,
+        profiler: Optional[HandlerProfiler] = None,
     ):
         if middleware is None:
             middleware = tuple()
@@ -61,6 +78,30 @@ class EnrouteBuilder:
 
         self.classes = classes
         self.middleware = middleware
+        self._executor = executor
+        self._profiler = profiler
+        self._instances = dict()
+        self._analyzers = dict()
+
+    @property
+    def executor(self) -> HandlerExecutor:
+        """Get the executor used to run the synchronous handling functions.
+
+        :return: A ``HandlerExecutor`` instance.
+        """
+        if self._executor is None:
+            return get_handler_executor()
+        return self._executor
+
+    @property
+    def profiler(self) -> HandlerProfiler:
+        """Get the profiler that wraps the handling functions of the routes and topics.
+
+        :return: A ``HandlerProfiler`` instance.
+        """
+        if self._profiler is None:
+            return get_handler_profiler()
+        return self._profiler
 
     def get_rest_command_query(self, **kwargs) -> dict[RestEnrouteDecorator, Handler]:
         """Get the rest handlers for commands and queries.
@@ -102,6 +143,17 @@ class EnrouteBuilder:
         # noinspection PyTypeChecker
         return self._build("get_periodic_event", **kwargs)
 
+    def get_analyzer(self, class_: type, **kwargs) -> EnrouteAnalyzer:
+        """Get the analyzer of the given class, which is created only once per builder.
+
+        :param class_: The decorated class.
+        :param kwargs: Additional named arguments passed to the analyzer on creation.
+        :return: An ``EnrouteAnalyzer`` instance.
+        """
+        if class_ not in self._analyzers:
+            self._analyzers[class_] = EnrouteAnalyzer(class_, **kwargs)
+        return self._analyzers[class_]
+
     def _build(self, method_name: str, **kwargs) -> dict[EnrouteDecorator, Handler]:
         def _flatten(decorator: EnrouteDecorator, fns: set[Handler]) -> Handler:
             if len(fns) == 1:
@@ -129,38 +181,134 @@ class EnrouteBuilder:
     def _build_one_class(
         self, class_: type, method_name: str, ans: dict[EnrouteDecorator, set[Handler]], **kwargs
     ) -> None:
-        analyzer = EnrouteAnalyzer(class_, **kwargs)
+        analyzer = self.get_analyzer(class_, **kwargs)
         mapping = getattr(analyzer, method_name)()
 
         for name, decorators in mapping.items():
             for decorator in decorators:
-                ans[decorator].add(self._build_one_method(class_, name, decorator.pre_fn_name, decorator.post_fn_name))
-
-    def _build_one_method(self, class_: type, name: str, pref_fn_name: str, post_fn_name: str, **kwargs) -> Handler:
-        instance = class_(**kwargs)
+                ans[decorator].add(
+                    self._build_one_method(
+                        class_,
+                        name,
+                        decorator.pre_fn_name,
+                        decorator.post_fn_name,
+                        coalesce=getattr(decorator, "coalesce", False),
+                        target=self._get_profiling_target(decorator),
+                    )
+                )
+
+    @staticmethod
+    def _get_profiling_target(decorator: EnrouteDecorator) -> Optional[str]:
+        if isinstance(decorator, RestEnrouteDecorator):
+            return f"{decorator.method} {decorator.url}"
+        if isinstance(decorator, BrokerEnrouteDecorator):
+            return decorator.topic
+        return None
+
+    def _build_one_method(
+        self,
+        class_: type,
+        name: str,
+        pref_fn_name: str,
+        post_fn_name: str,
+        coalesce: bool = False,
+        target: Optional[str] = None,
+        **kwargs,
+    ) -> Handler:
+        instance = self._get_instance(class_, **kwargs)
         fn = getattr(instance, name)
+        if target is not None:
+            fn = self.profiler.wrap(target, fn)
         pre_fn = getattr(instance, pref_fn_name, None)
         post_fn = getattr(instance, post_fn_name, None)
 
-        @wraps(fn)
+        handler = self._build_pipeline(fn, pre_fn, post_fn)
+
+        # The middleware is applied over the coalesced handler, so that it is still executed once per request.
+        if coalesce:
+            handler = self._build_coalesced(handler)
+
+        for middleware_fn in reversed(self.middleware):
+            handler = self._build_middleware(middleware_fn, handler)
+
+        return handler
+
+    @staticmethod
+    def _build_middleware(middleware_fn: Callable, inner: Handler) -> Handler:
+        # A closure is cheaper than a ``functools.partial`` with keywords, which merges them on every call.
         async def _wrapper(request: Request) -> Optional[Response]:
-            if pre_fn is not None:
-                request = pre_fn(request)
-                if isawaitable(request):
-                    request = await request
+            return await middleware_fn(request, inner=inner)
+
+        return update_wrapper(_wrapper, inner)
+
+    def _build_pipeline(self, fn: Callable, pre_fn: Optional[Callable], post_fn: Optional[Callable]) -> Handler:
+        fn = self._build_async_handler(fn)
+
+        if pre_fn is None and post_fn is None:
+            return fn
+
+        if pre_fn is not None:
+            pre_fn = self._build_async_hook(pre_fn)
+        if post_fn is not None:
+            post_fn = self._build_async_hook(post_fn)
 
-            response = fn(request)
+        if post_fn is None:
+
+            async def _wrapper(request: Request) -> Optional[Response]:
+                return await fn(await pre_fn(request))
+
+        elif pre_fn is None:
+
+            async def _wrapper(request: Request) -> Optional[Response]:
+                return await post_fn(await fn(request))
+
+        else:
+
+            async def _wrapper(request: Request) -> Optional[Response]:
+                return await post_fn(await fn(await pre_fn(request)))
+
+        return update_wrapper(_wrapper, fn)
+
+    def _build_async_handler(self, fn: Callable) -> Handler:
+        if iscoroutinefunction(fn):
+            return fn
+
+        executor = self.executor
+
+        @wraps(fn)
+        async def _wrapper(request: Request) -> Optional[Response]:
+            response = await executor.submit(fn, request)
             if isawaitable(response):
                 response = await response
+            return response
 
-            if post_fn is not None:
-                response = post_fn(response)
-                if isawaitable(response):
-                    response = await response
+        return _wrapper
 
-            return response
+    @staticmethod
+    def _build_coalesced(fn: Handler) -> Handler:
+        coalescer = RequestCoalescer(fn)
 
-        for middleware_fn in reversed(self.middleware):
-            _wrapper = partial(middleware_fn, inner=_wrapper)
+        @wraps(fn)
+        async def _wrapper(request: Request) -> Optional[Response]:
+            return await coalescer.run(request)
 
         return _wrapper
+
+    @staticmethod
+    def _build_async_hook(fn: Callable[[Any], Any]) -> Callable[[Any], Awaitable[Any]]:
+        if iscoroutinefunction(fn):
+            return fn
+
+        @wraps(fn)
+        async def _wrapper(value: Any) -> Any:
+            value = fn(value)
+            if isawaitable(value):
+                value = await value
+            return value
+
+        return _wrapper
+
+    def _get_instance(self, class_: type, **kwargs) -> Any:
+        if class_ not in self._instances:
+            self._instances[class_] = class_(**kwargs)
+        return self._instances[class_]
@@ -3,15 +3,23 @@ from __future__ import (
 )
 
 import asyncio
+import random
+import threading
 import time
 from asyncio import (
+    Future,
     gather,
     iscoroutinefunction,
 )
+from collections import (
+    defaultdict,
+)
 from collections.abc import (
     Awaitable,
     Callable,
+    Hashable,
     Iterable,
+    Iterator,
 )
 from functools import (
     wraps,
@@ -25,6 +33,9 @@ from typing import (
     Union,
     runtime_checkable,
 )
+from weakref import (
+    WeakValueDictionary,
+)
 
 from cached_property import (
     cached_property,
@@ -33,6 +44,9 @@ from cached_property import (
 from ...exceptions import (
     NotSatisfiedCheckerException,
 )
+from ...executors import (
+    get_handler_executor,
+)
 from ...requests import (
     Request,
 )
@@ -49,16 +63,76 @@ class CheckerWrapper(Protocol):
 
 
 class CheckerMeta:
-    """Checker Meta class."""
+    """Checker Meta class.
+
+    The satisfied checks are cached for ``cache_ttl`` seconds if provided, using the value returned by ``cache_key`` for
+    the request as the key, as the requests are not hashable. The cache is guarded by a lock, as the synchronous
+    checkers are run on the handler executor threads.
+
+    The pending checks of the checkers with ``wake_up_topics`` are woken up (through a broker topic hook) when a
+    message of any of those topics is dispatched by the ``BrokerHandler`` of the same process.
+    """
 
     func: Checker
     max_attempts: int
     delay: float
+    backoff: float
+    max_delay: Optional[float]
+    jitter: float
+    timeout: Optional[float]
+    cache_ttl: Optional[float]
+    cache_key: Optional[Callable[..., Hashable]]
+    wake_up_topics: frozenset[str]
+
+    _WAKE_UP_REGISTRY: dict[str, WeakValueDictionary[int, CheckerMeta]] = defaultdict(WeakValueDictionary)
+    _CACHE_MAX_SIZE: int = 1024
+
+    def __init__(
+        self,
+        func: Checker,
+        max_attempts: int,
+        delay: float,
+        backoff: float = 1.0,
+        max_delay: Optional[float] = None,
+        jitter: float = 0.0,
+        timeout: Optional[float] = None,
+        cache_ttl: Optional[float] = None,
+        cache_key: Optional[Callable[..., Hashable]] = None,
+        wake_up_topics: Optional[Iterable[str]] = None,
+    ):
+        if backoff < 1:
+            raise ValueError(f"The 'backoff' value must be greater or equal to one. Obtained: {backoff!r}")
+        if not 0 <= jitter <= 1:
+            raise ValueError(f"The 'jitter' value must be between zero and one. Obtained: {jitter!r}")
+        if cache_ttl is not None and cache_key is None:
+            raise ValueError("The 'cache_key' function must be provided if the 'cache_ttl' value is provided.")
+        if wake_up_topics is None:
+            wake_up_topics = frozenset()
 
-    def __init__(self, func: Checker, max_attempts: int, delay: float):
         self.func = func
         self.max_attempts = max_attempts
         self.delay = delay
+        self.backoff = backoff
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.cache_key = cache_key
+        self.wake_up_topics = frozenset(wake_up_topics)
+
+        self._cache: dict[Hashable, float] = dict()
+        self._cache_lock = threading.Lock()
+        self._waiters: set[Future] = set()
+
+        if self.wake_up_topics:
+            # The broker package depends on this one, so it is imported once both have been loaded.
+            from ...brokers import (
+                add_topic_hook,
+            )
+
+            add_topic_hook(self.wake_up_topic)
+        for topic in self.wake_up_topics:
+            self._WAKE_UP_REGISTRY[topic][id(self)] = self
 
     @staticmethod
     async def run_async(metas: set[CheckerMeta], *args, **kwargs) -> None:
@@ -69,6 +143,9 @@ class CheckerMeta:
         :param kwargs: Additional named arguments.
         :return: This method does not return anything.
         """
+        if not metas:
+            return
+
         metas = list(metas)
         futures = [meta.async_wrapper(*args, **kwargs) for meta in metas]
 
@@ -111,16 +188,23 @@ class CheckerMeta:
 
         @wraps(self.func)
         async def _wrapper(*args, **kwargs) -> bool:
-            r = 0
-            while r < self.max_attempts:
-                satisfied = self.func(*args, **kwargs)
+            key = self._get_cache_key(*args, **kwargs)
+            if self._is_cached(key):
+                return True
+
+            deadline = self._get_deadline()
+            for delay in self._delays():
+                satisfied = await get_handler_executor().run(self.func, *args, **kwargs)
                 if isawaitable(satisfied):
                     satisfied = await satisfied
                 if satisfied:
+                    self._set_cached(key)
                     return True
 
-                await asyncio.sleep(self.delay)
-                r += 1
+                delay = self._bound_delay(delay, deadline)
+                if delay is None:
+                    break
+                await self._sleep(delay)
 
             return False
 
@@ -138,20 +222,119 @@ class CheckerMeta:
 
         @wraps(self.func)
         def _wrapper(*args, **kwargs) -> bool:
-            r = 0
-            while r < self.max_attempts:
+            key = self._get_cache_key(*args, **kwargs)
+            if self._is_cached(key):
+                return True
+
+            deadline = self._get_deadline()
+            for delay in self._delays():
                 satisfied = self.func(*args, **kwargs)
                 if satisfied:
+                    self._set_cached(key)
                     return True
 
-                time.sleep(self.delay)
-                r += 1
+                delay = self._bound_delay(delay, deadline)
+                if delay is None:
+                    break
+                time.sleep(delay)
 
             return False
 
         _wrapper.meta = self
         return _wrapper
 
+    def _delays(self) -> Iterator[Optional[float]]:
+        if self.max_attempts < 1:
+            return
+
+        delay = self.delay
+        for _ in range(self.max_attempts - 1):
+            current = delay
+            if self.max_delay is not None:
+                current = min(current, self.max_delay)
+            if self.jitter:
+                current *= 1 - self.jitter * random.random()
+            yield current
+            delay *= self.backoff
+        yield None
+
+    def _get_deadline(self) -> Optional[float]:
+        if self.timeout is None:
+            return None
+        return time.monotonic() + self.timeout
+
+    @staticmethod
+    def _bound_delay(delay: Optional[float], deadline: Optional[float]) -> Optional[float]:
+        if delay is None or deadline is None:
+            return delay
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        return min(delay, remaining)
+
+    async def _sleep(self, delay: float) -> None:
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter, delay)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._waiters.discard(waiter)
+
+    def wake_up(self) -> None:
+        """Wake up the pending checks so that they are retried immediately instead of waiting for the next attempt.
+
+        :return: This method does not return anything.
+        """
+        for waiter in tuple(self._waiters):
+            if not waiter.done():
+                waiter.set_result(None)
+
+    @classmethod
+    def wake_up_topic(cls, topic: str) -> None:
+        """Wake up the pending checks of the checkers that are interested in the given topic.
+
+        :param topic: The topic of the received message.
+        :return: This method does not return anything.
+        """
+        metas = cls._WAKE_UP_REGISTRY.get(topic)
+        if metas is None:
+            return
+        for meta in tuple(metas.values()):
+            meta.wake_up()
+
+    def _get_cache_key(self, *args, **kwargs) -> Optional[Hashable]:
+        if self.cache_ttl is None:
+            return None
+
+        return self.cache_key(*args, **kwargs)
+
+    def _is_cached(self, key: Optional[Hashable]) -> bool:
+        if key is None:
+            return False
+
+        with self._cache_lock:
+            expiration = self._cache.get(key)
+            if expiration is None:
+                return False
+
+            if expiration < time.monotonic():
+                self._cache.pop(key, None)
+                return False
+
+            return True
+
+    def _set_cached(self, key: Optional[Hashable]) -> None:
+        if key is None:
+            return
+
+        with self._cache_lock:
+            self._cache.pop(key, None)
+            while len(self._cache) >= self._CACHE_MAX_SIZE:
+                self._cache.pop(next(iter(self._cache)), None)
+            self._cache[key] = time.monotonic() + self.cache_ttl
+
     def __repr__(self):
         args = ", ".join(map(repr, self))
         return f"{type(self).__name__}({args})"
@@ -167,4 +350,11 @@ class CheckerMeta:
             self.func,
             self.max_attempts,
             self.delay,
+            self.backoff,
+            self.max_delay,
+            self.jitter,
+            self.timeout,
+            self.cache_ttl,
+            self.cache_key,
+            self.wake_up_topics,
         )
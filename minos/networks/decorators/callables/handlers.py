@@ -15,6 +15,7 @@ from functools import (
     wraps,
 )
 from inspect import (
+    isasyncgenfunction,
     isawaitable,
 )
 from typing import (
@@ -88,7 +89,7 @@ class HandlerMeta:
 
         :return: A ``HandlerWrapper`` instance.
         """
-        if iscoroutinefunction(self.func):
+        if iscoroutinefunction(self.func) or isasyncgenfunction(self.func):
             return self.async_wrapper
         else:
             return self.sync_wrapper
@@ -31,10 +31,18 @@ class BrokerCommandEnrouteDecorator(BrokerEnrouteDecorator):
 
 
 class BrokerQueryEnrouteDecorator(BrokerEnrouteDecorator):
-    """Broker Query Enroute class"""
+    """Broker Query Enroute class
+
+    The concurrent identical requests can be collapsed into a single handler execution by setting ``coalesce``. This
+    option is not part of the decorator identity.
+    """
 
     KIND: Final[EnrouteDecoratorKind] = EnrouteDecoratorKind.Query
 
+    def __init__(self, topic: str, coalesce: bool = False):
+        super().__init__(topic)
+        self.coalesce = coalesce
+
 
 class BrokerEventEnrouteDecorator(BrokerEnrouteDecorator):
     """Broker Event Enroute class"""
@@ -6,12 +6,15 @@ from asyncio import (
     iscoroutinefunction,
 )
 from collections.abc import (
+    Callable,
+    Hashable,
     Iterable,
 )
 from datetime import (
     timedelta,
 )
 from typing import (
+    Optional,
     Union,
 )
 
@@ -28,13 +31,38 @@ class CheckDecorator:
     """Enroute Check Decorator class."""
 
     def __init__(
-        self, handler_meta: HandlerMeta, max_attempts: int = 10, delay: Union[float, timedelta] = 0.1,
+        self,
+        handler_meta: HandlerMeta,
+        max_attempts: int = 10,
+        delay: Union[float, timedelta] = 0.1,
+        backoff: float = 1.0,
+        max_delay: Optional[Union[float, timedelta]] = None,
+        jitter: float = 0.0,
+        timeout: Optional[Union[float, timedelta]] = None,
+        cache_ttl: Optional[Union[float, timedelta]] = None,
+        cache_key: Optional[Callable[..., Hashable]] = None,
+        wake_up_topics: Optional[Iterable[str]] = None,
     ):
         if isinstance(delay, timedelta):
             delay = delay.total_seconds()
+        if isinstance(max_delay, timedelta):
+            max_delay = max_delay.total_seconds()
+        if isinstance(timeout, timedelta):
+            timeout = timeout.total_seconds()
+        if isinstance(cache_ttl, timedelta):
+            cache_ttl = cache_ttl.total_seconds()
+        if wake_up_topics is not None:
+            wake_up_topics = frozenset(wake_up_topics)
 
         self.max_attempts = max_attempts
         self.delay = delay
+        self.backoff = backoff
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.cache_key = cache_key
+        self.wake_up_topics = wake_up_topics
 
         self.handler_meta = handler_meta
 
@@ -45,7 +73,18 @@ class CheckDecorator:
         if iscoroutinefunction(func) and not iscoroutinefunction(self._handler_func):
             raise ValueError(f"{self._handler_func!r} must be a coroutine if {func!r} is a coroutine")
 
-        meta = CheckerMeta(func, self.max_attempts, self.delay)
+        meta = CheckerMeta(
+            func,
+            self.max_attempts,
+            self.delay,
+            self.backoff,
+            self.max_delay,
+            self.jitter,
+            self.timeout,
+            self.cache_ttl,
+            self.cache_key,
+            self.wake_up_topics,
+        )
 
         self._handler_checkers.add(meta)
 
@@ -74,4 +113,11 @@ class CheckDecorator:
             self.handler_meta,
             self.max_attempts,
             self.delay,
+            self.backoff,
+            self.max_delay,
+            self.jitter,
+            self.timeout,
+            self.cache_ttl,
+            self.cache_key,
+            self.wake_up_topics,
         )
@@ -1,9 +1,14 @@
 from abc import (
     ABC,
 )
+from datetime import (
+    timedelta,
+)
 from typing import (
     Final,
     Iterable,
+    Optional,
+    Union,
 )
 
 from .abc import (
@@ -15,11 +20,21 @@ from .kinds import (
 
 
 class RestEnrouteDecorator(EnrouteDecorator, ABC):
-    """Rest Enroute class"""
+    """Rest Enroute class
+
+    The response compression can be enabled or disabled for the route by setting ``compress``. If it is not set, the
+    default behaviour is used, which is disabled unless the ``rest.compression.enabled`` config value says otherwise.
+    The number of concurrent requests of the route can be limited by setting ``max_concurrency``. These options are not
+    part of the decorator identity.
+    """
 
-    def __init__(self, url: str, method: str):
+    def __init__(self, url: str, method: str, compress: Optional[bool] = None, max_concurrency: Optional[int] = None):
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(f"The 'max_concurrency' value must be greater than zero. Obtained: {max_concurrency!r}")
         self.url = url
         self.method = method
+        self.compress = compress
+        self.max_concurrency = max_concurrency
 
     def __iter__(self) -> Iterable:
         yield from (
@@ -35,6 +50,32 @@ class RestCommandEnrouteDecorator(RestEnrouteDecorator):
 
 
 class RestQueryEnrouteDecorator(RestEnrouteDecorator):
-    """Rest Query Enroute class"""
+    """Rest Query Enroute class
+
+    The responses can be cached by setting ``cache_ttl``, and the concurrent identical requests can be collapsed into a
+    single handler execution by setting ``coalesce``. These options are not part of the decorator identity.
+    """
 
     KIND: Final[EnrouteDecoratorKind] = EnrouteDecoratorKind.Query
+
+    def __init__(
+        self,
+        url: str,
+        method: str,
+        cache_ttl: Optional[Union[float, timedelta]] = None,
+        cache_headers: Iterable[str] = tuple(),
+        cache_invalidation_topics: Iterable[str] = tuple(),
+        coalesce: bool = False,
+        compress: Optional[bool] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        super().__init__(url, method, compress=compress, max_concurrency=max_concurrency)
+        if isinstance(cache_ttl, timedelta):
+            cache_ttl = cache_ttl.total_seconds()
+        if cache_ttl is not None and cache_ttl <= 0:
+            raise ValueError(f"The 'cache_ttl' value must be greater than zero. Obtained: {cache_ttl!r}")
+
+        self.cache_ttl = cache_ttl
+        self.cache_headers = tuple(cache_headers)
+        self.cache_invalidation_topics = frozenset(cache_invalidation_topics)
+        self.coalesce = coalesce
@@ -0,0 +1,177 @@
+from __future__ import (
+    annotations,
+)
+
+from collections.abc import (
+    Callable,
+    Mapping,
+)
+from itertools import (
+    chain,
+)
+from types import (
+    MappingProxyType,
+)
+from typing import (
+    Optional,
+    Type,
+    Union,
+)
+
+from cached_property import (
+    cached_property,
+)
+from crontab import (
+    CronTab,
+)
+
+from minos.common import (
+    MinosConfig,
+)
+
+from ..executors import (
+    HandlerExecutor,
+    get_handler_executor,
+)
+from ..monitoring import (
+    HandlerProfiler,
+    get_handler_profiler,
+)
+from .builders import (
+    EnrouteBuilder,
+    Handler,
+)
+from .definitions import (
+    BrokerEnrouteDecorator,
+    EnrouteDecorator,
+    PeriodicEnrouteDecorator,
+    RestEnrouteDecorator,
+)
+
+
+class EnrouteRegistry:
+    """Enroute Registry class.
+
+    Analyses the decorated classes only once and shares the result (topics, routes, crontabs and built handlers) with
+    all the components that need it. The registries built by ``from_config`` are cached by config instance (as it is
+    passed to the analyzers and to the ``__get_enroute__`` methods of the decorated classes), services, middleware,
+    executor and profiler, so replacing the process-wide executor or profiler leads to a new registry. The cache can be
+    reset with ``clear``.
+    """
+
+    _INSTANCES: dict[tuple, EnrouteRegistry] = dict()
+
+    def __init__(
+        self,
+        *classes: Union[str, Type],
+        middleware: Optional[Union[str, Callable, list[Union[str, Callable]]]] = None,
+        executor: Optional[HandlerExecutor] = None,
+        profiler: Optional[HandlerProfiler] = None,
+        config: Optional[MinosConfig] = None,
+    ):
+        self._builder = EnrouteBuilder(*classes, middleware=middleware, executor=executor, profiler=profiler)
+        self._config = config
+
+    @classmethod
+    def from_config(cls, config: MinosConfig) -> EnrouteRegistry:
+        """Get the process-wide registry of the given config, building it on the first call.
+
+        :param config: The config instance.
+        :return: An ``EnrouteRegistry`` instance.
+        """
+        executor = get_handler_executor(config)
+        profiler = get_handler_profiler(config)
+        key = (config, tuple(config.services), tuple(config.middleware), executor, profiler)
+        if key not in cls._INSTANCES:
+            cls._INSTANCES[key] = cls(
+                *config.services, middleware=config.middleware, executor=executor, profiler=profiler, config=config
+            )
+        return cls._INSTANCES[key]
+
+    @classmethod
+    def clear(cls) -> None:
+        """Clear the registries built by ``from_config``.
+
+        :return: This method does not return anything.
+        """
+        cls._INSTANCES.clear()
+
+    @property
+    def middleware(self) -> tuple[Callable, ...]:
+        """Get the middleware functions that wrap the handlers.
+
+        :return: A tuple of functions.
+        """
+        return tuple(self._builder.middleware)
+
+    @property
+    def classes(self) -> tuple[type, ...]:
+        """Get the decorated classes.
+
+        :return: A tuple of classes.
+        """
+        return self._builder.classes
+
+    @cached_property
+    def decorators(self) -> Mapping[type, Mapping[str, frozenset[EnrouteDecorator]]]:
+        """Get the decorators of each class, grouped by function name.
+
+        :return: A read-only mapping with classes as keys and mappings from function names to decorators as values.
+        """
+        return MappingProxyType({class_: self._get_decorators(class_) for class_ in self.classes})
+
+    def _get_decorators(self, class_: type) -> Mapping[str, frozenset[EnrouteDecorator]]:
+        analyzer = self._builder.get_analyzer(class_, config=self._config)
+        return MappingProxyType({name: frozenset(decorators) for name, decorators in analyzer.get_all().items()})
+
+    @cached_property
+    def broker_topics(self) -> frozenset[str]:
+        """Get the topics of the broker commands, queries and events.
+
+        :return: A ``frozenset`` of ``str`` values.
+        """
+        return frozenset(decorator.topic for decorator in self._filter(BrokerEnrouteDecorator))
+
+    @cached_property
+    def rest_routes(self) -> tuple[tuple[str, str], ...]:
+        """Get the sorted ``(url, method)`` pairs of the rest commands and queries.
+
+        :return: A ``tuple`` of ``(str, str)`` pairs.
+        """
+        return tuple(sorted({(decorator.url, decorator.method) for decorator in self._filter(RestEnrouteDecorator)}))
+
+    @cached_property
+    def crontabs(self) -> tuple[CronTab, ...]:
+        """Get the crontabs of the periodic events.
+
+        :return: A ``tuple`` of ``CronTab`` instances.
+        """
+        return tuple(decorator.crontab for decorator in dict.fromkeys(self._filter(PeriodicEnrouteDecorator)))
+
+    def _filter(self, type_: Type[EnrouteDecorator]) -> list[EnrouteDecorator]:
+        decorators = chain.from_iterable(chain.from_iterable(mapping.values()) for mapping in self.decorators.values())
+        return [decorator for decorator in decorators if isinstance(decorator, type_)]
+
+    @cached_property
+    def rest_command_query(self) -> Mapping[RestEnrouteDecorator, Handler]:
+        """Get the rest handlers for commands and queries.
+
+        :return: A read-only mapping with decorators as keys and callable handlers as values.
+        """
+        return MappingProxyType(self._builder.get_rest_command_query(config=self._config))
+
+    @cached_property
+    def broker_command_query_event(self) -> Mapping[BrokerEnrouteDecorator, Handler]:
+        """Get the broker handlers for commands, queries and events.
+
+        :return: A read-only mapping with decorators as keys and callable handlers as values.
+        """
+        return MappingProxyType(self._builder.get_broker_command_query_event(config=self._config))
+
+    @cached_property
+    def periodic_event(self) -> Mapping[PeriodicEnrouteDecorator, Handler]:
+        """Get the periodic handlers for events.
+
+        :return: A read-only mapping with decorators as keys and callable handlers as values.
+        """
+        return MappingProxyType(self._builder.get_periodic_event(config=self._config))
@@ -6,12 +6,6 @@ import logging
 from inspect import (
     isclass,
 )
-from itertools import (
-    chain,
-)
-from operator import (
-    itemgetter,
-)
 from typing import (
     Any,
     Type,
@@ -25,7 +19,7 @@ from minos.common import (
 )
 
 from ..decorators import (
-    EnrouteAnalyzer,
+    EnrouteRegistry,
 )
 from ..exceptions import (
     MinosInvalidDiscoveryClient,
@@ -78,15 +72,8 @@ class DiscoveryConnector(MinosSetup):
 
     @staticmethod
     def _endpoints_from_config(config: MinosConfig) -> list[dict[str, Any]]:
-        endpoints = list()
-        for name in config.services:
-            decorators = EnrouteAnalyzer(name, config).get_rest_command_query()
-            endpoints += [
-                {"url": decorator.url, "method": decorator.method} for decorator in set(chain(*decorators.values()))
-            ]
-
-        endpoints.sort(key=itemgetter("url", "method"))
-        return endpoints
+        routes = EnrouteRegistry.from_config(config).rest_routes
+        return [{"url": url, "method": method} for url, method in routes]
 
     async def _setup(self) -> None:
         await self.subscribe()
@@ -0,0 +1,218 @@
+from __future__ import (
+    annotations,
+)
+
+import logging
+import os
+from asyncio import (
+    get_running_loop,
+    iscoroutinefunction,
+)
+from collections.abc import (
+    Awaitable,
+    Callable,
+)
+from concurrent.futures import (
+    ThreadPoolExecutor,
+)
+from contextvars import (
+    copy_context,
+)
+from functools import (
+    partial,
+)
+from inspect import (
+    isasyncgenfunction,
+)
+from typing import (
+    Any,
+    Optional,
+    Union,
+)
+
+from minos.common import (
+    MinosConfig,
+)
+
+from .utils import (
+    get_config_value,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class HandlerExecutor:
+    """Handler Executor class.
+
+    Runs synchronous handling functions on a bounded thread pool so that they never block the event loop.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, thread_name_prefix: str = "minos-handler"):
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) + 4)
+        if max_workers < 1:
+            raise ValueError(f"The 'max_workers' value must be greater than zero. Obtained: {max_workers!r}")
+
+        self._max_workers = max_workers
+        self._thread_name_prefix = thread_name_prefix
+        self._executor = None
+
+        self._pending = 0
+        self._submitted = 0
+        self._completed = 0
+        self._saturated = 0
+        self._max_queued = 0
+
+    @classmethod
+    def from_config(cls, config: MinosConfig, **kwargs) -> HandlerExecutor:
+        """Build a new instance from config.
+
+        :param config: The config instance.
+        :param kwargs: Additional named arguments.
+        :return: A ``HandlerExecutor`` instance.
+        """
+        if "max_workers" not in kwargs:
+            kwargs["max_workers"] = get_config_value(config, "executor.max_workers")
+        return cls(**kwargs)
+
+    @property
+    def max_workers(self) -> int:
+        """Get the maximum number of worker threads.
+
+        :return: An integer value.
+        """
+        return self._max_workers
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Get the underlying thread pool executor.
+
+        :return: A ``ThreadPoolExecutor`` instance.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self._max_workers, thread_name_prefix=self._thread_name_prefix)
+        return self._executor
+
+    def run(self, fn: Callable, *args, **kwargs) -> Awaitable[Any]:
+        """Run the given function without blocking the event loop.
+
+        Coroutine and asynchronous generator functions are called directly, and the rest of them are submitted to the
+        thread pool.
+
+        :param fn: The function to be run.
+        :param args: Additional positional arguments.
+        :param kwargs: Additional named arguments.
+        :return: An awaitable containing the function result.
+        """
+        if iscoroutinefunction(fn):
+            return fn(*args, **kwargs)
+        if isasyncgenfunction(fn):
+            return self._call_async_gen(fn, *args, **kwargs)
+        return self.submit(fn, *args, **kwargs)
+
+    @staticmethod
+    async def _call_async_gen(fn: Callable, *args, **kwargs) -> Any:
+        return fn(*args, **kwargs)
+
+    async def submit(self, fn: Callable, *args, **kwargs) -> Any:
+        """Submit the given function to the thread pool and wait for its result.
+
+        The current context is propagated, so the context variables are accessible from the function.
+
+        :param fn: The function to be submitted.
+        :param args: Additional positional arguments.
+        :param kwargs: Additional named arguments.
+        :return: The function result.
+        """
+        loop = get_running_loop()
+        context = copy_context()
+
+        self._on_submit()
+        try:
+            return await loop.run_in_executor(self.executor, partial(context.run, fn, *args, **kwargs))
+        finally:
+            self._pending -= 1
+            self._completed += 1
+
+    def _on_submit(self) -> None:
+        self._pending += 1
+        self._submitted += 1
+
+        queued = self.queued
+        if queued > 0:
+            self._saturated += 1
+            self._max_queued = max(self._max_queued, queued)
+
+    @property
+    def running(self) -> int:
+        """Get the number of functions currently running on a worker thread.
+
+        :return: An integer value.
+        """
+        return min(self._pending, self._max_workers)
+
+    @property
+    def queued(self) -> int:
+        """Get the number of functions waiting for a free worker thread.
+
+        :return: An integer value.
+        """
+        return max(self._pending - self._max_workers, 0)
+
+    @property
+    def metrics(self) -> dict[str, Union[int, float]]:
+        """Get the saturation metrics of the executor.
+
+        :return: A dictionary in which keys are metric names and values are numbers.
+        """
+        return {
+            "max_workers": self._max_workers,
+            "running": self.running,
+            "queued": self.queued,
+            "max_queued": self._max_queued,
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "saturated": self._saturated,
+            "utilization": self.running / self._max_workers,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shutdown the underlying thread pool.
+
+        :param wait: If ``True`` waits until the running functions are finished.
+        :return: This method does not return anything.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(max_workers={self._max_workers!r})"
+
+
+_HANDLER_EXECUTOR: Optional[HandlerExecutor] = None
+
+
+def get_handler_executor(config: Optional[MinosConfig] = None) -> HandlerExecutor:
+    """Get the process-wide handler executor, building it on the first call.
+
+    :param config: Optional config instance used to build the executor if it does not exist yet.
+    :return: A ``HandlerExecutor`` instance.
+    """
+    global _HANDLER_EXECUTOR
+    if _HANDLER_EXECUTOR is None:
+        if config is not None:
+            _HANDLER_EXECUTOR = HandlerExecutor.from_config(config)
+        else:
+            _HANDLER_EXECUTOR = HandlerExecutor()
+    return _HANDLER_EXECUTOR
+
+
+def set_handler_executor(executor: Optional[HandlerExecutor]) -> None:
+    """Set the process-wide handler executor.
+
+    :param executor: The new executor. If ``None`` is provided, a default one will be built on the next access.
+    :return: This method does not return anything.
+    """
+    global _HANDLER_EXECUTOR
+    _HANDLER_EXECUTOR = executor
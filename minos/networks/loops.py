@@ -0,0 +1,111 @@
+from __future__ import (
+    annotations,
+)
+
+import logging
+from asyncio import (
+    AbstractEventLoop,
+    AbstractEventLoopPolicy,
+    DefaultEventLoopPolicy,
+    set_event_loop_policy,
+)
+from typing import (
+    Optional,
+    Union,
+)
+
+from minos.common import (
+    MinosConfig,
+    import_module,
+)
+
+from .utils import (
+    get_config_value,
+)
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover
+    uvloop = None
+
+logger = logging.getLogger(__name__)
+
+
+def get_event_loop_policy(
+    policy: Optional[Union[str, type, AbstractEventLoopPolicy]] = None
+) -> AbstractEventLoopPolicy:
+    """Get the event loop policy identified by the given value.
+
+    The supported values are ``"asyncio"`` (the default one), ``"uvloop"``, ``"auto"``, that selects ``uvloop`` if it
+    is installed and the standard ``asyncio`` policy otherwise, the import path of a policy class, a policy class or a
+    policy instance. If ``"uvloop"`` is selected but it is not installed, a warning is logged and the standard policy
+    is used instead.
+
+    The standard policy is the default one because the benchmarks did not show any improvement with ``uvloop`` on the
+    handling paths (which are dominated by the serialization and the handling functions), so ``uvloop`` must be
+    selected explicitly after measuring it on the target workload.
+
+    :param policy: The policy identifier.
+    :return: An ``AbstractEventLoopPolicy`` instance.
+    """
+    if policy is None:
+        policy = "asyncio"
+
+    if isinstance(policy, AbstractEventLoopPolicy):
+        return policy
+
+    if isinstance(policy, str):
+        if policy == "auto":
+            return uvloop.EventLoopPolicy() if uvloop is not None else DefaultEventLoopPolicy()
+        if policy == "uvloop":
+            if uvloop is None:
+                logger.warning("The 'uvloop' package is not installed. Falling back to the 'asyncio' event loop...")
+                return DefaultEventLoopPolicy()
+            return uvloop.EventLoopPolicy()
+        if policy == "asyncio":
+            return DefaultEventLoopPolicy()
+        policy = import_module(policy)
+
+    if isinstance(policy, type) and issubclass(policy, AbstractEventLoopPolicy):
+        return policy()
+
+    raise ValueError(f"The given value is not a valid event loop policy: {policy!r}")
+
+
+def get_event_loop_policy_from_config(config: Optional[MinosConfig] = None) -> AbstractEventLoopPolicy:
+    """Get the event loop policy selected on the config (with the ``loop.policy`` value).
+
+    The policy of the process that runs the services is installed by the ``aiomisc`` entrypoint when it is entered (by
+    default, ``uvloop`` if it is installed), so the value returned by this function must be passed as its ``policy``
+    argument for the setting to take effect there. The additional REST worker processes apply it by themselves.
+
+    :param config: The config instance. If not provided, the ``"asyncio"`` policy is used.
+    :return: An ``AbstractEventLoopPolicy`` instance.
+    """
+    policy = get_config_value(config, "loop.policy") if config is not None else None
+    return get_event_loop_policy(policy)
+
+
+def new_event_loop(config: Optional[MinosConfig] = None) -> AbstractEventLoop:
+    """Create a new event loop with the policy selected on the config.
+
+    :param config: The config instance. If not provided, the ``"asyncio"`` policy is used.
+    :return: An ``AbstractEventLoop`` instance.
+    """
+    return get_event_loop_policy_from_config(config).new_event_loop()
+
+
+def setup_event_loop_policy(config: Optional[MinosConfig] = None) -> AbstractEventLoopPolicy:
+    """Set the event loop policy selected on the config as the process-wide policy.
+
+    This function must be called before creating the event loop that runs the services. Note that the ``aiomisc``
+    entrypoint installs its own policy when it is entered, so in that case ``get_event_loop_policy_from_config`` must
+    be passed as its ``policy`` argument instead.
+
+    :param config: The config instance. If not provided, the ``"asyncio"`` policy is used.
+    :return: The ``AbstractEventLoopPolicy`` instance that has been set.
+    """
+    policy = get_event_loop_policy_from_config(config)
+    set_event_loop_policy(policy)
+    logger.info(f"Using the {type(policy).__module__}.{type(policy).__qualname__} event loop policy.")
+    return policy
@@ -0,0 +1,393 @@
+from __future__ import (
+    annotations,
+)
+
+import logging
+import math
+from bisect import (
+    bisect_left,
+)
+from collections.abc import (
+    Awaitable,
+    Callable,
+    Iterable,
+)
+from inspect import (
+    isawaitable,
+)
+from typing import (
+    Any,
+    Optional,
+    Union,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+MetricsSample = tuple[str, dict[str, Any], Union[int, float]]
+MetricsCollector = Callable[[], Union[Iterable[MetricsSample], Awaitable[Iterable[MetricsSample]]]]
+
+
+class MetricsCounter:
+    """Metrics Counter class.
+
+    A monotonically increasing value, split by the given label names.
+    """
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = tuple()):
+        self._name = name
+        self._documentation = documentation
+        self._label_names = tuple(labels)
+        self._children: dict[tuple, MetricsCounterChild] = dict()
+
+    @property
+    def name(self) -> str:
+        """Get the metric name.
+
+        :return: A ``str`` value.
+        """
+        return self._name
+
+    @property
+    def label_names(self) -> tuple[str, ...]:
+        """Get the label names.
+
+        :return: A tuple of ``str`` values.
+        """
+        return self._label_names
+
+    def labels(self, *values: Any) -> MetricsCounterChild:
+        """Get the counter identified by the given label values.
+
+        The returned instance can be stored to avoid the lookup on the hot paths.
+
+        :param values: The label values, in the same order as the label names.
+        :return: A ``MetricsCounterChild`` instance.
+        """
+        try:
+            return self._children[values]
+        except KeyError:
+            pass
+        if len(values) != len(self._label_names):
+            raise ValueError(f"Expected {len(self._label_names)} label values. Obtained: {values!r}")
+        child = self._children[values] = MetricsCounterChild()
+        return child
+
+    def inc(self, amount: Union[int, float] = 1) -> None:
+        """Increase the unlabeled counter.
+
+        :param amount: The amount to be added.
+        :return: This method does not return anything.
+        """
+        self.labels().inc(amount)
+
+    def render(self) -> Iterable[str]:
+        """Render the counter in the Prometheus text format.
+
+        :return: An iterable of lines.
+        """
+        yield f"# HELP {self._name} {_escape_help(self._documentation)}"
+        yield f"# TYPE {self._name} counter"
+        for values, child in tuple(self._children.items()):
+            labels = _format_labels(self._label_names, values)
+            yield f"{self._name}{labels} {_format_value(child.value)}"
+
+
+class MetricsCounterChild:
+    """Metrics Counter Child class."""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: Union[int, float] = 1) -> None:
+        """Increase the counter.
+
+        :param amount: The amount to be added.
+        :return: This method does not return anything.
+        """
+        self.value += amount
+
+
+class MetricsHistogram:
+    """Metrics Histogram class.
+
+    Counts the observed values on fixed buckets, split by the given label names.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Iterable[str] = tuple(),
+        buckets: Optional[Iterable[float]] = None,
+    ):
+        if buckets is None:
+            buckets = DEFAULT_BUCKETS
+        buckets = tuple(sorted(float(bucket) for bucket in buckets if bucket != math.inf))
+        if not buckets:
+            raise ValueError("At least one finite bucket must be provided.")
+
+        self._name = name
+        self._documentation = documentation
+        self._label_names = tuple(labels)
+        self._buckets = buckets
+        self._children: dict[tuple, MetricsHistogramChild] = dict()
+
+    @property
+    def name(self) -> str:
+        """Get the metric name.
+
+        :return: A ``str`` value.
+        """
+        return self._name
+
+    @property
+    def label_names(self) -> tuple[str, ...]:
+        """Get the label names.
+
+        :return: A tuple of ``str`` values.
+        """
+        return self._label_names
+
+    @property
+    def buckets(self) -> tuple[float, ...]:
+        """Get the upper bounds of the finite buckets.
+
+        :return: A tuple of ``float`` values.
+        """
+        return self._buckets
+
+    def labels(self, *values: Any) -> MetricsHistogramChild:
+        """Get the histogram identified by the given label values.
+
+        The returned instance can be stored to avoid the lookup on the hot paths.
+
+        :param values: The label values, in the same order as the label names.
+        :return: A ``MetricsHistogramChild`` instance.
+        """
+        try:
+            return self._children[values]
+        except KeyError:
+            pass
+        if len(values) != len(self._label_names):
+            raise ValueError(f"Expected {len(self._label_names)} label values. Obtained: {values!r}")
+        child = self._children[values] = MetricsHistogramChild(self._buckets)
+        return child
+
+    def observe(self, value: float) -> None:
+        """Observe a value on the unlabeled histogram.
+
+        :param value: The observed value.
+        :return: This method does not return anything.
+        """
+        self.labels().observe(value)
+
+    def render(self) -> Iterable[str]:
+        """Render the histogram in the Prometheus text format.
+
+        :return: An iterable of lines.
+        """
+        yield f"# HELP {self._name} {_escape_help(self._documentation)}"
+        yield f"# TYPE {self._name} histogram"
+        bounds = [_format_value(bucket) for bucket in self._buckets] + ["+Inf"]
+        for values, child in tuple(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, tuple(child.counts)):
+                cumulative += count
+                labels = _format_labels(self._label_names + ("le",), values + (bound,))
+                yield f"{self._name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self._label_names, values)
+            yield f"{self._name}_sum{labels} {_format_value(child.sum)}"
+            yield f"{self._name}_count{labels} {child.count}"
+
+
+class MetricsHistogramChild:
+    """Metrics Histogram Child class."""
+
+    __slots__ = "_buckets", "counts", "sum", "count"
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self._buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Observe a value.
+
+        :param value: The observed value.
+        :return: This method does not return anything.
+        """
+        self.counts[bisect_left(self._buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Metrics Registry class.
+
+    Stores the counters and histograms updated by the hot paths, together with the collectors that provide the
+    gauges computed on demand (like queue depths), and renders all of them in the Prometheus text exposition format.
+
+    The updates are plain attribute increments performed from the event loop, so they do not need any lock.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Union[MetricsCounter, MetricsHistogram]] = dict()
+        self._collectors: list[MetricsCollector] = list()
+
+    def counter(self, name: str, documentation: str, labels: Iterable[str] = tuple()) -> MetricsCounter:
+        """Get or create a counter.
+
+        :param name: The metric name.
+        :param documentation: The metric description.
+        :param labels: The label names.
+        :return: A ``MetricsCounter`` instance.
+        """
+        return self._get_or_create(MetricsCounter, name, documentation, labels)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: Iterable[str] = tuple(),
+        buckets: Optional[Iterable[float]] = None,
+    ) -> MetricsHistogram:
+        """Get or create a histogram.
+
+        :param name: The metric name.
+        :param documentation: The metric description.
+        :param labels: The label names.
+        :param buckets: The upper bounds of the buckets. If not provided, latency-oriented ones are used.
+        :return: A ``MetricsHistogram`` instance.
+        """
+        return self._get_or_create(MetricsHistogram, name, documentation, labels, buckets=buckets)
+
+    def _get_or_create(self, cls: type, name: str, documentation: str, labels: Iterable[str], **kwargs) -> Any:
+        labels = tuple(labels)
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, documentation, labels, **kwargs)
+        elif not isinstance(metric, cls) or metric.label_names != labels:
+            raise ValueError(f"The {name!r} metric is already registered with a different definition: {metric!r}")
+        return metric
+
+    @property
+    def metrics(self) -> dict[str, Union[MetricsCounter, MetricsHistogram]]:
+        """Get the registered counters and histograms.
+
+        :return: A dictionary in which keys are names and values are metrics.
+        """
+        return self._metrics
+
+    def register_collector(self, collector: MetricsCollector) -> None:
+        """Register a collector.
+
+        The collectors are called on every render and return (or resolve to) an iterable of
+        ``(name, labels, value)`` samples, that are exposed as gauges.
+
+        :param collector: The collector function.
+        :return: This method does not return anything.
+        """
+        self._collectors.append(collector)
+
+    def unregister_collector(self, collector: MetricsCollector) -> None:
+        """Unregister a collector.
+
+        :param collector: The collector function.
+        :return: This method does not return anything.
+        """
+        self._collectors.remove(collector)
+
+    async def collect(self) -> list[MetricsSample]:
+        """Call the collectors.
+
+        The collectors that fail are skipped, so that one of them cannot break the whole exposition.
+
+        :return: A list of ``(name, labels, value)`` samples.
+        """
+        samples = list()
+        for collector in tuple(self._collectors):
+            try:
+                result = collector()
+                if isawaitable(result):
+                    result = await result
+                samples.extend(result)
+            except Exception as exc:
+                logger.warning(f"Raised an exception while collecting metrics from {collector!r}: {exc!r}")
+        return samples
+
+    async def render(self) -> str:
+        """Render the metrics in the Prometheus text exposition format.
+
+        :return: A ``str`` value.
+        """
+        lines = list()
+        for metric in tuple(self._metrics.values()):
+            lines.extend(metric.render())
+
+        gauges: dict[str, list[str]] = dict()
+        for name, labels, value in await self.collect():
+            formatted = _format_labels(tuple(labels.keys()), tuple(labels.values()))
+            gauges.setdefault(name, list()).append(f"{name}{formatted} {_format_value(value)}")
+        for name, samples in gauges.items():
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(samples)
+
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[Any, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape_label(value)}"' for name, value in zip(names, values))
+    return f"{{{pairs}}}"
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _escape_help(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n")
+
+
+def _format_value(value: Union[int, float]) -> str:
+    if isinstance(value, bool):
+        value = int(value)
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+_METRICS_REGISTRY: Optional[MetricsRegistry] = None
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get the process-wide metrics registry, building it on the first call.
+
+    :return: A ``MetricsRegistry`` instance.
+    """
+    global _METRICS_REGISTRY
+    if _METRICS_REGISTRY is None:
+        _METRICS_REGISTRY = MetricsRegistry()
+    return _METRICS_REGISTRY
+
+
+def set_metrics_registry(registry: Optional[MetricsRegistry]) -> None:
+    """Set the process-wide metrics registry.
+
+    The components get their metrics when they are built, so the registry must be set before building them.
+
+    :param registry: The new registry. If ``None`` is provided, a new one will be built on the next access.
+    :return: This method does not return anything.
+    """
+    global _METRICS_REGISTRY
+    _METRICS_REGISTRY = registry
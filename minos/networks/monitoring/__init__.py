@@ -0,0 +1,16 @@
+from .monitors import (
+    EventLoopMonitor,
+    EventLoopStall,
+    get_task_label,
+    reset_task_label,
+    set_task_label,
+)
+from .profilers import (
+    HandlerProfile,
+    HandlerProfiler,
+    get_handler_profiler,
+    set_handler_profiler,
+)
+from .services import (
+    EventLoopMonitorService,
+)
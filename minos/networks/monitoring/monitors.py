@@ -0,0 +1,291 @@
+from __future__ import (
+    annotations,
+)
+
+import logging
+import sys
+import threading
+import time
+import traceback
+from asyncio import (
+    AbstractEventLoop,
+    CancelledError,
+    Task,
+    create_task,
+    current_task,
+    get_running_loop,
+    sleep,
+)
+from typing import (
+    Optional,
+)
+from weakref import (
+    WeakKeyDictionary,
+)
+
+from minos.common import (
+    MinosConfig,
+    MinosSetup,
+)
+
+from ..metrics import (
+    get_metrics_registry,
+)
+from ..utils import (
+    get_config_value,
+)
+
+logger = logging.getLogger(__name__)
+
+_TASK_LABELS: WeakKeyDictionary[Task, str] = WeakKeyDictionary()
+
+
+def set_task_label(label: str) -> Optional[str]:
+    """Set the label of the current task, so that the event loop stalls can be attributed to it.
+
+    :param label: The label, like the route or the topic that is being handled.
+    :return: The previous label of the task, that must be restored later with ``reset_task_label``.
+    """
+    task = current_task()
+    if task is None:
+        return None
+    previous = _TASK_LABELS.get(task)
+    _TASK_LABELS[task] = label
+    return previous
+
+
+def reset_task_label(previous: Optional[str]) -> None:
+    """Restore the previous label of the current task.
+
+    :param previous: The value returned by ``set_task_label``.
+    :return: This method does not return anything.
+    """
+    task = current_task()
+    if task is None:
+        return
+    if previous is None:
+        _TASK_LABELS.pop(task, None)
+    else:
+        _TASK_LABELS[task] = previous
+
+
+def get_task_label(task: Optional[Task]) -> Optional[str]:
+    """Get the label of the given task.
+
+    :param task: The task.
+    :return: A ``str`` value or ``None`` if the task is not labeled.
+    """
+    if task is None:
+        return None
+    return _TASK_LABELS.get(task)
+
+
+class EventLoopStall:
+    """Event Loop Stall class.
+
+    Describes what the event loop was running while it was blocked.
+    """
+
+    __slots__ = "label", "task", "stack"
+
+    def __init__(self, label: Optional[str] = None, task: Optional[str] = None, stack: Optional[str] = None):
+        self.label = label
+        self.task = task
+        self.stack = stack
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(label={self.label!r}, task={self.task!r})"
+
+
+class EventLoopMonitor(MinosSetup):
+    """Event Loop Monitor class.
+
+    Measures the event loop lag continuously, by sleeping ``interval`` seconds and checking how late the wake up is.
+    Additionally, a watchdog thread checks if the loop has stopped responding for more than ``threshold`` seconds, and
+    in that case it captures the stack of the loop thread and the label of the running task (the route, topic or
+    periodic task set with ``set_task_label``), so that the blocking code can be found.
+
+    The lag is exposed with the ``minos_event_loop_lag_seconds`` histogram and the stalls with the
+    ``minos_event_loop_stalls_total`` counter. The stalls are also logged, but at most once every ``log_interval``
+    seconds, summarizing the suppressed ones.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        threshold: float = 0.25,
+        log_interval: float = 10.0,
+        stack_limit: int = 20,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        if interval <= 0:
+            raise ValueError(f"The 'interval' value must be greater than zero. Obtained: {interval!r}")
+
+        self._interval = interval
+        self._threshold = threshold
+        self._log_interval = log_interval
+        self._stack_limit = stack_limit
+
+        self._loop: Optional[AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+        self._heartbeat = time.monotonic()
+        self._pending: Optional[EventLoopStall] = None
+
+        self._lag = 0.0
+        self._max_lag = 0.0
+        self._stalls = 0
+        self._suppressed = 0
+        self._last_log: Optional[float] = None
+        self._last_stall: Optional[EventLoopStall] = None
+
+        registry = get_metrics_registry()
+        self._lag_histogram = registry.histogram("minos_event_loop_lag_seconds", "Lag of the event loop.")
+        self._stalls_counter = registry.counter(
+            "minos_event_loop_stalls_total", "Number of times the event loop has been blocked.", ("label",)
+        )
+
+    @classmethod
+    def _from_config(cls, config: MinosConfig, **kwargs) -> EventLoopMonitor:
+        for name in ("interval", "threshold", "log_interval", "stack_limit"):
+            if name not in kwargs:
+                value = get_config_value(config, f"loop.monitor.{name}")
+                if value is not None:
+                    kwargs[name] = value
+        return cls(**kwargs)
+
+    @property
+    def threshold(self) -> float:
+        """Get the minimum lag considered a stall, in seconds.
+
+        :return: A ``float`` value.
+        """
+        return self._threshold
+
+    @property
+    def lag(self) -> float:
+        """Get the last measured lag, in seconds.
+
+        :return: A ``float`` value.
+        """
+        return self._lag
+
+    @property
+    def last_stall(self) -> Optional[EventLoopStall]:
+        """Get the last detected stall.
+
+        :return: An ``EventLoopStall`` instance or ``None`` if there is not any.
+        """
+        return self._last_stall
+
+    @property
+    def started(self) -> bool:
+        """Check if the monitor is running.
+
+        :return: ``True`` if it is running or ``False`` otherwise.
+        """
+        return self._task is not None
+
+    @property
+    def metrics(self) -> dict[str, float]:
+        """Get the monitor metrics.
+
+        :return: A dictionary in which keys are metric names and values are numbers.
+        """
+        return {"lag": self._lag, "max_lag": self._max_lag, "stalls": self._stalls}
+
+    async def start(self) -> None:
+        """Start monitoring the running event loop.
+
+        :return: This method does not return anything.
+        """
+        if self._task is not None:
+            return
+
+        self._loop = get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopping.clear()
+
+        self._task = create_task(self._measure())
+        self._watchdog = threading.Thread(target=self._watch, name="minos-loop-monitor", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stop monitoring.
+
+        :return: This method does not return anything.
+        """
+        if self._task is None:
+            return
+
+        self._stopping.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except CancelledError:
+            pass
+        self._task = None
+
+        await get_running_loop().run_in_executor(None, self._watchdog.join)
+        self._watchdog = None
+
+    async def _measure(self) -> None:
+        while True:
+            start = self._loop.time()
+            await sleep(self._interval)
+            lag = max(0.0, self._loop.time() - start - self._interval)
+            self._heartbeat = time.monotonic()
+            self._on_lag(lag)
+
+    def _on_lag(self, lag: float) -> None:
+        self._lag = lag
+        self._max_lag = max(self._max_lag, lag)
+        self._lag_histogram.observe(lag)
+
+        stall, self._pending = self._pending, None
+        if stall is None and lag >= self._threshold:
+            # The stall was shorter than the watchdog period, so it could not be captured while it was happening.
+            stall = EventLoopStall()
+        if stall is not None:
+            self._report(stall, lag)
+
+    def _watch(self) -> None:
+        period = min(self._interval, self._threshold) / 2
+        while not self._stopping.wait(period):
+            blocked = time.monotonic() - self._heartbeat - self._interval
+            if blocked >= self._threshold and self._pending is None:
+                self._pending = self._capture()
+
+    def _capture(self) -> EventLoopStall:
+        task = current_task(self._loop)
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame, limit=self._stack_limit)) if frame is not None else None
+        return EventLoopStall(get_task_label(task), task.get_name() if task is not None else None, stack)
+
+    def _report(self, stall: EventLoopStall, lag: float) -> None:
+        self._stalls += 1
+        self._last_stall = stall
+        self._stalls_counter.labels(stall.label or "unknown").inc()
+
+        now = time.monotonic()
+        if self._last_log is not None and now - self._last_log < self._log_interval:
+            self._suppressed += 1
+            return
+
+        suppressed, self._suppressed, self._last_log = self._suppressed, 0, now
+        message = f"The event loop was blocked for {lag:.3f}s while running {stall.label or 'an unknown task'!r}"
+        if stall.task is not None:
+            message += f" (task {stall.task!r})"
+        if suppressed:
+            message += f". {suppressed} more stalls were detected since the last report"
+        if stall.stack is not None:
+            message += f":\n{stall.stack}"
+        logger.warning(message)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(interval={self._interval!r}, threshold={self._threshold!r})"
@@ -0,0 +1,354 @@
+from __future__ import (
+    annotations,
+)
+
+import cProfile
+import hmac
+import io
+import logging
+import marshal
+import pstats
+import random
+import threading
+from asyncio import (
+    iscoroutinefunction,
+)
+from collections.abc import (
+    Awaitable,
+    Callable,
+    Coroutine,
+    Generator,
+)
+from functools import (
+    wraps,
+)
+from inspect import (
+    isasyncgenfunction,
+)
+from typing import (
+    Any,
+    Optional,
+)
+
+from minos.common import (
+    MinosConfig,
+)
+
+from ..utils import (
+    get_config_value,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class HandlerProfile:
+    """Handler Profile class.
+
+    Aggregates the ``cProfile`` statistics of the sampled invocations of one route or topic.
+    """
+
+    def __init__(self, target: str, sample_rate: float = 1.0):
+        if not 0 < sample_rate <= 1:
+            raise ValueError(f"The 'sample_rate' value must be in the (0, 1] interval. Obtained: {sample_rate!r}")
+
+        self._target = target
+        self._sample_rate = sample_rate
+        self._calls = 0
+        self._sampled = 0
+        self._stats: Optional[pstats.Stats] = None
+        self._lock = threading.Lock()
+
+    @property
+    def target(self) -> str:
+        """Get the profiled route or topic.
+
+        :return: A ``str`` value.
+        """
+        return self._target
+
+    @property
+    def sample_rate(self) -> float:
+        """Get the fraction of invocations that are profiled.
+
+        :return: A ``float`` value.
+        """
+        return self._sample_rate
+
+    @property
+    def calls(self) -> int:
+        """Get the number of invocations since the profiling was enabled.
+
+        :return: An integer value.
+        """
+        return self._calls
+
+    @property
+    def sampled(self) -> int:
+        """Get the number of profiled invocations.
+
+        :return: An integer value.
+        """
+        return self._sampled
+
+    def should_sample(self) -> bool:
+        """Decide if the next invocation must be profiled, according to the sample rate.
+
+        :return: ``True`` if it must be profiled or ``False`` otherwise.
+        """
+        self._calls += 1
+        return self._sample_rate >= 1 or random.random() < self._sample_rate
+
+    def add(self, profile: cProfile.Profile) -> None:
+        """Add the statistics of a profiled invocation.
+
+        :param profile: The ``cProfile.Profile`` of the invocation.
+        :return: This method does not return anything.
+        """
+        profile.create_stats()
+        with self._lock:
+            self._sampled += 1
+            if not profile.stats:
+                return
+            if self._stats is None:
+                self._stats = pstats.Stats(profile)
+            else:
+                self._stats.add(profile)
+
+    def dump(self) -> bytes:
+        """Get the aggregated statistics in the binary ``pstats`` format, as written by ``cProfile.Profile.dump_stats``.
+
+        :return: A ``bytes`` value.
+        """
+        with self._lock:
+            stats = dict() if self._stats is None else self._stats.stats
+            return marshal.dumps(stats)
+
+    def render(self, sort: str = "cumulative", limit: int = 50) -> str:
+        """Get the aggregated statistics as a human-readable table.
+
+        :param sort: The ``pstats`` sort key.
+        :param limit: The maximum number of functions to be included.
+        :return: A ``str`` value.
+        """
+        stream = io.StringIO()
+        with self._lock:
+            stream.write(f"{self._target!r}: {self._sampled} sampled of {self._calls} calls.\n")
+            if self._stats is not None:
+                self._stats.stream = stream
+                self._stats.sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(target={self._target!r}, sample_rate={self._sample_rate!r})"
+
+
+class HandlerProfiler:
+    """Handler Profiler class.
+
+    Profiles on demand the handling functions of the chosen routes (like ``"GET /orders"``) or topics (like
+    ``"AddOrder"``) with ``cProfile``, sampling a fraction of their invocations and aggregating the results.
+
+    The handling functions are wrapped only if the profiler is enabled, so that there is no overhead otherwise. Once
+    wrapped, the targets can be enabled and disabled at runtime and the wrappers only check if their target is active.
+    The coroutines are profiled step by step, so the other tasks running on the event loop while the handler is waiting
+    are not included on its statistics.
+    """
+
+    def __init__(self, enabled: bool = False, token: Optional[str] = None):
+        self._enabled = enabled
+        self._token = token
+        self._profiles: dict[str, HandlerProfile] = dict()
+        self._active = threading.local()
+
+    @classmethod
+    def from_config(cls, config: MinosConfig, **kwargs) -> HandlerProfiler:
+        """Build a new instance from config.
+
+        :param config: The config instance.
+        :param kwargs: Additional named arguments.
+        :return: A ``HandlerProfiler`` instance.
+        """
+        for name in ("enabled", "token"):
+            if name not in kwargs:
+                value = get_config_value(config, f"profiling.{name}")
+                if value is not None:
+                    kwargs[name] = value
+        return cls(**kwargs)
+
+    @property
+    def enabled(self) -> bool:
+        """Check if the handling functions must be wrapped to be profiled.
+
+        :return: ``True`` if they must be wrapped or ``False`` otherwise.
+        """
+        return self._enabled
+
+    @property
+    def protected(self) -> bool:
+        """Check if a token has been set to protect the access to the profiling results.
+
+        :return: ``True`` if it has been set or ``False`` otherwise.
+        """
+        return self._token is not None
+
+    @property
+    def profiles(self) -> dict[str, HandlerProfile]:
+        """Get the profiles of the active targets.
+
+        :return: A dictionary in which keys are targets and values are ``HandlerProfile`` instances.
+        """
+        return dict(self._profiles)
+
+    def check_token(self, token: Optional[str]) -> bool:
+        """Check if the given token grants access to the profiling results.
+
+        :param token: The token to be checked.
+        :return: ``True`` if the access is granted or ``False`` otherwise.
+        """
+        if self._token is None or token is None:
+            return False
+        return hmac.compare_digest(self._token.encode(), token.encode())
+
+    def start(self, target: str, sample_rate: float = 1.0) -> HandlerProfile:
+        """Start profiling the given target, discarding its previous results.
+
+        :param target: The route (like ``"GET /orders"``) or topic to be profiled.
+        :param sample_rate: The fraction of invocations that are profiled.
+        :return: The new ``HandlerProfile`` instance.
+        """
+        if not self._enabled:
+            logger.warning(f"Started profiling {target!r} but the handling functions are not wrapped.")
+        profile = self._profiles[target] = HandlerProfile(target, sample_rate)
+        return profile
+
+    def stop(self, target: str) -> Optional[HandlerProfile]:
+        """Stop profiling the given target.
+
+        :param target: The profiled route or topic.
+        :return: The ``HandlerProfile`` instance containing the results or ``None`` if it was not being profiled.
+        """
+        return self._profiles.pop(target, None)
+
+    def get_profile(self, target: str) -> Optional[HandlerProfile]:
+        """Get the profile of the given target.
+
+        :param target: The profiled route or topic.
+        :return: A ``HandlerProfile`` instance or ``None`` if it is not being profiled.
+        """
+        return self._profiles.get(target)
+
+    def wrap(self, target: str, fn: Callable) -> Callable:
+        """Wrap the given handling function, so that it can be profiled.
+
+        :param target: The route or topic handled by the function.
+        :param fn: The handling function.
+        :return: The wrapped function if the profiler is enabled or the same function otherwise.
+        """
+        if not self._enabled or isasyncgenfunction(fn):
+            return fn
+
+        profiles = self._profiles
+
+        if iscoroutinefunction(fn):
+
+            @wraps(fn)
+            async def _wrapper(*args, **kwargs) -> Any:
+                profile = profiles.get(target)
+                if profile is None or not profile.should_sample():
+                    return await fn(*args, **kwargs)
+                return await _ProfiledCoroutine(fn(*args, **kwargs), profile, self._active)
+
+        else:
+
+            @wraps(fn)
+            def _wrapper(*args, **kwargs) -> Any:
+                profile = profiles.get(target)
+                if profile is None or not profile.should_sample():
+                    return fn(*args, **kwargs)
+                return self._call(fn, args, kwargs, profile)
+
+        return _wrapper
+
+    def _call(self, fn: Callable, args: tuple, kwargs: dict, profile: HandlerProfile) -> Any:
+        if getattr(self._active, "value", False):
+            return fn(*args, **kwargs)
+
+        raw = cProfile.Profile()
+        self._active.value = True
+        raw.enable()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            raw.disable()
+            self._active.value = False
+            profile.add(raw)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(enabled={self._enabled!r}, targets={list(self._profiles)!r})"
+
+
+class _ProfiledCoroutine(Awaitable):
+    def __init__(self, coro: Coroutine, profile: HandlerProfile, active: threading.local):
+        self._coro = coro
+        self._profile = profile
+        self._active = active
+
+    def __await__(self) -> Generator[Any, Any, Any]:
+        raw = cProfile.Profile()
+        value, exc = None, None
+        try:
+            while True:
+                # Another profiled invocation is nested on this step, so the outer one keeps the profiler.
+                nested = getattr(self._active, "value", False)
+                if not nested:
+                    self._active.value = True
+                    raw.enable()
+                try:
+                    if exc is None:
+                        yielded = self._coro.send(value)
+                    else:
+                        yielded = self._coro.throw(exc)
+                except StopIteration as stop:
+                    return stop.value
+                finally:
+                    if not nested:
+                        raw.disable()
+                        self._active.value = False
+
+                try:
+                    value, exc = (yield yielded), None
+                except BaseException as error:
+                    value, exc = None, error
+        finally:
+            self._coro.close()
+            self._profile.add(raw)
+
+
+_HANDLER_PROFILER: Optional[HandlerProfiler] = None
+
+
+def get_handler_profiler(config: Optional[MinosConfig] = None) -> HandlerProfiler:
+    """Get the process-wide handler profiler, building it on the first call.
+
+    :param config: Optional config instance used to build the profiler if it does not exist yet.
+    :return: A ``HandlerProfiler`` instance.
+    """
+    global _HANDLER_PROFILER
+    if _HANDLER_PROFILER is None:
+        if config is not None:
+            _HANDLER_PROFILER = HandlerProfiler.from_config(config)
+        else:
+            _HANDLER_PROFILER = HandlerProfiler()
+    return _HANDLER_PROFILER
+
+
+def set_handler_profiler(profiler: Optional[HandlerProfiler]) -> None:
+    """Set the process-wide handler profiler.
+
+    The handling functions are wrapped when they are built, so the profiler must be set before building them.
+
+    :param profiler: The new profiler. If ``None`` is provided, a default one will be built on the next access.
+    :return: This method does not return anything.
+    """
+    global _HANDLER_PROFILER
+    _HANDLER_PROFILER = profiler
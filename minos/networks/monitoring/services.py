@@ -0,0 +1,53 @@
+import logging
+
+from aiomisc import (
+    Service,
+)
+from cached_property import (
+    cached_property,
+)
+
+from .monitors import (
+    EventLoopMonitor,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopMonitorService(Service):
+    """Event Loop Monitor Service class."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._init_kwargs = kwargs
+
+    async def start(self) -> None:
+        """Start the service execution.
+
+        :return: This method does not return anything.
+        """
+        await self.monitor.setup()
+
+        try:
+            self.start_event.set()
+        except RuntimeError:
+            logger.warning("Runtime is not properly setup.")
+
+        await self.monitor.start()
+
+    async def stop(self, exception: Exception = None) -> None:
+        """Stop the service execution.
+
+        :param exception: Optional exception that stopped the execution.
+        :return: This method does not return anything.
+        """
+        await self.monitor.stop()
+        await self.monitor.destroy()
+
+    @cached_property
+    def monitor(self) -> EventLoopMonitor:
+        """Get the service monitor.
+
+        :return: A ``EventLoopMonitor`` instance.
+        """
+        return EventLoopMonitor.from_config(**self._init_kwargs)
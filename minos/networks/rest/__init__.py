@@ -1,11 +1,32 @@
+from .caches import (
+    RestCacheEntry,
+    RestCachePolicy,
+    RestResponseCache,
+)
+from .compressors import (
+    RestCompressor,
+)
 from .handlers import (
     RestHandler,
 )
+from .limiters import (
+    RestAdmissionController,
+    RestConcurrencyLimiter,
+)
+from .logs import (
+    RestAccessLogger,
+)
 from .requests import (
     RestRequest,
     RestResponse,
     RestResponseException,
 )
+from .serializers import (
+    AvroRestSerializer,
+    JsonRestSerializer,
+    NdJsonRestSerializer,
+    RestSerializer,
+)
 from .services import (
     RestService,
 )
@@ -0,0 +1,337 @@
+from __future__ import (
+    annotations,
+)
+
+import hashlib
+import logging
+import time
+from collections import (
+    OrderedDict,
+    defaultdict,
+)
+from collections.abc import (
+    Iterable,
+)
+from typing import (
+    Any,
+    Optional,
+)
+from weakref import (
+    WeakKeyDictionary,
+)
+
+from aiohttp import (
+    web,
+)
+
+from minos.common import (
+    MinosConfig,
+)
+
+from ..brokers import (
+    add_topic_hook,
+)
+from ..decorators import (
+    RestQueryEnrouteDecorator,
+)
+from ..utils import (
+    get_config_value,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RestCachePolicy:
+    """Rest Cache Policy class.
+
+    Defines how the responses of a route are cached.
+
+    The cached responses are returned before calling the handler, so the middleware that wraps it (for example, the
+    authentication or permission checks) is not executed on the hits. Hence, the ``headers`` that identify the caller
+    (for example, ``Authorization``) must be listed to cache the responses of the routes wrapped by middleware.
+    """
+
+    __slots__ = "url", "method", "ttl", "headers", "invalidation_topics"
+
+    def __init__(
+        self,
+        url: str,
+        method: str,
+        ttl: float,
+        headers: Iterable[str] = tuple(),
+        invalidation_topics: Iterable[str] = tuple(),
+    ):
+        if ttl <= 0:
+            raise ValueError(f"The 'ttl' value must be greater than zero. Obtained: {ttl!r}")
+        self.url = url
+        self.method = method
+        self.ttl = ttl
+        self.headers = tuple(headers)
+        self.invalidation_topics = frozenset(invalidation_topics)
+
+    @classmethod
+    def from_decorator(cls, decorator: RestQueryEnrouteDecorator) -> Optional[RestCachePolicy]:
+        """Build a new instance from a query decorator.
+
+        :param decorator: The query decorator.
+        :return: A ``RestCachePolicy`` instance or ``None`` if the decorator does not enable the cache.
+        """
+        if decorator.cache_ttl is None:
+            return None
+        return cls(
+            decorator.url,
+            decorator.method,
+            decorator.cache_ttl,
+            decorator.cache_headers,
+            decorator.cache_invalidation_topics,
+        )
+
+    def build_key(self, request: web.Request, content_type: str) -> tuple:
+        """Build the cache key of the given request.
+
+        The key is composed by the route, the url (including the query params), the user, the content type of the
+        response and the selected headers.
+
+        :param request: The ``aiohttp`` request.
+        :param content_type: The content type of the response.
+        :return: A ``tuple`` value.
+        """
+        headers = request.headers
+        return (
+            self.url,
+            self.method,
+            request.path_qs,
+            headers.get("User"),
+            content_type,
+            *(headers.get(name) for name in self.headers),
+        )
+
+    def __eq__(self, other: Any) -> bool:
+        return type(self) == type(other) and tuple(self) == tuple(other)
+
+    def __hash__(self) -> int:
+        return hash(tuple(self))
+
+    def __iter__(self) -> Iterable:
+        yield from (self.url, self.method, self.ttl, self.headers, self.invalidation_topics)
+
+    def __repr__(self) -> str:
+        args = ", ".join(map(repr, self))
+        return f"{type(self).__name__}({args})"
+
+
+class RestCacheEntry:
+    """Rest Cache Entry class."""
+
+    __slots__ = "body", "content_type", "etag", "expires_at", "encoded"
+
+    def __init__(self, body: Optional[bytes], content_type: str, expires_at: float):
+        self.body = body
+        self.content_type = content_type
+        self.etag = f'"{hashlib.blake2b(body or bytes(), digest_size=16).hexdigest()}"'
+        self.expires_at = expires_at
+        self.encoded: dict[str, bytes] = dict()
+
+    def build_response(self, request: web.Request) -> web.Response:
+        """Build the ``aiohttp`` response for the given request.
+
+        If the request contains a matching ``If-None-Match`` header, a ``304 Not Modified`` response is returned.
+
+        :param request: The ``aiohttp`` request.
+        :return: A ``web.Response`` instance.
+        """
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match is not None and self._match(if_none_match):
+            return web.Response(status=304, headers={"ETag": self.etag})
+
+        return web.Response(body=self.body, content_type=self.content_type, headers={"ETag": self.etag})
+
+    def _match(self, if_none_match: str) -> bool:
+        if if_none_match.strip() == "*":
+            return True
+        for etag in if_none_match.split(","):
+            etag = etag.strip()
+            if etag.startswith("W/"):
+                etag = etag[2:]
+            if etag == self.etag:
+                return True
+        return False
+
+
+class RestResponseCache:
+    """Rest Response Cache class.
+
+    Stores the serialized responses of the cached query routes in a bounded in-memory store with LRU eviction and
+    per-route expiration times.
+
+    The routes are also invalidated when a message of any of their ``invalidation_topics`` is handled. The invalidation
+    is triggered (through a topic hook) by the ``BrokerHandler`` of the same process once the message is dispatched, so
+    only the topics that are handled by the service (that is, the ones that have a broker handling function) invalidate
+    the cache.
+    """
+
+    _INVALIDATION_REGISTRY: dict[str, WeakKeyDictionary[RestResponseCache, set[tuple[str, str]]]] = defaultdict(
+        WeakKeyDictionary
+    )
+
+    def __init__(self, policies: Iterable[RestCachePolicy] = tuple(), max_size: int = 1024):
+        if max_size < 1:
+            raise ValueError(f"The 'max_size' value must be greater than zero. Obtained: {max_size!r}")
+        self._max_size = max_size
+        self._entries: OrderedDict[tuple, RestCacheEntry] = OrderedDict()
+        self._policies: dict[tuple[str, str], RestCachePolicy] = dict()
+
+        self._hits = 0
+        self._misses = 0
+
+        for policy in policies:
+            self.add_policy(policy)
+
+    @classmethod
+    def from_config(
+        cls, config: MinosConfig, decorators: Iterable[Any], middleware: Iterable[Any] = tuple(), **kwargs
+    ) -> RestResponseCache:
+        """Build a new instance from config.
+
+        :param config: The config instance.
+        :param decorators: The rest decorators. The query decorators with ``cache_ttl`` are cached.
+        :param middleware: The middleware functions that wrap the handlers. If any is provided, only the routes whose
+            policy lists the ``headers`` that identify the caller are cached, as the middleware is skipped on the hits.
+        :param kwargs: Additional named arguments.
+        :return: A ``RestResponseCache`` instance.
+        """
+        middleware = tuple(middleware)
+        if "max_size" not in kwargs:
+            kwargs["max_size"] = get_config_value(config, "rest.cache.max_size", 1024)
+
+        policies = list()
+        for decorator in decorators:
+            if not isinstance(decorator, RestQueryEnrouteDecorator):
+                continue
+            policy = RestCachePolicy.from_decorator(decorator)
+            if policy is None:
+                continue
+            if middleware and not policy.headers:
+                logger.warning(
+                    f"The {policy.method} {policy.url} responses are not cached: the route is wrapped by middleware, "
+                    f"so the cache policy must list the headers that identify the caller."
+                )
+                continue
+            policies.append(policy)
+
+        return cls(policies, **kwargs)
+
+    @property
+    def max_size(self) -> int:
+        """Get the maximum number of entries.
+
+        :return: An integer value.
+        """
+        return self._max_size
+
+    @property
+    def policies(self) -> dict[tuple[str, str], RestCachePolicy]:
+        """Get the cache policies indexed by ``(url, method)``.
+
+        :return: A dictionary.
+        """
+        return self._policies
+
+    def add_policy(self, policy: RestCachePolicy) -> None:
+        """Enable the cache for a route.
+
+        :param policy: The cache policy of the route.
+        :return: This method does not return anything.
+        """
+        self._policies[(policy.url, policy.method)] = policy
+        if policy.invalidation_topics:
+            add_topic_hook(self.invalidate_topic)
+        for topic in policy.invalidation_topics:
+            self._INVALIDATION_REGISTRY[topic].setdefault(self, set()).add((policy.url, policy.method))
+
+    def get_policy(self, url: str, method: str) -> Optional[RestCachePolicy]:
+        """Get the cache policy of a route.
+
+        :param url: The route url.
+        :param method: The route method.
+        :return: A ``RestCachePolicy`` instance or ``None`` if the route is not cached.
+        """
+        return self._policies.get((url, method))
+
+    def get(self, key: tuple) -> Optional[RestCacheEntry]:
+        """Get a non-expired entry.
+
+        :param key: The cache key.
+        :return: A ``RestCacheEntry`` instance or ``None`` if there is not any valid entry.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry
+
+    def set(self, key: tuple, body: Optional[bytes], content_type: str, policy: RestCachePolicy) -> RestCacheEntry:
+        """Store a new entry.
+
+        :param key: The cache key.
+        :param body: The serialized response body.
+        :param content_type: The content type of the response.
+        :param policy: The cache policy of the route.
+        :return: The stored ``RestCacheEntry`` instance.
+        """
+        entry = RestCacheEntry(body, content_type, time.monotonic() + policy.ttl)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, url: Optional[str] = None, method: Optional[str] = None) -> int:
+        """Remove the entries of a route, or all of them if no route is given.
+
+        :param url: The route url.
+        :param method: The route method. If not provided, the entries of all the methods of the url are removed.
+        :return: The number of removed entries.
+        """
+        if url is None:
+            count = len(self._entries)
+            self._entries.clear()
+            return count
+
+        keys = [key for key in self._entries if key[0] == url and (method is None or key[1] == method)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    @classmethod
+    def invalidate_topic(cls, topic: str) -> None:
+        """Invalidate the routes that are invalidated by the given topic.
+
+        :param topic: The topic name.
+        :return: This method does not return anything.
+        """
+        caches = cls._INVALIDATION_REGISTRY.get(topic)
+        if caches is None:
+            return
+        for cache, routes in tuple(caches.items()):
+            for url, method in routes:
+                cache.invalidate(url, method)
+
+    @property
+    def metrics(self) -> dict[str, int]:
+        """Get the cache metrics.
+
+        :return: A dictionary in which keys are metric names and values are numbers.
+        """
+        return {"size": len(self._entries), "hits": self._hits, "misses": self._misses}
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,213 @@
+from __future__ import (
+    annotations,
+)
+
+import gzip
+import zlib
+from collections.abc import (
+    Iterable,
+)
+from typing import (
+    Any,
+    Optional,
+)
+
+from minos.common import (
+    MinosConfig,
+)
+
+from ..decorators import (
+    RestEnrouteDecorator,
+)
+from ..executors import (
+    get_handler_executor,
+)
+from ..utils import (
+    get_config_value,
+)
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+_NEGOTIATED_MAX_SIZE = 1024
+
+
+class RestCompressor:
+    """Rest Compressor class.
+
+    Compresses the response bodies with the encoding that better fits the ``Accept-Encoding`` request header. The
+    supported encodings are ``gzip``, ``deflate`` and ``br`` (if the ``brotli`` package is installed).
+
+    The compression is opt-in: it is disabled by default and can be enabled for every route with ``enabled`` (or the
+    ``rest.compression.enabled`` config value) or for a single route with the decorator ``compress`` option.
+
+    The bodies smaller than ``min_size`` are not compressed, and the ones bigger than ``offload_size`` are compressed
+    on the handler executor's thread pool, so that they do not block the event loop.
+    """
+
+    def __init__(
+        self,
+        encodings: Optional[Iterable[str]] = None,
+        min_size: int = 1024,
+        level: int = 6,
+        brotli_quality: int = 4,
+        offload_size: int = 128 * 1024,
+        enabled: bool = False,
+        routes: Optional[dict[tuple[str, str], bool]] = None,
+    ):
+        if encodings is None:
+            encodings = ("br", "gzip", "deflate") if brotli is not None else ("gzip", "deflate")
+        encodings = tuple(encodings)
+        for encoding in encodings:
+            if encoding not in ("br", "gzip", "deflate"):
+                raise ValueError(f"The {encoding!r} encoding is not supported.")
+            if encoding == "br" and brotli is None:
+                raise ValueError("The 'brotli' package is not installed.")
+        if not 0 <= level <= 9:
+            raise ValueError(f"The 'level' value must be between 0 and 9. Obtained: {level!r}")
+        if routes is None:
+            routes = dict()
+
+        self._encodings = encodings
+        self._min_size = min_size
+        self._level = level
+        self._brotli_quality = brotli_quality
+        self._offload_size = offload_size
+        self._enabled = enabled
+        self._routes = routes
+        self._negotiated = dict()
+
+    @classmethod
+    def from_config(cls, config: MinosConfig, decorators: Iterable[Any] = tuple(), **kwargs) -> RestCompressor:
+        """Build a new instance from config.
+
+        :param config: The config instance.
+        :param decorators: The rest decorators. The ones with ``compress`` set override the default behaviour.
+        :param kwargs: Additional named arguments.
+        :return: A ``RestCompressor`` instance.
+        """
+        for name in ("encodings", "min_size", "level", "brotli_quality", "offload_size", "enabled"):
+            if name not in kwargs:
+                value = get_config_value(config, f"rest.compression.{name}")
+                if value is not None:
+                    kwargs[name] = value
+
+        if "routes" not in kwargs:
+            kwargs["routes"] = {
+                (decorator.url, decorator.method): decorator.compress
+                for decorator in decorators
+                if isinstance(decorator, RestEnrouteDecorator) and decorator.compress is not None
+            }
+
+        return cls(**kwargs)
+
+    @property
+    def encodings(self) -> tuple[str, ...]:
+        """Get the supported encodings, sorted by preference.
+
+        :return: A tuple of strings.
+        """
+        return self._encodings
+
+    @property
+    def min_size(self) -> int:
+        """Get the minimum size of the bodies to be compressed.
+
+        :return: An integer value.
+        """
+        return self._min_size
+
+    @property
+    def level(self) -> int:
+        """Get the compression level of the ``gzip`` and ``deflate`` encodings.
+
+        :return: An integer value.
+        """
+        return self._level
+
+    @property
+    def offload_size(self) -> int:
+        """Get the minimum size of the bodies to be compressed on the thread pool.
+
+        :return: An integer value.
+        """
+        return self._offload_size
+
+    def is_enabled(self, url: str, method: str) -> bool:
+        """Check if the compression is enabled for the given route.
+
+        :param url: The route url.
+        :param method: The route method.
+        :return: A boolean value.
+        """
+        return self._routes.get((url, method), self._enabled)
+
+    def negotiate(self, accept_encoding: Optional[str]) -> Optional[str]:
+        """Get the encoding that better fits the given ``Accept-Encoding`` header.
+
+        :param accept_encoding: The ``Accept-Encoding`` header value.
+        :return: The encoding name or ``None`` if the body must not be compressed.
+        """
+        if not accept_encoding:
+            return None
+
+        try:
+            return self._negotiated[accept_encoding]
+        except KeyError:
+            pass
+
+        encoding = self._negotiate(accept_encoding)
+        if len(self._negotiated) >= _NEGOTIATED_MAX_SIZE:
+            self._negotiated.pop(next(iter(self._negotiated)))
+        self._negotiated[accept_encoding] = encoding
+        return encoding
+
+    def _negotiate(self, accept_encoding: str) -> Optional[str]:
+        qualities = dict()
+        for item in accept_encoding.split(","):
+            coding, *params = item.split(";")
+            quality = 1.0
+            for param in params:
+                key, _, value = param.strip().partition("=")
+                if key == "q":
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+            qualities[coding.strip().lower()] = quality
+
+        default = qualities.get("*", 0.0)
+        best, best_quality = None, 0.0
+        for encoding in self._encodings:
+            quality = qualities.get(encoding, default)
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    async def compress(self, body: bytes, encoding: str) -> bytes:
+        """Compress the given body.
+
+        :param body: The body to be compressed.
+        :param encoding: The encoding name.
+        :return: The compressed body.
+        """
+        if len(body) >= self._offload_size:
+            return await get_handler_executor().submit(self.compress_sync, body, encoding)
+        return self.compress_sync(body, encoding)
+
+    def compress_sync(self, body: bytes, encoding: str) -> bytes:
+        """Compress the given body on the current thread.
+
+        :param body: The body to be compressed.
+        :param encoding: The encoding name.
+        :return: The compressed body.
+        """
+        if encoding == "gzip":
+            return gzip.compress(body, compresslevel=self._level, mtime=0)
+        if encoding == "deflate":
+            return zlib.compress(body, self._level)
+        if encoding == "br":
+            return brotli.compress(body, quality=self._brotli_quality)
+        raise ValueError(f"The {encoding!r} encoding is not supported.")
@@ -3,6 +3,14 @@ from __future__ import (
 )
 
 import logging
+import time
+from asyncio import (
+    CancelledError,
+)
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+)
 from functools import (
     cached_property,
     wraps,
@@ -11,6 +19,7 @@ from inspect import (
     isawaitable,
 )
 from typing import (
+    Any,
     Awaitable,
     Callable,
     Optional,
@@ -18,38 +27,123 @@ from typing import (
 )
 
 from aiohttp import (
+    hdrs,
     web,
 )
 
 from minos.common import (
     MinosConfig,
     MinosSetup,
+    import_module,
 )
 
 from ..decorators import (
-    EnrouteBuilder,
+    EnrouteRegistry,
+)
+from ..executors import (
+    get_handler_executor,
+)
+from ..metrics import (
+    get_metrics_registry,
+)
+from ..monitoring import (
+    HandlerProfile,
+    get_handler_profiler,
+    reset_task_label,
+    set_task_label,
 )
 from ..requests import (
     REQUEST_USER_CONTEXT_VAR,
     Response,
     ResponseException,
 )
+from ..utils import (
+    get_config_value,
+)
+from .caches import (
+    RestCacheEntry,
+    RestCachePolicy,
+    RestResponseCache,
+)
+from .compressors import (
+    RestCompressor,
+)
+from .limiters import (
+    RestAdmissionController,
+    RestConcurrencyLimiter,
+)
+from .logs import (
+    RestAccessLogger,
+)
 from .requests import (
     RestRequest,
     RestResponse,
 )
+from .serializers import (
+    AvroRestSerializer,
+    JsonRestSerializer,
+    NdJsonRestSerializer,
+    RestSerializer,
+)
 
 logger = logging.getLogger(__name__)
 
+_NEGOTIATED_MAX_SIZE = 1024
+
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+_STREAM_ENCODINGS = {"gzip": web.ContentCoding.gzip, "deflate": web.ContentCoding.deflate}
+
+_METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
 
 class RestHandler(MinosSetup):
-    """Rest Handler class."""
+    """Rest Handler class.
+
+    The ``/system/profiling`` routes are only mounted if ``profiling`` is ``True`` and they are protected by a token.
+    """
 
-    def __init__(self, host: str, port: int, endpoints: dict[(str, str), Callable], **kwargs):
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        endpoints: dict[(str, str), Callable],
+        serializer: Optional[RestSerializer] = None,
+        serializers: Optional[list[RestSerializer]] = None,
+        cache: Optional[RestResponseCache] = None,
+        compressor: Optional[RestCompressor] = None,
+        admission: Optional[RestAdmissionController] = None,
+        access_log: Optional[RestAccessLogger] = None,
+        profiling: bool = True,
+        **kwargs,
+    ):
         super().__init__(**kwargs)
+        if access_log is None:
+            access_log = RestAccessLogger()
+        if admission is None:
+            admission = RestAdmissionController()
+        if cache is None:
+            cache = RestResponseCache()
+        if compressor is None:
+            compressor = RestCompressor()
+        if serializer is None:
+            serializer = JsonRestSerializer()
+        if serializers is None:
+            serializers = [AvroRestSerializer(), NdJsonRestSerializer()]
+
         self._host = host
         self._port = port
         self._endpoints = endpoints
+        self._serializer = serializer
+        self._serializers = {serializer.content_type: serializer}
+        for alternative in serializers:
+            self._serializers.setdefault(alternative.content_type, alternative)
+        self._negotiated = dict()
+        self._cache = cache
+        self._compressor = compressor
+        self._admission = admission
+        self._access_log = access_log
+        self._profiling = profiling
 
     @property
     def endpoints(self) -> dict[(str, str), Callable]:
@@ -64,16 +158,171 @@ class RestHandler(MinosSetup):
         host = config.rest.host
         port = config.rest.port
         endpoints = cls._endpoints_from_config(config)
+        if "serializer" not in kwargs:
+            kwargs["serializer"] = cls._serializer_from_config(config)
+        if "serializers" not in kwargs:
+            kwargs["serializers"] = cls._serializers_from_config(config)
+        if "cache" not in kwargs:
+            kwargs["cache"] = cls._cache_from_config(config)
+        if "compressor" not in kwargs:
+            kwargs["compressor"] = cls._compressor_from_config(config)
+        if "admission" not in kwargs:
+            kwargs["admission"] = cls._admission_from_config(config)
+        if "access_log" not in kwargs:
+            kwargs["access_log"] = RestAccessLogger.from_config(config)
 
         return cls(host=host, port=port, endpoints=endpoints, **kwargs)
 
+    # noinspection PyUnusedLocal
     @staticmethod
     def _endpoints_from_config(config: MinosConfig, **kwargs) -> dict[(str, str), Callable]:
-        builder = EnrouteBuilder(*config.services, middleware=config.middleware)
-        decorators = builder.get_rest_command_query(config=config, **kwargs)
+        decorators = EnrouteRegistry.from_config(config).rest_command_query
         endpoints = {(decorator.url, decorator.method): fn for decorator, fn in decorators.items()}
         return endpoints
 
+    @staticmethod
+    def _cache_from_config(config: MinosConfig) -> RestResponseCache:
+        registry = EnrouteRegistry.from_config(config)
+        return RestResponseCache.from_config(config, registry.rest_command_query.keys(), registry.middleware)
+
+    @staticmethod
+    def _compressor_from_config(config: MinosConfig) -> RestCompressor:
+        decorators = EnrouteRegistry.from_config(config).rest_command_query
+        return RestCompressor.from_config(config, decorators.keys())
+
+    @staticmethod
+    def _admission_from_config(config: MinosConfig) -> RestAdmissionController:
+        decorators = EnrouteRegistry.from_config(config).rest_command_query
+        return RestAdmissionController.from_config(config, decorators.keys())
+
+    @classmethod
+    def _serializer_from_config(cls, config: MinosConfig) -> Optional[RestSerializer]:
+        serializer = get_config_value(config, "rest.serializer")
+        if serializer is None:
+            return None
+        return cls._build_serializer(serializer)
+
+    @classmethod
+    def _serializers_from_config(cls, config: MinosConfig) -> Optional[list[RestSerializer]]:
+        serializers = get_config_value(config, "rest.serializers")
+        if serializers is None:
+            return None
+        return [cls._build_serializer(serializer) for serializer in serializers]
+
+    @staticmethod
+    def _build_serializer(serializer: Union[str, type, RestSerializer]) -> RestSerializer:
+        if isinstance(serializer, str):
+            serializer = import_module(serializer)
+        if isinstance(serializer, type):
+            serializer = serializer()
+        return serializer
+
+    @property
+    def serializer(self) -> RestSerializer:
+        """Get the serializer used to build the response bodies.
+
+        :return: A ``RestSerializer`` instance.
+        """
+        return self._serializer
+
+    @property
+    def cache(self) -> RestResponseCache:
+        """Get the response cache of the query routes.
+
+        :return: A ``RestResponseCache`` instance.
+        """
+        return self._cache
+
+    @property
+    def compressor(self) -> RestCompressor:
+        """Get the compressor of the response bodies.
+
+        :return: A ``RestCompressor`` instance.
+        """
+        return self._compressor
+
+    @property
+    def admission(self) -> RestAdmissionController:
+        """Get the admission controller that limits the concurrent requests.
+
+        :return: A ``RestAdmissionController`` instance.
+        """
+        return self._admission
+
+    @property
+    def access_log(self) -> RestAccessLogger:
+        """Get the access logger of the requests.
+
+        :return: A ``RestAccessLogger`` instance.
+        """
+        return self._access_log
+
+    async def _destroy(self) -> None:
+        self._access_log.stop()
+        await super()._destroy()
+
+    @property
+    def serializers(self) -> dict[str, RestSerializer]:
+        """Get the available serializers, indexed by content type.
+
+        :return: A dictionary in which keys are content types and values are ``RestSerializer`` instances.
+        """
+        return self._serializers
+
+    def get_serializer(self, accept: Optional[str] = None) -> RestSerializer:
+        """Get the serializer that better fits the given ``Accept`` header.
+
+        The default serializer is returned if the header is not provided or if none of the available serializers is
+        acceptable.
+
+        :param accept: The ``Accept`` header value.
+        :return: A ``RestSerializer`` instance.
+        """
+        if not accept:
+            return self._serializer
+
+        try:
+            return self._negotiated[accept]
+        except KeyError:
+            pass
+
+        serializer = self._negotiate(accept)
+        if len(self._negotiated) >= _NEGOTIATED_MAX_SIZE:
+            self._negotiated.pop(next(iter(self._negotiated)))
+        self._negotiated[accept] = serializer
+        return serializer
+
+    def _negotiate(self, accept: str) -> RestSerializer:
+        for media_range in self._parse_accept(accept):
+            if media_range == "*/*":
+                return self._serializer
+            if media_range in self._serializers:
+                return self._serializers[media_range]
+            if media_range.endswith("/*"):
+                prefix = media_range[:-1]
+                for content_type, serializer in self._serializers.items():
+                    if content_type.startswith(prefix):
+                        return serializer
+        return self._serializer
+
+    @staticmethod
+    def _parse_accept(accept: str) -> list[str]:
+        media_ranges = list()
+        for position, item in enumerate(accept.split(",")):
+            media_range, *params = item.split(";")
+            quality = 1.0
+            for param in params:
+                key, _, value = param.strip().partition("=")
+                if key == "q":
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+            media_range = media_range.strip().lower()
+            if media_range and quality > 0:
+                media_ranges.append((-quality, position, media_range))
+        return [media_range for *_, media_range in sorted(media_ranges)]
+
     @property
     def host(self) -> str:
         """Get the rest host.
@@ -110,56 +359,362 @@ class RestHandler(MinosSetup):
 
         # Load default routes
         self._mount_system_health(app)
+        self._mount_system_profiling(app)
 
     def _mount_one_route(self, method: str, url: str, action: Callable, app: web.Application) -> None:
-        handler = self.get_callback(action)
-        app.router.add_route(method, url, handler)
+        handler = self.get_callback(
+            action, self._cache.get_policy(url, method), compress=self._compressor.is_enabled(url, method)
+        )
+        limiters = self._admission.get_limiters(url, method)
+        if limiters:
+            handler = self._build_limited(handler, limiters, self._admission.retry_after)
+        app.router.add_route(method, url, self._build_observed(handler, method, url))
+
+    def _build_observed(
+        self, fn: Callable[[web.Request], Awaitable[web.StreamResponse]], method: str, url: str
+    ) -> Callable[[web.Request], Awaitable[web.StreamResponse]]:
+        access_log = self._access_log
+        registry = get_metrics_registry()
+        duration = registry.histogram(
+            "minos_rest_request_duration_seconds", "Duration of the rest requests.", ("method", "route")
+        ).labels(method, url)
+        requests = registry.counter(
+            "minos_rest_requests_total", "Number of rest requests.", ("method", "route", "status")
+        )
+        label = f"{method} {url}"
+
+        @wraps(fn)
+        async def _wrapper(raw: web.Request) -> web.StreamResponse:
+            previous = set_task_label(label)
+            start = time.monotonic()
+            status, size = 500, None
+            try:
+                response = await fn(raw)
+                status, size = response.status, _get_body_size(response)
+                return response
+            except web.HTTPException as exc:
+                status = exc.status
+                raise
+            except CancelledError:
+                # The client closed the connection before the response was sent.
+                status = 499
+                raise
+            finally:
+                latency = time.monotonic() - start
+                duration.observe(latency)
+                requests.labels(method, url, status).inc()
+                access_log.log(raw, status, latency, size)
+                reset_task_label(previous)
+
+        return _wrapper
 
     @staticmethod
+    def _build_limited(
+        fn: Callable[[web.Request], Awaitable[web.StreamResponse]],
+        limiters: tuple[RestConcurrencyLimiter, ...],
+        retry_after: int,
+    ) -> Callable[[web.Request], Awaitable[web.StreamResponse]]:
+        headers = {hdrs.RETRY_AFTER: str(retry_after)}
+
+        @wraps(fn)
+        async def _wrapper(raw: web.Request) -> web.StreamResponse:
+            acquired = 0
+            try:
+                for limiter in limiters:
+                    if not await limiter.acquire():
+                        logger.debug(f"Rejected '{raw!s}' from '{raw.remote!s}': {limiter!r} is overloaded.")
+                        raise web.HTTPServiceUnavailable(headers=headers)
+                    acquired += 1
+            except BaseException:
+                for limiter in limiters[:acquired]:
+                    limiter.release()
+                raise
+
+            start = time.monotonic()
+            try:
+                return await fn(raw)
+            finally:
+                latency = time.monotonic() - start
+                for limiter in limiters:
+                    limiter.release(latency)
+
+        return _wrapper
+
     def get_callback(
-        fn: Callable[[RestRequest], Union[Optional[RestResponse], Awaitable[Optional[RestResponse]]]]
+        self,
+        fn: Callable[[RestRequest], Union[Optional[RestResponse], Awaitable[Optional[RestResponse]]]],
+        cache_policy: Optional[RestCachePolicy] = None,
+        compress: bool = False,
     ) -> Callable[[web.Request], Awaitable[web.Response]]:
         """Get the handler function to be used by the ``aiohttp`` Controller.
 
+        If the action returns an asynchronous iterable (or a ``Response`` containing one), the items are streamed
+        using a chunked ``web.StreamResponse`` instead of being serialized at once.
+
         :param fn: The action function.
+        :param cache_policy: Optional cache policy. If provided, the serialized responses are stored on the response
+            cache and revalidated with ``ETag`` and ``If-None-Match`` headers.
+        :param compress: If ``True``, the response bodies are compressed according to the ``Accept-Encoding`` header.
         :return: A wrapper function around the given one that is compatible with the ``aiohttp`` Controller.
         """
 
+        negotiate = len(self._serializers) > 1
+        cache = self._cache
+
         @wraps(fn)
-        async def _wrapper(request: web.Request) -> web.Response:
-            logger.info(f"Dispatching '{request!s}' from '{request.remote!s}'...")
+        async def _wrapper(raw: web.Request) -> web.StreamResponse:
+            serializer = self.get_serializer(raw.headers.get("Accept"))
+
+            if cache_policy is not None:
+                cache_key = cache_policy.build_key(raw, serializer.content_type)
+                entry = cache.get(cache_key)
+                if entry is not None:
+                    return await self._finish_response(raw, entry.build_response(raw), negotiate, compress, entry)
 
-            request = RestRequest(request)
+            request = RestRequest(raw)
             token = REQUEST_USER_CONTEXT_VAR.set(request.user)
 
             try:
-                response = fn(request)
-                if isawaitable(response):
-                    response = await response
-                if isinstance(response, Response):
-                    response = await response.raw_content()
-                if response is None:
-                    return web.json_response()
-                return web.json_response(response)
-            except ResponseException as exc:
-                logger.warning(f"Raised an application exception: {exc!s}")
-                raise web.HTTPBadRequest(text=str(exc))
-            except Exception as exc:
-                logger.exception(f"Raised a system exception: {exc!r}")
-                raise web.HTTPInternalServerError()
+                try:
+                    response = await get_handler_executor().run(fn, request)
+                    if isawaitable(response):
+                        response = await response
+
+                    items = await self._get_stream_items(response)
+                    if items is None:
+                        body = await serializer.serialize(response)
+                        if cache_policy is not None:
+                            entry = cache.set(cache_key, body, serializer.content_type, cache_policy)
+                            response = entry.build_response(raw)
+                        else:
+                            entry = None
+                            response = web.Response(body=body, content_type=serializer.content_type)
+                        return await self._finish_response(raw, response, negotiate, compress, entry)
+
+                    chunks = serializer.serialize_stream(items).__aiter__()
+                    try:
+                        first = await chunks.__anext__()
+                    except StopAsyncIteration:
+                        first = bytes()
+                except ResponseException as exc:
+                    logger.warning(f"Raised an application exception: {exc!s}")
+                    raise web.HTTPBadRequest(text=str(exc))
+                except Exception as exc:
+                    logger.exception(f"Raised a system exception: {exc!r}")
+                    raise web.HTTPInternalServerError()
+
+                # Once the response is prepared, the errors cannot be converted into error responses anymore, so they
+                # are propagated to let ``aiohttp`` abort the connection.
+                response = web.StreamResponse()
+                response.content_type = serializer.content_type
+                response.enable_chunked_encoding()
+                vary = ["Accept"] if negotiate else []
+                if compress:
+                    vary.append("Accept-Encoding")
+                    encoding = self._compressor.negotiate(raw.headers.get(hdrs.ACCEPT_ENCODING))
+                    if encoding in _STREAM_ENCODINGS:
+                        response.enable_compression(_STREAM_ENCODINGS[encoding])
+                if vary:
+                    response.headers["Vary"] = ", ".join(vary)
+                await response.prepare(raw)
+                await self._write_stream(response, first, chunks)
+                return response
             finally:
                 REQUEST_USER_CONTEXT_VAR.reset(token)
 
         return _wrapper
 
+    async def _finish_response(
+        self,
+        raw: web.Request,
+        response: web.Response,
+        negotiate: bool,
+        compress: bool,
+        entry: Optional[RestCacheEntry] = None,
+    ) -> web.Response:
+        vary = ["Accept"] if negotiate else []
+        if compress:
+            # The header is always set on the compressible routes, so that the caches do not mix up the encodings.
+            vary.append("Accept-Encoding")
+        if compress and response.status == 200 and response.body is not None:
+            body = response.body
+            if len(body) >= self._compressor.min_size:
+                encoding = self._compressor.negotiate(raw.headers.get(hdrs.ACCEPT_ENCODING))
+                if encoding is not None:
+                    await self._compress_response(response, body, encoding, entry)
+        if vary:
+            response.headers["Vary"] = ", ".join(vary)
+        return response
+
+    async def _compress_response(
+        self, response: web.Response, body: bytes, encoding: str, entry: Optional[RestCacheEntry]
+    ) -> None:
+        if entry is None:
+            compressed = await self._compressor.compress(body, encoding)
+        else:
+            # The cached responses are compressed only once per encoding.
+            compressed = entry.encoded.get(encoding)
+            if compressed is None:
+                compressed = entry.encoded[encoding] = await self._compressor.compress(body, encoding)
+
+        response.body = compressed
+        response.headers[hdrs.CONTENT_ENCODING] = encoding
+
+        # The compressed representation is not byte-equivalent to the original one, so the entity tag becomes weak.
+        etag = response.headers.get(hdrs.ETAG)
+        if etag is not None and not etag.startswith("W/"):
+            response.headers[hdrs.ETAG] = f"W/{etag}"
+
+    @staticmethod
+    async def _get_stream_items(response: Any) -> Optional[AsyncIterable]:
+        if isinstance(response, Response) and type(response).raw_content is Response.raw_content:
+            response = await response.content()
+        if isinstance(response, AsyncIterable):
+            return response
+        return None
+
+    @staticmethod
+    async def _write_stream(response: web.StreamResponse, first: bytes, chunks: AsyncIterator[bytes]) -> None:
+        await response.write(first)
+
+        buffer = bytearray()
+        async for chunk in chunks:
+            buffer += chunk
+            if len(buffer) >= _STREAM_CHUNK_SIZE:
+                await response.write(bytes(buffer))
+                buffer.clear()
+
+        if buffer:
+            await response.write(bytes(buffer))
+        await response.write_eof()
+
     def _mount_system_health(self, app: web.Application):
-        """Mount System Health Route."""
-        app.router.add_get("/system/health", self._system_health_handler)
+        """Mount System Health and System Metrics Routes."""
+        app.router.add_get("/system/health", self._build_observed(self._system_health_handler, "GET", "/system/health"))
+        app.router.add_get(
+            "/system/metrics", self._build_observed(self._system_metrics_handler, "GET", "/system/metrics")
+        )
 
     @staticmethod
     async def _system_health_handler(request: web.Request) -> web.Response:
         """System Health Route Handler.
         :return: A `web.json_response` response.
         """
-        logger.info(f"Dispatching '{request!s}' from '{request.remote!s}'...")
         return web.json_response({"host": request.host})
+
+    @staticmethod
+    async def _system_metrics_handler(request: web.Request) -> web.Response:
+        """System Metrics Route Handler.
+        :return: A `web.Response` containing the metrics in the Prometheus text format.
+        """
+        body = await get_metrics_registry().render()
+        return web.Response(body=body.encode(), headers={hdrs.CONTENT_TYPE: _METRICS_CONTENT_TYPE})
+
+    def _mount_system_profiling(self, app: web.Application):
+        """Mount System Profiling Routes, only if they are enabled and protected by a token."""
+        if not self._profiling or not get_handler_profiler().protected:
+            return
+
+        url = "/system/profiling"
+        for method, fn in (
+            ("GET", self._system_profiling_list_handler),
+            ("POST", self._system_profiling_start_handler),
+            ("DELETE", self._system_profiling_stop_handler),
+        ):
+            app.router.add_route(method, url, self._build_observed(_build_protected(fn), method, url))
+
+        url = "/system/profiling/stats"
+        app.router.add_get(
+            url, self._build_observed(_build_protected(self._system_profiling_stats_handler), "GET", url)
+        )
+
+    @staticmethod
+    async def _system_profiling_list_handler(request: web.Request) -> web.Response:
+        """System Profiling List Route Handler.
+        :return: A `web.json_response` response containing the profiled targets.
+        """
+        profiles = get_handler_profiler().profiles.values()
+        return web.json_response([_profile_to_json(profile) for profile in profiles])
+
+    @staticmethod
+    async def _system_profiling_start_handler(request: web.Request) -> web.Response:
+        """System Profiling Start Route Handler.
+        :return: A `web.json_response` response containing the new profiled target.
+        """
+        target = _get_profiling_target(request)
+        try:
+            sample_rate = float(request.query.get("sample_rate", 1.0))
+            profile = get_handler_profiler().start(target, sample_rate)
+        except ValueError as exc:
+            raise web.HTTPBadRequest(text=str(exc))
+        return web.json_response(_profile_to_json(profile), status=201)
+
+    @staticmethod
+    async def _system_profiling_stop_handler(request: web.Request) -> web.Response:
+        """System Profiling Stop Route Handler.
+        :return: A `web.Response` containing the final profiling results as text.
+        """
+        profile = get_handler_profiler().stop(_get_profiling_target(request))
+        if profile is None:
+            raise web.HTTPNotFound()
+        return web.Response(text=profile.render())
+
+    @staticmethod
+    async def _system_profiling_stats_handler(request: web.Request) -> web.Response:
+        """System Profiling Stats Route Handler.
+        :return: A `web.Response` containing the profiling results as text or in the binary ``pstats`` format.
+        """
+        profile = get_handler_profiler().get_profile(_get_profiling_target(request))
+        if profile is None:
+            raise web.HTTPNotFound()
+
+        if request.query.get("format") == "pstats":
+            filename = f"{profile.target.replace('/', '_').replace(' ', '')}.pstats"
+            return web.Response(
+                body=profile.dump(),
+                content_type="application/octet-stream",
+                headers={hdrs.CONTENT_DISPOSITION: f'attachment; filename="{filename}"'},
+            )
+
+        try:
+            limit = int(request.query.get("limit", 50))
+        except ValueError as exc:
+            raise web.HTTPBadRequest(text=str(exc))
+        return web.Response(text=profile.render(request.query.get("sort", "cumulative"), limit))
+
+
+def _build_protected(
+    fn: Callable[[web.Request], Awaitable[web.StreamResponse]]
+) -> Callable[[web.Request], Awaitable[web.StreamResponse]]:
+    @wraps(fn)
+    async def _wrapper(raw: web.Request) -> web.StreamResponse:
+        scheme, _, token = raw.headers.get(hdrs.AUTHORIZATION, "").partition(" ")
+        if scheme.lower() != "bearer" or not get_handler_profiler().check_token(token):
+            raise web.HTTPUnauthorized(headers={hdrs.WWW_AUTHENTICATE: "Bearer"})
+        return await fn(raw)
+
+    return _wrapper
+
+
+def _get_profiling_target(request: web.Request) -> str:
+    target = request.query.get("target")
+    if not target:
+        raise web.HTTPBadRequest(text="The 'target' query parameter is required.")
+    return target
+
+
+def _profile_to_json(profile: HandlerProfile) -> dict[str, Any]:
+    return {
+        "target": profile.target,
+        "sample_rate": profile.sample_rate,
+        "calls": profile.calls,
+        "sampled": profile.sampled,
+    }
+
+
+def _get_body_size(response: web.StreamResponse) -> Optional[int]:
+    if isinstance(response, web.Response):
+        return response.content_length
+    if response.prepared:
+        return response.body_length
+    return None
@@ -0,0 +1,280 @@
+from __future__ import (
+    annotations,
+)
+
+import math
+from asyncio import (
+    CancelledError,
+    Future,
+    TimeoutError,
+    get_running_loop,
+    wait_for,
+)
+from collections import (
+    deque,
+)
+from collections.abc import (
+    Iterable,
+)
+from typing import (
+    Any,
+    Optional,
+)
+
+from minos.common import (
+    MinosConfig,
+)
+
+from ..decorators import (
+    RestEnrouteDecorator,
+)
+from ..utils import (
+    get_config_value,
+)
+
+
+class RestConcurrencyLimiter:
+    """Rest Concurrency Limiter class.
+
+    Limits the number of requests handled concurrently. The requests that exceed the limit wait on a bounded FIFO
+    queue, and they are rejected when the queue is full or when they wait for longer than ``queue_timeout`` seconds.
+
+    If ``latency_target`` is provided, the limit is adapted with an AIMD (additive increase, multiplicative decrease)
+    strategy: it grows by one every ``limit`` requests completed on time and it is multiplied by ``backoff`` every
+    time a request is slower than the target, always between ``min_limit`` and ``max_limit``.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        max_queued: int = 0,
+        queue_timeout: Optional[float] = None,
+        latency_target: Optional[float] = None,
+        min_limit: int = 1,
+        max_limit: Optional[int] = None,
+        backoff: float = 0.9,
+    ):
+        if limit < 1:
+            raise ValueError(f"The 'limit' value must be greater than zero. Obtained: {limit!r}")
+        if max_queued < 0:
+            raise ValueError(f"The 'max_queued' value must be positive. Obtained: {max_queued!r}")
+        if not 0 < backoff < 1:
+            raise ValueError(f"The 'backoff' value must be between 0 and 1. Obtained: {backoff!r}")
+        if max_limit is None:
+            max_limit = limit if latency_target is None else limit * 10
+
+        self._limit = float(limit)
+        self._max_queued = max_queued
+        self._queue_timeout = queue_timeout
+        self._latency_target = latency_target
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._backoff = backoff
+
+        self._in_flight = 0
+        self._waiters: deque[Future] = deque()
+
+        self._accepted = 0
+        self._rejected = 0
+
+    @property
+    def limit(self) -> int:
+        """Get the current concurrency limit.
+
+        :return: An integer value.
+        """
+        return int(self._limit)
+
+    @property
+    def adaptive(self) -> bool:
+        """Check if the limit is adapted to the observed latencies.
+
+        :return: A boolean value.
+        """
+        return self._latency_target is not None
+
+    @property
+    def in_flight(self) -> int:
+        """Get the number of requests that are being handled.
+
+        :return: An integer value.
+        """
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """Get the number of requests that are waiting.
+
+        :return: An integer value.
+        """
+        return len(self._waiters)
+
+    async def acquire(self) -> bool:
+        """Acquire a slot, waiting on the queue if there is not any available.
+
+        :return: ``True`` if the slot was acquired or ``False`` if the request must be rejected.
+        """
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            self._accepted += 1
+            return True
+
+        if len(self._waiters) >= self._max_queued:
+            self._rejected += 1
+            return False
+
+        future = get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await wait_for(future, self._queue_timeout)
+        except (TimeoutError, CancelledError) as exc:
+            if future.done() and not future.cancelled():
+                # The slot was granted while giving up, so it is passed to the next waiter.
+                self.release()
+            elif future in self._waiters:
+                # Otherwise, the future could have been discarded already while waking up the waiters.
+                self._waiters.remove(future)
+            if isinstance(exc, CancelledError):
+                raise exc
+            self._rejected += 1
+            return False
+
+        self._accepted += 1
+        return True
+
+    def release(self, latency: Optional[float] = None) -> None:
+        """Release a slot.
+
+        :param latency: The handling time of the request, in seconds. It is used to adapt the limit.
+        :return: This method does not return anything.
+        """
+        self._in_flight -= 1
+        if latency is not None and self._latency_target is not None:
+            self._adapt(latency)
+        self._wake_up()
+
+    def _adapt(self, latency: float) -> None:
+        if latency > self._latency_target:
+            self._limit = max(float(self._min_limit), self._limit * self._backoff)
+        else:
+            self._limit = min(float(self._max_limit), self._limit + 1 / self._limit)
+
+    def _wake_up(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            future = self._waiters.popleft()
+            if future.done():
+                continue
+            self._in_flight += 1
+            future.set_result(None)
+
+    @property
+    def metrics(self) -> dict[str, int]:
+        """Get the limiter metrics.
+
+        :return: A dictionary in which keys are metric names and values are numbers.
+        """
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "queued": self.queued,
+            "accepted": self._accepted,
+            "rejected": self._rejected,
+        }
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(limit={self.limit!r}, max_queued={self._max_queued!r})"
+
+
+class RestAdmissionController:
+    """Rest Admission Controller class.
+
+    Provides the concurrency limiters of the rest routes: a global one, shared by all the routes, and the per-route
+    ones, defined with the ``max_concurrency`` option of the rest decorators. The rejected requests are answered with
+    ``503 Service Unavailable`` and a ``Retry-After`` header.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        routes: Optional[dict[tuple[str, str], int]] = None,
+        retry_after: float = 1,
+        **kwargs,
+    ):
+        if routes is None:
+            routes = dict()
+
+        self._kwargs = kwargs
+        self._global = self._build_limiter(max_concurrency) if max_concurrency is not None else None
+        self._routes = {route: self._build_limiter(limit) for route, limit in routes.items()}
+        self._retry_after = retry_after
+
+    def _build_limiter(self, limit: int) -> RestConcurrencyLimiter:
+        return RestConcurrencyLimiter(limit, **self._kwargs)
+
+    @classmethod
+    def from_config(cls, config: MinosConfig, decorators: Iterable[Any] = tuple(), **kwargs) -> RestAdmissionController:
+        """Build a new instance from config.
+
+        :param config: The config instance.
+        :param decorators: The rest decorators. The ones with ``max_concurrency`` are limited individually.
+        :param kwargs: Additional named arguments.
+        :return: A ``RestAdmissionController`` instance.
+        """
+        names = ("max_concurrency", "retry_after", "max_queued", "queue_timeout", "latency_target", "min_limit")
+        for name in names:
+            if name not in kwargs:
+                value = get_config_value(config, f"rest.admission.{name}")
+                if value is not None:
+                    kwargs[name] = value
+
+        if "routes" not in kwargs:
+            kwargs["routes"] = {
+                (decorator.url, decorator.method): decorator.max_concurrency
+                for decorator in decorators
+                if isinstance(decorator, RestEnrouteDecorator) and decorator.max_concurrency is not None
+            }
+
+        return cls(**kwargs)
+
+    @property
+    def global_limiter(self) -> Optional[RestConcurrencyLimiter]:
+        """Get the limiter shared by all the routes.
+
+        :return: A ``RestConcurrencyLimiter`` instance or ``None`` if there is not any global limit.
+        """
+        return self._global
+
+    @property
+    def retry_after(self) -> int:
+        """Get the value of the ``Retry-After`` header of the rejected requests, in seconds.
+
+        :return: An integer value.
+        """
+        return math.ceil(self._retry_after)
+
+    def get_limiters(self, url: str, method: str) -> tuple[RestConcurrencyLimiter, ...]:
+        """Get the limiters of the given route, in acquisition order.
+
+        :param url: The route url.
+        :param method: The route method.
+        :return: A tuple of ``RestConcurrencyLimiter`` instances.
+        """
+        limiters = list()
+        if (url, method) in self._routes:
+            limiters.append(self._routes[(url, method)])
+        if self._global is not None:
+            limiters.append(self._global)
+        return tuple(limiters)
+
+    @property
+    def metrics(self) -> dict[str, dict[str, int]]:
+        """Get the metrics of the limiters.
+
+        :return: A dictionary in which keys are ``"global"`` or ``"{method} {url}"`` and values are metrics.
+        """
+        metrics = dict()
+        if self._global is not None:
+            metrics["global"] = self._global.metrics
+        for (url, method), limiter in self._routes.items():
+            metrics[f"{method} {url}"] = limiter.metrics
+        return metrics
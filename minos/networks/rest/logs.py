@@ -0,0 +1,192 @@
+from __future__ import (
+    annotations,
+)
+
+import logging
+import random
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+)
+from queue import (
+    SimpleQueue,
+)
+from typing import (
+    Optional,
+    Union,
+)
+
+from aiohttp import (
+    web,
+)
+
+from minos.common import (
+    MinosConfig,
+)
+
+from ..utils import (
+    get_config_value,
+)
+
+ACCESS_LOGGER_NAME = "minos.networks.rest.access"
+
+
+class RestAccessLogger:
+    """Rest Access Logger class.
+
+    Emits a single structured record per request, after the response has been built, containing the method, the path,
+    the status, the latency and the body size. The fields are also available on the ``access`` attribute of the
+    records, so that they can be used by structured formatters.
+
+    The cost of the disabled or discarded records is kept to a minimum: the message is formatted lazily by the logging
+    handlers, and only a ``sample_rate`` fraction of the successful requests are logged (the server errors and the
+    requests slower than ``slow_threshold`` seconds are always logged). If ``queued`` is set, the records are passed to
+    the handlers through a queue and processed on a background thread, so that the event loop never waits for them.
+    The queued records are emitted by a private logger and handled by the given logger on the background thread, so
+    its handlers and configuration are left untouched and can be shared by several instances.
+    """
+
+    def __init__(
+        self,
+        logger: Optional[Union[str, logging.Logger]] = None,
+        sample_rate: float = 1.0,
+        slow_threshold: Optional[float] = None,
+        queued: bool = False,
+        enabled: bool = True,
+    ):
+        if logger is None:
+            logger = ACCESS_LOGGER_NAME
+        if isinstance(logger, str):
+            logger = logging.getLogger(logger)
+        if not 0 <= sample_rate <= 1:
+            raise ValueError(f"The 'sample_rate' value must be between 0 and 1. Obtained: {sample_rate!r}")
+
+        self._logger = logger
+        self._sample_rate = sample_rate
+        self._slow_threshold = slow_threshold
+        self._queued = queued
+        self._enabled = enabled
+
+        self._listener: Optional[QueueListener] = None
+        self._queue_logger: Optional[logging.Logger] = None
+
+    @classmethod
+    def from_config(cls, config: MinosConfig, **kwargs) -> RestAccessLogger:
+        """Build a new instance from config.
+
+        :param config: The config instance.
+        :param kwargs: Additional named arguments.
+        :return: A ``RestAccessLogger`` instance.
+        """
+        for name in ("sample_rate", "slow_threshold", "queued", "enabled"):
+            if name not in kwargs:
+                value = get_config_value(config, f"rest.access_log.{name}")
+                if value is not None:
+                    kwargs[name] = value
+        return cls(**kwargs)
+
+    @property
+    def logger(self) -> logging.Logger:
+        """Get the logger used to emit the records.
+
+        :return: A ``Logger`` instance.
+        """
+        return self._logger
+
+    @property
+    def sample_rate(self) -> float:
+        """Get the fraction of successful requests that are logged.
+
+        :return: A float value.
+        """
+        return self._sample_rate
+
+    @property
+    def enabled(self) -> bool:
+        """Check if the access log is enabled.
+
+        :return: A boolean value.
+        """
+        return self._enabled and self._logger.isEnabledFor(logging.INFO)
+
+    def log(self, request: web.BaseRequest, status: int, latency: float, size: Optional[int] = None) -> None:
+        """Log an access.
+
+        :param request: The ``aiohttp`` request.
+        :param status: The response status.
+        :param latency: The handling time, in seconds.
+        :param size: The response body size, in bytes.
+        :return: This method does not return anything.
+        """
+        if not self._enabled or not self._logger.isEnabledFor(logging.INFO):
+            return
+
+        if (
+            self._sample_rate < 1
+            and status < 500
+            and (self._slow_threshold is None or latency < self._slow_threshold)
+            and random.random() >= self._sample_rate
+        ):
+            return
+
+        if self._queued and self._listener is None:
+            self.start()
+
+        logger = self._logger if self._queue_logger is None else self._queue_logger
+        access = {
+            "remote": request.remote,
+            "method": request.method,
+            "path": request.path_qs,
+            "status": status,
+            "latency": latency,
+            "size": size,
+        }
+        logger.info(
+            '%s "%s %s" %s %s %.6f',
+            access["remote"],
+            access["method"],
+            access["path"],
+            status,
+            "-" if size is None else size,
+            latency,
+            extra={"access": access},
+        )
+
+    def start(self) -> None:
+        """Start the background processing of the records, if the logger is queued.
+
+        :return: This method does not return anything.
+        """
+        if not self._queued or self._listener is not None:
+            return
+
+        queue = SimpleQueue()
+
+        # The private logger is not registered on the logging hierarchy, so it does not propagate the records.
+        queue_logger = logging.Logger(self._logger.name)
+        queue_logger.addHandler(QueueHandler(queue))
+
+        self._listener = QueueListener(queue, _LoggerHandler(self._logger))
+        self._queue_logger = queue_logger
+        self._listener.start()
+
+    def stop(self) -> None:
+        """Stop the background processing of the records, flushing the pending ones.
+
+        :return: This method does not return anything.
+        """
+        if self._listener is None:
+            return
+
+        self._queue_logger = None
+        self._listener.stop()
+        self._listener = None
+
+
+class _LoggerHandler(logging.Handler):
+    def __init__(self, logger: logging.Logger):
+        super().__init__()
+        self._logger = logger
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self._logger.handle(record)
@@ -2,14 +2,20 @@ from __future__ import (
     annotations,
 )
 
+import io
+import json
 import warnings
 from collections import (
+    OrderedDict,
     defaultdict,
 )
 from collections.abc import (
     Callable,
     Iterable,
 )
+from functools import (
+    lru_cache,
+)
 from itertools import (
     chain,
 )
@@ -29,11 +35,14 @@ from aiohttp.web import Request as AioHttpRequest
 from cached_property import (
     cached_property,
 )
+from fastavro import (
+    reader,
+)
 
 from minos.common import (
     AvroDataDecoder,
     AvroSchemaDecoder,
-    MinosAvroProtocol,
+    MinosProtocolException,
     import_module,
 )
 
@@ -134,11 +143,23 @@ class RestRequest(Request):
         return self._parse_multi_dict(form)
 
     async def _raw_avro(self) -> Any:
-        data = MinosAvroProtocol.decode(await self._raw_bytes())
-        schema = MinosAvroProtocol.decode_schema(await self._raw_bytes())
+        schema, data = self._decode_avro(await self._raw_bytes())
+        return _get_avro_decoder(schema).build(data)
+
+    @staticmethod
+    def _decode_avro(raw: bytes) -> tuple[Any, Any]:
+        try:
+            with io.BytesIO(raw) as file:
+                avro_reader = reader(file)
+                schema = avro_reader.writer_schema
+                values = list(avro_reader)
+        except Exception as exc:
+            raise MinosProtocolException(f"Error decoding the avro bytes: {exc}")
+
+        if len(values) != 1:
+            raise MinosProtocolException(f"The avro bytes must contain exactly one value. Obtained: {values!r}")
 
-        type_ = AvroSchemaDecoder(schema).build()
-        return AvroDataDecoder(type_).build(data)
+        return schema, values[0]
 
     async def _raw_text(self) -> str:
         return await self.raw.text()
@@ -226,10 +247,12 @@ class RestRequest(Request):
         if type_ is None:
             return data
 
-        if isinstance(type_, str):
-            type_ = import_module(type_)
+        try:
+            decoder = _get_data_decoder(type_)
+        except TypeError:
+            decoder = _build_data_decoder(type_)
 
-        return AvroDataDecoder(type_).build(data)
+        return decoder.build(data)
 
     @staticmethod
     def _parse_multi_dict(raw: Iterable[str, Any]) -> dict[str, Any]:
@@ -239,6 +262,49 @@ class RestRequest(Request):
         return {k: v if len(v) > 1 else v[0] for k, v in args.items()}
 
 
+_DECODER_CACHE_MAX_SIZE = 1024
+
+
+def _build_data_decoder(type_: Union[type, str]) -> AvroDataDecoder:
+    if isinstance(type_, str):
+        type_ = import_module(type_)
+    return AvroDataDecoder(type_)
+
+
+_get_data_decoder = lru_cache(maxsize=_DECODER_CACHE_MAX_SIZE)(_build_data_decoder)
+
+_AVRO_DECODERS: OrderedDict[str, AvroDataDecoder] = OrderedDict()
+
+
+def _get_avro_decoder(schema: Any) -> AvroDataDecoder:
+    fingerprint = json.dumps(_normalize_schema(schema), sort_keys=True)
+    try:
+        _AVRO_DECODERS.move_to_end(fingerprint)
+        return _AVRO_DECODERS[fingerprint]
+    except KeyError:
+        pass
+
+    decoder = AvroDataDecoder(AvroSchemaDecoder(schema).build())
+    _AVRO_DECODERS[fingerprint] = decoder
+    if len(_AVRO_DECODERS) > _DECODER_CACHE_MAX_SIZE:
+        _AVRO_DECODERS.popitem(last=False)
+    return decoder
+
+
+def _normalize_schema(schema: Any) -> Any:
+    # The schema encoder adds a random suffix to the namespaces that is ignored by the schema decoder.
+    if isinstance(schema, dict):
+        normalized = {key: _normalize_schema(value) for key, value in schema.items()}
+        if isinstance(normalized.get("namespace"), str):
+            normalized["namespace"] = normalized["namespace"].rsplit(".", 1)[0]
+        return normalized
+
+    if isinstance(schema, list):
+        return [_normalize_schema(value) for value in schema]
+
+    return schema
+
+
 class RestResponse(Response):
     """Rest Response class."""
 
@@ -0,0 +1,308 @@
+from __future__ import (
+    annotations,
+)
+
+import json
+from abc import (
+    ABC,
+    abstractmethod,
+)
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+)
+from datetime import (
+    date,
+    datetime,
+    time,
+    timedelta,
+    timezone,
+)
+from decimal import (
+    Decimal,
+)
+from typing import (
+    Any,
+    Optional,
+)
+from uuid import (
+    UUID,
+)
+
+from minos.common import (
+    AvroDataEncoder,
+    AvroSchemaEncoder,
+    DeclarativeModel,
+    MinosAvroProtocol,
+    Model,
+    TypeHintBuilder,
+)
+
+from ..requests import (
+    Response,
+)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+_EPOCH_DATE = date(1970, 1, 1)
+_EPOCH_DATETIME = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+_SCHEMA_CACHE_MAX_SIZE = 1024
+
+
+class RestSerializer(ABC):
+    """Rest Serializer class.
+
+    Converts the handler responses into the body of the ``aiohttp`` responses.
+    """
+
+    content_type: str
+
+    async def serialize(self, response: Any) -> Optional[bytes]:
+        """Serialize the given handler response.
+
+        :param response: The handler response. It can be a ``Response`` instance or any raw value.
+        :return: The serialized body as ``bytes`` or ``None`` if there is no content.
+        """
+        if isinstance(response, Response):
+            if type(response).raw_content is Response.raw_content:
+                response = await response.content()
+            else:
+                response = await response.raw_content()
+
+        if response is None:
+            return None
+
+        return self.dumps(response)
+
+    async def serialize_stream(self, items: AsyncIterable[Any]) -> AsyncIterator[bytes]:
+        """Serialize the given items progressively, as chunks of the response body.
+
+        By default, all the items are collected and serialized at once, so the serializers that support streaming
+        must override this method.
+
+        :param items: An asynchronous iterable of items.
+        :return: An asynchronous iterator of ``bytes`` chunks.
+        """
+        yield self.dumps([item async for item in items])
+
+    @abstractmethod
+    def dumps(self, data: Any) -> bytes:
+        """Serialize the given data.
+
+        :param data: The data to be serialized. It can contain ``Model`` instances.
+        :return: A ``bytes`` value.
+        """
+
+
+class JsonRestSerializer(RestSerializer):
+    """Json Rest Serializer class.
+
+    Encodes ``Model`` instances directly into ``json`` (with the same representation as the ``AvroDataEncoder``)
+    without building an intermediate structure, and uses ``orjson`` if it is installed.
+    """
+
+    content_type = "application/json"
+
+    def __init__(self, use_orjson: Optional[bool] = None):
+        if use_orjson is None:
+            use_orjson = orjson is not None
+        if use_orjson and orjson is None:
+            raise ValueError("The 'orjson' package is not installed.")
+        self._use_orjson = use_orjson
+
+    @property
+    def use_orjson(self) -> bool:
+        """Check if the ``orjson`` encoder is used.
+
+        :return: A boolean value.
+        """
+        return self._use_orjson
+
+    def dumps(self, data: Any) -> bytes:
+        """Serialize the given data.
+
+        :param data: The data to be serialized. It can contain ``Model`` instances.
+        :return: A ``bytes`` value.
+        """
+        if self._use_orjson:
+            try:
+                return orjson.dumps(data, default=encode_json_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+            except TypeError:
+                # Some values (like integers bigger than 64 bits) are only supported by the standard encoder.
+                pass
+        return json.dumps(data, default=encode_json_default).encode()
+
+    async def serialize_stream(self, items: AsyncIterable[Any]) -> AsyncIterator[bytes]:
+        """Serialize the given items progressively, as the chunks of a ``json`` array.
+
+        The first chunk already contains the first item, so errors raised before it are raised before anything is
+        sent.
+
+        :param items: An asynchronous iterable of items.
+        :return: An asynchronous iterator of ``bytes`` chunks.
+        """
+        separator = b"["
+        async for item in items:
+            yield separator + self.dumps(item)
+            separator = b","
+        yield b"[]" if separator == b"[" else b"]"
+
+
+class NdJsonRestSerializer(JsonRestSerializer):
+    """Newline Delimited Json Rest Serializer class.
+
+    Encodes each item as a ``json`` document in its own line, which is suitable for streaming large result sets.
+    """
+
+    content_type = "application/x-ndjson"
+
+    def dumps(self, data: Any) -> bytes:
+        """Serialize the given data.
+
+        :param data: The data to be serialized. If it is a list, each item is serialized into its own line.
+        :return: A ``bytes`` value.
+        """
+        if isinstance(data, list):
+            return b"".join(self._dumps_line(item) for item in data)
+        return self._dumps_line(data)
+
+    def _dumps_line(self, item: Any) -> bytes:
+        return super().dumps(item) + b"\n"
+
+    async def serialize_stream(self, items: AsyncIterable[Any]) -> AsyncIterator[bytes]:
+        """Serialize the given items progressively, one line per item.
+
+        :param items: An asynchronous iterable of items.
+        :return: An asynchronous iterator of ``bytes`` chunks.
+        """
+        async for item in items:
+            yield self._dumps_line(item)
+
+
+class AvroRestSerializer(RestSerializer):
+    """Avro Rest Serializer class.
+
+    Encodes the responses as ``avro/binary`` with the ``MinosAvroProtocol``, so that they can be decoded by the
+    ``RestRequest`` class. The schemas are cached by type.
+    """
+
+    content_type = "avro/binary"
+
+    def __init__(self, schema_cache_max_size: int = _SCHEMA_CACHE_MAX_SIZE):
+        self._schema_cache_max_size = schema_cache_max_size
+        self._schemas = dict()
+
+    def dumps(self, data: Any) -> bytes:
+        """Serialize the given data.
+
+        :param data: The data to be serialized. It can contain ``Model`` instances.
+        :return: A ``bytes`` value.
+        """
+        schema = self.get_schema(self._build_type(data))
+        return MinosAvroProtocol.encode(encode_raw_data(data), schema)
+
+    @staticmethod
+    def _build_type(data: Any) -> type:
+        if isinstance(data, DeclarativeModel):
+            return type(data)
+
+        if isinstance(data, list) and len(data) and isinstance(data[0], DeclarativeModel):
+            type_ = type(data[0])
+            if all(type(item) is type_ for item in data):
+                return list[type_]
+
+        return TypeHintBuilder(data).build()
+
+    def get_schema(self, type_: type) -> Any:
+        """Get the avro schema of the given type.
+
+        :param type_: The type to be encoded.
+        :return: The avro schema.
+        """
+        try:
+            return self._schemas[type_]
+        except KeyError:
+            pass
+
+        schema = AvroSchemaEncoder(type_).build()
+        if len(self._schemas) >= self._schema_cache_max_size:
+            self._schemas.pop(next(iter(self._schemas)))
+        self._schemas[type_] = schema
+        return schema
+
+
+_RAW_TYPES = (str, int, float, bool, bytes, type(None))
+
+
+def encode_raw_data(value: Any) -> Any:
+    """Encode the given value into its raw representation in a single pass.
+
+    The result is the same as the one obtained from the ``AvroDataEncoder``, but without re-visiting the already
+    encoded models.
+
+    :param value: The value to be encoded.
+    :return: The raw representation of the value.
+    """
+    if type(value) in _RAW_TYPES:
+        return value
+
+    if isinstance(value, Model):
+        if type(value).encode_data is not Model.encode_data:
+            return AvroDataEncoder(value).build()
+        return {name: encode_raw_data(field.value) for name, field in value.fields.items()}
+
+    if isinstance(value, (list, set, frozenset)):
+        return [encode_raw_data(item) for item in value]
+
+    if isinstance(value, dict):
+        return {key: encode_raw_data(item) for key, item in value.items()}
+
+    if isinstance(value, _RAW_TYPES):
+        return value
+
+    if isinstance(value, memoryview):
+        return value.tobytes()
+
+    return encode_json_default(value)
+
+
+def encode_json_default(value: Any) -> Any:
+    """Encode the values that are not natively supported by the ``json`` encoders.
+
+    This function is intended to be used as the ``default`` argument of ``json.dumps`` or ``orjson.dumps``.
+
+    :param value: The value to be encoded.
+    :return: A ``json``-compatible value.
+    """
+    if isinstance(value, Model):
+        if type(value).encode_data is not Model.encode_data:
+            return AvroDataEncoder(value).build()
+        return {name: field.value for name, field in value.fields.items()}
+
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+
+    if isinstance(value, Decimal):
+        return float(value)
+
+    if isinstance(value, datetime):
+        return (value.astimezone(timezone.utc) - _EPOCH_DATETIME) // _ONE_MICROSECOND
+
+    if isinstance(value, timedelta):
+        return value // _ONE_MICROSECOND
+
+    if isinstance(value, date):
+        return (value - _EPOCH_DATE).days
+
+    if isinstance(value, time):
+        return (datetime.combine(date(1, 1, 1), value) - datetime(1, 1, 1)) // _ONE_MICROSECOND
+
+    if isinstance(value, UUID):
+        return str(value)
+
+    raise TypeError(f"Given type is not supported: {type(value)!r} ({value!r})")
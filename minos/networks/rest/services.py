@@ -1,14 +1,76 @@
+from __future__ import (
+    annotations,
+)
+
+import logging
+import multiprocessing
+import signal
+import time
+from asyncio import (
+    Event,
+    Task,
+    create_task,
+    gather,
+)
+from asyncio import get_event_loop_policy as get_current_event_loop_policy
+from asyncio import (
+    get_running_loop,
+    set_event_loop,
+    sleep,
+)
+from inspect import (
+    isawaitable,
+)
+from multiprocessing.context import (
+    BaseContext,
+)
+from multiprocessing.process import (
+    BaseProcess,
+)
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Optional,
+    Union,
+)
+
 from aiohttp import (
     web,
 )
 from aiomisc.service.aiohttp import (
     AIOHTTPService,
 )
+from aiomisc.utils import (
+    bind_socket,
+)
+
+from minos.common import (
+    MinosConfig,
+    import_module,
+)
 
+from ..loops import (
+    get_event_loop_policy,
+)
+from ..utils import (
+    get_config_value,
+)
+from .caches import (
+    RestResponseCache,
+)
 from .handlers import (
     RestHandler,
 )
 
+logger = logging.getLogger(__name__)
+
+_WORKER_START_TIMEOUT = 60
+_WORKER_MAX_RESTARTS = 5
+_WORKER_MAX_BACKOFF = 30
+
+WorkerInitializer = Callable[[MinosConfig], Union[None, Awaitable[None]]]
+
 
 class RestService(AIOHTTPService):
     """
@@ -16,15 +78,291 @@ class RestService(AIOHTTPService):
 
     Expose REST Interface handler using aiomisc AIOHTTPService.
 
+    If ``workers`` is greater than one (it can also be set with the ``rest.workers`` config value), the service forks
+    ``workers - 1`` additional processes. Each of them builds its own ``RestHandler`` and binds its own socket to the
+    same address with ``SO_REUSEPORT``, so that the kernel balances the connections between all of them. The
+    ``worker_initializer`` function (or its import path) is called on each additional process before building the
+    handler, so that the dependencies needed by the handling functions can be set up there. Their event loops are
+    created with the policy selected by the ``loop.policy`` config value or, if it is not set, with the same policy as
+    the current process (which is installed by the ``aiomisc`` entrypoint), so that every process runs the same loop.
+
+    As the processes do not share any state, the features that depend on it are not available on that mode: the response
+    cache is disabled on every process, even if one is given (as the invalidations received by the broker handler would
+    only reach the current process, so the responses would depend on the process that accepts the connection) and so
+    are the ``/system/profiling`` routes (as the start, stats and stop requests could reach different processes). The
+    ``/system/metrics`` route is still available, but each process answers with its own metrics only.
+
+    The workers that exit are restarted with an exponential backoff (independently of each other), and they are not
+    restarted anymore after exiting several times in a row shortly after being started. The requests are logged by the
+    ``RestAccessLogger`` of the handlers, so the ``aiohttp`` access log is disabled on every process.
     """
 
-    def __init__(self, **kwargs):
-        self.handler = RestHandler.from_config(**kwargs)
-        super().__init__(**(kwargs | {"address": self.handler.host, "port": self.handler.port}))
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        worker_initializer: Optional[Union[str, WorkerInitializer]] = None,
+        worker_context: Union[str, BaseContext] = "spawn",
+        **kwargs,
+    ):
+        config = kwargs.get("config")
+        if workers is None:
+            workers = get_config_value(config, "rest.workers", 1) if config is not None else 1
+        if workers < 1:
+            raise ValueError(f"The 'workers' value must be greater than zero. Obtained: {workers!r}")
+
+        if workers > 1:
+            logger.info("The response cache and the profiling routes are disabled, as there are several REST workers.")
+            # The given values are overridden, so that the behaviour does not depend on the process that serves.
+            self.handler = RestHandler.from_config(**(kwargs | _get_worker_handler_kwargs()))
+        else:
+            self.handler = RestHandler.from_config(**kwargs)
+
+        if isinstance(worker_context, str):
+            worker_context = multiprocessing.get_context(worker_context)
+
+        self._config = config
+        self._workers = workers
+        self._worker_initializer = worker_initializer
+        self._worker_context = worker_context
+        self._processes: list[Optional[BaseProcess]] = list()
+        self._supervisor: Optional[Task] = None
+
+        kwargs = kwargs | {"address": self.handler.host, "port": self.handler.port}
+        if workers > 1:
+            kwargs["sock"] = bind_socket(address=self.handler.host, port=self.handler.port, reuse_port=True)
+        super().__init__(**kwargs)
+
+    @property
+    def workers(self) -> int:
+        """Get the number of serving processes, including the current one.
+
+        :return: An integer value.
+        """
+        return self._workers
+
+    @property
+    def processes(self) -> list[Optional[BaseProcess]]:
+        """Get the additional worker processes.
+
+        :return: A list of processes.
+        """
+        return self._processes
 
     async def create_application(self) -> web.Application:
         """Create the web application.
 
         :return: A ``web.Application`` instance.
         """
-        return self.handler.get_app()  # pragma: no cover
+        return self.handler.get_app()
+
+    async def start(self) -> None:
+        """Start the service.
+
+        :return: This method does not return anything.
+        """
+        await self.handler.setup()
+        # The requests are already logged by the handler, so the ``aiohttp`` access log is disabled.
+        self.runner = web.AppRunner(await self.create_application(), access_log=None)
+        await self.runner.setup()
+        self.site = await self.create_site()
+        await self.site.start()
+
+        if self._workers > 1:
+            self._processes = list(await gather(*(self._start_worker(index) for index in range(1, self._workers))))
+            self._supervisor = create_task(self._supervise())
+
+    async def _start_worker(self, index: int) -> BaseProcess:
+        host, port = self.socket.getsockname()[:2]
+        ready = self._worker_context.Event()
+        process = self._worker_context.Process(
+            target=_run_worker,
+            args=(
+                self._config,
+                host,
+                port,
+                self.shutdown_timeout,
+                self._worker_initializer,
+                ready,
+                _get_worker_loop_policy(self._config),
+            ),
+            name=f"minos-rest-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        # The worker is waited until it is serving, so that the startup (and an eventual shutdown) is coordinated.
+        if not await get_running_loop().run_in_executor(None, _wait_worker, process, ready, _WORKER_START_TIMEOUT):
+            logger.warning(f"The {process.name!r} REST worker (pid={process.pid!r}) is not ready.")
+        else:
+            logger.info(f"Started the {process.name!r} REST worker (pid={process.pid!r}).")
+        return process
+
+    async def _supervise(self, interval: float = 1.0) -> None:
+        failures = [0] * len(self._processes)
+        started_at = [time.monotonic()] * len(self._processes)
+        restarts: dict[int, Task] = dict()
+
+        async def _restart(position: int, backoff: float) -> None:
+            await sleep(backoff)
+            self._processes[position] = await self._start_worker(position + 1)
+            started_at[position] = time.monotonic()
+
+        try:
+            while True:
+                await sleep(interval)
+                for position, process in enumerate(self._processes):
+                    if process is None or process.is_alive() or position in restarts:
+                        continue
+                    backoff = self._get_backoff(process, position, failures, started_at, interval)
+                    if backoff is None:
+                        self._processes[position] = None
+                        continue
+                    # Each worker is restarted on its own task, so that its backoff does not delay the other ones.
+                    restarts[position] = create_task(_restart(position, backoff))
+                    restarts[position].add_done_callback(lambda _, position=position: restarts.pop(position, None))
+
+                if all(process is None for process in self._processes):
+                    return
+        finally:
+            for task in tuple(restarts.values()):
+                task.cancel()
+
+    @staticmethod
+    def _get_backoff(
+        process: BaseProcess, position: int, failures: list[int], started_at: list[float], interval: float
+    ) -> Optional[float]:
+
+        # The failures are only consecutive if the worker exited shortly after being started.
+        if time.monotonic() - started_at[position] < _WORKER_START_TIMEOUT:
+            failures[position] += 1
+        else:
+            failures[position] = 1
+
+        if failures[position] > _WORKER_MAX_RESTARTS:
+            logger.error(
+                f"The {process.name!r} REST worker exited ({process.exitcode!r}) {failures[position]!r} times "
+                f"in a row. It will not be restarted anymore."
+            )
+            return None
+
+        backoff = min(interval * 2 ** (failures[position] - 1), _WORKER_MAX_BACKOFF)
+        logger.warning(
+            f"The {process.name!r} REST worker exited ({process.exitcode!r}). Restarting in {backoff:.3g}s..."
+        )
+        return backoff
+
+    async def stop(self, exception: Exception = None) -> None:
+        """Stop the service.
+
+        The worker processes are asked to stop gracefully at the same time as the current one, and they are killed if
+        they are still alive after the shutdown timeout.
+
+        :param exception: The exception that caused the stop, if any.
+        :return: This method does not return anything.
+        """
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            self._supervisor = None
+
+        for process in self._processes:
+            if process is not None and process.is_alive():
+                process.terminate()
+        try:
+            await super().stop(exception)
+        finally:
+            await get_running_loop().run_in_executor(None, self._join_workers)
+            await self.handler.destroy()
+
+    def _join_workers(self) -> None:
+        for process in self._processes:
+            if process is None:
+                continue
+            process.join(self.shutdown_timeout + 1)
+            if process.is_alive():
+                logger.warning(f"The {process.name!r} REST worker did not stop gracefully. Killing...")
+                process.kill()
+                process.join()
+        self._processes = list()
+
+
+def _get_worker_handler_kwargs() -> dict[str, Any]:
+    return {"cache": RestResponseCache(), "profiling": False}
+
+
+def _get_worker_loop_policy(config: Optional[MinosConfig]) -> Union[str, type]:
+    policy = get_config_value(config, "loop.policy") if config is not None else None
+    if policy is None:
+        policy = type(get_current_event_loop_policy())
+        if policy.__module__ == "uvloop":
+            # The ``uvloop`` policy class is built dynamically, so it cannot be pickled.
+            policy = "uvloop"
+    return policy
+
+
+def _wait_worker(process: BaseProcess, ready: Any, timeout: float, interval: float = 0.1) -> bool:
+    deadline = time.monotonic() + timeout
+    while not ready.wait(interval):
+        if not process.is_alive() or time.monotonic() > deadline:
+            return False
+    return True
+
+
+def _run_worker(
+    config: MinosConfig,
+    host: str,
+    port: int,
+    shutdown_timeout: float,
+    initializer: Optional[Union[str, WorkerInitializer]] = None,
+    ready: Optional[Any] = None,
+    loop_policy: Optional[Union[str, type]] = None,
+) -> None:
+    loop = get_event_loop_policy(loop_policy).new_event_loop()
+    set_event_loop(loop)
+    try:
+        loop.run_until_complete(_serve_worker(config, host, port, shutdown_timeout, initializer, ready))
+    finally:
+        loop.close()
+
+
+async def _serve_worker(
+    config: MinosConfig,
+    host: str,
+    port: int,
+    shutdown_timeout: float,
+    initializer: Optional[Union[str, WorkerInitializer]] = None,
+    ready: Optional[Any] = None,
+) -> None:
+    stop = Event()
+    loop = get_running_loop()
+    loop.add_signal_handler(signal.SIGTERM, stop.set)
+    loop.add_signal_handler(signal.SIGINT, stop.set)
+
+    if initializer is not None:
+        await _call_initializer(initializer, config)
+
+    handler = RestHandler.from_config(config=config, **_get_worker_handler_kwargs())
+    await handler.setup()
+    try:
+        # The requests are already logged by the handler, so the ``aiohttp`` access log is disabled.
+        runner = web.AppRunner(handler.get_app(), access_log=None)
+        await runner.setup()
+        sock = bind_socket(address=host, port=port, reuse_port=True)
+        site = web.SockSite(runner, sock, shutdown_timeout=shutdown_timeout)
+        await site.start()
+        if ready is not None:
+            ready.set()
+        try:
+            await stop.wait()
+        finally:
+            # The pending requests are completed before exiting, up to the shutdown timeout.
+            await runner.cleanup()
+    finally:
+        await handler.destroy()
+
+
+async def _call_initializer(initializer: Union[str, WorkerInitializer], config: MinosConfig) -> Any:
+    if isinstance(initializer, str):
+        initializer = import_module(initializer)
+    result = initializer(config)
+    if isawaitable(result):
+        result = await result
+    return result
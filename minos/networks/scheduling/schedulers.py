@@ -4,6 +4,7 @@ from __future__ import (
 
 import asyncio
 import logging
+import time
 from contextlib import (
     suppress,
 )
@@ -32,7 +33,17 @@ from minos.common import (
 )
 
 from ..decorators import (
-    EnrouteBuilder,
+    EnrouteRegistry,
+)
+from ..executors import (
+    get_handler_executor,
+)
+from ..metrics import (
+    get_metrics_registry,
+)
+from ..monitoring import (
+    reset_task_label,
+    set_task_label,
 )
 from ..requests import (
     ResponseException,
@@ -56,10 +67,10 @@ class PeriodicTaskScheduler(MinosSetup):
         tasks = cls._tasks_from_config(config, **kwargs)
         return cls(tasks, **kwargs)
 
+    # noinspection PyUnusedLocal
     @staticmethod
     def _tasks_from_config(config: MinosConfig, **kwargs) -> set[PeriodicTask]:
-        builder = EnrouteBuilder(*config.services, middleware=config.middleware)
-        decorators = builder.get_periodic_event(config=config, **kwargs)
+        decorators = EnrouteRegistry.from_config(config).periodic_event
         tasks = {PeriodicTask(decorator.crontab, fn) for decorator, fn in decorators.items()}
         return tasks
 
@@ -102,6 +113,10 @@ class PeriodicTask:
         self._task = None
         self._running = False
 
+        self._duration = get_metrics_registry().histogram(
+            "minos_periodic_task_duration_seconds", "Duration of the periodic tasks.", ("task", "outcome")
+        )
+
     @property
     def crontab(self) -> CronTab:
         """Get the crontab of the periodic task.
@@ -187,15 +202,27 @@ class PeriodicTask:
 
         request = ScheduledRequest(now)
         logger.debug("Running periodic task...")
+        outcome = "success"
+        name = _get_task_name(self._fn)
+        previous = set_task_label(name)
+        start = time.monotonic()
         try:
             self._running = True
             with suppress(asyncio.CancelledError):
-                response = self._fn(request)
+                response = await get_handler_executor().run(self._fn, request)
                 if isawaitable(response):
                     await response
         except ResponseException as exc:
+            outcome = "error"
             logger.warning(f"Raised an application exception: {exc!s}")
         except Exception as exc:
+            outcome = "system_error"
             logger.exception(f"Raised a system exception: {exc!r}")
         finally:
             self._running = False
+            self._duration.labels(name, outcome).observe(time.monotonic() - start)
+            reset_task_label(previous)
+
+
+def _get_task_name(fn: Callable) -> str:
+    return getattr(fn, "__qualname__", None) or repr(fn)
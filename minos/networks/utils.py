@@ -3,6 +3,14 @@ import socket
 from asyncio import (
     QueueEmpty,
 )
+from typing import (
+    Any,
+)
+
+from minos.common import (
+    MinosConfig,
+    MinosConfigException,
+)
 
 
 def get_host_ip() -> str:
@@ -47,3 +55,18 @@ async def consume_queue(queue, max_count: int) -> None:
             queue.get_nowait()
         except QueueEmpty:
             break
+
+
+def get_config_value(config: MinosConfig, key: str, default: Any = None) -> Any:
+    """Get an optional value from the config.
+
+    :param config: The config instance.
+    :param key: The dotted key of the value (for example, ``"executor.max_workers"``).
+    :param default: The value to be returned if the key is not defined on the config.
+    :return: The config value or ``default`` if it is not defined.
+    """
+    try:
+        # noinspection PyProtectedMember
+        return config._get(key)
+    except MinosConfigException:
+        return default
@@ -0,0 +1,138 @@
+import asyncio
+import unittest
+from pathlib import (
+    Path,
+)
+from tempfile import (
+    TemporaryDirectory,
+)
+
+from benchmarks import (
+    BenchmarkResult,
+    BrokerBenchmark,
+    RestBenchmark,
+    dump_results,
+    find_regressions,
+    load_baselines,
+    run_load_benchmark,
+    save_baselines,
+    select_median,
+)
+from minos.common import (
+    MinosConfig,
+)
+
+BENCHMARKS_PATH = Path(__file__).parents[1] / "benchmarks"
+
+
+class TestBenchmarkResult(unittest.TestCase):
+    def test_metrics(self):
+        result = BenchmarkResult("foo", [0.4, 0.1, 0.3, 0.2], 8, 1.0)
+        self.assertEqual(8, result.throughput)
+        self.assertEqual(0.2, result.p50)
+        self.assertEqual(0.4, result.p95)
+        self.assertEqual(
+            {"operations": 4, "messages": 8, "throughput": 8, "p50": 0.2, "p95": 0.4, "p99": 0.4}, result.as_dict()
+        )
+
+    def test_baselines(self):
+        result = BenchmarkResult("foo", [0.1], 1, 0.1)
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / "baselines.json"
+            self.assertEqual({"environment": None, "results": dict()}, load_baselines(path))
+
+            save_baselines(path, load_baselines(path), {"memory:foo": result})
+            baselines = load_baselines(path)
+
+        self.assertEqual(list(), find_regressions(baselines, {"memory:foo": [result]}, 0.25))
+
+        slower = BenchmarkResult("foo", [0.2], 1, 0.2)
+        self.assertEqual(2, len(find_regressions(baselines, {"memory:foo": [slower]}, 0.25)))
+        self.assertEqual(list(), find_regressions(baselines, {"memory:bar": [slower]}, 0.25))
+
+    def test_find_regressions_best_run(self):
+        baselines = {"results": {"memory:foo": BenchmarkResult("foo", [0.1], 1, 0.1).as_dict()}}
+        noisy = BenchmarkResult("foo", [0.2, 0.2, 0.4], 3, 0.8)
+
+        # A single noisy run is not a regression, but a regression observed on every run is.
+        self.assertEqual(
+            list(), find_regressions(baselines, {"memory:foo": [noisy, BenchmarkResult("foo", [0.1], 1, 0.1)]}, 0.25)
+        )
+        self.assertEqual(2, len(find_regressions(baselines, {"memory:foo": [noisy, noisy]}, 0.25)))
+
+    def test_select_median(self):
+        runs = [BenchmarkResult("foo", [0.1], 1, elapsed) for elapsed in (0.1, 0.3, 0.2)]
+        self.assertIs(runs[2], select_median(runs))
+
+    def test_dump_results(self):
+        observed = dump_results({"rest:foo": BenchmarkResult("foo", [0.1], 1, 0.1)})
+        self.assertEqual({"environment", "results"}, set(observed))
+        self.assertEqual({"rest:foo"}, set(observed["results"]))
+        self.assertEqual(10, observed["results"]["rest:foo"]["throughput"])
+
+
+class TestRunLoadBenchmark(unittest.IsolatedAsyncioTestCase):
+    async def test_run(self):
+        running, max_running = 0, 0
+
+        async def _fn() -> int:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return 2
+
+        result = await run_load_benchmark("foo", _fn, 20, concurrency=4)
+
+        self.assertEqual(4, max_running)
+        self.assertEqual(20, len(result.latencies))
+        self.assertEqual(40, result.messages)
+        # The throughput uses the wall time, so it must include the concurrency gains.
+        self.assertGreater(result.throughput, 2 / 0.01)
+
+
+class TestBrokerBenchmark(unittest.IsolatedAsyncioTestCase):
+    async def test_run(self):
+        benchmark = BrokerBenchmark(MinosConfig(BENCHMARKS_PATH / "config.yml"), batch_size=5)
+        async with benchmark:
+            results = await benchmark.run(messages=10)
+
+        self.assertEqual(list(benchmark.stages), list(results))
+        self.assertEqual(set(benchmark.stages), benchmark.gated_stages)
+        for result in results.values():
+            self.assertEqual(10, result.messages)
+            self.assertGreater(result.throughput, 0)
+        # Two measured batches and a warmup one.
+        self.assertEqual(15, benchmark.kafka.sent)
+
+    async def test_run_sqlite(self):
+        benchmark = BrokerBenchmark(MinosConfig(BENCHMARKS_PATH / "config.yml"), backend="sqlite", batch_size=5)
+        async with benchmark:
+            results = await benchmark.run(["producer.dispatch", "handler.dispatch"], messages=10)
+
+        self.assertEqual(["producer.dispatch", "handler.dispatch"], list(results))
+        self.assertEqual(15, benchmark.kafka.sent)
+
+    def test_constructor_raises(self):
+        with self.assertRaises(ValueError):
+            BrokerBenchmark(MinosConfig(BENCHMARKS_PATH / "config.yml"), backend="foo")
+
+
+class TestRestBenchmark(unittest.IsolatedAsyncioTestCase):
+    async def test_run(self):
+        benchmark = RestBenchmark(payload_sizes=(16, 256), concurrency=2)
+        async with benchmark:
+            results = await benchmark.run(messages=4)
+
+        self.assertEqual(list(benchmark.stages), list(results))
+        self.assertIn("rest_request.content.avro.256", results)
+        self.assertIn("load.echo.16", results)
+        self.assertEqual({"load.echo.16", "load.echo.256"}, benchmark.gated_stages)
+        for result in results.values():
+            self.assertEqual(4, result.messages)
+            self.assertGreater(result.throughput, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -14,6 +14,7 @@ from unittest.mock import (
 import aiopg
 
 from minos.common import (
+    MinosConfig,
     NotProvidedException,
 )
 from minos.common.testing import (
@@ -24,6 +25,7 @@ from minos.networks import (
     BrokerHandlerSetup,
     BrokerPublisher,
     DynamicBroker,
+    InMemoryBrokerQueue,
     MinosHandlerNotFoundEnoughEntriesException,
 )
 from tests.utils import (
@@ -127,5 +129,37 @@ class TestDynamicBroker(PostgresAsyncTestCase):
         self.assertAlmostEqual(expected.created_at, observed.created_at, delta=timedelta(seconds=2))
 
 
+class TestDynamicBrokerWithQueue(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.config = MinosConfig(BASE_PATH / "test_config.yml")
+        self.queue = InMemoryBrokerQueue()
+        self.publisher = BrokerPublisher.from_config(self.config, broker_queue=self.queue)
+        self.handler = DynamicBroker.from_config(
+            config=self.config, topic="fooReply", publisher=self.publisher, broker_queue=self.queue
+        )
+
+    async def asyncSetUp(self):
+        await self.publisher.setup()
+        await self.handler.setup()
+
+    async def asyncTearDown(self):
+        await self.handler.destroy()
+        await self.publisher.destroy()
+
+    async def test_get_many(self):
+        await self.queue.enqueue_consumer("fooReply", 0, FakeModel("test1").avro_bytes)
+        await self.queue.enqueue_consumer("other", 0, FakeModel("other").avro_bytes)
+
+        async def _fn():
+            await sleep(0.01)
+            await self.queue.enqueue_consumer("fooReply", 0, FakeModel("test2").avro_bytes)
+
+        observed, _ = await gather(self.handler.get_many(count=2, max_wait=0.1), _fn())
+
+        self.assertEqual([FakeModel("test1"), FakeModel("test2")], [entry.data for entry in observed])
+        self.assertEqual(list(), await self.queue.claim_consumer(["fooReply"], None, 10))
+        self.assertEqual(1, await self.queue.count_consumer(["other"], None))
+
+
 if __name__ == "__main__":
     unittest.main()
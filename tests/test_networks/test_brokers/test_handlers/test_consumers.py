@@ -1,25 +1,48 @@
 import unittest
+from asyncio import (
+    sleep,
+)
+from collections import (
+    namedtuple,
+)
 from unittest.mock import (
     AsyncMock,
     MagicMock,
     call,
+    patch,
 )
 
+from aiokafka import (
+    TopicPartition,
+)
+from kafka.errors import (
+    CommitFailedError,
+)
 from psycopg2.sql import (
     SQL,
 )
 
+from minos.common import (
+    MinosConfig,
+)
 from minos.common.testing import (
     PostgresAsyncTestCase,
 )
 from minos.networks import (
     BrokerConsumer,
+    BrokerHandler,
+    BrokerMessage,
+    BrokerPublisher,
+    InMemoryBrokerQueue,
 )
 from tests.utils import (
     BASE_PATH,
+    FakeModel,
     Message,
 )
 
+_KafkaMessage = namedtuple("_KafkaMessage", ["topic", "partition", "value", "offset"])
+
 
 class _ConsumerClient:
     """For testing purposes."""
@@ -52,6 +75,9 @@ class _ConsumerClient:
     async def commit(self, *args, **kwargs):
         """For testing purposes."""
 
+    def seek(self, *args, **kwargs):
+        """For testing purposes."""
+
 
 class TestConsumer(PostgresAsyncTestCase):
     CONFIG_FILE_PATH = BASE_PATH / "test_config.yml"
@@ -175,5 +201,210 @@ class TestConsumer(PostgresAsyncTestCase):
         self.assertEqual(call(query, ("AddOrder", 0, b"test")), mock.call_args)
 
 
+class TestConsumerWithQueue(unittest.IsolatedAsyncioTestCase):
+    async def test_enqueue(self):
+        config = MinosConfig(BASE_PATH / "test_config.yml")
+        queue = InMemoryBrokerQueue()
+        # noinspection PyTypeChecker
+        consumer = BrokerConsumer(
+            topics={"AddOrder"},
+            broker=config.broker,
+            client=_ConsumerClient(),
+            broker_queue=queue,
+            **config.broker.queue._asdict(),
+        )
+
+        async with consumer:
+            await consumer.enqueue("AddOrder", 0, b"test")
+
+        rows = await queue.claim_consumer(["AddOrder"], 2, 10)
+        self.assertEqual([("AddOrder", 0, b"test")], [row[1:4] for row in rows])
+
+
+class TestConsumerDirect(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.config = MinosConfig(BASE_PATH / "test_config.yml")
+        self.queue = InMemoryBrokerQueue()
+        self.handler = MagicMock(topics={"AddOrder", "DeleteOrder"}, dispatch_direct=AsyncMock(return_value=True))
+        self.client = _ConsumerClient()
+        self.client.commit = AsyncMock()
+        self.client.seek = MagicMock()
+        # noinspection PyTypeChecker
+        self.consumer = BrokerConsumer(
+            topics={"AddOrder", "DeleteOrder", "OrderReply"},
+            broker=self.config.broker,
+            client=self.client,
+            handler=self.handler,
+            broker_queue=self.queue,
+            **self.config.broker.queue._asdict(),
+        )
+
+    def _set_batches(self, batches: dict) -> None:
+        self.client.getmany = AsyncMock(return_value=batches)
+
+    def test_from_config(self):
+        self.assertIsNone(BrokerConsumer.from_config(self.config).handler)
+
+        handler = MagicMock()
+        with patch("minos.networks.brokers.handlers.consumers.get_config_value", return_value=True):
+            with patch.object(BrokerHandler, "from_config", return_value=handler) as mock:
+                consumer = BrokerConsumer.from_config(self.config, broker_queue=self.queue)
+
+        self.assertEqual(handler, consumer.handler)
+        self.assertEqual([call(self.config, broker_queue=self.queue, publisher=None)], mock.call_args_list)
+
+    async def test_handle_batch_real_handler(self):
+        publisher = BrokerPublisher.from_config(self.config, broker_queue=self.queue)
+        publisher.send = AsyncMock()
+
+        def _get_config_value(config, key, default=None):
+            return True if key == "broker.queue.direct" else default
+
+        with patch("minos.networks.brokers.handlers.consumers.get_config_value", side_effect=_get_config_value):
+            consumer = BrokerConsumer.from_config(
+                self.config, client=self.client, broker_queue=self.queue, publisher=publisher
+            )
+        self.assertIsInstance(consumer.handler, BrokerHandler)
+        self.assertFalse(consumer.handler.already_setup)
+
+        message = BrokerMessage("AddOrder", FakeModel("foo"), reply_topic="UpdateTicket")
+        partition = TopicPartition("AddOrder", 0)
+        self.client.getmany = AsyncMock(return_value={partition: [_KafkaMessage("AddOrder", 0, message.avro_bytes, 0)]})
+
+        await consumer.handle_batch(self.client)
+
+        self.assertEqual(1, publisher.send.call_count)
+        self.assertEqual([call({partition: 1})], self.client.commit.call_args_list)
+        self.assertEqual(0, await self.queue.count_consumer(["AddOrder"], None))
+
+    async def test_handle_batch_timeout(self):
+        async def _dispatch_direct(*args, **kwargs):
+            await sleep(1)
+            return True
+
+        self.handler.dispatch_direct = AsyncMock(side_effect=_dispatch_direct)
+        self.consumer._direct_timeout = 0.01
+        partition = TopicPartition("AddOrder", 0)
+        self._set_batches(
+            {partition: [_KafkaMessage("AddOrder", 0, b"one", 0), _KafkaMessage("AddOrder", 0, b"two", 1)]}
+        )
+
+        with self.assertLogs("minos.networks.brokers.handlers.consumers", "WARNING"):
+            await self.consumer.handle_batch(self.client)
+
+        self.assertEqual(1, self.handler.dispatch_direct.call_count)
+        self.assertEqual([call({partition: 2})], self.client.commit.call_args_list)
+        rows = await self.queue.claim_consumer(["AddOrder"], 2, 10)
+        self.assertEqual([b"one", b"two"], [row[3] for row in rows])
+
+    async def test_handle_batch(self):
+        first, second = TopicPartition("AddOrder", 0), TopicPartition("DeleteOrder", 1)
+        self._set_batches(
+            {
+                first: [_KafkaMessage("AddOrder", 0, b"one", 3), _KafkaMessage("AddOrder", 0, b"two", 4)],
+                second: [_KafkaMessage("DeleteOrder", 1, b"three", 7)],
+            }
+        )
+
+        await self.consumer.handle_batch(self.client)
+
+        self.assertEqual(
+            [call(timeout_ms=1000, max_records=self.config.broker.queue.records)], self.client.getmany.call_args_list
+        )
+        calls = self.handler.dispatch_direct.call_args_list
+        self.assertEqual([call("AddOrder", 0, b"one"), call("AddOrder", 0, b"two")], [c for c in calls if c[0][1] == 0])
+        self.assertEqual([call("DeleteOrder", 1, b"three")], [c for c in calls if c[0][1] == 1])
+        self.assertCountEqual([call({first: 5}), call({second: 8})], self.client.commit.call_args_list)
+        self.assertEqual(0, await self.queue.count_consumer(["AddOrder", "DeleteOrder"], None))
+
+    async def test_handle_batch_failed(self):
+        self.handler.dispatch_direct.side_effect = [False, True]
+        partition = TopicPartition("AddOrder", 0)
+        self._set_batches(
+            {partition: [_KafkaMessage("AddOrder", 0, b"one", 0), _KafkaMessage("AddOrder", 0, b"two", 1)]}
+        )
+
+        await self.consumer.handle_batch(self.client)
+
+        self.assertEqual([call({partition: 2})], self.client.commit.call_args_list)
+        rows = await self.queue.claim_consumer(["AddOrder"], 2, 10)
+        self.assertEqual([("AddOrder", 0, b"one", 0)], [row[1:5] for row in rows])
+
+    async def test_handle_batch_not_handled_topic(self):
+        partition = TopicPartition("OrderReply", 0)
+        self._set_batches({partition: [_KafkaMessage("OrderReply", 0, b"one", 0)]})
+
+        await self.consumer.handle_batch(self.client)
+
+        self.assertEqual(0, self.handler.dispatch_direct.call_count)
+        self.assertEqual([call({partition: 1})], self.client.commit.call_args_list)
+        self.assertEqual(1, await self.queue.count_consumer(["OrderReply"], None))
+
+    async def test_handle_batch_not_committed(self):
+        self.handler.dispatch_direct.return_value = False
+        self.queue.enqueue_consumer = AsyncMock(side_effect=ValueError)
+        partition = TopicPartition("AddOrder", 0)
+        self._set_batches({partition: [_KafkaMessage("AddOrder", 0, b"one", 0)]})
+
+        with self.assertLogs("minos.networks.brokers.handlers.consumers", "ERROR"):
+            await self.consumer.handle_batch(self.client)
+
+        self.assertEqual(0, self.client.commit.call_count)
+        self.assertEqual([call(partition, 0)], self.client.seek.call_args_list)
+
+    async def test_handle_batch_partition_failed(self):
+        self.handler.dispatch_direct.return_value = False
+        enqueue_consumer = self.queue.enqueue_consumer
+
+        async def _enqueue_consumer(topic, partition, binary):
+            if binary == b"two":
+                raise ValueError()
+            return await enqueue_consumer(topic, partition, binary)
+
+        self.queue.enqueue_consumer = AsyncMock(side_effect=_enqueue_consumer)
+        first, second = TopicPartition("AddOrder", 0), TopicPartition("DeleteOrder", 1)
+        self._set_batches(
+            {
+                first: [
+                    _KafkaMessage("AddOrder", 0, b"one", 3),
+                    _KafkaMessage("AddOrder", 0, b"two", 4),
+                    _KafkaMessage("AddOrder", 0, b"three", 5),
+                ],
+                second: [_KafkaMessage("DeleteOrder", 1, b"four", 7)],
+            }
+        )
+
+        with self.assertLogs("minos.networks.brokers.handlers.consumers", "ERROR"):
+            await self.consumer.handle_batch(self.client)
+
+        self.assertCountEqual([call({first: 4}), call({second: 8})], self.client.commit.call_args_list)
+        self.assertEqual([call(first, 4)], self.client.seek.call_args_list)
+        rows = await self.queue.claim_consumer(["AddOrder", "DeleteOrder"], 2, 10)
+        self.assertCountEqual([b"one", b"four"], [row[3] for row in rows])
+
+    async def test_handle_batch_commit_failed(self):
+        self.client.commit.side_effect = CommitFailedError()
+        self._set_batches({TopicPartition("AddOrder", 0): [_KafkaMessage("AddOrder", 0, b"one", 0)]})
+
+        with self.assertLogs("minos.networks.brokers.handlers.consumers", "WARNING"):
+            await self.consumer.handle_batch(self.client)
+
+    async def test_handle_batch_empty(self):
+        self._set_batches(dict())
+
+        await self.consumer.handle_batch(self.client)
+
+        self.assertEqual(0, self.client.commit.call_count)
+
+    async def test_dispatch(self):
+        mock = AsyncMock(side_effect=[None, ValueError])
+        self.consumer.handle_batch = mock
+
+        with self.assertRaises(ValueError):
+            await self.consumer.dispatch()
+
+        self.assertEqual([call(self.client), call(self.client)], mock.call_args_list)
+
+
 if __name__ == "__main__":
     unittest.main()
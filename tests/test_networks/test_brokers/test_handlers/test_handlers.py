@@ -27,6 +27,7 @@ from uuid import (
 import aiopg
 
 from minos.common import (
+    MinosConfig,
     NotProvidedException,
 )
 from minos.common.testing import (
@@ -43,6 +44,7 @@ from minos.networks import (
     BrokerRequest,
     BrokerResponse,
     BrokerResponseException,
+    InMemoryBrokerQueue,
     InMemoryRequest,
     MinosActionNotFoundException,
     Request,
@@ -403,5 +405,62 @@ class TestBrokerHandler(PostgresAsyncTestCase):
                 return (await cur.fetchone())[0] == 0
 
 
+class TestBrokerHandlerWithQueue(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.config = MinosConfig(BASE_PATH / "test_config.yml")
+        self.queue = InMemoryBrokerQueue()
+        self.publisher = BrokerPublisher.from_config(self.config, broker_queue=self.queue)
+        self.handler = BrokerHandler.from_config(self.config, publisher=self.publisher, broker_queue=self.queue)
+        self.message = BrokerMessage("AddOrder", FakeModel("foo"), reply_topic="UpdateTicket")
+
+    async def asyncSetUp(self):
+        await self.publisher.setup()
+        await self.handler.setup()
+
+    async def asyncTearDown(self):
+        await self.handler.destroy()
+        await self.publisher.destroy()
+
+    async def test_dispatch(self):
+        await self.queue.enqueue_consumer("AddOrder", 0, self.message.avro_bytes)
+        wrong = await self.queue.enqueue_consumer("AddOrder", 0, b"Test")
+        send_mock = AsyncMock()
+        self.publisher.send = send_mock
+
+        await self.handler.dispatch()
+
+        self.assertEqual(1, send_mock.call_count)
+        rows = await self.queue.claim_consumer(["AddOrder"], 2, 10)
+        self.assertEqual([(wrong, 1)], [(row[0], row[4]) for row in rows])
+
+    async def test_dispatch_direct(self):
+        send_mock = AsyncMock()
+        self.publisher.send = send_mock
+
+        self.assertTrue(await self.handler.dispatch_direct("AddOrder", 0, self.message.avro_bytes))
+        self.assertFalse(await self.handler.dispatch_direct("AddOrder", 0, b"Test"))
+
+        self.assertEqual(1, send_mock.call_count)
+        self.assertEqual(0, await self.queue.count_consumer(["AddOrder"], None))
+
+    async def test_dispatch_forever(self):
+        await self.queue.enqueue_consumer("AddOrder", 0, self.message.avro_bytes)
+        mock = AsyncMock(side_effect=[None, ValueError])
+        self.handler.dispatch = mock
+
+        with self.assertRaises(ValueError):
+            await self.handler.dispatch_forever(max_wait=0.01)
+
+        self.assertEqual([call(background_mode=True), call(background_mode=True)], mock.call_args_list)
+
+    async def test_metrics(self):
+        await self.queue.enqueue_consumer("AddOrder", 0, self.message.avro_bytes)
+
+        # noinspection PyUnresolvedReferences
+        samples = await self.handler._collect_metrics()
+
+        self.assertIn(("minos_broker_consumer_queue_depth", {"topic": "AddOrder"}, 1), samples)
+
+
 if __name__ == "__main__":
     unittest.main()
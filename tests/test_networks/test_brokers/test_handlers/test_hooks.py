@@ -0,0 +1,49 @@
+import unittest
+from unittest.mock import (
+    MagicMock,
+)
+
+from minos.networks import (
+    add_topic_hook,
+    remove_topic_hook,
+    run_topic_hooks,
+)
+
+
+class TestTopicHooks(unittest.TestCase):
+    def setUp(self) -> None:
+        self.hook = MagicMock()
+        add_topic_hook(self.hook)
+
+    def tearDown(self) -> None:
+        remove_topic_hook(self.hook)
+
+    def test_run_topic_hooks(self):
+        add_topic_hook(self.hook)
+
+        run_topic_hooks("TicketAdded")
+
+        self.hook.assert_called_once_with("TicketAdded")
+
+    def test_remove_topic_hook(self):
+        remove_topic_hook(self.hook)
+        remove_topic_hook(self.hook)
+
+        run_topic_hooks("TicketAdded")
+
+        self.assertEqual(0, self.hook.call_count)
+
+    def test_run_topic_hooks_failure(self):
+        failing = MagicMock(side_effect=ValueError)
+        add_topic_hook(failing)
+        try:
+            with self.assertLogs("minos.networks.brokers.handlers.hooks", "ERROR"):
+                run_topic_hooks("TicketAdded")
+        finally:
+            remove_topic_hook(failing)
+
+        self.hook.assert_called_once_with("TicketAdded")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,6 +15,7 @@ from uuid import (
 import aiopg
 
 from minos.common import (
+    MinosConfig,
     NotProvidedException,
 )
 from minos.common.testing import (
@@ -26,6 +27,7 @@ from minos.networks import (
     BrokerMessageStrategy,
     BrokerProducer,
     BrokerPublisher,
+    InMemoryBrokerQueue,
 )
 from tests.utils import (
     BASE_PATH,
@@ -210,5 +212,43 @@ class TestProducer(PostgresAsyncTestCase):
                 await cur.execute(f"NOTIFY {name!s};")
 
 
+class TestProducerWithQueue(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.config = MinosConfig(BASE_PATH / "test_config.yml")
+        self.queue = InMemoryBrokerQueue()
+        self.consumer = BrokerConsumer.from_config(self.config, broker_queue=self.queue)
+        self.producer = BrokerProducer.from_config(self.config, consumer=self.consumer, broker_queue=self.queue)
+
+    async def test_dispatch(self):
+        await self.queue.enqueue_producer("GetOrder", BrokerMessageStrategy.MULTICAST, b"one")
+        await self.queue.enqueue_producer("GetOrder", BrokerMessageStrategy.MULTICAST, b"two")
+        mock = AsyncMock(side_effect=[True, False])
+        self.producer.publish = mock
+
+        await self.producer.dispatch()
+
+        self.assertEqual([call("GetOrder", b"one"), call("GetOrder", b"two")], mock.call_args_list)
+        rows = await self.queue.claim_producer(2, 10)
+        self.assertEqual([(b"two", 1)], [(row[2], row[4]) for row in rows])
+
+    async def test_dispatch_forever(self):
+        await self.queue.enqueue_producer("GetOrder", BrokerMessageStrategy.MULTICAST, b"one")
+        mock = AsyncMock(side_effect=[None, ValueError])
+        self.producer.dispatch = mock
+
+        with self.assertRaises(ValueError):
+            await self.producer.dispatch_forever(max_wait=0.01)
+
+        self.assertEqual(2, mock.call_count)
+
+    async def test_metrics(self):
+        await self.queue.enqueue_producer("GetOrder", BrokerMessageStrategy.MULTICAST, b"one")
+
+        # noinspection PyUnresolvedReferences
+        samples = await self.producer._collect_metrics()
+
+        self.assertIn(("minos_broker_producer_queue_depth", {}, 1), samples)
+
+
 if __name__ == "__main__":
     unittest.main()
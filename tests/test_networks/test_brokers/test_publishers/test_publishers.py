@@ -13,6 +13,7 @@ from psycopg2.sql import (
 )
 
 from minos.common import (
+    MinosConfig,
     Model,
 )
 from minos.common.testing import (
@@ -23,6 +24,7 @@ from minos.networks import (
     BrokerMessageStatus,
     BrokerMessageStrategy,
     BrokerPublisher,
+    InMemoryBrokerQueue,
 )
 from tests.utils import (
     BASE_PATH,
@@ -129,7 +131,10 @@ class TestBrokerPublisher(PostgresAsyncTestCase):
         self.assertEqual(BrokerMessageStrategy.UNICAST, args[1])
 
         expected = BrokerMessage(
-            reply_topic, FakeModel("foo"), identifier=observed, status=BrokerMessageStatus.SUCCESS,
+            reply_topic,
+            FakeModel("foo"),
+            identifier=observed,
+            status=BrokerMessageStatus.SUCCESS,
         )
         observed = Model.from_avro_bytes(args[2])
         self.assertEqual(expected, observed)
@@ -150,7 +155,10 @@ class TestBrokerPublisher(PostgresAsyncTestCase):
         self.assertEqual(BrokerMessageStrategy.MULTICAST, args[1])
 
         expected = BrokerMessage(
-            topic, FakeModel("foo"), identifier=observed, strategy=BrokerMessageStrategy.MULTICAST,
+            topic,
+            FakeModel("foo"),
+            identifier=observed,
+            strategy=BrokerMessageStrategy.MULTICAST,
         )
         observed = Model.from_avro_bytes(args[2])
         self.assertEqual(expected, observed)
@@ -169,5 +177,29 @@ class TestBrokerPublisher(PostgresAsyncTestCase):
         self.assertEqual(call(query, ("test_topic", b"test", BrokerMessageStrategy.UNICAST)), mock.call_args)
 
 
+class TestBrokerPublisherWithQueue(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.config = MinosConfig(BASE_PATH / "test_config.yml")
+        self.queue = InMemoryBrokerQueue()
+        self.publisher = BrokerPublisher.from_config(self.config, broker_queue=self.queue)
+
+    async def test_send(self):
+        async with self.publisher:
+            await self.publisher.send(FakeModel("Foo"), topic="fake")
+
+        rows = await self.queue.claim_producer(2, 10)
+        self.assertEqual(1, len(rows))
+        self.assertEqual(("fake", BrokerMessageStrategy.UNICAST), (rows[0][1], rows[0][3]))
+        self.assertEqual(FakeModel("Foo"), BrokerMessage.from_avro_bytes(rows[0][2]).data)
+
+    async def test_queue_destroyed_by_last_user(self):
+        other = BrokerPublisher.from_config(self.config, broker_queue=self.queue)
+        async with self.publisher:
+            async with other:
+                self.assertTrue(self.queue.already_setup)
+            self.assertTrue(self.queue.already_setup)
+        self.assertTrue(self.queue.already_destroyed)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,150 @@
+import unittest
+from abc import (
+    ABC,
+)
+from asyncio import (
+    CancelledError,
+    create_task,
+    sleep,
+    wait_for,
+)
+
+from minos.common import (
+    MinosSetup,
+)
+from minos.networks import (
+    BrokerQueue,
+)
+
+
+class _BrokerQueue(BrokerQueue):
+    """For testing purposes."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.entries = 0
+        self.counts = 0
+
+    async def enqueue_producer(self, *args, **kwargs) -> int:
+        """For testing purposes."""
+        self.entries += 1
+        await self._notify()
+        return self.entries
+
+    async def claim_producer(self, *args, **kwargs) -> list[tuple]:
+        """For testing purposes."""
+
+    async def ack_producer(self, *args, **kwargs) -> None:
+        """For testing purposes."""
+
+    async def nack_producer(self, *args, **kwargs) -> None:
+        """For testing purposes."""
+
+    async def count_producer(self, *args, **kwargs) -> int:
+        """For testing purposes."""
+        self.counts += 1
+        entries = self.entries
+        # Emulates a queue that yields control after counting the entries, so the count could be outdated.
+        await sleep(0)
+        return entries
+
+    async def get_producer_metrics(self, *args, **kwargs) -> tuple[int, float]:
+        """For testing purposes."""
+
+    async def enqueue_consumer(self, *args, **kwargs) -> int:
+        """For testing purposes."""
+
+    async def claim_consumer(self, *args, **kwargs) -> list[tuple]:
+        """For testing purposes."""
+
+    async def ack_consumer(self, *args, **kwargs) -> None:
+        """For testing purposes."""
+
+    async def nack_consumer(self, *args, **kwargs) -> None:
+        """For testing purposes."""
+
+    async def count_consumer(self, *args, **kwargs) -> int:
+        """For testing purposes."""
+        return 0
+
+    async def get_consumer_metrics(self, *args, **kwargs) -> list[tuple[str, int, float]]:
+        """For testing purposes."""
+
+
+class TestBrokerQueue(unittest.IsolatedAsyncioTestCase):
+    def test_abstract(self):
+        self.assertTrue(issubclass(BrokerQueue, (ABC, MinosSetup)))
+        expected = {
+            "enqueue_producer",
+            "claim_producer",
+            "ack_producer",
+            "nack_producer",
+            "count_producer",
+            "get_producer_metrics",
+            "enqueue_consumer",
+            "claim_consumer",
+            "ack_consumer",
+            "nack_consumer",
+            "count_consumer",
+            "get_consumer_metrics",
+        }
+        # noinspection PyUnresolvedReferences
+        self.assertEqual(expected, BrokerQueue.__abstractmethods__)
+
+    async def test_setup_destroy_count_users(self):
+        queue = _BrokerQueue()
+        await queue.setup()
+        await queue.setup()
+
+        await queue.destroy()
+        self.assertTrue(queue.already_setup)
+
+        await queue.destroy()
+        self.assertTrue(queue.already_destroyed)
+
+        await queue.destroy()
+        await queue.setup()
+        self.assertTrue(queue.already_setup)
+        await queue.destroy()
+        self.assertTrue(queue.already_destroyed)
+
+    async def test_wait_returns_if_there_are_entries(self):
+        queue = _BrokerQueue()
+        await queue.enqueue_producer("foo", "unicast", bytes())
+
+        await wait_for(queue.wait_producer(2), 1)
+        self.assertEqual(1, queue.counts)
+
+    async def test_wait_is_notified(self):
+        queue = _BrokerQueue()
+        task = create_task(queue.wait_producer(2))
+
+        # The entry is enqueued while the waiting task is counting.
+        await sleep(0)
+        await queue.enqueue_producer("foo", "unicast", bytes())
+
+        await wait_for(task, 1)
+        self.assertEqual(2, queue.counts)
+
+    async def test_wait_counts_again_after_max_wait(self):
+        queue = _BrokerQueue()
+        task = create_task(queue.wait_producer(2, max_wait=0.01))
+        await sleep(0.05)
+        self.assertFalse(task.done())
+        self.assertGreater(queue.counts, 2)
+
+        queue.entries = 1
+        await wait_for(task, 1)
+
+    async def test_wait_cancelled(self):
+        queue = _BrokerQueue()
+        task = create_task(queue.wait_consumer(["foo"], 2))
+        await sleep(0.01)
+
+        task.cancel()
+        with self.assertRaises(CancelledError):
+            await wait_for(task, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+from unittest.mock import (
+    patch,
+)
+
+from minos.common import (
+    MinosConfig,
+)
+from minos.networks import (
+    InMemoryBrokerQueue,
+    SQLiteBrokerQueue,
+    get_broker_queue,
+    set_broker_queue,
+)
+from tests.utils import (
+    BASE_PATH,
+)
+
+
+class TestBrokerQueueFactories(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = MinosConfig(BASE_PATH / "test_config.yml")
+
+    def tearDown(self) -> None:
+        set_broker_queue(None)
+
+    def test_get_broker_queue_default(self):
+        self.assertIsNone(get_broker_queue())
+        self.assertIsNone(get_broker_queue(self.config))
+
+    def test_get_broker_queue_memory(self):
+        with patch("minos.networks.brokers.queues.factories.get_config_value", return_value="memory"):
+            queue = get_broker_queue(self.config)
+
+        self.assertIsInstance(queue, InMemoryBrokerQueue)
+        self.assertIs(queue, get_broker_queue(self.config))
+        self.assertIs(queue, get_broker_queue())
+
+    def test_get_broker_queue_sqlite(self):
+        with patch("minos.networks.brokers.queues.factories.get_config_value", return_value="sqlite"):
+            queue = get_broker_queue(self.config)
+
+        self.assertIsInstance(queue, SQLiteBrokerQueue)
+
+    def test_get_broker_queue_import_path(self):
+        path = "minos.networks.InMemoryBrokerQueue"
+        with patch("minos.networks.brokers.queues.factories.get_config_value", return_value=path):
+            self.assertIsInstance(get_broker_queue(self.config), InMemoryBrokerQueue)
+
+    def test_set_broker_queue(self):
+        queue = InMemoryBrokerQueue()
+        set_broker_queue(queue)
+        self.assertIs(queue, get_broker_queue(self.config))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+import unittest
+from asyncio import (
+    create_task,
+    sleep,
+    wait_for,
+)
+
+from minos.networks import (
+    BrokerMessageStrategy,
+    BrokerQueue,
+    InMemoryBrokerQueue,
+)
+
+
+class TestInMemoryBrokerQueue(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.queue = InMemoryBrokerQueue()
+
+    def test_is_subclass(self):
+        self.assertTrue(issubclass(InMemoryBrokerQueue, BrokerQueue))
+
+    async def test_enqueue_claim_producer(self):
+        first = await self.queue.enqueue_producer("foo", BrokerMessageStrategy.UNICAST, b"one")
+        second = await self.queue.enqueue_producer("bar", BrokerMessageStrategy.MULTICAST, b"two")
+        self.assertEqual(2, await self.queue.count_producer(2))
+
+        rows = await self.queue.claim_producer(2, 10)
+
+        self.assertEqual([first, second], [row[0] for row in rows])
+        self.assertEqual(("foo", b"one", BrokerMessageStrategy.UNICAST, 0), rows[0][1:5])
+        self.assertEqual(("bar", b"two", BrokerMessageStrategy.MULTICAST, 0), rows[1][1:5])
+        self.assertEqual(list(), await self.queue.claim_producer(2, 10))
+        self.assertEqual(0, await self.queue.count_producer(2))
+
+    async def test_claim_producer_limit(self):
+        for i in range(3):
+            await self.queue.enqueue_producer("foo", BrokerMessageStrategy.UNICAST, bytes([i]))
+
+        self.assertEqual([b"\x00", b"\x01"], [row[2] for row in await self.queue.claim_producer(2, 2)])
+        self.assertEqual([b"\x02"], [row[2] for row in await self.queue.claim_producer(2, 2)])
+
+    async def test_ack_producer(self):
+        id_ = await self.queue.enqueue_producer("foo", BrokerMessageStrategy.UNICAST, b"one")
+        await self.queue.claim_producer(2, 10)
+
+        await self.queue.ack_producer(id_)
+        await self.queue.nack_producer(id_)
+
+        self.assertEqual(list(), await self.queue.claim_producer(2, 10))
+
+    async def test_ack_producer_many(self):
+        ids = [await self.queue.enqueue_producer("foo", BrokerMessageStrategy.UNICAST, bytes([i])) for i in range(3)]
+        await self.queue.claim_producer(2, 10)
+
+        await self.queue.ack_producer_many(ids[:2])
+        await self.queue.nack_producer(ids[2])
+
+        self.assertEqual([ids[2]], [row[0] for row in await self.queue.claim_producer(2, 10)])
+
+    async def test_nack_producer_keeps_order(self):
+        first = await self.queue.enqueue_producer("foo", BrokerMessageStrategy.UNICAST, b"one")
+        await self.queue.claim_producer(2, 1)
+        second = await self.queue.enqueue_producer("foo", BrokerMessageStrategy.UNICAST, b"two")
+
+        await self.queue.nack_producer(first)
+
+        rows = await self.queue.claim_producer(2, 10)
+        self.assertEqual([(first, 1), (second, 0)], [(row[0], row[4]) for row in rows])
+
+    async def test_nack_producer_exhausted(self):
+        id_ = await self.queue.enqueue_producer("foo", BrokerMessageStrategy.UNICAST, b"one")
+        for _ in range(2):
+            await self.queue.claim_producer(2, 10)
+            await self.queue.nack_producer(id_)
+
+        with self.assertLogs("minos.networks.brokers.queues.memory", "WARNING"):
+            self.assertEqual(list(), await self.queue.claim_producer(2, 10))
+        self.assertEqual((0, 0.0), await self.queue.get_producer_metrics(2))
+
+    async def test_get_producer_metrics(self):
+        await self.queue.enqueue_producer("foo", BrokerMessageStrategy.UNICAST, b"one")
+        await self.queue.enqueue_producer("foo", BrokerMessageStrategy.UNICAST, b"two")
+
+        depth, age = await self.queue.get_producer_metrics(2)
+
+        self.assertEqual(2, depth)
+        self.assertGreaterEqual(age, 0)
+
+    async def test_enqueue_claim_consumer(self):
+        first = await self.queue.enqueue_consumer("foo", 0, b"one")
+        second = await self.queue.enqueue_consumer("bar", 1, b"two")
+        third = await self.queue.enqueue_consumer("foo", 0, b"three")
+        await self.queue.enqueue_consumer("other", 0, b"four")
+        self.assertEqual(3, await self.queue.count_consumer(["foo", "bar"], 2))
+
+        rows = await self.queue.claim_consumer(["foo", "bar"], 2, 10)
+
+        self.assertEqual([first, second, third], [row[0] for row in rows])
+        self.assertEqual(("bar", 1, b"two", 0), rows[1][1:5])
+        self.assertEqual(0, await self.queue.count_consumer(["foo", "bar", "unknown"], 2))
+        self.assertEqual(1, await self.queue.count_consumer(["other"], None))
+
+    async def test_claim_consumer_limit(self):
+        for i in range(3):
+            await self.queue.enqueue_consumer("foo" if i % 2 else "bar", 0, bytes([i]))
+
+        self.assertEqual([b"\x00", b"\x01"], [row[3] for row in await self.queue.claim_consumer(["foo", "bar"], 2, 2)])
+        self.assertEqual([b"\x02"], [row[3] for row in await self.queue.claim_consumer(["foo", "bar"], 2, 2)])
+
+    async def test_nack_consumer(self):
+        id_ = await self.queue.enqueue_consumer("foo", 0, b"one")
+        await self.queue.claim_consumer(["foo"], 2, 10)
+
+        await self.queue.nack_consumer(id_)
+        rows = await self.queue.claim_consumer(["foo"], 2, 10)
+        self.assertEqual([(id_, 1)], [(row[0], row[4]) for row in rows])
+
+        await self.queue.nack_consumer(id_)
+        with self.assertLogs("minos.networks.brokers.queues.memory", "WARNING"):
+            self.assertEqual(list(), await self.queue.claim_consumer(["foo"], 2, 10))
+
+    async def test_claim_consumer_without_retry(self):
+        id_ = await self.queue.enqueue_consumer("foo", 0, b"one")
+        for _ in range(3):
+            await self.queue.claim_consumer(["foo"], None, 10)
+            await self.queue.nack_consumer(id_)
+
+        self.assertEqual([id_], [row[0] for row in await self.queue.claim_consumer(["foo"], None, 10)])
+
+    async def test_ack_consumer(self):
+        id_ = await self.queue.enqueue_consumer("foo", 0, b"one")
+        await self.queue.claim_consumer(["foo"], 2, 10)
+
+        await self.queue.ack_consumer(id_)
+        await self.queue.nack_consumer(id_)
+
+        self.assertEqual(list(), await self.queue.claim_consumer(["foo"], 2, 10))
+
+    async def test_get_consumer_metrics(self):
+        await self.queue.enqueue_consumer("foo", 0, b"one")
+        await self.queue.enqueue_consumer("foo", 0, b"two")
+        await self.queue.enqueue_consumer("bar", 0, b"three")
+        await self.queue.claim_consumer(["bar"], 2, 10)
+
+        metrics = await self.queue.get_consumer_metrics(2)
+
+        self.assertEqual([("foo", 2)], [(topic, depth) for topic, depth, _ in metrics])
+
+    async def test_wait_consumer(self):
+        task = create_task(self.queue.wait_consumer(["foo"], 2))
+        await self.queue.enqueue_consumer("bar", 0, b"one")
+        await sleep(0.01)
+        self.assertFalse(task.done())
+
+        await self.queue.enqueue_consumer("foo", 0, b"two")
+        await wait_for(task, 1)
+
+    async def test_wait_producer_nack(self):
+        id_ = await self.queue.enqueue_producer("foo", BrokerMessageStrategy.UNICAST, b"one")
+        await self.queue.claim_producer(2, 10)
+
+        task = create_task(self.queue.wait_producer(2))
+        await sleep(0.01)
+        self.assertFalse(task.done())
+
+        await self.queue.nack_producer(id_)
+        await wait_for(task, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
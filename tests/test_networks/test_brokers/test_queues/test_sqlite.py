@@ -0,0 +1,289 @@
+import sqlite3
+import unittest
+from asyncio import (
+    CancelledError,
+    Future,
+    create_task,
+    gather,
+    get_running_loop,
+    sleep,
+    wait_for,
+)
+from contextlib import (
+    closing,
+)
+from datetime import (
+    datetime,
+)
+from pathlib import (
+    Path,
+)
+from tempfile import (
+    TemporaryDirectory,
+)
+from unittest.mock import (
+    patch,
+)
+
+from minos.common import (
+    MinosConfig,
+)
+from minos.networks import (
+    BrokerMessageStrategy,
+    BrokerQueue,
+    SQLiteBrokerQueue,
+)
+from tests.utils import (
+    BASE_PATH,
+)
+
+
+class TestSQLiteBrokerQueue(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.path = Path(self.directory.name) / "queue.sqlite3"
+        self.queue = SQLiteBrokerQueue(self.path)
+
+    async def asyncSetUp(self) -> None:
+        await self.queue.setup()
+
+    async def asyncTearDown(self) -> None:
+        await self.queue.destroy()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_is_subclass(self):
+        self.assertTrue(issubclass(SQLiteBrokerQueue, BrokerQueue))
+
+    def test_from_config(self):
+        config = MinosConfig(BASE_PATH / "test_config.yml")
+        self.assertEqual("broker_queue.sqlite3", SQLiteBrokerQueue.from_config(config).path)
+
+        with patch("minos.networks.brokers.queues.sqlite.get_config_value", return_value="/tmp/foo.db"):
+            self.assertEqual("/tmp/foo.db", SQLiteBrokerQueue.from_config(config).path)
+
+    async def test_setup(self):
+        with closing(sqlite3.connect(self.path)) as connection:
+            self.assertEqual("wal", connection.execute("PRAGMA journal_mode").fetchone()[0])
+            tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        self.assertLessEqual({"producer_queue", "consumer_queue"}, tables)
+
+    async def test_setup_concurrently(self):
+        queue = SQLiteBrokerQueue(Path(self.directory.name) / "other.sqlite3")
+        with patch.object(SQLiteBrokerQueue, "_connect", side_effect=queue._connect) as mock:
+            await gather(*(queue.setup() for _ in range(3)))
+            ids = await gather(
+                *(queue.enqueue_producer("foo", BrokerMessageStrategy.UNICAST, b"one") for _ in range(3))
+            )
+            await gather(*(queue.destroy() for _ in range(3)))
+
+        self.assertEqual(1, mock.call_count)
+        self.assertEqual([1, 2, 3], ids)
+        self.assertTrue(queue.already_destroyed)
+
+    async def test_claim_cancelled(self):
+        await self.queue.enqueue_consumer("foo", 0, b"one")
+
+        task = create_task(self.queue.claim_consumer(["foo"], 2, 10))
+        await sleep(0)
+        task.cancel()
+        with self.assertRaises(CancelledError):
+            await task
+
+        rows = await self.queue.claim_consumer(["foo"], 2, 10)
+        self.assertEqual([(b"one", 0)], [(row[3], row[4]) for row in rows])
+
+    async def test_claim_cancelled_after_claiming(self):
+        await self.queue.enqueue_producer("foo", BrokerMessageStrategy.UNICAST, b"one")
+        loop = get_running_loop()
+        task = None
+
+        class _Future(Future):
+            def set_result(self, result):
+                super().set_result(result)
+                task.cancel()
+
+        create_future = loop.create_future
+        # Only the future of the claim cancels the caller once it has the claimed rows.
+        futures = iter([_Future(loop=loop)])
+        with patch.object(loop, "create_future", side_effect=lambda: next(futures, None) or create_future()):
+            task = create_task(self.queue.claim_producer(2, 10))
+            with self.assertRaises(CancelledError):
+                await task
+
+        rows = await self.queue.claim_producer(2, 10)
+        self.assertEqual([(b"one", 0)], [(row[2], row[4]) for row in rows])
+
+    async def test_write_failure_isolated(self):
+        def _fail(connection):
+            connection.execute("INSERT INTO unknown VALUES (1)")
+
+        # noinspection PyProtectedMember
+        observed = await gather(
+            self.queue.enqueue_producer("foo", BrokerMessageStrategy.UNICAST, b"one"),
+            self.queue._write(_fail),
+            self.queue.enqueue_producer("foo", BrokerMessageStrategy.UNICAST, b"two"),
+            return_exceptions=True,
+        )
+
+        self.assertEqual([1, 2], [observed[0], observed[2]])
+        self.assertIsInstance(observed[1], sqlite3.OperationalError)
+        self.assertEqual([b"one", b"two"], [row[2] for row in await self.queue.claim_producer(2, 10)])
+
+    async def test_enqueue_claim_producer(self):
+        first = await self.queue.enqueue_producer("foo", BrokerMessageStrategy.UNICAST, b"one")
+        second = await self.queue.enqueue_producer("bar", BrokerMessageStrategy.MULTICAST, b"two")
+        self.assertEqual(2, await self.queue.count_producer(2))
+
+        rows = await self.queue.claim_producer(2, 10)
+
+        self.assertEqual([first, second], [row[0] for row in rows])
+        self.assertEqual(("foo", b"one", BrokerMessageStrategy.UNICAST, 0), rows[0][1:5])
+        self.assertEqual(("bar", b"two", BrokerMessageStrategy.MULTICAST, 0), rows[1][1:5])
+        self.assertIsInstance(rows[0][5], datetime)
+        self.assertEqual(list(), await self.queue.claim_producer(2, 10))
+        self.assertEqual(0, await self.queue.count_producer(2))
+
+    async def test_enqueue_batch(self):
+        ids = await gather(
+            *(self.queue.enqueue_producer("foo", BrokerMessageStrategy.UNICAST, bytes([i])) for i in range(10))
+        )
+
+        self.assertEqual(sorted(ids), ids)
+        rows = await self.queue.claim_producer(2, 5)
+        self.assertEqual([bytes([i]) for i in range(5)], [row[2] for row in rows])
+
+    async def test_ack_producer(self):
+        id_ = await self.queue.enqueue_producer("foo", BrokerMessageStrategy.UNICAST, b"one")
+        await self.queue.claim_producer(2, 10)
+
+        await self.queue.ack_producer(id_)
+        await self.queue.nack_producer(id_)
+
+        self.assertEqual(list(), await self.queue.claim_producer(2, 10))
+
+    async def test_ack_producer_many(self):
+        ids = [await self.queue.enqueue_producer("foo", BrokerMessageStrategy.UNICAST, bytes([i])) for i in range(3)]
+        await self.queue.claim_producer(2, 10)
+
+        await self.queue.ack_producer_many(ids[:2])
+        await self.queue.ack_producer_many([])
+        await self.queue.nack_producer(ids[2])
+
+        self.assertEqual([ids[2]], [row[0] for row in await self.queue.claim_producer(2, 10)])
+
+    async def test_nack_producer(self):
+        first = await self.queue.enqueue_producer("foo", BrokerMessageStrategy.UNICAST, b"one")
+        await self.queue.claim_producer(2, 1)
+        second = await self.queue.enqueue_producer("foo", BrokerMessageStrategy.UNICAST, b"two")
+
+        await self.queue.nack_producer(first)
+
+        rows = await self.queue.claim_producer(2, 10)
+        self.assertEqual([(first, 1), (second, 0)], [(row[0], row[4]) for row in rows])
+
+        await self.queue.nack_producer(first)
+        self.assertEqual(list(), await self.queue.claim_producer(2, 10))
+        self.assertEqual(1, await self.queue.count_producer(3))
+
+    async def test_get_producer_metrics(self):
+        self.assertEqual((0, 0.0), await self.queue.get_producer_metrics(2))
+
+        await self.queue.enqueue_producer("foo", BrokerMessageStrategy.UNICAST, b"one")
+        await self.queue.enqueue_producer("foo", BrokerMessageStrategy.UNICAST, b"two")
+
+        depth, age = await self.queue.get_producer_metrics(2)
+        self.assertEqual(2, depth)
+        self.assertGreaterEqual(age, 0)
+
+    async def test_enqueue_claim_consumer(self):
+        first = await self.queue.enqueue_consumer("foo", 0, b"one")
+        second = await self.queue.enqueue_consumer("bar", 1, b"two")
+        third = await self.queue.enqueue_consumer("foo", 0, b"three")
+        await self.queue.enqueue_consumer("other", 0, b"four")
+        self.assertEqual(3, await self.queue.count_consumer(["foo", "bar"], 2))
+        self.assertEqual(0, await self.queue.count_consumer([], 2))
+
+        rows = await self.queue.claim_consumer(["foo", "bar"], 2, 10)
+
+        self.assertEqual([first, second, third], [row[0] for row in rows])
+        self.assertEqual(("bar", 1, b"two", 0), rows[1][1:5])
+        self.assertEqual(list(), await self.queue.claim_consumer([], 2, 10))
+        self.assertEqual(0, await self.queue.count_consumer(["foo", "bar"], 2))
+        self.assertEqual(1, await self.queue.count_consumer(["other"], None))
+
+    async def test_nack_consumer(self):
+        id_ = await self.queue.enqueue_consumer("foo", 0, b"one")
+        for _ in range(3):
+            await self.queue.claim_consumer(["foo"], None, 10)
+            await self.queue.nack_consumer(id_)
+
+        self.assertEqual(list(), await self.queue.claim_consumer(["foo"], 2, 10))
+        self.assertEqual([(id_, 3)], [(row[0], row[4]) for row in await self.queue.claim_consumer(["foo"], None, 10)])
+
+    async def test_ack_consumer(self):
+        id_ = await self.queue.enqueue_consumer("foo", 0, b"one")
+        await self.queue.claim_consumer(["foo"], 2, 10)
+
+        await self.queue.ack_consumer(id_)
+
+        self.assertEqual(0, await self.queue.count_consumer(["foo"], None))
+
+    async def test_get_consumer_metrics(self):
+        await self.queue.enqueue_consumer("foo", 0, b"one")
+        await self.queue.enqueue_consumer("foo", 0, b"two")
+        await self.queue.enqueue_consumer("bar", 0, b"three")
+        await self.queue.claim_consumer(["bar"], 2, 10)
+
+        metrics = await self.queue.get_consumer_metrics(2)
+
+        self.assertEqual([("foo", 2)], [(topic, depth) for topic, depth, _ in metrics])
+
+    async def test_wait_consumer(self):
+        task = create_task(self.queue.wait_consumer(["foo"], 2))
+        await self.queue.enqueue_consumer("bar", 0, b"one")
+        await sleep(0.01)
+        self.assertFalse(task.done())
+
+        await self.queue.enqueue_consumer("foo", 0, b"two")
+        await wait_for(task, 1)
+
+    async def test_durability(self):
+        await self.queue.enqueue_producer("foo", BrokerMessageStrategy.UNICAST, b"one")
+        await self.queue.enqueue_consumer("bar", 0, b"two")
+        await self.queue.claim_consumer(["bar"], 2, 10)
+        await self.queue.destroy()
+
+        # The claimed entries are released, as the process that claimed them is not running anymore.
+        async with SQLiteBrokerQueue(self.path) as queue:
+            self.assertEqual([b"one"], [row[2] for row in await queue.claim_producer(2, 10)])
+            self.assertEqual([b"two"], [row[3] for row in await queue.claim_consumer(["bar"], 2, 10)])
+
+    async def test_compaction(self):
+        await self.queue.destroy()
+        self.queue = SQLiteBrokerQueue(self.path, compaction_threshold=100)
+        await self.queue.setup()
+
+        for _ in range(3):
+            await gather(*(self.queue.enqueue_consumer("foo", 0, bytes(4096)) for _ in range(100)))
+            rows = await self.queue.claim_consumer(["foo"], 2, 100)
+            await gather(*(self.queue.ack_consumer(row[0]) for row in rows))
+
+        with closing(sqlite3.connect(self.path)) as connection:
+            self.assertEqual(0, connection.execute("PRAGMA freelist_count").fetchone()[0])
+
+    async def test_compact(self):
+        ids = await gather(*(self.queue.enqueue_consumer("foo", 0, bytes(4096)) for _ in range(10)))
+        await self.queue.claim_consumer(["foo"], 2, 10)
+        await gather(*(self.queue.ack_consumer(id_) for id_ in ids))
+        before = self.path.stat().st_size + Path(f"{self.path}-wal").stat().st_size
+
+        await self.queue.compact()
+
+        after = self.path.stat().st_size + Path(f"{self.path}-wal").stat().st_size
+        self.assertLess(after, before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,258 @@
+import json
+import threading
+import time
+import unittest
+from pathlib import (
+    Path,
+)
+from tempfile import (
+    TemporaryDirectory,
+)
+from unittest.mock import (
+    AsyncMock,
+    MagicMock,
+    patch,
+)
+
+from minos.common import (
+    MinosConfig,
+)
+from minos.networks import (
+    PUBLISHED_AT_HEADER,
+    TRACE_CONTEXT_VAR,
+    TRACEPARENT_HEADER,
+    BrokerHandler,
+    BrokerHandlerEntry,
+    BrokerMessage,
+    BrokerProducer,
+    BrokerPublisher,
+    BrokerSpan,
+    BrokerSpanKind,
+    BrokerTraceContext,
+    BrokerTracer,
+    InMemoryBrokerSpanExporter,
+    OtlpFileBrokerSpanExporter,
+    Response,
+    get_broker_tracer,
+    set_broker_tracer,
+)
+from tests.utils import (
+    BASE_PATH,
+)
+
+
+class TestBrokerTraceContext(unittest.TestCase):
+    def test_new(self):
+        context = BrokerTraceContext.new()
+        self.assertEqual(32, len(context.trace_id))
+        self.assertEqual(16, len(context.span_id))
+        self.assertIsNone(context.parent_id)
+        self.assertTrue(context.sampled)
+
+    def test_child(self):
+        context = BrokerTraceContext.new(sampled=False)
+        child = context.child()
+        self.assertEqual(context.trace_id, child.trace_id)
+        self.assertEqual(context.span_id, child.parent_id)
+        self.assertNotEqual(context.span_id, child.span_id)
+        self.assertFalse(child.sampled)
+
+    def test_traceparent(self):
+        context = BrokerTraceContext("4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7")
+        self.assertEqual("00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01", context.to_traceparent())
+        self.assertEqual(context, BrokerTraceContext.from_traceparent(context.to_traceparent()))
+
+    def test_from_traceparent_invalid(self):
+        self.assertIsNone(BrokerTraceContext.from_traceparent(None))
+        self.assertIsNone(BrokerTraceContext.from_traceparent("foo"))
+        self.assertIsNone(
+            BrokerTraceContext.from_traceparent("00-4bf92f3577b34da6a3ce929d0e0e473z-00f067aa0ba902b7-01")
+        )
+
+
+class TestBrokerTracer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.exporter = InMemoryBrokerSpanExporter()
+        self.tracer = BrokerTracer(self.exporter)
+
+    def test_constructor(self):
+        self.assertFalse(BrokerTracer().enabled)
+        self.assertTrue(self.tracer.enabled)
+        with self.assertRaises(ValueError):
+            BrokerTracer(sample_rate=2)
+
+    def test_from_config(self):
+        config = MinosConfig(BASE_PATH / "test_config.yml")
+        self.assertFalse(BrokerTracer.from_config(config).enabled)
+        self.assertIs(self.exporter, BrokerTracer.from_config(config, exporter=self.exporter).exporter)
+
+    def test_inject(self):
+        headers = dict()
+        context = self.tracer.inject(headers, 1.5)
+
+        self.assertEqual(context.to_traceparent(), headers[TRACEPARENT_HEADER])
+        self.assertEqual(1.5, self.tracer.get_published_at(headers))
+        self.assertEqual(context, self.tracer.extract(headers))
+
+    def test_inject_child(self):
+        parent = BrokerTraceContext.new()
+        headers = {TRACEPARENT_HEADER: parent.to_traceparent()}
+        self.assertEqual(parent.span_id, self.tracer.inject(headers, 1.5).parent_id)
+
+        handling = BrokerTraceContext.new()
+        token = TRACE_CONTEXT_VAR.set(handling)
+        try:
+            self.assertEqual(handling.span_id, self.tracer.inject(headers, 1.5).parent_id)
+        finally:
+            TRACE_CONTEXT_VAR.reset(token)
+
+    def test_inject_sampled(self):
+        tracer = BrokerTracer(self.exporter, sample_rate=0.5)
+        with patch("random.random", return_value=0.75):
+            context = tracer.inject(dict(), 1.5)
+        self.assertFalse(context.sampled)
+        self.assertIsNone(tracer.record("foo", context, 1.0, 2.0))
+        self.assertEqual(list(), self.exporter.spans)
+
+    def test_record(self):
+        context = BrokerTraceContext.new()
+        span = self.tracer.record("foo", context, 1.0, 2.5, BrokerSpanKind.CONSUMER, {"bar": 1})
+
+        self.assertEqual([span], self.exporter.spans)
+        self.assertEqual(1.5, span.duration)
+        self.assertIsNone(self.tracer.record("foo", context, None, 2.5))
+
+        self.exporter.clear()
+        self.assertEqual(list(), self.exporter.spans)
+
+    def test_get_set_tracer(self):
+        set_broker_tracer(self.tracer)
+        try:
+            self.assertIs(self.tracer, get_broker_tracer())
+        finally:
+            set_broker_tracer(None)
+        self.assertFalse(get_broker_tracer().enabled)
+
+
+class TestOtlpFileBrokerSpanExporter(unittest.TestCase):
+    def test_export(self):
+        context = BrokerTraceContext.new().child()
+        span = BrokerSpan("foo", context, 1.0, 2.0, BrokerSpanKind.PRODUCER, {"bar": "baz", "qux": 3})
+
+        with TemporaryDirectory() as directory:
+            exporter = OtlpFileBrokerSpanExporter(Path(directory) / "traces.jsonl", service_name="orders", batch_size=2)
+            exporter.export([span])
+            self.assertFalse(exporter.path.exists())
+
+            exporter.export([span])
+            exporter.export([span])
+            exporter.close()
+
+            lines = exporter.path.read_text().splitlines()
+
+        self.assertEqual(2, len(lines))
+        request = json.loads(lines[0])
+        (resource_spans,) = request["resourceSpans"]
+        self.assertEqual(
+            [{"key": "service.name", "value": {"stringValue": "orders"}}], resource_spans["resource"]["attributes"]
+        )
+        observed = resource_spans["scopeSpans"][0]["spans"]
+        self.assertEqual(2, len(observed))
+        self.assertEqual(
+            {
+                "traceId": context.trace_id,
+                "spanId": context.span_id,
+                "parentSpanId": context.parent_id,
+                "name": "foo",
+                "kind": 4,
+                "startTimeUnixNano": "1000000000",
+                "endTimeUnixNano": "2000000000",
+                "attributes": [
+                    {"key": "bar", "value": {"stringValue": "baz"}},
+                    {"key": "qux", "value": {"intValue": "3"}},
+                ],
+            },
+            observed[0],
+        )
+
+    def test_flush_in_background(self):
+        threads = list()
+        span = BrokerSpan("foo", BrokerTraceContext.new(), 1.0, 2.0)
+
+        with TemporaryDirectory() as directory:
+            exporter = OtlpFileBrokerSpanExporter(Path(directory) / "traces.jsonl")
+            with patch.object(exporter, "_write", side_effect=lambda spans: threads.append(threading.get_ident())):
+                exporter.export([span])
+                exporter.flush()
+                exporter.close()
+
+        self.assertEqual(1, len(threads))
+        self.assertNotEqual(threading.get_ident(), threads[0])
+
+
+class TestBrokerTracing(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.config = MinosConfig(BASE_PATH / "test_config.yml")
+        self.exporter = InMemoryBrokerSpanExporter()
+        set_broker_tracer(BrokerTracer(self.exporter))
+
+        self.publisher = BrokerPublisher.from_config(config=self.config)
+        self.publisher.enqueue = AsyncMock(return_value=1)
+
+    def tearDown(self) -> None:
+        set_broker_tracer(None)
+        super().tearDown()
+
+    async def test_publish(self):
+        headers = {"foo": "bar"}
+        await self.publisher.send("foo", "AddOrder", headers=headers)
+
+        message = BrokerMessage.from_avro_bytes(self.publisher.enqueue.call_args.args[2])
+        self.assertEqual({"foo": "bar"}, headers)
+        self.assertEqual({"foo", TRACEPARENT_HEADER, PUBLISHED_AT_HEADER}, set(message.headers))
+
+        (span,) = self.exporter.spans
+        self.assertEqual("publish", span.name)
+        self.assertEqual(BrokerSpanKind.PRODUCER, span.kind)
+        self.assertEqual(span.context, BrokerTraceContext.from_traceparent(message.headers[TRACEPARENT_HEADER]))
+
+    async def test_produce(self):
+        await self.publisher.send("foo", "AddOrder")
+        raw = self.publisher.enqueue.call_args.args[2]
+
+        producer = BrokerProducer.from_config(config=self.config, consumer=MagicMock(topics=set()))
+        producer.publish = AsyncMock(return_value=True)
+        self.assertTrue(await producer.dispatch_one((1, "AddOrder", raw, "unicast")))
+
+        publish, queued, produce = self.exporter.spans
+        self.assertEqual(["producer_queue", "produce"], [queued.name, produce.name])
+        self.assertEqual(publish.context.span_id, queued.context.parent_id)
+        self.assertEqual(publish.context.span_id, produce.context.parent_id)
+        self.assertTrue(produce.attributes["minos.published"])
+
+    async def test_handle_and_reply(self):
+        await self.publisher.send("foo", "AddOrder", reply_topic="AddOrderReply")
+        raw = self.publisher.enqueue.call_args.args[2]
+
+        async def _fn(request):
+            return Response("bar")
+
+        handler = BrokerHandler.from_config(config=self.config, handlers={"AddOrder": _fn}, publisher=self.publisher)
+        entry = BrokerHandlerEntry(1, "AddOrder", 0, raw, callback_lookup=handler.get_action, fetched_at=time.time())
+        await handler.dispatch_one(entry)
+
+        spans = {span.name: span for span in self.exporter.spans if span.name != "publish"}
+        request, reply = [span for span in self.exporter.spans if span.name == "publish"]
+        self.assertEqual({"transport", "consumer_queue", "handler_queue", "handle"}, set(spans))
+        for span in spans.values():
+            self.assertEqual(request.context.trace_id, span.context.trace_id)
+            self.assertEqual(request.context.span_id, span.context.parent_id)
+
+        self.assertEqual(spans["handle"].context.span_id, reply.context.parent_id)
+        self.assertEqual(request.attributes["messaging.message.id"], reply.attributes["messaging.message.id"])
+        self.assertEqual("AddOrderReply", reply.attributes["messaging.destination.name"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+from asyncio import (
+    CancelledError,
+    Event,
+    create_task,
+    gather,
+    sleep,
+)
+from uuid import (
+    uuid4,
+)
+
+from minos.networks import (
+    InMemoryRequest,
+    RequestCoalescer,
+    Response,
+)
+from tests.utils import (
+    FakeModel,
+)
+
+
+class TestRequestCoalescer(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.calls = list()
+        self.coalescer = RequestCoalescer(self._fn)
+
+    async def _fn(self, request):
+        self.calls.append(request)
+        await sleep(0.01)
+        if await request.content() == "error":
+            raise ValueError("error")
+        return Response(await request.content())
+
+    def test_fn(self):
+        self.assertEqual(self._fn, self.coalescer.fn)
+
+    async def test_run(self):
+        self.assertEqual(Response("foo"), await self.coalescer.run(InMemoryRequest("foo")))
+        self.assertEqual(1, len(self.calls))
+
+    async def test_run_concurrent(self):
+        observed = await gather(*(self.coalescer.run(InMemoryRequest("foo")) for _ in range(5)))
+
+        self.assertEqual([Response("foo")] * 5, observed)
+        self.assertEqual(1, len(self.calls))
+        self.assertEqual({"in_flight": 0, "executions": 1, "coalesced": 4}, self.coalescer.metrics)
+
+    async def test_run_concurrent_different(self):
+        user = uuid4()
+        requests = [
+            InMemoryRequest("foo"),
+            InMemoryRequest("bar"),
+            InMemoryRequest("foo", user=user),
+            InMemoryRequest("foo", params={"page": 2}),
+            InMemoryRequest(1),
+            InMemoryRequest(True),
+        ]
+        observed = await gather(*(self.coalescer.run(request) for request in requests))
+
+        expected = [Response("foo"), Response("bar"), Response("foo"), Response("foo"), Response(1), Response(True)]
+        self.assertEqual(expected, observed)
+        self.assertEqual(6, len(self.calls))
+
+    async def test_run_sequential(self):
+        await self.coalescer.run(InMemoryRequest("foo"))
+        await self.coalescer.run(InMemoryRequest("foo"))
+
+        self.assertEqual(2, len(self.calls))
+        self.assertEqual(0, self.coalescer.in_flight)
+
+    async def test_run_raises(self):
+        observed = await gather(
+            *(self.coalescer.run(InMemoryRequest("error")) for _ in range(3)), return_exceptions=True
+        )
+
+        self.assertEqual(1, len(self.calls))
+        for exc in observed:
+            self.assertIsInstance(exc, ValueError)
+        self.assertEqual(0, self.coalescer.in_flight)
+
+    async def test_run_leader_cancelled(self):
+        leader = create_task(self.coalescer.run(InMemoryRequest("foo")))
+        await sleep(0)
+        follower = create_task(self.coalescer.run(InMemoryRequest("foo")))
+        await sleep(0)
+        leader.cancel()
+
+        with self.assertRaises(CancelledError):
+            await leader
+        self.assertEqual(Response("foo"), await follower)
+        self.assertEqual(1, len(self.calls))
+
+    async def test_run_streamed(self):
+        event = Event()
+
+        async def _items():
+            yield 1
+
+        async def _fn(request):
+            self.calls.append(request)
+            await event.wait()
+            return Response(_items())
+
+        coalescer = RequestCoalescer(_fn)
+        tasks = [create_task(coalescer.run(InMemoryRequest("foo"))) for _ in range(3)]
+        await sleep(0)
+        event.set()
+        observed = await gather(*tasks)
+
+        self.assertEqual(3, len(self.calls))
+        self.assertEqual(3, len({id(response) for response in observed}))
+        self.assertEqual({"in_flight": 0, "executions": 3, "coalesced": 0}, coalescer.metrics)
+
+    async def test_build_key(self):
+        observed = await self.coalescer.build_key(InMemoryRequest({"b": [1, 2], "a": FakeModel("foo")}))
+        expected = await self.coalescer.build_key(InMemoryRequest({"a": FakeModel("foo"), "b": [1, 2]}))
+        self.assertEqual(expected, observed)
+
+    async def test_build_key_without_content(self):
+        self.assertIsNotNone(await self.coalescer.build_key(InMemoryRequest()))
+
+    async def test_build_key_unhashable(self):
+        self.assertIsNone(await self.coalescer.build_key(InMemoryRequest(bytearray(b"foo"))))
+
+    async def test_run_unhashable(self):
+        coalescer = RequestCoalescer(self._fn)
+        await gather(*(coalescer.run(InMemoryRequest(bytearray(b"foo"))) for _ in range(2)))
+        self.assertEqual(2, len(self.calls))
+
+    def test_repr(self):
+        self.assertEqual(f"RequestCoalescer({self._fn!r})", repr(self.coalescer))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -45,6 +45,10 @@ class TestEnrouteAnalyzer(unittest.IsolatedAsyncioTestCase):
 
         self.assertEqual(expected, observed)
 
+    def test_get_all_cached(self):
+        analyzer = EnrouteAnalyzer(FakeService)
+        self.assertIs(analyzer.get_all(), analyzer.get_all())
+
     def test_get_rest_command_query(self):
         analyzer = EnrouteAnalyzer(FakeService)
 
@@ -1,4 +1,9 @@
+import threading
 import unittest
+from asyncio import (
+    gather,
+    sleep,
+)
 
 from minos.common import (
     classname,
@@ -7,7 +12,9 @@ from minos.networks import (
     BrokerCommandEnrouteDecorator,
     BrokerEventEnrouteDecorator,
     BrokerQueryEnrouteDecorator,
+    EnrouteAnalyzer,
     EnrouteBuilder,
+    HandlerProfiler,
     InMemoryRequest,
     MinosRedefinedEnrouteDecoratorException,
     PeriodicEventEnrouteDecorator,
@@ -34,6 +41,12 @@ class TestEnrouteBuilder(unittest.IsolatedAsyncioTestCase):
         builder = EnrouteBuilder(classname(FakeService))
         self.assertEqual((FakeService,), builder.classes)
 
+    def test_get_analyzer(self):
+        analyzer = self.builder.get_analyzer(FakeService)
+        self.assertIsInstance(analyzer, EnrouteAnalyzer)
+        self.assertEqual(FakeService, analyzer.decorated)
+        self.assertIs(analyzer, self.builder.get_analyzer(FakeService))
+
     async def test_get_rest_command_query(self):
         handlers = self.builder.get_rest_command_query()
         self.assertEqual(3, len(handlers))
@@ -111,6 +124,170 @@ class TestEnrouteBuilder(unittest.IsolatedAsyncioTestCase):
         observed = await handlers[BrokerCommandEnrouteDecorator("DeleteTicket")](self.request)
         self.assertEqual(expected, observed)
 
+    async def test_sync_handler_off_loop(self):
+        threads = list()
+
+        class _Service:
+            @enroute.rest.command(url="orders/", method="GET")
+            def _fn(self, request):
+                threads.append(threading.get_ident())
+                return Response("bar")
+
+        handlers = EnrouteBuilder(_Service).get_rest_command_query()
+        observed = await handlers[RestCommandEnrouteDecorator("orders/", "GET")](self.request)
+
+        self.assertEqual(Response("bar"), observed)
+        self.assertEqual(1, len(threads))
+        self.assertNotIn(threading.get_ident(), threads)
+
+    async def test_instances_shared(self):
+        instances = list()
+
+        class _Service:
+            def __init__(self):
+                instances.append(self)
+
+            @enroute.rest.command(url="orders/", method="GET")
+            @enroute.broker.command(topic="CreateOrder")
+            def _fn1(self, request):
+                return Response(id(self))
+
+            @enroute.rest.command(url="orders/", method="DELETE")
+            @enroute.broker.command(topic="DeleteOrder")
+            def _fn2(self, request):
+                return Response(id(self))
+
+        builder = EnrouteBuilder(_Service)
+        rest_handlers = builder.get_rest_command_query()
+        broker_handlers = builder.get_broker_command_query_event()
+
+        self.assertEqual(1, len(instances))
+        expected = Response(id(instances[0]))
+        for fn in (*rest_handlers.values(), *broker_handlers.values()):
+            self.assertEqual(expected, await fn(self.request))
+
+    async def test_pipeline_hooks(self):
+        calls = list()
+
+        class _Service:
+            @staticmethod
+            async def _pre_command_handle(request):
+                calls.append("pre")
+                return InMemoryRequest(f"{await request.content()}-pre")
+
+            @staticmethod
+            async def _post_command_handle(response):
+                calls.append("post")
+                return Response(f"{await response.content()}-post")
+
+            @enroute.rest.command(url="orders/", method="GET")
+            async def _fn(self, request):
+                calls.append("handle")
+                return Response(f"{await request.content()}-handle")
+
+        handlers = EnrouteBuilder(_Service).get_rest_command_query()
+        observed = await handlers[RestCommandEnrouteDecorator("orders/", "GET")](self.request)
+
+        self.assertEqual(Response("test-pre-handle-post"), observed)
+        self.assertEqual(["pre", "handle", "post"], calls)
+
+    async def test_pipeline_without_hooks(self):
+        class _Service:
+            @enroute.rest.command(url="orders/", method="GET")
+            async def _fn(self, request):
+                return Response("bar")
+
+        handlers = EnrouteBuilder(_Service).get_rest_command_query()
+        handler = handlers[RestCommandEnrouteDecorator("orders/", "GET")]
+
+        self.assertEqual(Response("bar"), await handler(self.request))
+        self.assertEqual("_fn", handler.__name__)
+
+    async def test_middleware(self):
+        calls = list()
+
+        def _build_middleware(name):
+            async def _middleware(request, inner):
+                calls.append(f"{name}-pre")
+                response = await inner(request)
+                calls.append(f"{name}-post")
+                return response
+
+            return _middleware
+
+        class _Service:
+            @enroute.rest.command(url="orders/", method="GET")
+            async def _fn(self, request):
+                calls.append("handle")
+                return Response("bar")
+
+        builder = EnrouteBuilder(_Service, middleware=[_build_middleware("first"), _build_middleware("second")])
+        handler = builder.get_rest_command_query()[RestCommandEnrouteDecorator("orders/", "GET")]
+
+        self.assertEqual(Response("bar"), await handler(self.request))
+        self.assertEqual(["first-pre", "second-pre", "handle", "second-post", "first-post"], calls)
+        self.assertEqual("_fn", handler.__name__)
+
+    async def test_coalesce(self):
+        calls = list()
+
+        async def _middleware(request, inner):
+            calls.append("middleware")
+            return await inner(request)
+
+        class _Service:
+            @enroute.rest.query(url="tickets/", method="GET", coalesce=True)
+            @enroute.broker.query(topic="GetTickets", coalesce=True)
+            async def _fn(self, request):
+                calls.append("handle")
+                await sleep(0.01)
+                return Response(await request.content())
+
+        builder = EnrouteBuilder(_Service, middleware=_middleware)
+        for handler in (
+            builder.get_rest_command_query()[RestQueryEnrouteDecorator("tickets/", "GET")],
+            builder.get_broker_command_query()[BrokerQueryEnrouteDecorator("GetTickets")],
+        ):
+            calls.clear()
+            observed = await gather(*(handler(InMemoryRequest("test")) for _ in range(3)))
+
+            self.assertEqual([Response("test")] * 3, observed)
+            self.assertEqual(3, calls.count("middleware"))
+            self.assertEqual(1, calls.count("handle"))
+
+    async def test_coalesce_disabled(self):
+        calls = list()
+
+        class _Service:
+            @enroute.rest.query(url="tickets/", method="GET")
+            async def _fn(self, request):
+                calls.append("handle")
+                await sleep(0.01)
+                return Response("bar")
+
+        handler = EnrouteBuilder(_Service).get_rest_command_query()[RestQueryEnrouteDecorator("tickets/", "GET")]
+        await gather(*(handler(self.request) for _ in range(3)))
+
+        self.assertEqual(3, len(calls))
+
+    async def test_profiler(self):
+        profiler = HandlerProfiler(enabled=True)
+        builder = EnrouteBuilder(FakeService, profiler=profiler)
+        self.assertIs(profiler, builder.profiler)
+
+        rest, broker = profiler.start("GET tickets/"), profiler.start("CreateTicket")
+
+        handlers = builder.get_rest_command_query()
+        await handlers[RestQueryEnrouteDecorator("tickets/", "GET")](self.request)
+        await handlers[RestCommandEnrouteDecorator("orders/", "GET")](self.request)
+        self.assertEqual(1, rest.sampled)
+        self.assertIn("get_tickets", rest.render())
+
+        handlers = builder.get_broker_command_query()
+        await handlers[BrokerCommandEnrouteDecorator("CreateTicket")](self.request)
+        self.assertEqual(1, broker.sampled)
+        self.assertIn("create_ticket", broker.render())
+
     def test_raises(self):
         class _BadService:
             @enroute.rest.command(url="orders/", method="GET")
@@ -1,3 +1,6 @@
+import asyncio
+import gc
+import threading
 import unittest
 from unittest.mock import (
     AsyncMock,
@@ -5,11 +8,14 @@ from unittest.mock import (
 )
 
 from minos.networks import (
+    BrokerMessage,
+    BrokerRequest,
     CheckerMeta,
     CheckerWrapper,
     InMemoryRequest,
     NotSatisfiedCheckerException,
     Request,
+    run_topic_hooks,
 )
 
 
@@ -35,6 +41,141 @@ class TestCheckerMeta(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(_fn, self.meta.func)
         self.assertEqual(self.max_attempts, self.meta.max_attempts)
         self.assertEqual(self.delay, self.meta.delay)
+        self.assertEqual(1.0, self.meta.backoff)
+        self.assertEqual(None, self.meta.max_delay)
+        self.assertEqual(0.0, self.meta.jitter)
+        self.assertEqual(None, self.meta.timeout)
+        self.assertEqual(None, self.meta.cache_ttl)
+        self.assertEqual(None, self.meta.cache_key)
+        self.assertEqual(frozenset(), self.meta.wake_up_topics)
+
+    def test_constructor_raises(self):
+        with self.assertRaises(ValueError):
+            CheckerMeta(_fn, self.max_attempts, self.delay, backoff=0.5)
+        with self.assertRaises(ValueError):
+            CheckerMeta(_fn, self.max_attempts, self.delay, jitter=2)
+        with self.assertRaises(ValueError):
+            CheckerMeta(_fn, self.max_attempts, self.delay, cache_ttl=60)
+
+    def test_delays(self):
+        meta = CheckerMeta(_fn, 5, 0.1, backoff=2, max_delay=0.5)
+        # noinspection PyProtectedMember
+        self.assertEqual([0.1, 0.2, 0.4, 0.5, None], list(meta._delays()))
+
+    def test_delays_jitter(self):
+        meta = CheckerMeta(_fn, 3, 1, jitter=0.5)
+        # noinspection PyProtectedMember
+        observed = list(meta._delays())
+        self.assertEqual(3, len(observed))
+        self.assertIsNone(observed[-1])
+        for delay in observed[:-1]:
+            self.assertTrue(0.5 <= delay <= 1)
+
+    async def test_wrapper_async_call_timeout(self):
+        mock = AsyncMock(return_value=False)
+        meta = CheckerMeta(mock, 100, 0.05, timeout=0.12)
+        self.assertEqual(False, await meta.wrapper(InMemoryRequest(False)))
+        self.assertLess(mock.call_count, 5)
+
+    def test_wrapper_sync_call_timeout(self):
+        mock = MagicMock(return_value=False)
+        meta = CheckerMeta(mock, 100, 0.05, timeout=0.12)
+        self.assertEqual(False, meta.wrapper(InMemoryRequest(False)))
+        self.assertLess(mock.call_count, 5)
+
+    async def test_wrapper_async_call_cached(self):
+        mock = AsyncMock(return_value=True)
+        meta = CheckerMeta(mock, self.max_attempts, self.delay, cache_ttl=60, cache_key=str)
+        self.assertEqual(True, await meta.wrapper("foo"))
+        self.assertEqual(True, await meta.wrapper("foo"))
+        self.assertEqual(True, await meta.wrapper("bar"))
+        self.assertEqual(2, mock.call_count)
+
+    async def test_wrapper_async_call_cached_expired(self):
+        mock = AsyncMock(return_value=True)
+        meta = CheckerMeta(mock, self.max_attempts, self.delay, cache_ttl=0.01, cache_key=str)
+        self.assertEqual(True, await meta.wrapper("foo"))
+        await asyncio.sleep(0.02)
+        self.assertEqual(True, await meta.wrapper("foo"))
+        self.assertEqual(2, mock.call_count)
+
+    async def test_wrapper_async_call_cached_key(self):
+        mock = AsyncMock(return_value=True)
+        meta = CheckerMeta(mock, self.max_attempts, self.delay, cache_ttl=60, cache_key=lambda r: r.has_content)
+        self.assertEqual(True, await meta.wrapper(InMemoryRequest(True)))
+        self.assertEqual(True, await meta.wrapper(InMemoryRequest(False)))
+        self.assertEqual(1, mock.call_count)
+
+    async def test_wrapper_async_call_cached_request(self):
+        mock = AsyncMock(return_value=True)
+        meta = CheckerMeta(mock, self.max_attempts, self.delay, cache_ttl=60, cache_key=lambda r: r.raw.topic)
+        self.assertEqual(True, await meta.wrapper(BrokerRequest(BrokerMessage("FooCreated", "foo"))))
+        self.assertEqual(True, await meta.wrapper(BrokerRequest(BrokerMessage("FooCreated", "bar"))))
+        self.assertEqual(True, await meta.wrapper(BrokerRequest(BrokerMessage("FooUpdated", "foo"))))
+        self.assertEqual(2, mock.call_count)
+
+    def test_wrapper_sync_call_cached(self):
+        mock = MagicMock(return_value=True)
+        meta = CheckerMeta(mock, self.max_attempts, self.delay, cache_ttl=60, cache_key=str)
+        self.assertEqual(True, meta.wrapper("foo"))
+        self.assertEqual(True, meta.wrapper("foo"))
+        self.assertEqual(1, mock.call_count)
+
+    def test_wrapper_sync_call_cached_concurrently(self):
+        meta = CheckerMeta(MagicMock(return_value=True), self.max_attempts, self.delay, cache_ttl=60, cache_key=str)
+        meta._CACHE_MAX_SIZE = 8
+        errors = list()
+
+        def _run(offset: int) -> None:
+            try:
+                for i in range(2000):
+                    meta.wrapper(offset + i)
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=_run, args=(i * 2000,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(list(), errors)
+        # noinspection PyProtectedMember
+        self.assertLessEqual(len(meta._cache), 8)
+
+    async def test_wake_up(self):
+        mock = AsyncMock(side_effect=[False, True])
+        meta = CheckerMeta(mock, self.max_attempts, 60)
+
+        task = asyncio.create_task(meta.wrapper(InMemoryRequest(True)))
+        await asyncio.sleep(0.01)
+        meta.wake_up()
+
+        self.assertEqual(True, await asyncio.wait_for(task, 1))
+        self.assertEqual(2, mock.call_count)
+
+    async def test_wake_up_topic(self):
+        mock = AsyncMock(side_effect=[False, True])
+        meta = CheckerMeta(mock, self.max_attempts, 60, wake_up_topics={"TicketAdded"})
+
+        task = asyncio.create_task(meta.wrapper(InMemoryRequest(True)))
+        await asyncio.sleep(0.01)
+        run_topic_hooks("TicketAdded")
+
+        self.assertEqual(True, await asyncio.wait_for(task, 1))
+        self.assertEqual(2, mock.call_count)
+
+    def test_wake_up_topic_unregistered(self):
+        meta = CheckerMeta(MagicMock(), self.max_attempts, 60, wake_up_topics={"TicketRemoved"})
+        # noinspection PyProtectedMember
+        self.assertEqual([meta], list(CheckerMeta._WAKE_UP_REGISTRY["TicketRemoved"].values()))
+
+        del meta
+        gc.collect()
+
+        # noinspection PyProtectedMember
+        self.assertEqual([], list(CheckerMeta._WAKE_UP_REGISTRY["TicketRemoved"].values()))
+        CheckerMeta.wake_up_topic("TicketRemoved")
 
     async def test_wrapper_async(self):
         meta = CheckerMeta(_async_fn, self.max_attempts, self.delay)
@@ -89,6 +230,17 @@ class TestCheckerMeta(unittest.IsolatedAsyncioTestCase):
         meta = CheckerMeta(mock, self.max_attempts, self.delay)
         self.assertEqual(True, await meta.async_wrapper(InMemoryRequest(True)))
 
+    async def test_async_wrapper_sync_off_loop(self):
+        threads = list()
+
+        def _fn(request: Request) -> bool:
+            threads.append(threading.get_ident())
+            return True
+
+        meta = CheckerMeta(_fn, self.max_attempts, self.delay)
+        self.assertEqual(True, await meta.async_wrapper(InMemoryRequest(True)))
+        self.assertNotIn(threading.get_ident(), threads)
+
     def test_sync_wrapper_async_raises(self):
         mock = AsyncMock(return_value=True)
         meta = CheckerMeta(mock, self.max_attempts, self.delay)
@@ -120,7 +272,11 @@ class TestCheckerMeta(unittest.IsolatedAsyncioTestCase):
             CheckerMeta.run_sync({m1, m2}, InMemoryRequest(True))
 
     def test_repr(self):
-        self.assertEqual(f"CheckerMeta({_fn!r}, {self.max_attempts!r}, {self.delay!r})", repr(self.meta))
+        self.assertEqual(
+            f"CheckerMeta({_fn!r}, {self.max_attempts!r}, {self.delay!r}, 1.0, None, 0.0, None, None, None, "
+            f"{frozenset()!r})",
+            repr(self.meta),
+        )
 
     def test_eq(self):
         self.assertEqual(
@@ -133,10 +289,12 @@ class TestCheckerMeta(unittest.IsolatedAsyncioTestCase):
         self.assertNotEqual(CheckerMeta(_fn, self.max_attempts, 1), CheckerMeta(_fn, self.max_attempts, 2))
 
     def test_iter(self):
-        self.assertEqual((_fn, self.max_attempts, self.delay), tuple(self.meta))
+        expected = (_fn, self.max_attempts, self.delay, 1.0, None, 0.0, None, None, None, frozenset())
+        self.assertEqual(expected, tuple(self.meta))
 
     def test_hash(self):
-        self.assertEqual(hash((_fn, self.max_attempts, self.delay)), hash(self.meta))
+        expected = hash((_fn, self.max_attempts, self.delay, 1.0, None, 0.0, None, None, None, frozenset()))
+        self.assertEqual(expected, hash(self.meta))
 
 
 if __name__ == "__main__":
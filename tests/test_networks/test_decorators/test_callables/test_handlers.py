@@ -31,6 +31,11 @@ async def _async_fn(request: Request) -> Response:
     return Response(f"Async Fn: {await request.content()}")
 
 
+async def _async_gen_fn(request: Request):
+    """For testing purposes."""
+    yield Response(f"Async Gen Fn: {await request.content()}")
+
+
 class TestHandlerMeta(unittest.IsolatedAsyncioTestCase):
     def setUp(self) -> None:
         self.meta = HandlerMeta(_fn)
@@ -60,6 +65,14 @@ class TestHandlerMeta(unittest.IsolatedAsyncioTestCase):
             self.assertEqual(Response("Async Fn: foo"), await meta.wrapper(InMemoryRequest("foo")))
             self.assertEqual([call(meta.decorators, InMemoryRequest("foo"))], mock.call_args_list)
 
+    async def test_wrapper_async_gen_call(self):
+        meta = HandlerMeta(_async_gen_fn)
+        self.assertEqual(meta.async_wrapper, meta.wrapper)
+        with patch("minos.networks.CheckerMeta.run_async") as mock:
+            observed = [item async for item in await meta.wrapper(InMemoryRequest("foo"))]
+            self.assertEqual([Response("Async Gen Fn: foo")], observed)
+            self.assertEqual([call(meta.decorators, InMemoryRequest("foo"))], mock.call_args_list)
+
     async def test_wrapper_async_call_raises(self):
         meta = HandlerMeta(_async_fn)
         with patch("minos.networks.CheckerMeta.run_async", side_effect=NotSatisfiedCheckerException("")):
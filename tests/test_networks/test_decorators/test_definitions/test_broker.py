@@ -0,0 +1,26 @@
+import unittest
+
+from minos.networks import (
+    BrokerQueryEnrouteDecorator,
+)
+
+
+class TestBrokerQueryEnrouteDecorator(unittest.TestCase):
+    def test_constructor(self):
+        decorator = BrokerQueryEnrouteDecorator("GetTickets")
+        self.assertEqual("GetTickets", decorator.topic)
+        self.assertFalse(decorator.coalesce)
+
+    def test_constructor_coalesce(self):
+        decorator = BrokerQueryEnrouteDecorator("GetTickets", coalesce=True)
+        self.assertTrue(decorator.coalesce)
+
+    def test_identity_without_coalesce(self):
+        decorator = BrokerQueryEnrouteDecorator("GetTickets", coalesce=True)
+        self.assertEqual(BrokerQueryEnrouteDecorator("GetTickets"), decorator)
+        self.assertEqual(hash(BrokerQueryEnrouteDecorator("GetTickets")), hash(decorator))
+        self.assertEqual("BrokerQueryEnrouteDecorator('GetTickets')", repr(decorator))
+
+
+if __name__ == "__main__":
+    unittest.main()
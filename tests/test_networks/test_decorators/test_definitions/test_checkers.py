@@ -63,11 +63,38 @@ class TestEnrouteCheckDecorator(unittest.IsolatedAsyncioTestCase):
         decorator = CheckDecorator(self.handler_meta, self.max_attempts, timedelta(seconds=2, milliseconds=500))
         self.assertEqual(2.5, decorator.delay)
 
+    def test_timedelta(self):
+        decorator = CheckDecorator(
+            self.handler_meta,
+            max_delay=timedelta(seconds=3),
+            timeout=timedelta(seconds=10),
+            cache_ttl=timedelta(milliseconds=500),
+        )
+        self.assertEqual(3, decorator.max_delay)
+        self.assertEqual(10, decorator.timeout)
+        self.assertEqual(0.5, decorator.cache_ttl)
+
+    def test_decorate_extended(self):
+        decorator = CheckDecorator(
+            self.handler_meta,
+            backoff=2,
+            max_delay=5,
+            jitter=0.1,
+            timeout=30,
+            cache_ttl=1,
+            cache_key=str,
+            wake_up_topics=["Foo"],
+        )
+        observed = decorator(_fn).meta
+        self.assertEqual(CheckerMeta(_fn, 10, 0.1, 2, 5, 0.1, 30, 1, str, {"Foo"}), observed)
+
     def test_iter(self):
-        self.assertEqual((self.handler_meta, self.max_attempts, self.delay), tuple(self.decorator))
+        expected = (self.handler_meta, self.max_attempts, self.delay, 1.0, None, 0.0, None, None, None, None)
+        self.assertEqual(expected, tuple(self.decorator))
 
     def test_hash(self):
-        self.assertEqual(hash((self.handler_meta, self.max_attempts, self.delay)), hash(self.decorator))
+        expected = hash((self.handler_meta, self.max_attempts, self.delay, 1.0, None, 0.0, None, None, None, None))
+        self.assertEqual(expected, hash(self.decorator))
 
     def test_eq(self):
         self.assertEqual(
@@ -88,7 +115,9 @@ class TestEnrouteCheckDecorator(unittest.IsolatedAsyncioTestCase):
 
     def test_repr(self):
         self.assertEqual(
-            f"CheckDecorator({self.handler_meta!r}, {self.max_attempts!r}, {self.delay!r})", repr(self.decorator)
+            f"CheckDecorator({self.handler_meta!r}, {self.max_attempts!r}, {self.delay!r}, 1.0, None, 0.0, None, "
+            f"None, None, None)",
+            repr(self.decorator),
         )
 
 
@@ -0,0 +1,56 @@
+import unittest
+from datetime import (
+    timedelta,
+)
+
+from minos.networks import (
+    RestQueryEnrouteDecorator,
+)
+
+
+class TestRestQueryEnrouteDecorator(unittest.TestCase):
+    def test_constructor(self):
+        decorator = RestQueryEnrouteDecorator("tickets/", "GET")
+        self.assertEqual("tickets/", decorator.url)
+        self.assertEqual("GET", decorator.method)
+        self.assertIsNone(decorator.cache_ttl)
+        self.assertEqual(tuple(), decorator.cache_headers)
+        self.assertEqual(frozenset(), decorator.cache_invalidation_topics)
+        self.assertFalse(decorator.coalesce)
+
+    def test_constructor_cache(self):
+        decorator = RestQueryEnrouteDecorator(
+            "tickets/",
+            "GET",
+            cache_ttl=timedelta(minutes=1),
+            cache_headers=["X-Tenant"],
+            cache_invalidation_topics=["TicketAdded"],
+        )
+        self.assertEqual(60, decorator.cache_ttl)
+        self.assertEqual(("X-Tenant",), decorator.cache_headers)
+        self.assertEqual(frozenset({"TicketAdded"}), decorator.cache_invalidation_topics)
+
+    def test_constructor_coalesce(self):
+        decorator = RestQueryEnrouteDecorator("tickets/", "GET", coalesce=True)
+        self.assertTrue(decorator.coalesce)
+
+    def test_constructor_raises(self):
+        with self.assertRaises(ValueError):
+            RestQueryEnrouteDecorator("tickets/", "GET", cache_ttl=0)
+        with self.assertRaises(ValueError):
+            RestQueryEnrouteDecorator("tickets/", "GET", max_concurrency=0)
+
+    def test_constructor_route_options(self):
+        decorator = RestQueryEnrouteDecorator("tickets/", "GET", compress=False, max_concurrency=4)
+        self.assertFalse(decorator.compress)
+        self.assertEqual(4, decorator.max_concurrency)
+
+    def test_identity_without_cache_options(self):
+        decorator = RestQueryEnrouteDecorator("tickets/", "GET", cache_ttl=10, coalesce=True)
+        self.assertEqual(RestQueryEnrouteDecorator("tickets/", "GET"), decorator)
+        self.assertEqual(hash(RestQueryEnrouteDecorator("tickets/", "GET")), hash(decorator))
+        self.assertEqual("RestQueryEnrouteDecorator('tickets/', 'GET')", repr(decorator))
+
+
+if __name__ == "__main__":
+    unittest.main()
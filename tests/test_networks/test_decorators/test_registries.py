@@ -0,0 +1,140 @@
+import unittest
+from types import (
+    MappingProxyType,
+)
+
+from crontab import (
+    CronTab,
+)
+
+from minos.common import (
+    MinosConfig,
+)
+from minos.networks import (
+    BrokerEventEnrouteDecorator,
+    BrokerQueryEnrouteDecorator,
+    EnrouteRegistry,
+    HandlerProfiler,
+    InMemoryRequest,
+    PeriodicEventEnrouteDecorator,
+    Response,
+    RestCommandEnrouteDecorator,
+    RestQueryEnrouteDecorator,
+    set_handler_profiler,
+)
+from tests.utils import (
+    BASE_PATH,
+    FakeService,
+    fake_middleware,
+)
+
+
+class TestEnrouteRegistry(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.request = InMemoryRequest("test")
+        self.registry = EnrouteRegistry(FakeService, middleware=fake_middleware)
+
+    def tearDown(self) -> None:
+        EnrouteRegistry.clear()
+
+    def test_classes(self):
+        self.assertEqual((FakeService,), self.registry.classes)
+
+    def test_middleware(self):
+        self.assertEqual((fake_middleware,), self.registry.middleware)
+
+    def test_from_config(self):
+        config = MinosConfig(BASE_PATH / "test_config.yml")
+        registry = EnrouteRegistry.from_config(config)
+        self.assertIsInstance(registry, EnrouteRegistry)
+        self.assertEqual(registry, EnrouteRegistry.from_config(config))
+
+    def test_from_config_other_config(self):
+        registry = EnrouteRegistry.from_config(MinosConfig(BASE_PATH / "test_config.yml"))
+        other = EnrouteRegistry.from_config(MinosConfig(BASE_PATH / "test_config.yml"))
+
+        self.assertNotEqual(registry, other)
+        # noinspection PyProtectedMember
+        self.assertNotEqual(registry._config, other._config)
+
+    def test_from_config_profiler(self):
+        config = MinosConfig(BASE_PATH / "test_config.yml")
+        registry = EnrouteRegistry.from_config(config)
+        profiler = HandlerProfiler()
+        set_handler_profiler(profiler)
+        try:
+            observed = EnrouteRegistry.from_config(config)
+        finally:
+            set_handler_profiler(None)
+
+        self.assertNotEqual(registry, observed)
+        self.assertEqual(profiler, observed._builder.profiler)
+
+    def test_clear(self):
+        config = MinosConfig(BASE_PATH / "test_config.yml")
+        registry = EnrouteRegistry.from_config(config)
+
+        EnrouteRegistry.clear()
+
+        self.assertNotEqual(registry, EnrouteRegistry.from_config(config))
+
+    def test_decorators(self):
+        observed = self.registry.decorators
+        self.assertIsInstance(observed, MappingProxyType)
+        self.assertEqual({FakeService}, set(observed.keys()))
+        self.assertEqual(
+            frozenset({BrokerQueryEnrouteDecorator("GetTickets"), RestQueryEnrouteDecorator("tickets/", "GET")}),
+            observed[FakeService]["get_tickets"],
+        )
+
+    def test_broker_topics(self):
+        expected = frozenset({"CreateTicket", "AddTicket", "DeleteTicket", "GetTickets", "TicketAdded"})
+        self.assertEqual(expected, self.registry.broker_topics)
+
+    def test_rest_routes(self):
+        expected = (("orders/", "DELETE"), ("orders/", "GET"), ("tickets/", "GET"))
+        self.assertEqual(expected, self.registry.rest_routes)
+
+    def test_crontabs(self):
+        observed = self.registry.crontabs
+        self.assertEqual(1, len(observed))
+        self.assertIsInstance(observed[0], CronTab)
+
+    async def test_rest_command_query(self):
+        handlers = self.registry.rest_command_query
+        self.assertIsInstance(handlers, MappingProxyType)
+        self.assertEqual(
+            {
+                RestQueryEnrouteDecorator("tickets/", "GET"),
+                RestCommandEnrouteDecorator("orders/", "GET"),
+                RestCommandEnrouteDecorator("orders/", "DELETE"),
+            },
+            set(handlers.keys()),
+        )
+
+        expected = Response("_(Get Tickets: test)_")
+        observed = await handlers[RestQueryEnrouteDecorator("tickets/", "GET")](self.request)
+        self.assertEqual(expected, observed)
+        self.assertIs(handlers, self.registry.rest_command_query)
+
+    async def test_broker_command_query_event(self):
+        handlers = self.registry.broker_command_query_event
+        self.assertIsInstance(handlers, MappingProxyType)
+        self.assertEqual(5, len(handlers))
+
+        expected = Response("_Ticket Added: [test]_")
+        observed = await handlers[BrokerEventEnrouteDecorator("TicketAdded")](self.request)
+        self.assertEqual(expected, observed)
+
+        expected = Response("_(Get Tickets: test)_")
+        observed = await handlers[BrokerQueryEnrouteDecorator("GetTickets")](self.request)
+        self.assertEqual(expected, observed)
+
+    async def test_periodic_event(self):
+        handlers = self.registry.periodic_event
+        self.assertIsInstance(handlers, MappingProxyType)
+        self.assertEqual({PeriodicEventEnrouteDecorator("@daily")}, set(handlers.keys()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import threading
+import unittest
+from asyncio import (
+    gather,
+)
+from concurrent.futures import (
+    ThreadPoolExecutor,
+)
+from time import (
+    sleep,
+)
+from unittest.mock import (
+    AsyncMock,
+)
+
+from minos.common import (
+    MinosConfig,
+)
+from minos.networks import (
+    REQUEST_USER_CONTEXT_VAR,
+    HandlerExecutor,
+    get_handler_executor,
+    set_handler_executor,
+)
+from tests.utils import (
+    BASE_PATH,
+)
+
+
+def _current_thread() -> int:
+    return threading.get_ident()
+
+
+class TestHandlerExecutor(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.executor = HandlerExecutor(max_workers=2)
+
+    def tearDown(self) -> None:
+        self.executor.shutdown()
+
+    def test_max_workers(self):
+        self.assertEqual(2, self.executor.max_workers)
+
+    def test_max_workers_default(self):
+        self.assertLessEqual(1, HandlerExecutor().max_workers)
+
+    def test_max_workers_raises(self):
+        with self.assertRaises(ValueError):
+            HandlerExecutor(max_workers=0)
+
+    def test_from_config(self):
+        config = MinosConfig(BASE_PATH / "test_config.yml")
+        executor = HandlerExecutor.from_config(config)
+        self.assertEqual(4, executor.max_workers)
+
+    def test_executor(self):
+        self.assertIsInstance(self.executor.executor, ThreadPoolExecutor)
+        self.assertEqual(self.executor.executor, self.executor.executor)
+
+    async def test_submit(self):
+        observed = await self.executor.submit(_current_thread)
+        self.assertNotEqual(threading.get_ident(), observed)
+
+    async def test_submit_context(self):
+        token = REQUEST_USER_CONTEXT_VAR.set("foo")
+        try:
+            observed = await self.executor.submit(REQUEST_USER_CONTEXT_VAR.get)
+        finally:
+            REQUEST_USER_CONTEXT_VAR.reset(token)
+        self.assertEqual("foo", observed)
+
+    async def test_run_sync(self):
+        observed = await self.executor.run(_current_thread)
+        self.assertNotEqual(threading.get_ident(), observed)
+
+    async def test_run_async(self):
+        mock = AsyncMock(return_value=56)
+        self.assertEqual(56, await self.executor.run(mock, "foo"))
+        self.assertEqual([(("foo",), {})], mock.call_args_list)
+        self.assertEqual(0, self.executor.metrics["submitted"])
+
+    async def test_run_async_gen(self):
+        async def _fn(value):
+            yield threading.get_ident()
+            yield value
+
+        observed = [item async for item in await self.executor.run(_fn, "foo")]
+        self.assertEqual([threading.get_ident(), "foo"], observed)
+        self.assertEqual(0, self.executor.metrics["submitted"])
+
+    async def test_metrics(self):
+        await gather(*(self.executor.submit(sleep, 0.05) for _ in range(4)))
+
+        expected = {
+            "max_workers": 2,
+            "running": 0,
+            "queued": 0,
+            "max_queued": 2,
+            "submitted": 4,
+            "completed": 4,
+            "saturated": 2,
+            "utilization": 0.0,
+        }
+        self.assertEqual(expected, self.executor.metrics)
+
+    def test_shutdown(self):
+        executor = self.executor.executor
+        self.executor.shutdown()
+        self.assertNotEqual(executor, self.executor.executor)
+
+    def test_repr(self):
+        self.assertEqual("HandlerExecutor(max_workers=2)", repr(self.executor))
+
+
+class TestHandlerExecutorFunctions(unittest.TestCase):
+    def tearDown(self) -> None:
+        set_handler_executor(None)
+
+    def test_get_handler_executor(self):
+        set_handler_executor(None)
+        executor = get_handler_executor()
+        self.assertIsInstance(executor, HandlerExecutor)
+        self.assertEqual(executor, get_handler_executor())
+
+    def test_get_handler_executor_from_config(self):
+        set_handler_executor(None)
+        config = MinosConfig(BASE_PATH / "test_config.yml")
+        self.assertEqual(4, get_handler_executor(config).max_workers)
+
+    def test_set_handler_executor(self):
+        executor = HandlerExecutor()
+        set_handler_executor(executor)
+        self.assertEqual(executor, get_handler_executor())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+from asyncio import (
+    DefaultEventLoopPolicy,
+)
+from asyncio import get_event_loop_policy as get_current_event_loop_policy
+from asyncio import (
+    set_event_loop_policy,
+)
+from unittest.mock import (
+    MagicMock,
+    patch,
+)
+
+from minos.common import (
+    MinosConfig,
+)
+from minos.networks import (
+    get_event_loop_policy,
+    get_event_loop_policy_from_config,
+    new_event_loop,
+    setup_event_loop_policy,
+)
+from tests.utils import (
+    BASE_PATH,
+)
+
+
+class _Policy(DefaultEventLoopPolicy):
+    """For testing purposes."""
+
+
+class TestGetEventLoopPolicy(unittest.TestCase):
+    def setUp(self) -> None:
+        self.uvloop = MagicMock()
+        self.uvloop.EventLoopPolicy.return_value = _Policy()
+
+    def test_default(self):
+        with patch("minos.networks.loops.uvloop", self.uvloop):
+            self.assertIs(DefaultEventLoopPolicy, type(get_event_loop_policy()))
+
+    def test_auto(self):
+        with patch("minos.networks.loops.uvloop", self.uvloop):
+            self.assertIsInstance(get_event_loop_policy("auto"), _Policy)
+
+    def test_auto_not_installed(self):
+        with patch("minos.networks.loops.uvloop", None):
+            self.assertIs(DefaultEventLoopPolicy, type(get_event_loop_policy("auto")))
+
+    def test_uvloop(self):
+        with patch("minos.networks.loops.uvloop", self.uvloop):
+            self.assertIsInstance(get_event_loop_policy("uvloop"), _Policy)
+
+    def test_uvloop_not_installed(self):
+        with patch("minos.networks.loops.uvloop", None):
+            with self.assertLogs("minos.networks.loops", "WARNING"):
+                self.assertIs(DefaultEventLoopPolicy, type(get_event_loop_policy("uvloop")))
+
+    def test_asyncio(self):
+        with patch("minos.networks.loops.uvloop", self.uvloop):
+            self.assertIs(DefaultEventLoopPolicy, type(get_event_loop_policy("asyncio")))
+
+    def test_import_path(self):
+        self.assertIsInstance(get_event_loop_policy("tests.test_networks.test_loops._Policy"), _Policy)
+
+    def test_class(self):
+        self.assertIsInstance(get_event_loop_policy(_Policy), _Policy)
+
+    def test_instance(self):
+        policy = _Policy()
+        self.assertIs(policy, get_event_loop_policy(policy))
+
+    def test_raises(self):
+        with self.assertRaises(ValueError):
+            get_event_loop_policy(int)
+
+
+class TestEventLoopPolicyFromConfig(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = MinosConfig(BASE_PATH / "test_config.yml")
+
+    def test_get_event_loop_policy_from_config(self):
+        self.assertIs(DefaultEventLoopPolicy, type(get_event_loop_policy_from_config(self.config)))
+
+    def test_get_event_loop_policy_from_config_selected(self):
+        with patch("minos.networks.loops.get_config_value", return_value="asyncio") as mock:
+            self.assertIs(DefaultEventLoopPolicy, type(get_event_loop_policy_from_config(self.config)))
+        self.assertEqual([((self.config, "loop.policy"), {})], mock.call_args_list)
+
+    def test_new_event_loop(self):
+        with patch("minos.networks.loops.get_config_value", return_value="asyncio"):
+            loop = new_event_loop(self.config)
+        try:
+            self.assertEqual(3, loop.run_until_complete(self._fn()))
+        finally:
+            loop.close()
+
+    def test_setup_event_loop_policy(self):
+        previous = get_current_event_loop_policy()
+        try:
+            with patch("minos.networks.loops.get_config_value", return_value="tests.test_networks.test_loops._Policy"):
+                policy = setup_event_loop_policy(self.config)
+            self.assertIsInstance(policy, _Policy)
+            self.assertIs(policy, get_current_event_loop_policy())
+        finally:
+            set_event_loop_policy(previous)
+
+    @staticmethod
+    async def _fn():
+        return 3
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+
+from minos.networks import (
+    MetricsCounter,
+    MetricsHistogram,
+    MetricsRegistry,
+    get_metrics_registry,
+    set_metrics_registry,
+)
+
+
+class TestMetricsCounter(unittest.TestCase):
+    def test_inc(self):
+        counter = MetricsCounter("foo_total", "Foo.", ("topic",))
+        counter.labels("bar").inc()
+        counter.labels("bar").inc(2)
+        counter.labels("baz").inc()
+
+        self.assertEqual(3, counter.labels("bar").value)
+        self.assertEqual(1, counter.labels("baz").value)
+
+    def test_labels_raises(self):
+        with self.assertRaises(ValueError):
+            MetricsCounter("foo_total", "Foo.", ("topic",)).labels("bar", "baz")
+
+    def test_render(self):
+        counter = MetricsCounter("foo_total", "Foo.", ("topic",))
+        counter.labels('b"ar').inc()
+
+        expected = ["# HELP foo_total Foo.", "# TYPE foo_total counter", 'foo_total{topic="b\\"ar"} 1']
+        self.assertEqual(expected, list(counter.render()))
+
+
+class TestMetricsHistogram(unittest.TestCase):
+    def test_constructor_raises(self):
+        with self.assertRaises(ValueError):
+            MetricsHistogram("foo_seconds", "Foo.", buckets=[])
+
+    def test_observe(self):
+        histogram = MetricsHistogram("foo_seconds", "Foo.", buckets=(0.1, 1))
+        for value in (0.05, 0.1, 0.5, 2):
+            histogram.observe(value)
+
+        child = histogram.labels()
+        self.assertEqual([2, 1, 1], child.counts)
+        self.assertEqual(4, child.count)
+        self.assertAlmostEqual(2.65, child.sum)
+
+    def test_render(self):
+        histogram = MetricsHistogram("foo_seconds", "Foo.", ("topic",), buckets=(0.1, 1))
+        histogram.labels("bar").observe(0.5)
+
+        expected = [
+            "# HELP foo_seconds Foo.",
+            "# TYPE foo_seconds histogram",
+            'foo_seconds_bucket{topic="bar",le="0.1"} 0',
+            'foo_seconds_bucket{topic="bar",le="1.0"} 1',
+            'foo_seconds_bucket{topic="bar",le="+Inf"} 1',
+            'foo_seconds_sum{topic="bar"} 0.5',
+            'foo_seconds_count{topic="bar"} 1',
+        ]
+        self.assertEqual(expected, list(histogram.render()))
+
+
+class TestMetricsRegistry(unittest.IsolatedAsyncioTestCase):
+    def test_get_or_create(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("foo_total", "Foo.", ("topic",))
+        self.assertIs(counter, registry.counter("foo_total", "Foo.", ("topic",)))
+        self.assertEqual({"foo_total": counter}, registry.metrics)
+
+    def test_get_or_create_raises(self):
+        registry = MetricsRegistry()
+        registry.counter("foo_total", "Foo.", ("topic",))
+        with self.assertRaises(ValueError):
+            registry.histogram("foo_total", "Foo.", ("topic",))
+        with self.assertRaises(ValueError):
+            registry.counter("foo_total", "Foo.", ("status",))
+
+    async def test_render(self):
+        registry = MetricsRegistry()
+        registry.counter("foo_total", "Foo.").inc()
+
+        async def _collect():
+            return [("bar_depth", {"topic": "one"}, 3), ("bar_depth", {"topic": "two"}, 0.5)]
+
+        def _collect_raises():
+            raise ValueError()
+
+        registry.register_collector(_collect)
+        registry.register_collector(_collect_raises)
+
+        expected = (
+            "# HELP foo_total Foo.\n"
+            "# TYPE foo_total counter\n"
+            "foo_total 1\n"
+            "# TYPE bar_depth gauge\n"
+            'bar_depth{topic="one"} 3\n'
+            'bar_depth{topic="two"} 0.5\n'
+        )
+        with self.assertLogs("minos.networks.metrics", "WARNING"):
+            self.assertEqual(expected, await registry.render())
+
+        registry.unregister_collector(_collect)
+        registry.unregister_collector(_collect_raises)
+        self.assertEqual("# HELP foo_total Foo.\n# TYPE foo_total counter\nfoo_total 1\n", await registry.render())
+
+    def test_get_set_registry(self):
+        registry = MetricsRegistry()
+        set_metrics_registry(registry)
+        try:
+            self.assertIs(registry, get_metrics_registry())
+        finally:
+            set_metrics_registry(None)
+        self.assertIsNot(registry, get_metrics_registry())
+
+
+if __name__ == "__main__":
+    unittest.main()
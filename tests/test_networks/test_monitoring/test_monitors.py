@@ -0,0 +1,136 @@
+import time
+import unittest
+from asyncio import (
+    create_task,
+    current_task,
+    sleep,
+)
+
+from aiohttp.test_utils import (
+    TestClient,
+    TestServer,
+)
+
+from minos.common import (
+    MinosConfig,
+)
+from minos.networks import (
+    EventLoopMonitor,
+    MetricsRegistry,
+    Response,
+    RestHandler,
+    get_metrics_registry,
+    get_task_label,
+    reset_task_label,
+    set_metrics_registry,
+    set_task_label,
+)
+from tests.utils import (
+    BASE_PATH,
+)
+
+
+class TestTaskLabels(unittest.IsolatedAsyncioTestCase):
+    async def test_set_reset(self):
+        task = current_task()
+        self.assertIsNone(get_task_label(task))
+
+        previous = set_task_label("foo")
+        self.assertIsNone(previous)
+        self.assertEqual("foo", get_task_label(task))
+
+        inner = set_task_label("bar")
+        self.assertEqual("foo", inner)
+        self.assertEqual("bar", get_task_label(task))
+
+        reset_task_label(inner)
+        self.assertEqual("foo", get_task_label(task))
+        reset_task_label(previous)
+        self.assertIsNone(get_task_label(task))
+
+    def test_get_none(self):
+        self.assertIsNone(get_task_label(None))
+
+
+class TestEventLoopMonitor(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        set_metrics_registry(MetricsRegistry())
+
+    def tearDown(self) -> None:
+        set_metrics_registry(None)
+        super().tearDown()
+
+    def test_constructor_raises(self):
+        with self.assertRaises(ValueError):
+            EventLoopMonitor(interval=0)
+
+    def test_from_config(self):
+        monitor = EventLoopMonitor.from_config(MinosConfig(BASE_PATH / "test_config.yml"), threshold=0.5)
+        self.assertEqual(0.5, monitor.threshold)
+
+    async def test_start_stop(self):
+        monitor = EventLoopMonitor(interval=0.01)
+        await monitor.start()
+        self.assertTrue(monitor.started)
+        await sleep(0.05)
+        await monitor.stop()
+        self.assertFalse(monitor.started)
+
+        self.assertEqual(0, monitor.metrics["stalls"])
+        self.assertLess(0, get_metrics_registry().metrics["minos_event_loop_lag_seconds"].labels().count)
+
+    async def test_stall(self):
+        monitor = EventLoopMonitor(interval=0.01, threshold=0.05)
+        await monitor.start()
+
+        async def _blocking():
+            previous = set_task_label("GET /tickets")
+            try:
+                time.sleep(0.2)
+            finally:
+                reset_task_label(previous)
+
+        try:
+            await sleep(0.02)
+            with self.assertLogs("minos.networks.monitoring.monitors", "WARNING") as cm:
+                await create_task(_blocking())
+                await sleep(0.05)
+        finally:
+            await monitor.stop()
+
+        self.assertEqual(1, monitor.metrics["stalls"])
+        self.assertLessEqual(0.15, monitor.metrics["max_lag"])
+        self.assertEqual("GET /tickets", monitor.last_stall.label)
+        self.assertIn("time.sleep(0.2)", monitor.last_stall.stack)
+        self.assertIn("'GET /tickets'", cm.output[0])
+
+        counter = get_metrics_registry().metrics["minos_event_loop_stalls_total"]
+        self.assertEqual(1, counter.labels("GET /tickets").value)
+
+    async def test_report_rate_limited(self):
+        monitor = EventLoopMonitor(threshold=0.05, log_interval=60)
+        with self.assertLogs("minos.networks.monitoring.monitors", "WARNING") as cm:
+            for _ in range(3):
+                monitor._on_lag(0.1)
+        self.assertEqual(1, len(cm.output))
+        self.assertEqual(3, monitor.metrics["stalls"])
+
+
+class TestRestHandlerTaskLabels(unittest.IsolatedAsyncioTestCase):
+    async def test_label(self):
+        labels = list()
+
+        async def _fn(request):
+            labels.append(get_task_label(current_task()))
+            return Response("foo")
+
+        handler = RestHandler(host="localhost", port=8080, endpoints={("/tickets/{id}", "GET"): _fn})
+        async with TestClient(TestServer(handler.get_app())) as client:
+            await client.get("/tickets/1")
+
+        self.assertEqual(["GET /tickets/{id}"], labels)
+
+
+if __name__ == "__main__":
+    unittest.main()
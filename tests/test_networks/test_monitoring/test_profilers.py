@@ -0,0 +1,139 @@
+import marshal
+import unittest
+from asyncio import (
+    gather,
+    sleep,
+)
+from unittest.mock import (
+    patch,
+)
+
+from minos.common import (
+    MinosConfig,
+)
+from minos.networks import (
+    HandlerProfile,
+    HandlerProfiler,
+    get_handler_profiler,
+    set_handler_profiler,
+)
+from tests.utils import (
+    BASE_PATH,
+)
+
+
+def _work(n: int) -> int:
+    return sum(range(n))
+
+
+class TestHandlerProfile(unittest.TestCase):
+    def test_constructor_raises(self):
+        with self.assertRaises(ValueError):
+            HandlerProfile("foo", sample_rate=0)
+
+    def test_should_sample(self):
+        profile = HandlerProfile("foo", sample_rate=0.5)
+        with patch("random.random", side_effect=[0.25, 0.75]):
+            self.assertTrue(profile.should_sample())
+            self.assertFalse(profile.should_sample())
+        self.assertEqual(2, profile.calls)
+
+    def test_render_empty(self):
+        profile = HandlerProfile("foo")
+        self.assertEqual("'foo': 0 sampled of 0 calls.\n", profile.render())
+        self.assertEqual(dict(), marshal.loads(profile.dump()))
+
+
+class TestHandlerProfiler(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.profiler = HandlerProfiler(enabled=True, token="secret")
+
+    def test_from_config(self):
+        profiler = HandlerProfiler.from_config(MinosConfig(BASE_PATH / "test_config.yml"))
+        self.assertFalse(profiler.enabled)
+        self.assertFalse(profiler.protected)
+
+    def test_check_token(self):
+        self.assertTrue(self.profiler.protected)
+        self.assertTrue(self.profiler.check_token("secret"))
+        self.assertFalse(self.profiler.check_token("other"))
+        self.assertFalse(self.profiler.check_token(None))
+        self.assertFalse(HandlerProfiler().check_token("secret"))
+
+    def test_wrap_disabled(self):
+        profiler = HandlerProfiler()
+        self.assertIs(_work, profiler.wrap("foo", _work))
+
+    def test_wrap_sync(self):
+        fn = self.profiler.wrap("foo", _work)
+        self.assertEqual(45, fn(10))
+
+        profile = self.profiler.start("foo")
+        self.assertEqual({"foo": profile}, self.profiler.profiles)
+        self.assertEqual(45, fn(10))
+        self.assertEqual(45, fn(10))
+
+        self.assertEqual((2, 2), (profile.calls, profile.sampled))
+        self.assertIn("_work", profile.render())
+        self.assertTrue(any(name == "_work" for _, _, name in marshal.loads(profile.dump())))
+
+        self.assertIs(profile, self.profiler.stop("foo"))
+        self.assertIsNone(self.profiler.get_profile("foo"))
+        self.assertEqual(45, fn(10))
+        self.assertEqual(2, profile.calls)
+
+    async def test_wrap_async(self):
+        async def _fn(n: int) -> int:
+            await sleep(0)
+            return _work(n)
+
+        async def _other() -> None:
+            await sleep(0)
+            _work(10)
+
+        fn = self.profiler.wrap("foo", _fn)
+        profile = self.profiler.start("foo")
+
+        # The concurrent tasks are not included on the statistics.
+        self.assertEqual(45, (await gather(fn(10), _other()))[0])
+
+        self.assertEqual(1, profile.sampled)
+        self.assertIn("_fn", profile.render())
+        self.assertNotIn("_other", profile.render())
+
+    async def test_wrap_async_raises(self):
+        async def _fn() -> None:
+            await sleep(0)
+            raise ValueError()
+
+        fn = self.profiler.wrap("foo", _fn)
+        profile = self.profiler.start("foo")
+        with self.assertRaises(ValueError):
+            await fn()
+        self.assertEqual(1, profile.sampled)
+
+    async def test_wrap_nested(self):
+        inner = self.profiler.wrap("bar", _work)
+
+        async def _fn(n: int) -> int:
+            return inner(n)
+
+        fn = self.profiler.wrap("foo", _fn)
+        foo, bar = self.profiler.start("foo"), self.profiler.start("bar")
+        self.assertEqual(45, await fn(10))
+
+        self.assertIn("_work", foo.render())
+        self.assertEqual((1, 0), (bar.calls, bar.sampled))
+
+    def test_get_set_profiler(self):
+        set_handler_profiler(self.profiler)
+        try:
+            self.assertIs(self.profiler, get_handler_profiler())
+        finally:
+            set_handler_profiler(None)
+        self.assertFalse(get_handler_profiler().enabled)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from unittest.mock import (
+    AsyncMock,
+)
+
+from aiomisc import (
+    Service,
+)
+
+from minos.common import (
+    MinosConfig,
+)
+from minos.networks import (
+    EventLoopMonitor,
+    EventLoopMonitorService,
+)
+from tests.utils import (
+    BASE_PATH,
+)
+
+
+class TestEventLoopMonitorService(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.config = MinosConfig(BASE_PATH / "test_config.yml")
+
+    def test_is_instance(self):
+        service = EventLoopMonitorService(config=self.config)
+        self.assertIsInstance(service, Service)
+
+    def test_monitor(self):
+        service = EventLoopMonitorService(config=self.config)
+        self.assertIsInstance(service.monitor, EventLoopMonitor)
+
+    async def test_start_stop(self):
+        service = EventLoopMonitorService(config=self.config)
+        service.monitor.start = AsyncMock()
+        service.monitor.stop = AsyncMock()
+
+        await service.start()
+        self.assertEqual(1, service.monitor.start.call_count)
+        self.assertEqual(0, service.monitor.stop.call_count)
+
+        await service.stop()
+        self.assertEqual(1, service.monitor.stop.call_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
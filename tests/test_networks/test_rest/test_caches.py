@@ -0,0 +1,238 @@
+import gc
+import unittest
+from unittest.mock import (
+    patch,
+)
+
+from aiohttp.test_utils import (
+    TestClient,
+    TestServer,
+)
+
+from minos.common import (
+    MinosConfig,
+)
+from minos.networks import (
+    Response,
+    RestCacheEntry,
+    RestCachePolicy,
+    RestCommandEnrouteDecorator,
+    RestHandler,
+    RestQueryEnrouteDecorator,
+    RestResponseCache,
+    run_topic_hooks,
+)
+from tests.test_networks.test_rest.utils import (
+    mocked_request,
+)
+from tests.utils import (
+    BASE_PATH,
+    fake_middleware,
+)
+
+
+class TestRestCachePolicy(unittest.TestCase):
+    def setUp(self) -> None:
+        self.policy = RestCachePolicy("/tickets", "GET", 10, ["X-Tenant"], ["TicketAdded"])
+
+    def test_constructor(self):
+        self.assertEqual("/tickets", self.policy.url)
+        self.assertEqual("GET", self.policy.method)
+        self.assertEqual(10, self.policy.ttl)
+        self.assertEqual(("X-Tenant",), self.policy.headers)
+        self.assertEqual(frozenset({"TicketAdded"}), self.policy.invalidation_topics)
+
+    def test_constructor_raises(self):
+        with self.assertRaises(ValueError):
+            RestCachePolicy("/tickets", "GET", 0)
+
+    def test_from_decorator(self):
+        decorator = RestQueryEnrouteDecorator(
+            "/tickets", "GET", cache_ttl=10, cache_headers=["X-Tenant"], cache_invalidation_topics=["TicketAdded"]
+        )
+        self.assertEqual(self.policy, RestCachePolicy.from_decorator(decorator))
+
+    def test_from_decorator_disabled(self):
+        self.assertIsNone(RestCachePolicy.from_decorator(RestQueryEnrouteDecorator("/tickets", "GET")))
+
+    def test_build_key(self):
+        request = mocked_request(path="/tickets?page=2", headers={"X-Tenant": "foo"}, user="bar")
+        expected = ("/tickets", "GET", "/tickets?page=2", "bar", "application/json", "foo")
+        self.assertEqual(expected, self.policy.build_key(request, "application/json"))
+
+    def test_repr(self):
+        expected = "RestCachePolicy('/tickets', 'GET', 10, ('X-Tenant',), frozenset({'TicketAdded'}))"
+        self.assertEqual(expected, repr(self.policy))
+
+
+class TestRestCacheEntry(unittest.TestCase):
+    def setUp(self) -> None:
+        self.entry = RestCacheEntry(b'{"foo":"bar"}', "application/json", 0)
+
+    def test_etag(self):
+        self.assertTrue(self.entry.etag.startswith('"'))
+        self.assertEqual(self.entry.etag, RestCacheEntry(b'{"foo":"bar"}', "application/json", 0).etag)
+        self.assertNotEqual(self.entry.etag, RestCacheEntry(b"{}", "application/json", 0).etag)
+
+    def test_build_response(self):
+        response = self.entry.build_response(mocked_request())
+        self.assertEqual(200, response.status)
+        self.assertEqual(b'{"foo":"bar"}', response.body)
+        self.assertEqual(self.entry.etag, response.headers["ETag"])
+
+    def test_build_response_not_modified(self):
+        for if_none_match in (self.entry.etag, f'"other", W/{self.entry.etag}', "*"):
+            with self.subTest(if_none_match=if_none_match):
+                response = self.entry.build_response(mocked_request(headers={"If-None-Match": if_none_match}))
+                self.assertEqual(304, response.status)
+                self.assertEqual(self.entry.etag, response.headers["ETag"])
+
+    def test_build_response_modified(self):
+        response = self.entry.build_response(mocked_request(headers={"If-None-Match": '"other"'}))
+        self.assertEqual(200, response.status)
+
+
+class TestRestResponseCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.policy = RestCachePolicy("/tickets", "GET", 10, invalidation_topics=["TicketAdded"])
+        self.cache = RestResponseCache([self.policy], max_size=2)
+
+    def test_from_config(self):
+        decorators = [
+            RestQueryEnrouteDecorator("/tickets", "GET", cache_ttl=10),
+            RestQueryEnrouteDecorator("/orders", "GET"),
+            RestCommandEnrouteDecorator("/tickets", "POST"),
+        ]
+        cache = RestResponseCache.from_config(MinosConfig(BASE_PATH / "test_config.yml"), decorators)
+        self.assertEqual({("/tickets", "GET")}, set(cache.policies))
+        self.assertEqual(1024, cache.max_size)
+
+    def test_from_config_middleware(self):
+        decorators = [
+            RestQueryEnrouteDecorator("/tickets", "GET", cache_ttl=10),
+            RestQueryEnrouteDecorator("/orders", "GET", cache_ttl=10, cache_headers=["Authorization"]),
+        ]
+        config = MinosConfig(BASE_PATH / "test_config.yml")
+        with self.assertLogs("minos.networks.rest.caches", "WARNING"):
+            cache = RestResponseCache.from_config(config, decorators, [fake_middleware])
+        self.assertEqual({("/orders", "GET")}, set(cache.policies))
+
+    def test_constructor_raises(self):
+        with self.assertRaises(ValueError):
+            RestResponseCache(max_size=0)
+
+    def test_get_policy(self):
+        self.assertEqual(self.policy, self.cache.get_policy("/tickets", "GET"))
+        self.assertIsNone(self.cache.get_policy("/tickets", "POST"))
+
+    def test_get_set(self):
+        self.assertIsNone(self.cache.get(("/tickets", "GET", "a")))
+        entry = self.cache.set(("/tickets", "GET", "a"), b"foo", "application/json", self.policy)
+        self.assertEqual(entry, self.cache.get(("/tickets", "GET", "a")))
+        self.assertEqual({"size": 1, "hits": 1, "misses": 1}, self.cache.metrics)
+
+    def test_get_expired(self):
+        with patch("minos.networks.rest.caches.time.monotonic", return_value=100):
+            self.cache.set(("/tickets", "GET", "a"), b"foo", "application/json", self.policy)
+        with patch("minos.networks.rest.caches.time.monotonic", return_value=110):
+            self.assertIsNone(self.cache.get(("/tickets", "GET", "a")))
+        self.assertEqual(0, len(self.cache))
+
+    def test_lru(self):
+        self.cache.set(("/tickets", "GET", "a"), b"a", "application/json", self.policy)
+        self.cache.set(("/tickets", "GET", "b"), b"b", "application/json", self.policy)
+        self.cache.get(("/tickets", "GET", "a"))
+        self.cache.set(("/tickets", "GET", "c"), b"c", "application/json", self.policy)
+
+        self.assertIsNotNone(self.cache.get(("/tickets", "GET", "a")))
+        self.assertIsNone(self.cache.get(("/tickets", "GET", "b")))
+        self.assertIsNotNone(self.cache.get(("/tickets", "GET", "c")))
+
+    def test_invalidate(self):
+        self.cache.set(("/tickets", "GET", "a"), b"a", "application/json", self.policy)
+        self.cache.set(("/orders", "GET", "b"), b"b", "application/json", self.policy)
+
+        self.assertEqual(1, self.cache.invalidate("/tickets", "GET"))
+        self.assertEqual(1, len(self.cache))
+        self.assertEqual(1, self.cache.invalidate())
+        self.assertEqual(0, len(self.cache))
+
+    def test_invalidate_topic(self):
+        self.cache.set(("/tickets", "GET", "a"), b"a", "application/json", self.policy)
+
+        RestResponseCache.invalidate_topic("OrderAdded")
+        self.assertEqual(1, len(self.cache))
+
+        RestResponseCache.invalidate_topic("TicketAdded")
+        self.assertEqual(0, len(self.cache))
+
+    def test_invalidate_topic_unregistered(self):
+        policy = RestCachePolicy("/tickets", "GET", 10, invalidation_topics=["TicketRemoved"])
+        cache = RestResponseCache([policy])
+        # noinspection PyProtectedMember
+        self.assertEqual([cache], list(RestResponseCache._INVALIDATION_REGISTRY["TicketRemoved"]))
+
+        del cache
+        gc.collect()
+
+        # noinspection PyProtectedMember
+        self.assertEqual([], list(RestResponseCache._INVALIDATION_REGISTRY["TicketRemoved"]))
+        RestResponseCache.invalidate_topic("TicketRemoved")
+
+
+class TestRestHandlerCache(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.calls = 0
+
+        async def _fn(request):
+            self.calls += 1
+            return Response({"calls": self.calls})
+
+        policy = RestCachePolicy("/tickets", "GET", 10, ["X-Tenant"], ["TicketsChanged"])
+        self.handler = RestHandler(
+            host="localhost", port=8080, endpoints={("/tickets", "GET"): _fn}, cache=RestResponseCache([policy])
+        )
+        self.client = TestClient(TestServer(self.handler.get_app()))
+        await self.client.start_server()
+
+    async def asyncTearDown(self) -> None:
+        await self.client.close()
+        await super().asyncTearDown()
+
+    async def test_cached(self):
+        first = await self.client.get("/tickets")
+        second = await self.client.get("/tickets")
+
+        self.assertEqual({"calls": 1}, await first.json())
+        self.assertEqual({"calls": 1}, await second.json())
+        self.assertEqual(first.headers["ETag"], second.headers["ETag"])
+        self.assertEqual(1, self.calls)
+
+    async def test_key(self):
+        await self.client.get("/tickets")
+        await self.client.get("/tickets?page=2")
+        await self.client.get("/tickets", headers={"X-Tenant": "foo"})
+        await self.client.get("/tickets", headers={"User": "3f6e8d3e-0c6c-4b1e-9a3a-3b1c1b0d2f11"})
+        await self.client.get("/tickets", headers={"Accept": "application/x-ndjson"})
+        await self.client.get("/tickets", headers={"X-Other": "foo"})
+
+        self.assertEqual(5, self.calls)
+
+    async def test_not_modified(self):
+        first = await self.client.get("/tickets")
+        second = await self.client.get("/tickets", headers={"If-None-Match": first.headers["ETag"]})
+
+        self.assertEqual(304, second.status)
+        self.assertEqual(b"", await second.read())
+
+    async def test_invalidate_topic(self):
+        await self.client.get("/tickets")
+        run_topic_hooks("TicketsChanged")
+        response = await self.client.get("/tickets")
+
+        self.assertEqual({"calls": 2}, await response.json())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,208 @@
+import gzip
+import unittest
+import zlib
+from unittest.mock import (
+    AsyncMock,
+    patch,
+)
+
+from aiohttp import (
+    web,
+)
+from aiohttp.test_utils import (
+    TestClient,
+    TestServer,
+)
+
+from minos.common import (
+    MinosConfig,
+)
+from minos.networks import (
+    HandlerExecutor,
+    Response,
+    RestCachePolicy,
+    RestCommandEnrouteDecorator,
+    RestCompressor,
+    RestHandler,
+    RestQueryEnrouteDecorator,
+    RestResponseCache,
+)
+from tests.utils import (
+    BASE_PATH,
+)
+
+
+class TestRestCompressor(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.compressor = RestCompressor(encodings=["gzip", "deflate"], enabled=True)
+
+    def test_constructor(self):
+        compressor = RestCompressor()
+        self.assertEqual(("gzip", "deflate"), compressor.encodings)
+        self.assertEqual(1024, compressor.min_size)
+        self.assertEqual(6, compressor.level)
+        self.assertEqual(128 * 1024, compressor.offload_size)
+        self.assertFalse(compressor.is_enabled("/tickets", "GET"))
+
+    def test_constructor_raises(self):
+        with self.assertRaises(ValueError):
+            RestCompressor(encodings=["zstd"])
+        with self.assertRaises(ValueError):
+            RestCompressor(level=10)
+
+    def test_constructor_brotli_not_installed(self):
+        with patch("minos.networks.rest.compressors.brotli", None):
+            with self.assertRaises(ValueError):
+                RestCompressor(encodings=["br"])
+
+    def test_from_config(self):
+        decorators = [
+            RestQueryEnrouteDecorator("/tickets", "GET", compress=False),
+            RestQueryEnrouteDecorator("/orders", "GET"),
+            RestCommandEnrouteDecorator("/orders", "POST", compress=True),
+        ]
+        compressor = RestCompressor.from_config(MinosConfig(BASE_PATH / "test_config.yml"), decorators, enabled=False)
+
+        self.assertFalse(compressor.is_enabled("/tickets", "GET"))
+        self.assertFalse(compressor.is_enabled("/orders", "GET"))
+        self.assertTrue(compressor.is_enabled("/orders", "POST"))
+
+    def test_is_enabled(self):
+        self.assertTrue(self.compressor.is_enabled("/tickets", "GET"))
+
+    def test_negotiate(self):
+        cases = [
+            (None, None),
+            ("", None),
+            ("identity", None),
+            ("gzip", "gzip"),
+            ("deflate, gzip", "gzip"),
+            ("gzip;q=0.5, deflate", "deflate"),
+            ("gzip;q=0, *", "deflate"),
+            ("*;q=0", None),
+            ("br", None),
+        ]
+        for accept_encoding, expected in cases:
+            with self.subTest(accept_encoding=accept_encoding):
+                self.assertEqual(expected, self.compressor.negotiate(accept_encoding))
+
+    async def test_compress(self):
+        body = b"foo" * 100
+        self.assertEqual(body, gzip.decompress(await self.compressor.compress(body, "gzip")))
+        self.assertEqual(body, zlib.decompress(await self.compressor.compress(body, "deflate")))
+
+    async def test_compress_offloaded(self):
+        compressor = RestCompressor(offload_size=10)
+        executor = HandlerExecutor(max_workers=1)
+        with patch("minos.networks.rest.compressors.get_handler_executor", return_value=executor):
+            observed = await compressor.compress(b"foo" * 100, "gzip")
+        executor.shutdown()
+
+        self.assertEqual(b"foo" * 100, gzip.decompress(observed))
+        self.assertEqual(1, executor.metrics["completed"])
+
+    def test_compress_sync_deterministic(self):
+        self.assertEqual(self.compressor.compress_sync(b"foo", "gzip"), self.compressor.compress_sync(b"foo", "gzip"))
+
+    def test_compress_sync_raises(self):
+        with self.assertRaises(ValueError):
+            self.compressor.compress_sync(b"foo", "zstd")
+
+
+class TestRestHandlerCompression(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+
+        async def _fn(request):
+            return Response(["foo"] * 1000)
+
+        async def _small_fn(request):
+            return Response("foo")
+
+        async def _stream_fn(request):
+            for _ in range(1000):
+                yield "foo"
+
+        endpoints = {
+            ("/tickets", "GET"): _fn,
+            ("/orders", "GET"): _fn,
+            ("/small", "GET"): _small_fn,
+            ("/stream", "GET"): _stream_fn,
+        }
+        self.handler = RestHandler(
+            host="localhost",
+            port=8080,
+            endpoints=endpoints,
+            cache=RestResponseCache([RestCachePolicy("/orders", "GET", 10)]),
+            compressor=RestCompressor(enabled=True, routes={("/small", "GET"): True, ("/tickets", "POST"): False}),
+        )
+        self.client = TestClient(TestServer(self.handler.get_app()), auto_decompress=False)
+        await self.client.start_server()
+
+    async def asyncTearDown(self) -> None:
+        await self.client.close()
+        await super().asyncTearDown()
+
+    async def test_compressor(self):
+        self.assertIsInstance(self.handler.compressor, RestCompressor)
+
+    async def test_gzip(self):
+        response = await self.client.get("/tickets", headers={"Accept-Encoding": "gzip"})
+
+        self.assertEqual("gzip", response.headers["Content-Encoding"])
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+        self.assertEqual(b'["foo"' + b',"foo"' * 999 + b"]", gzip.decompress(await response.read()))
+
+    async def test_stream(self):
+        response = await self.client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+        self.assertEqual("gzip", response.headers["Content-Encoding"])
+        self.assertEqual(b'["foo"' + b',"foo"' * 999 + b"]", gzip.decompress(await response.read()))
+
+    async def test_identity(self):
+        response = await self.client.get("/tickets", headers={"Accept-Encoding": "identity"})
+
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+
+    async def test_small(self):
+        response = await self.client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+        self.assertEqual(b'"foo"', await response.read())
+
+    async def test_cached(self):
+        with patch.object(RestCompressor, "compress", side_effect=self.handler.compressor.compress) as mock:
+            first = await self.client.get("/orders", headers={"Accept-Encoding": "deflate"})
+            second = await self.client.get("/orders", headers={"Accept-Encoding": "deflate"})
+
+        self.assertEqual(1, mock.call_count)
+        self.assertEqual(await first.read(), await second.read())
+        self.assertTrue(first.headers["ETag"].startswith("W/"))
+
+        response = await self.client.get("/orders", headers={"If-None-Match": first.headers["ETag"]})
+        self.assertEqual(304, response.status)
+
+    async def test_disabled(self):
+        self.assertFalse(self.handler.compressor.is_enabled("/tickets", "POST"))
+
+        callback = self.handler.get_callback(AsyncMock(return_value=Response(["foo"] * 1000)))
+        client = TestClient(TestServer(self._app(callback)), auto_decompress=False)
+        await client.start_server()
+        try:
+            response = await client.get("/", headers={"Accept-Encoding": "gzip"})
+            self.assertNotIn("Content-Encoding", response.headers)
+            self.assertNotIn("Accept-Encoding", response.headers["Vary"])
+        finally:
+            await client.close()
+
+    @staticmethod
+    def _app(callback):
+        app = web.Application()
+        app.router.add_get("/", callback)
+        return app
+
+
+if __name__ == "__main__":
+    unittest.main()
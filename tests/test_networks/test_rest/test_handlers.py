@@ -1,6 +1,9 @@
+import json
+import marshal
 import unittest
 from unittest.mock import (
     AsyncMock,
+    patch,
 )
 from uuid import (
     uuid4,
@@ -9,21 +12,34 @@ from uuid import (
 from aiohttp import (
     web,
 )
+from aiohttp.test_utils import (
+    TestClient,
+    TestServer,
+)
 from aiohttp.web_exceptions import (
     HTTPBadRequest,
     HTTPInternalServerError,
 )
 
+from minos.common import (
+    MinosAvroProtocol,
+)
 from minos.common.testing import (
     PostgresAsyncTestCase,
 )
 from minos.networks import (
     REQUEST_USER_CONTEXT_VAR,
+    AvroRestSerializer,
+    HandlerProfiler,
+    JsonRestSerializer,
+    MetricsRegistry,
     Request,
     Response,
     RestHandler,
     RestResponse,
     RestResponseException,
+    set_handler_profiler,
+    set_metrics_registry,
 )
 from tests.test_networks.test_rest.utils import (
     json_mocked_request,
@@ -31,6 +47,7 @@ from tests.test_networks.test_rest.utils import (
 )
 from tests.utils import (
     BASE_PATH,
+    FakeModel,
 )
 
 
@@ -63,6 +80,14 @@ class TestRestHandler(PostgresAsyncTestCase):
         self.assertIsInstance(self.handler, RestHandler)
         self.assertEqual({("/order", "GET"), ("/ticket", "POST")}, set(self.handler.endpoints.keys()))
 
+    def test_from_config_serializer(self):
+        self.assertIsInstance(self.handler.serializer, JsonRestSerializer)
+
+    def test_serializer(self):
+        serializer = JsonRestSerializer(use_orjson=False)
+        handler = RestHandler(host="localhost", port=8080, endpoints=dict(), serializer=serializer)
+        self.assertEqual(serializer, handler.serializer)
+
     def test_from_config_raises(self):
         with self.assertRaises(Exception):
             RestHandler.from_config()
@@ -74,7 +99,7 @@ class TestRestHandler(PostgresAsyncTestCase):
         handler = self.handler.get_callback(_Cls._fn)
         response = await handler(json_mocked_request({"foo": "bar"}))
         self.assertIsInstance(response, web.Response)
-        self.assertEqual('{"foo": "bar"}', response.text)
+        self.assertEqual({"foo": "bar"}, json.loads(response.text))
         self.assertEqual("application/json", response.content_type)
 
     async def test_get_callback_none(self):
@@ -109,5 +134,249 @@ class TestRestHandler(PostgresAsyncTestCase):
         self.assertEqual(1, mock.call_count)
 
 
+class TestRestHandlerNegotiation(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.handler = RestHandler(host="localhost", port=8080, endpoints=dict())
+
+    def test_serializers(self):
+        expected = ["application/json", "avro/binary", "application/x-ndjson"]
+        self.assertEqual(expected, list(self.handler.serializers.keys()))
+
+    def test_get_serializer_default(self):
+        for accept in (None, "", "*/*", "text/html", "text/*", "avro/binary;q=0"):
+            with self.subTest(accept=accept):
+                self.assertIsInstance(self.handler.get_serializer(accept), JsonRestSerializer)
+
+    def test_get_serializer_avro(self):
+        for accept in ("avro/binary", "avro/*", "application/json;q=0.5, avro/binary", "text/html, avro/binary;q=0.1"):
+            with self.subTest(accept=accept):
+                self.assertIsInstance(self.handler.get_serializer(accept), AvroRestSerializer)
+
+    def test_get_serializer_json(self):
+        for accept in ("application/json", "application/json, avro/binary", "avro/binary;q=0.2, application/*"):
+            with self.subTest(accept=accept):
+                self.assertIsInstance(self.handler.get_serializer(accept), JsonRestSerializer)
+
+    def test_get_serializer_cached(self):
+        self.handler.get_serializer("avro/binary")
+        self.assertEqual({"avro/binary"}, set(self.handler._negotiated))
+
+    async def test_get_callback_avro(self):
+        async def _fn(request):
+            return Response([FakeModel("foo"), FakeModel("bar")])
+
+        handler = self.handler.get_callback(_fn)
+        response = await handler(mocked_request(headers={"Accept": "avro/binary"}))
+
+        self.assertEqual("avro/binary", response.content_type)
+        self.assertEqual("Accept", response.headers["Vary"])
+        observed = await AvroRestSerializer().serialize(Response([FakeModel("foo"), FakeModel("bar")]))
+        self.assertEqual(MinosAvroProtocol.decode(observed), MinosAvroProtocol.decode(response.body))
+
+    async def test_get_callback_json(self):
+        async def _fn(request):
+            return Response({"foo": "bar"})
+
+        handler = self.handler.get_callback(_fn)
+        response = await handler(mocked_request(headers={"Accept": "application/json"}))
+
+        self.assertEqual("application/json", response.content_type)
+        self.assertEqual({"foo": "bar"}, json.loads(response.text))
+
+
+async def _stream_items(count: int):
+    for i in range(count):
+        yield {"id": i}
+
+
+class TestRestHandlerStreaming(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+
+        async def _fn_stream(request):
+            return Response(_stream_items(3))
+
+        async def _fn_stream_empty(request):
+            return _stream_items(0)
+
+        async def _fn_stream_models(request):
+            for text in ("foo", "bar"):
+                yield FakeModel(text)
+
+        async def _fn_stream_raises(request):
+            raise RestResponseException("foo")
+            # noinspection PyUnreachableCode
+            yield
+
+        endpoints = {
+            ("/stream", "GET"): _fn_stream,
+            ("/empty", "GET"): _fn_stream_empty,
+            ("/models", "GET"): _fn_stream_models,
+            ("/raises", "GET"): _fn_stream_raises,
+        }
+        self.handler = RestHandler(host="localhost", port=8080, endpoints=endpoints)
+        self.client = TestClient(TestServer(self.handler.get_app()))
+        await self.client.start_server()
+
+    async def asyncTearDown(self) -> None:
+        await self.client.close()
+        await super().asyncTearDown()
+
+    async def test_json_array(self):
+        response = await self.client.get("/stream")
+
+        self.assertEqual(200, response.status)
+        self.assertEqual("application/json", response.content_type)
+        self.assertEqual("chunked", response.headers["Transfer-Encoding"])
+        self.assertEqual([{"id": 0}, {"id": 1}, {"id": 2}], await response.json())
+
+    async def test_json_array_empty(self):
+        response = await self.client.get("/empty")
+        self.assertEqual([], await response.json())
+
+    async def test_ndjson(self):
+        response = await self.client.get("/stream", headers={"Accept": "application/x-ndjson"})
+
+        self.assertEqual("application/x-ndjson", response.content_type)
+        self.assertEqual("Accept", response.headers["Vary"])
+        observed = [json.loads(line) for line in (await response.text()).splitlines()]
+        self.assertEqual([{"id": 0}, {"id": 1}, {"id": 2}], observed)
+
+    async def test_models(self):
+        response = await self.client.get("/models")
+        self.assertEqual([{"text": "foo"}, {"text": "bar"}], await response.json())
+
+    async def test_not_supported_serializer(self):
+        response = await self.client.get("/models", headers={"Accept": "avro/binary"})
+
+        self.assertEqual("avro/binary", response.content_type)
+        observed = await AvroRestSerializer().serialize(Response([FakeModel("foo"), FakeModel("bar")]))
+        self.assertEqual(MinosAvroProtocol.decode(observed), MinosAvroProtocol.decode(await response.read()))
+
+    async def test_raises_before_first_item(self):
+        response = await self.client.get("/raises")
+        self.assertEqual(400, response.status)
+
+
+class TestRestHandlerMetrics(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        set_metrics_registry(MetricsRegistry())
+
+        async def _fn(request):
+            return Response("foo")
+
+        self.handler = RestHandler(host="localhost", port=8080, endpoints={("/tickets/{id}", "GET"): _fn})
+        self.client = TestClient(TestServer(self.handler.get_app()))
+        await self.client.start_server()
+
+    async def asyncTearDown(self) -> None:
+        await self.client.close()
+        set_metrics_registry(None)
+        await super().asyncTearDown()
+
+    async def test_system_metrics(self):
+        await self.client.get("/tickets/1")
+        await self.client.get("/tickets/2")
+
+        response = await self.client.get("/system/metrics")
+        self.assertEqual(200, response.status)
+        self.assertEqual("text/plain; version=0.0.4; charset=utf-8", response.headers["Content-Type"])
+
+        lines = (await response.text()).splitlines()
+        self.assertIn("# TYPE minos_rest_request_duration_seconds histogram", lines)
+        self.assertIn('minos_rest_request_duration_seconds_count{method="GET",route="/tickets/{id}"} 2', lines)
+        self.assertIn('minos_rest_requests_total{method="GET",route="/tickets/{id}",status="200"} 2', lines)
+
+
+class TestRestHandlerProfiling(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.profiler = HandlerProfiler(enabled=True, token="secret")
+        set_handler_profiler(self.profiler)
+
+        async def _fn(request):
+            return Response("foo")
+
+        endpoints = {("/tickets", "GET"): self.profiler.wrap("GET /tickets", _fn)}
+        self.handler = RestHandler(host="localhost", port=8080, endpoints=endpoints)
+        self.client = TestClient(TestServer(self.handler.get_app()))
+        await self.client.start_server()
+        self.headers = {"Authorization": "Bearer secret"}
+
+    async def asyncTearDown(self) -> None:
+        await self.client.close()
+        set_handler_profiler(None)
+        await super().asyncTearDown()
+
+    async def test_unauthorized(self):
+        response = await self.client.get("/system/profiling")
+        self.assertEqual(401, response.status)
+
+        response = await self.client.get("/system/profiling", headers={"Authorization": "Bearer other"})
+        self.assertEqual(401, response.status)
+
+    async def test_not_mounted(self):
+        set_handler_profiler(HandlerProfiler(enabled=True))
+        client = TestClient(TestServer(RestHandler(host="localhost", port=8080, endpoints={}).get_app()))
+        await client.start_server()
+        try:
+            response = await client.get("/system/profiling", headers=self.headers)
+            self.assertEqual(404, response.status)
+        finally:
+            await client.close()
+
+    async def test_not_mounted_disabled(self):
+        client = TestClient(
+            TestServer(RestHandler(host="localhost", port=8080, endpoints={}, profiling=False).get_app())
+        )
+        await client.start_server()
+        try:
+            response = await client.get("/system/profiling", headers=self.headers)
+            self.assertEqual(404, response.status)
+        finally:
+            await client.close()
+
+    async def test_profiling(self):
+        response = await self.client.post("/system/profiling?target=GET /tickets&sample_rate=0.5", headers=self.headers)
+        self.assertEqual(201, response.status)
+        self.assertEqual(
+            {"target": "GET /tickets", "sample_rate": 0.5, "calls": 0, "sampled": 0}, await response.json()
+        )
+
+        with patch("random.random", return_value=0.25):
+            await self.client.get("/tickets")
+
+        response = await self.client.get("/system/profiling", headers=self.headers)
+        self.assertEqual(
+            [{"target": "GET /tickets", "sample_rate": 0.5, "calls": 1, "sampled": 1}], await response.json()
+        )
+
+        response = await self.client.get("/system/profiling/stats?target=GET /tickets", headers=self.headers)
+        self.assertEqual(200, response.status)
+        self.assertIn("'GET /tickets': 1 sampled of 1 calls.", await response.text())
+
+        response = await self.client.get(
+            "/system/profiling/stats?target=GET /tickets&format=pstats", headers=self.headers
+        )
+        self.assertEqual(200, response.status)
+        self.assertEqual("application/octet-stream", response.content_type)
+        self.assertIsInstance(marshal.loads(await response.read()), dict)
+
+        response = await self.client.delete("/system/profiling?target=GET /tickets", headers=self.headers)
+        self.assertEqual(200, response.status)
+        self.assertIsNone(self.profiler.get_profile("GET /tickets"))
+
+        response = await self.client.get("/system/profiling/stats?target=GET /tickets", headers=self.headers)
+        self.assertEqual(404, response.status)
+
+    async def test_bad_request(self):
+        response = await self.client.post("/system/profiling", headers=self.headers)
+        self.assertEqual(400, response.status)
+
+        response = await self.client.post("/system/profiling?target=foo&sample_rate=2", headers=self.headers)
+        self.assertEqual(400, response.status)
+
+
 if __name__ == "__main__":
     unittest.main()
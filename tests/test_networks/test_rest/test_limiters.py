@@ -0,0 +1,230 @@
+import unittest
+from asyncio import (
+    CancelledError,
+    Event,
+    create_task,
+    gather,
+    sleep,
+)
+
+from aiohttp.test_utils import (
+    TestClient,
+    TestServer,
+)
+
+from minos.common import (
+    MinosConfig,
+)
+from minos.networks import (
+    Response,
+    RestAdmissionController,
+    RestCommandEnrouteDecorator,
+    RestConcurrencyLimiter,
+    RestHandler,
+    RestQueryEnrouteDecorator,
+)
+from tests.utils import (
+    BASE_PATH,
+)
+
+
+class TestRestConcurrencyLimiter(unittest.IsolatedAsyncioTestCase):
+    def test_constructor(self):
+        limiter = RestConcurrencyLimiter(2)
+        self.assertEqual(2, limiter.limit)
+        self.assertFalse(limiter.adaptive)
+        self.assertEqual(0, limiter.in_flight)
+        self.assertEqual(0, limiter.queued)
+
+    def test_constructor_raises(self):
+        with self.assertRaises(ValueError):
+            RestConcurrencyLimiter(0)
+        with self.assertRaises(ValueError):
+            RestConcurrencyLimiter(1, max_queued=-1)
+        with self.assertRaises(ValueError):
+            RestConcurrencyLimiter(1, backoff=1)
+
+    async def test_acquire_release(self):
+        limiter = RestConcurrencyLimiter(2)
+        self.assertTrue(await limiter.acquire())
+        self.assertTrue(await limiter.acquire())
+        self.assertFalse(await limiter.acquire())
+
+        limiter.release()
+        self.assertTrue(await limiter.acquire())
+        self.assertEqual({"limit": 2, "in_flight": 2, "queued": 0, "accepted": 3, "rejected": 1}, limiter.metrics)
+
+    async def test_acquire_queued(self):
+        limiter = RestConcurrencyLimiter(1, max_queued=1)
+        await limiter.acquire()
+
+        waiter = create_task(limiter.acquire())
+        await sleep(0)
+        self.assertEqual(1, limiter.queued)
+        self.assertFalse(await limiter.acquire())
+
+        limiter.release()
+        self.assertTrue(await waiter)
+        self.assertEqual(1, limiter.in_flight)
+        self.assertEqual(0, limiter.queued)
+
+    async def test_acquire_fifo(self):
+        limiter = RestConcurrencyLimiter(1, max_queued=3)
+        await limiter.acquire()
+        order = list()
+
+        async def _acquire(index):
+            await limiter.acquire()
+            order.append(index)
+            limiter.release()
+
+        tasks = [create_task(_acquire(index)) for index in range(3)]
+        await sleep(0)
+        limiter.release()
+        await gather(*tasks)
+
+        self.assertEqual([0, 1, 2], order)
+        self.assertEqual(0, limiter.in_flight)
+
+    async def test_acquire_timeout(self):
+        limiter = RestConcurrencyLimiter(1, max_queued=1, queue_timeout=0.01)
+        await limiter.acquire()
+
+        self.assertFalse(await limiter.acquire())
+        self.assertEqual(0, limiter.queued)
+        self.assertEqual(1, limiter.metrics["rejected"])
+
+    async def test_acquire_cancelled(self):
+        limiter = RestConcurrencyLimiter(1, max_queued=1)
+        await limiter.acquire()
+
+        waiter = create_task(limiter.acquire())
+        await sleep(0)
+        waiter.cancel()
+        with self.assertRaises(CancelledError):
+            await waiter
+
+        self.assertEqual(0, limiter.queued)
+        limiter.release()
+        self.assertEqual(0, limiter.in_flight)
+
+    async def test_acquire_discarded_while_giving_up(self):
+        limiter = RestConcurrencyLimiter(1, max_queued=1)
+        await limiter.acquire()
+
+        waiter = create_task(limiter.acquire())
+        await sleep(0)
+        # The waiter gives up, but the slot is released before it resumes, so its future is discarded.
+        limiter._waiters[0].cancel()
+        limiter.release()
+        with self.assertRaises(CancelledError):
+            await waiter
+
+        self.assertEqual(0, limiter.queued)
+        self.assertEqual(0, limiter.in_flight)
+        self.assertTrue(await limiter.acquire())
+
+    async def test_adaptive(self):
+        limiter = RestConcurrencyLimiter(4, latency_target=0.1, min_limit=2, max_limit=5)
+        self.assertTrue(limiter.adaptive)
+
+        for _ in range(3):
+            await limiter.acquire()
+            limiter.release(1.0)
+        self.assertEqual(2, limiter.limit)
+
+        for _ in range(20):
+            await limiter.acquire()
+            limiter.release(0.01)
+        self.assertEqual(5, limiter.limit)
+
+    async def test_adaptive_wakes_up(self):
+        limiter = RestConcurrencyLimiter(1, max_queued=1, latency_target=0.1)
+        await limiter.acquire()
+        waiter = create_task(limiter.acquire())
+        await sleep(0)
+
+        limiter.release(0.01)
+        self.assertTrue(await waiter)
+
+    def test_repr(self):
+        self.assertEqual("RestConcurrencyLimiter(limit=2, max_queued=3)", repr(RestConcurrencyLimiter(2, 3)))
+
+
+class TestRestAdmissionController(unittest.TestCase):
+    def test_constructor(self):
+        controller = RestAdmissionController()
+        self.assertIsNone(controller.global_limiter)
+        self.assertEqual(tuple(), controller.get_limiters("/tickets", "GET"))
+        self.assertEqual(1, controller.retry_after)
+        self.assertEqual(dict(), controller.metrics)
+
+    def test_from_config(self):
+        decorators = [
+            RestQueryEnrouteDecorator("/tickets", "GET", max_concurrency=2),
+            RestCommandEnrouteDecorator("/tickets", "POST"),
+        ]
+        controller = RestAdmissionController.from_config(
+            MinosConfig(BASE_PATH / "test_config.yml"), decorators, max_concurrency=10, max_queued=5, retry_after=0.5
+        )
+
+        route, global_ = controller.get_limiters("/tickets", "GET")
+        self.assertEqual(2, route.limit)
+        self.assertIs(controller.global_limiter, global_)
+        self.assertEqual(10, global_.limit)
+        self.assertEqual((global_,), controller.get_limiters("/tickets", "POST"))
+        self.assertEqual(1, controller.retry_after)
+        self.assertEqual({"global", "GET /tickets"}, set(controller.metrics))
+
+
+class TestRestHandlerAdmission(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.event = Event()
+
+        async def _fn(request):
+            await self.event.wait()
+            return Response("foo")
+
+        self.handler = RestHandler(
+            host="localhost",
+            port=8080,
+            endpoints={("/tickets", "GET"): _fn, ("/orders", "GET"): _fn},
+            admission=RestAdmissionController(routes={("/tickets", "GET"): 1}, retry_after=2),
+        )
+        self.client = TestClient(TestServer(self.handler.get_app()))
+        await self.client.start_server()
+
+    async def asyncTearDown(self) -> None:
+        await self.client.close()
+        await super().asyncTearDown()
+
+    async def test_rejected(self):
+        first = create_task(self.client.get("/tickets"))
+        while not self.handler.admission.get_limiters("/tickets", "GET")[0].in_flight:
+            await sleep(0.001)
+
+        response = await self.client.get("/tickets")
+        self.assertEqual(503, response.status)
+        self.assertEqual("2", response.headers["Retry-After"])
+
+        self.event.set()
+        self.assertEqual(200, (await first).status)
+        self.assertEqual(0, self.handler.admission.get_limiters("/tickets", "GET")[0].in_flight)
+
+    async def test_not_limited(self):
+        first = create_task(self.client.get("/tickets"))
+        while not self.handler.admission.get_limiters("/tickets", "GET")[0].in_flight:
+            await sleep(0.001)
+
+        health = await self.client.get("/system/health")
+        self.assertEqual(200, health.status)
+
+        other = create_task(self.client.get("/orders"))
+        self.event.set()
+        self.assertEqual(200, (await first).status)
+        self.assertEqual(200, (await other).status)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import logging
+import threading
+import unittest
+from unittest.mock import (
+    patch,
+)
+
+from aiohttp.test_utils import (
+    TestClient,
+    TestServer,
+    make_mocked_request,
+)
+
+from minos.common import (
+    MinosConfig,
+)
+from minos.networks import (
+    Response,
+    RestAccessLogger,
+    RestHandler,
+)
+from tests.utils import (
+    BASE_PATH,
+)
+
+
+class _Collector(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = list()
+        self.threads = list()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+        self.threads.append(threading.get_ident())
+
+
+class TestRestAccessLogger(unittest.TestCase):
+    def setUp(self) -> None:
+        self.logger = logging.getLogger("tests.access")
+        self.logger.setLevel(logging.INFO)
+        self.collector = _Collector()
+        self.logger.addHandler(self.collector)
+        self.request = make_mocked_request("GET", "/tickets?page=2")
+
+    def tearDown(self) -> None:
+        self.logger.removeHandler(self.collector)
+
+    def test_constructor(self):
+        access_log = RestAccessLogger()
+        self.assertEqual(logging.getLogger("minos.networks.rest.access"), access_log.logger)
+        self.assertEqual(1.0, access_log.sample_rate)
+
+    def test_constructor_raises(self):
+        with self.assertRaises(ValueError):
+            RestAccessLogger(sample_rate=1.5)
+
+    def test_from_config(self):
+        access_log = RestAccessLogger.from_config(MinosConfig(BASE_PATH / "test_config.yml"), sample_rate=0.5)
+        self.assertEqual(0.5, access_log.sample_rate)
+
+    def test_log(self):
+        RestAccessLogger(self.logger).log(self.request, 200, 0.25, 13)
+
+        self.assertEqual(1, len(self.collector.records))
+        record = self.collector.records[0]
+        self.assertEqual('None "GET /tickets?page=2" 200 13 0.250000', record.getMessage())
+        expected = {"remote": None, "method": "GET", "path": "/tickets?page=2", "status": 200, "latency": 0.25}
+        self.assertEqual(expected | {"size": 13}, record.access)
+
+    def test_log_disabled(self):
+        RestAccessLogger(self.logger, enabled=False).log(self.request, 200, 0.25, 13)
+        self.logger.setLevel(logging.WARNING)
+        RestAccessLogger(self.logger).log(self.request, 200, 0.25, 13)
+
+        self.assertEqual(0, len(self.collector.records))
+
+    def test_log_sampled(self):
+        access_log = RestAccessLogger(self.logger, sample_rate=0.5, slow_threshold=1)
+        with patch("random.random", return_value=0.75):
+            access_log.log(self.request, 200, 0.25)
+            access_log.log(self.request, 500, 0.25)
+            access_log.log(self.request, 200, 2)
+        with patch("random.random", return_value=0.25):
+            access_log.log(self.request, 200, 0.25)
+
+        self.assertEqual([500, 200, 200], [record.access["status"] for record in self.collector.records])
+
+    def test_queued(self):
+        handlers = list(self.logger.handlers)
+        access_log = RestAccessLogger(self.logger, queued=True)
+        try:
+            access_log.log(self.request, 200, 0.25)
+            self.assertEqual(handlers, self.logger.handlers)
+            self.assertTrue(self.logger.propagate)
+        finally:
+            access_log.stop()
+
+        self.assertEqual(handlers, self.logger.handlers)
+        self.assertEqual(["tests.access"], [record.name for record in self.collector.records])
+        self.assertNotEqual([threading.get_ident()], self.collector.threads)
+
+    def test_queued_shared_logger(self):
+        handlers = list(self.logger.handlers)
+        first = RestAccessLogger(self.logger, queued=True)
+        second = RestAccessLogger(self.logger, queued=True)
+        try:
+            first.log(self.request, 200, 0.25)
+            second.log(self.request, 404, 0.25)
+        finally:
+            first.stop()
+        second.log(self.request, 500, 0.25)
+        second.stop()
+
+        self.assertEqual(handlers, self.logger.handlers)
+        self.assertTrue(self.logger.propagate)
+        self.assertEqual([200, 404, 500], sorted(record.access["status"] for record in self.collector.records))
+
+
+class TestRestHandlerAccessLog(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+
+        async def _fn(request):
+            return Response("foo")
+
+        async def _fail(request):
+            raise ValueError()
+
+        self.handler = RestHandler(
+            host="localhost",
+            port=8080,
+            endpoints={("/tickets", "GET"): _fn, ("/fail", "GET"): _fail},
+            access_log=RestAccessLogger("tests.access"),
+        )
+        self.client = TestClient(TestServer(self.handler.get_app()))
+        await self.client.start_server()
+
+    async def asyncTearDown(self) -> None:
+        await self.client.close()
+        await super().asyncTearDown()
+
+    async def test_log(self):
+        with self.assertLogs("tests.access") as cm:
+            await self.client.get("/tickets")
+            await self.client.get("/fail")
+            await self.client.get("/system/health")
+
+        observed = [(record.access["path"], record.access["status"]) for record in cm.records]
+        self.assertEqual([("/tickets", 200), ("/fail", 500), ("/system/health", 200)], observed)
+        self.assertEqual(5, cm.records[0].access["size"])
+        self.assertIsNone(cm.records[1].access["size"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,8 @@ from uuid import (
 )
 
 from minos.common import (
+    MinosAvroProtocol,
+    MinosProtocolException,
     ModelType,
     classname,
 )
@@ -14,6 +16,10 @@ from minos.networks import (
     RestRequest,
     RestResponse,
 )
+from minos.networks.rest.requests import (
+    _get_avro_decoder,
+    _get_data_decoder,
+)
 from tests.test_networks.test_rest.utils import (
     avro_mocked_request,
     bytes_mocked_request,
@@ -220,6 +226,38 @@ class TestRestRequestContent(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(expected, observed)
 
 
+class TestRestRequestAvroDecoding(unittest.TestCase):
+    def test_decode_avro(self):
+        model = FakeModel("foobar")
+        schema, data = RestRequest._decode_avro(MinosAvroProtocol.encode(model.avro_data, model.avro_schema))
+
+        self.assertEqual("record", schema["type"])
+        self.assertEqual({"text": "foobar"}, data)
+
+    def test_decode_avro_raises(self):
+        with self.assertRaises(MinosProtocolException):
+            RestRequest._decode_avro(b"foobar")
+
+        with self.assertRaises(MinosProtocolException):
+            RestRequest._decode_avro(MinosAvroProtocol.encode([1, 2], "int", batch_mode=True))
+
+    def test_get_avro_decoder_cached(self):
+        # Each schema has a different random namespace suffix.
+        first, second = FakeModel.avro_schema, FakeModel.avro_schema
+        self.assertNotEqual(first, second)
+
+        decoder = _get_avro_decoder(first)
+        self.assertIs(decoder, _get_avro_decoder(second))
+        self.assertEqual(FakeModel("foobar"), decoder.build({"text": "foobar"}))
+
+    def test_get_avro_decoder_different(self):
+        self.assertIsNot(_get_avro_decoder("int"), _get_avro_decoder("string"))
+
+    def test_build_decoder_cached(self):
+        self.assertIs(_get_data_decoder(classname(FakeModel)), _get_data_decoder(classname(FakeModel)))
+        self.assertEqual(FakeModel("foobar"), RestRequest._build({"text": "foobar"}, classname(FakeModel)))
+
+
 class TestRestRequestParams(unittest.IsolatedAsyncioTestCase):
     def test_has_url_params_false(self):
         raw = mocked_request()
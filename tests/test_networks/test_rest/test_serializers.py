@@ -0,0 +1,252 @@
+import json
+import unittest
+from datetime import (
+    date,
+    datetime,
+    time,
+    timedelta,
+    timezone,
+)
+from decimal import (
+    Decimal,
+)
+from typing import (
+    Optional,
+)
+from uuid import (
+    UUID,
+    uuid4,
+)
+
+from minos.common import (
+    AvroDataDecoder,
+    AvroDataEncoder,
+    AvroSchemaDecoder,
+    DeclarativeModel,
+    MinosAvroProtocol,
+)
+from minos.networks import (
+    AvroRestSerializer,
+    JsonRestSerializer,
+    NdJsonRestSerializer,
+    Response,
+    RestSerializer,
+)
+from minos.networks.rest.serializers import (
+    encode_json_default,
+    encode_raw_data,
+)
+from tests.utils import (
+    FakeModel,
+)
+
+
+class _Model(DeclarativeModel):
+    """For testing purposes."""
+
+    uuid: UUID
+    created_at: datetime
+    day: date
+    hour: time
+    duration: timedelta
+    tags: list[str]
+    scores: dict[str, float]
+    child: FakeModel
+    parent: Optional[FakeModel]
+
+
+class _RawResponse(Response):
+    """For testing purposes."""
+
+    async def raw_content(self, **kwargs):
+        return {"raw": True}
+
+
+class TestJsonRestSerializer(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.serializer = JsonRestSerializer()
+        self.models = [
+            _Model(
+                uuid4(),
+                datetime(2021, 7, 1, 12, 30, tzinfo=timezone.utc),
+                date(2021, 7, 1),
+                time(12, 30, 15),
+                timedelta(minutes=3),
+                ["foo", "bar"],
+                {"one": 1.5},
+                FakeModel("foo"),
+                None,
+            )
+            for _ in range(3)
+        ]
+
+    def test_subclass(self):
+        self.assertTrue(issubclass(JsonRestSerializer, RestSerializer))
+
+    def test_content_type(self):
+        self.assertEqual("application/json", self.serializer.content_type)
+
+    def test_use_orjson(self):
+        self.assertTrue(self.serializer.use_orjson)
+        self.assertFalse(JsonRestSerializer(use_orjson=False).use_orjson)
+
+    async def test_serialize_models(self):
+        expected = AvroDataEncoder(self.models).build()
+        for serializer in (self.serializer, JsonRestSerializer(use_orjson=False)):
+            with self.subTest(serializer=serializer):
+                observed = json.loads(await serializer.serialize(Response(self.models)))
+                self.assertEqual(expected, observed)
+
+    async def test_serialize_raw(self):
+        self.assertEqual({"foo": "bar"}, json.loads(await self.serializer.serialize({"foo": "bar"})))
+
+    async def test_serialize_raw_content_overridden(self):
+        self.assertEqual({"raw": True}, json.loads(await self.serializer.serialize(_RawResponse(None))))
+
+    async def test_serialize_none(self):
+        self.assertIsNone(await self.serializer.serialize(None))
+        self.assertIsNone(await self.serializer.serialize(Response(None)))
+
+    async def test_serialize_stream(self):
+        observed = [chunk async for chunk in self.serializer.serialize_stream(_iterate([1, FakeModel("foo")]))]
+        self.assertEqual([b"[1", b',{"text":"foo"}', b"]"], observed)
+        self.assertEqual([1, {"text": "foo"}], json.loads(b"".join(observed)))
+
+    async def test_serialize_stream_empty(self):
+        observed = [chunk async for chunk in self.serializer.serialize_stream(_iterate([]))]
+        self.assertEqual([], json.loads(b"".join(observed)))
+
+    def test_dumps_big_integer(self):
+        self.assertEqual(2 ** 70, json.loads(self.serializer.dumps(2 ** 70)))
+
+    def test_dumps_raises(self):
+        with self.assertRaises(TypeError):
+            self.serializer.dumps(object())
+
+
+class TestNdJsonRestSerializer(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.serializer = NdJsonRestSerializer()
+
+    def test_subclass(self):
+        self.assertTrue(issubclass(NdJsonRestSerializer, JsonRestSerializer))
+
+    def test_content_type(self):
+        self.assertEqual("application/x-ndjson", self.serializer.content_type)
+
+    def test_dumps(self):
+        self.assertEqual([{"text": "foo"}], self._loads(self.serializer.dumps(FakeModel("foo"))))
+
+    def test_dumps_list(self):
+        observed = self._loads(self.serializer.dumps([FakeModel("foo"), FakeModel("bar")]))
+        self.assertEqual([{"text": "foo"}, {"text": "bar"}], observed)
+
+    async def test_serialize_stream(self):
+        observed = [chunk async for chunk in self.serializer.serialize_stream(_iterate([1, {"foo": "bar"}]))]
+        self.assertEqual([b"1\n", b'{"foo":"bar"}\n'], observed)
+
+    @staticmethod
+    def _loads(data: bytes) -> list:
+        return [json.loads(line) for line in data.splitlines()]
+
+
+class TestAvroRestSerializer(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.serializer = AvroRestSerializer()
+
+    def test_subclass(self):
+        self.assertTrue(issubclass(AvroRestSerializer, RestSerializer))
+
+    def test_content_type(self):
+        self.assertEqual("avro/binary", self.serializer.content_type)
+
+    async def test_serialize_models(self):
+        models = [FakeModel("foo"), FakeModel("bar")]
+        observed = await self._decode(await self.serializer.serialize(Response(models)))
+        self.assertEqual(models, observed)
+
+    async def test_serialize_model(self):
+        observed = await self._decode(await self.serializer.serialize(Response(FakeModel("foo"))))
+        self.assertEqual(FakeModel("foo"), observed)
+
+    async def test_serialize_raw(self):
+        for value in ({"foo": [1, 2]}, "foo", 56, []):
+            with self.subTest(value=value):
+                observed = await self._decode(await self.serializer.serialize(value))
+                self.assertEqual(value, observed)
+
+    async def test_serialize_none(self):
+        self.assertIsNone(await self.serializer.serialize(Response(None)))
+
+    async def test_serialize_stream(self):
+        models = [FakeModel("foo"), FakeModel("bar")]
+        observed = [chunk async for chunk in self.serializer.serialize_stream(_iterate(models))]
+        self.assertEqual(1, len(observed))
+        self.assertEqual(models, await self._decode(observed[0]))
+
+    def test_get_schema_cached(self):
+        schema = self.serializer.get_schema(list[FakeModel])
+        self.assertEqual("array", schema["type"])
+        self.assertIs(schema, self.serializer.get_schema(list[FakeModel]))
+
+    def test_get_schema_cache_max_size(self):
+        serializer = AvroRestSerializer(schema_cache_max_size=1)
+        schema = serializer.get_schema(FakeModel)
+        serializer.get_schema(list[FakeModel])
+        self.assertIsNot(schema, serializer.get_schema(FakeModel))
+
+    @staticmethod
+    async def _decode(data: bytes):
+        schema = MinosAvroProtocol.decode_schema(data)
+        return AvroDataDecoder(AvroSchemaDecoder(schema).build()).build(MinosAvroProtocol.decode(data))
+
+
+async def _iterate(items):
+    for item in items:
+        yield item
+
+
+class TestEncodeRawData(unittest.TestCase):
+    def test_models(self):
+        models = [
+            _Model(
+                uuid4(),
+                datetime(2021, 7, 1, 12, 30, tzinfo=timezone.utc),
+                date(2021, 7, 1),
+                time(12, 30, 15),
+                timedelta(minutes=3),
+                ["foo"],
+                {"one": 1.5},
+                FakeModel("foo"),
+                FakeModel("bar"),
+            )
+        ]
+        self.assertEqual(AvroDataEncoder(models).build(), encode_raw_data(models))
+
+    def test_raw(self):
+        for value in (None, "foo", 56, 3.5, True, b"foo", {"foo": {1, 2}}):
+            with self.subTest(value=value):
+                self.assertEqual(AvroDataEncoder(value).build(), encode_raw_data(value))
+
+    def test_memoryview(self):
+        self.assertEqual(b"foo", encode_raw_data(memoryview(b"foo")))
+
+
+class TestEncodeJsonDefault(unittest.TestCase):
+    def test_set(self):
+        self.assertEqual([1], encode_json_default({1}))
+
+    def test_decimal(self):
+        self.assertEqual(3.5, encode_json_default(Decimal("3.5")))
+
+    def test_uuid(self):
+        uuid = uuid4()
+        self.assertEqual(str(uuid), encode_json_default(uuid))
+
+    def test_raises(self):
+        with self.assertRaises(TypeError):
+            encode_json_default(object())
+
+
+if __name__ == "__main__":
+    unittest.main()
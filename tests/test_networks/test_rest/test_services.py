@@ -1,5 +1,21 @@
+import socket
+import time
 import unittest
+from asyncio import (
+    DefaultEventLoopPolicy,
+    create_task,
+    sleep,
+    wait_for,
+)
+from unittest.mock import (
+    AsyncMock,
+    MagicMock,
+    patch,
+)
 
+from aiohttp import (
+    ClientSession,
+)
 from aiohttp.test_utils import (
     AioHTTPTestCase,
 )
@@ -8,13 +24,23 @@ from minos.common import (
     MinosConfig,
 )
 from minos.networks import (
+    RestCachePolicy,
+    RestResponseCache,
     RestService,
 )
+from minos.networks.rest.services import (
+    _get_worker_loop_policy,
+)
 from tests.utils import (
     BASE_PATH,
 )
 
 
+def _failing_initializer(config: MinosConfig) -> None:
+    """For testing purposes."""
+    raise ValueError("foo")
+
+
 class TestRestService(AioHTTPTestCase):
     CONFIG_FILE_PATH = BASE_PATH / "test_config.yml"
 
@@ -44,5 +70,137 @@ class TestRestService(AioHTTPTestCase):
         assert resp.status == 200
 
 
+class TestRestServiceWorkers(unittest.IsolatedAsyncioTestCase):
+    CONFIG_FILE_PATH = BASE_PATH / "test_config.yml"
+
+    def setUp(self) -> None:
+        with socket.socket() as sock:
+            sock.bind(("localhost", 0))
+            self.port = sock.getsockname()[1]
+        self.config = MinosConfig(self.CONFIG_FILE_PATH, rest_port=self.port)
+
+    def test_workers(self):
+        service = RestService(config=self.config)
+        self.assertEqual(1, service.workers)
+        self.assertEqual(list(), service.processes)
+
+    def test_workers_disable_shared_state(self):
+        cache = RestResponseCache([RestCachePolicy("/order", "GET", 10)])
+        with patch("minos.networks.RestHandler._cache_from_config", return_value=cache):
+            self.assertEqual(cache, RestService(config=self.config).handler.cache)
+
+            service = RestService(config=self.config, workers=2)
+
+        self.assertEqual(dict(), service.handler.cache.policies)
+        # noinspection PyProtectedMember
+        self.assertFalse(service.handler._profiling)
+        service.socket.close()
+
+    def test_workers_disable_given_cache(self):
+        cache = RestResponseCache([RestCachePolicy("/order", "GET", 10)])
+        service = RestService(config=self.config, workers=2, cache=cache, profiling=True)
+
+        self.assertEqual(dict(), service.handler.cache.policies)
+        # noinspection PyProtectedMember
+        self.assertFalse(service.handler._profiling)
+        service.socket.close()
+
+    def test_worker_loop_policy(self):
+        with patch("minos.networks.rest.services.get_current_event_loop_policy", return_value=DefaultEventLoopPolicy()):
+            self.assertIs(DefaultEventLoopPolicy, _get_worker_loop_policy(self.config))
+            self.assertIs(DefaultEventLoopPolicy, _get_worker_loop_policy(None))
+
+        with patch("minos.networks.rest.services.get_config_value", return_value="asyncio"):
+            self.assertEqual("asyncio", _get_worker_loop_policy(self.config))
+
+        policy = type("EventLoopPolicy", (DefaultEventLoopPolicy,), {"__module__": "uvloop"})()
+        with patch("minos.networks.rest.services.get_current_event_loop_policy", return_value=policy):
+            self.assertEqual("uvloop", _get_worker_loop_policy(self.config))
+
+    def test_workers_raises(self):
+        with self.assertRaises(ValueError):
+            RestService(config=self.config, workers=0)
+
+    async def test_start_stop(self):
+        service = RestService(config=self.config, workers=2)
+        self.assertTrue(service.socket.getsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT))
+
+        await service.start()
+        try:
+            self.assertTrue(service.handler.already_setup)
+            # noinspection PyProtectedMember
+            self.assertIsNone(service.runner._kwargs["access_log"])
+            self.assertEqual(1, len(service.processes))
+            process = service.processes[0]
+            self.assertTrue(process.is_alive())
+
+            async with ClientSession() as session:
+                for _ in range(10):
+                    async with session.get(f"http://localhost:{self.port}/system/health") as response:
+                        self.assertEqual(200, response.status)
+        finally:
+            await service.stop()
+
+        self.assertFalse(process.is_alive())
+        self.assertEqual(0, process.exitcode)
+        self.assertEqual(list(), service.processes)
+        self.assertTrue(service.handler.already_destroyed)
+
+    async def test_supervise_restarts(self):
+        service = RestService(config=self.config, workers=2)
+        await service.start()
+        try:
+            process = service.processes[0]
+            process.kill()
+            process.join()
+
+            supervisor = create_task(service._supervise(interval=0.01))
+            while service.processes[0] is process:
+                await sleep(0.01)
+            supervisor.cancel()
+
+            self.assertTrue(service.processes[0].is_alive())
+        finally:
+            await service.stop()
+
+    async def test_supervise_restarts_independently(self):
+        service = RestService(config=self.config, workers=3)
+        failing = MagicMock(**{"is_alive.return_value": False})
+        healthy = MagicMock(**{"is_alive.return_value": True})
+        service._processes = [failing, healthy]
+        start_worker = AsyncMock(side_effect=lambda index: failing if index == 1 else healthy)
+
+        with patch.object(service, "_start_worker", start_worker):
+            with patch("minos.networks.rest.services._WORKER_MAX_RESTARTS", 100):
+                supervisor = create_task(service._supervise(interval=0.01))
+                try:
+                    # The backoff of the failing worker grows until it is greater than a second.
+                    while start_worker.call_count < 7:
+                        await sleep(0.01)
+
+                    healthy.is_alive.return_value = False
+                    restarted = MagicMock(**{"is_alive.return_value": True})
+                    start_worker.side_effect = lambda index: failing if index == 1 else restarted
+                    start = time.monotonic()
+                    while service.processes[1] is not restarted:
+                        await sleep(0.01)
+                    self.assertLess(time.monotonic() - start, 0.5)
+                finally:
+                    supervisor.cancel()
+        service.socket.close()
+
+    async def test_supervise_gives_up(self):
+        initializer = f"{__name__}._failing_initializer"
+        service = RestService(config=self.config, workers=2, worker_initializer=initializer)
+        await service.start()
+        try:
+            with patch("minos.networks.rest.services._WORKER_MAX_RESTARTS", 1):
+                with self.assertLogs("minos.networks.rest.services", "ERROR"):
+                    await wait_for(service._supervise(interval=0.01), 30)
+            self.assertEqual([None], service.processes)
+        finally:
+            await service.stop()
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -17,10 +17,13 @@ from minos.common import (
     current_datetime,
 )
 from minos.networks import (
+    MetricsRegistry,
     PeriodicTask,
     PeriodicTaskScheduler,
     ScheduledRequest,
     ScheduledResponseException,
+    get_metrics_registry,
+    set_metrics_registry,
 )
 from tests.utils import (
     BASE_PATH,
@@ -152,6 +155,22 @@ class TestPeriodicTask(unittest.IsolatedAsyncioTestCase):
 
         self.assertEqual(1, self.fn_mock.call_count)
 
+    async def test_run_once_metrics(self) -> None:
+        set_metrics_registry(MetricsRegistry())
+        try:
+
+            async def _fn(request):
+                raise ScheduledResponseException("")
+
+            periodic = PeriodicTask("@daily", _fn)
+            await periodic.run_once()
+            await periodic.run_once()
+
+            histogram = get_metrics_registry().metrics["minos_periodic_task_duration_seconds"]
+            self.assertEqual(2, histogram.labels(_fn.__qualname__, "error").count)
+        finally:
+            set_metrics_registry(None)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -3,8 +3,15 @@ from asyncio import (
     Queue,
 )
 
+from minos.common import (
+    MinosConfig,
+)
 from minos.networks import (
     consume_queue,
+    get_config_value,
+)
+from tests.utils import (
+    BASE_PATH,
 )
 
 
@@ -27,3 +34,12 @@ class TestUtils(unittest.IsolatedAsyncioTestCase):
 
         self.assertEqual(3, await queue.get())
         self.assertTrue(queue.empty())
+
+    def test_get_config_value(self):
+        config = MinosConfig(BASE_PATH / "test_config.yml")
+        self.assertEqual(4, get_config_value(config, "executor.max_workers"))
+
+    def test_get_config_value_default(self):
+        config = MinosConfig(BASE_PATH / "test_config.yml")
+        self.assertEqual(None, get_config_value(config, "foo.bar"))
+        self.assertEqual(56, get_config_value(config, "foo.bar", 56))